@@ -0,0 +1,101 @@
+# Copyright 2017 gRPC authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Coroutine interceptor that adds headers to outgoing requests.
+
+This is the asyncio counterpart of ``client_interceptor``; pass the
+interceptors to ``grpc.aio.insecure_channel(..., interceptors=...)``.
+"""
+
+from grpc import aio
+
+class _GenericAsyncClientInterceptor:
+
+    def __init__(self, interceptor_function):
+        self._fn = interceptor_function
+
+    async def _intercept(self, continuation, client_call_details,
+                         request_or_iterator, request_streaming,
+                         response_streaming):
+        new_details, new_request_or_iterator, postprocess = await self._fn(
+            client_call_details, request_or_iterator, request_streaming,
+            response_streaming)
+        call = await continuation(new_details, new_request_or_iterator)
+        return await postprocess(call) if postprocess else call
+
+
+class _UnaryUnaryInterceptor(_GenericAsyncClientInterceptor,
+                             aio.UnaryUnaryClientInterceptor):
+
+    async def intercept_unary_unary(self, continuation, client_call_details,
+                                    request):
+        return await self._intercept(continuation, client_call_details,
+                                     request, False, False)
+
+
+class _UnaryStreamInterceptor(_GenericAsyncClientInterceptor,
+                              aio.UnaryStreamClientInterceptor):
+
+    async def intercept_unary_stream(self, continuation, client_call_details,
+                                     request):
+        return await self._intercept(continuation, client_call_details,
+                                     request, False, True)
+
+
+class _StreamUnaryInterceptor(_GenericAsyncClientInterceptor,
+                              aio.StreamUnaryClientInterceptor):
+
+    async def intercept_stream_unary(self, continuation, client_call_details,
+                                     request_iterator):
+        return await self._intercept(continuation, client_call_details,
+                                     request_iterator, True, False)
+
+
+class _StreamStreamInterceptor(_GenericAsyncClientInterceptor,
+                               aio.StreamStreamClientInterceptor):
+
+    async def intercept_stream_stream(self, continuation, client_call_details,
+                                      request_iterator):
+        return await self._intercept(continuation, client_call_details,
+                                     request_iterator, True, True)
+
+
+def create_interceptors(intercept_call):
+    # grpc.aio files every interceptor under a single call shape, so one
+    # interceptor per shape is needed to see all four.
+    return [
+        _UnaryUnaryInterceptor(intercept_call),
+        _UnaryStreamInterceptor(intercept_call),
+        _StreamUnaryInterceptor(intercept_call),
+        _StreamStreamInterceptor(intercept_call),
+    ]
+
+
+def header_adder_interceptor(header, value):
+
+    async def intercept_call(client_call_details, request_or_iterator,
+                             request_streaming, response_streaming):
+        metadata = []
+        if client_call_details.metadata is not None:
+            metadata = list(client_call_details.metadata)
+        metadata.append((
+            header,
+            value,
+        ))
+        client_call_details = aio.ClientCallDetails(
+            client_call_details.method, client_call_details.timeout,
+            aio.Metadata(*metadata), client_call_details.credentials,
+            client_call_details.wait_for_ready)
+        return client_call_details, request_or_iterator, None
+
+    return create_interceptors(intercept_call)
@@ -0,0 +1,56 @@
+import asyncio
+import sys
+
+from grpc import aio
+
+from google.showcase_v1beta1.services.echo import EchoAsyncClient
+from google.showcase_v1beta1.services.echo import transports
+from google.showcase_v1beta1.types import echo as gs_echo
+
+import async_client_interceptor
+
+async def requests(content):
+  for word in content.split(' '):
+    yield gs_echo.EchoRequest(content=word)
+
+async def run_should_fail():
+  print("================= should fail with 'Access denied!' ====================")
+  channel = aio.insecure_channel('localhost:50051')
+  transport = transports.EchoGrpcAsyncIOTransport(channel=channel)
+  client = EchoAsyncClient(transport=transport)
+
+  content = 'The rain in Spain stays mainly on the Plain!'
+  try:
+    responses = await client.chat(requests(content))
+    async for res in responses:
+      print(res)
+    print("trailing metadata...")
+    print(await responses.trailing_metadata())
+  except:
+    print(sys.exc_info())
+  await channel.close()
+
+async def run_should_pass():
+  print("================= should pass ====================")
+  header_adder_interceptors = async_client_interceptor.header_adder_interceptor(
+        'one-time-password', '42')
+  channel = aio.insecure_channel('localhost:50051',
+                                 interceptors=header_adder_interceptors)
+  transport = transports.EchoGrpcAsyncIOTransport(channel=channel)
+  client = EchoAsyncClient(transport=transport)
+
+  content = 'The rain in Spain stays mainly on the Plain!'
+  responses = await client.chat(requests(content))
+  async for res in responses:
+    print(res)
+  print("trailing metadata...")
+  print(await responses.trailing_metadata())
+
+  request = gs_echo.ExpandRequest(content='one two three four')
+  responses = await client.expand(request)
+  async for message in responses:
+    print(message)
+  await channel.close()
+
+asyncio.run(run_should_pass())
+asyncio.run(run_should_fail())
@@ -15,6 +15,11 @@
 # limitations under the License.
 
 
+import time
+
+import grpc
+
+import google.api_core.exceptions
 import google.api_core.grpc_helpers
 import google.api_core.operations_v1
 
@@ -36,7 +41,7 @@ class EchoGrpcTransport(object):
     )
 
     def __init__(self, channel=None, credentials=None,
-                 address='localhost:7469'):
+                 address='localhost:7469', connect_timeout=None):
         """Instantiate the transport class.
 
         Args:
@@ -49,6 +54,9 @@ class EchoGrpcTransport(object):
                 are specified, the client will attempt to ascertain the
                 credentials from the environment.
             address (str): The address where the service is hosted.
+            connect_timeout (float): If set, connect at once rather than on
+                the first call: :meth:`warm_up` waits up to this many
+                seconds for the channel to be ready.
         """
         # If both `channel` and `credentials` are specified, raise an
         # exception (channels come with credentials baked in already).
@@ -82,6 +90,11 @@ class EchoGrpcTransport(object):
         # instantiate an LRO client.
         self._operations_client = google.api_core.operations_v1.OperationsClient(channel)
 
+        # How long the warm-up took, once there was one.
+        self.warm_up_time = None
+        if connect_timeout is not None:
+            self.warm_up(connect_timeout)
+
     @classmethod
     def create_channel(
                 cls,
@@ -110,6 +123,36 @@ class EchoGrpcTransport(object):
             **kwargs
         )
 
+    def warm_up(self, timeout=None):
+        """Connect the channel, and wait until it is ready.
+
+        This moves the cost of name resolution, the handshakes and the
+        HTTP/2 setup from the first call to here. The stubs in ``_stubs``
+        already hold a callable for every method.
+
+        Args:
+            timeout (float): The most seconds to wait for the channel to be
+                ready; None waits for as long as it takes.
+
+        Returns:
+            float: The seconds the warm-up took; also saved as
+                ``warm_up_time``.
+
+        Raises:
+            google.api_core.exceptions.DeadlineExceeded: If the channel was
+                not ready in time.
+        """
+        started = time.monotonic()
+        ready = grpc.channel_ready_future(self._channel)
+        try:
+            ready.result(timeout=timeout)
+        except grpc.FutureTimeoutError:
+            ready.cancel()
+            raise google.api_core.exceptions.DeadlineExceeded(
+                'The channel was not ready within {}s.'.format(timeout))
+        self.warm_up_time = time.monotonic() - started
+        return self.warm_up_time
+
     @property
     def channel(self):
         """The gRPC channel used by the transport.
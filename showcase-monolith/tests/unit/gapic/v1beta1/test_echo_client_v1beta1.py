@@ -16,13 +16,16 @@
 
 """Unit tests."""
 
+import grpc
 import mock
 import pytest
 
+from google.api_core import exceptions
 from google.rpc import status_pb2
 
 from google import showcase_v1beta1
 from google.longrunning import operations_pb2
+from google.showcase_v1beta1.gapic.transports import echo_grpc_transport
 from google.showcase_v1beta1.proto import echo_pb2
 
 
@@ -343,3 +346,27 @@ class TestEchoClient(object):
 
         with pytest.raises(CustomException):
             client.block()
+
+    def test_transport_connect_timeout(self):
+        channel = ChannelStub()
+        patch = mock.patch('grpc.channel_ready_future')
+        with patch as channel_ready_future:
+            transport = echo_grpc_transport.EchoGrpcTransport(
+                channel=channel, connect_timeout=5.0)
+
+        channel_ready_future.assert_called_once_with(channel)
+        channel_ready_future.return_value.result.assert_called_once_with(
+            timeout=5.0)
+        assert transport.warm_up_time >= 0
+
+    def test_transport_connect_timeout_exception(self):
+        channel = ChannelStub()
+        patch = mock.patch('grpc.channel_ready_future')
+        with patch as channel_ready_future:
+            ready = channel_ready_future.return_value
+            ready.result.side_effect = grpc.FutureTimeoutError()
+            with pytest.raises(exceptions.DeadlineExceeded):
+                echo_grpc_transport.EchoGrpcTransport(
+                    channel=channel, connect_timeout=0.1)
+
+        ready.cancel.assert_called_once_with()
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Compare unary Echo throughput over one channel and over a channel pool.
+
+An in-process server answers every Echo after a fixed delay and, like a
+real backend behind an HTTP/2 stream limit, works on only so many calls
+per connection at once; further calls on that connection queue up. Many
+client threads then hammer it, first through a single channel and then
+through pools of increasing size.
+
+Usage::
+
+    python benchmarks/channel_pool.py [--threads N] [--calls N] [--sizes 1,2,4]
+"""
+
+import argparse
+import collections
+from concurrent import futures
+import threading
+import time
+
+from google.showcase_v1beta1 import channel_pool
+from google.showcase_v1beta1.services.echo import EchoClient
+from google.showcase_v1beta1.services.echo import transports
+from google.showcase_v1beta1.types import echo as gs_echo
+
+import grpc  # type: ignore
+
+
+def _serve(latency: float, streams_per_connection: int):
+    # Each client connection (peer address) gets its own set of slots.
+    slots = collections.defaultdict(
+        lambda: threading.BoundedSemaphore(streams_per_connection))
+    slots_lock = threading.Lock()
+
+    def echo(request, context):
+        with slots_lock:
+            connection = slots[context.peer()]
+        with connection:
+            time.sleep(latency)
+        return gs_echo.EchoResponse(content=request.content)
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=256))
+    server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler(
+        'google.showcase.v1beta1.Echo', {
+            'Echo': grpc.unary_unary_rpc_method_handler(
+                echo,
+                request_deserializer=gs_echo.EchoRequest.deserialize,
+                response_serializer=gs_echo.EchoResponse.serialize,
+            ),
+        }),))
+    port = server.add_insecure_port('localhost:0')
+    server.start()
+    return server, 'localhost:{}'.format(port)
+
+
+def _run(client: EchoClient, threads: int, calls: int) -> float:
+    request = gs_echo.EchoRequest(content='benchmark')
+    start = threading.Barrier(threads + 1)
+
+    def worker():
+        start.wait()
+        for _ in range(calls):
+            client.echo(request)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for w in workers:
+        w.start()
+    start.wait()
+    began = time.perf_counter()
+    for w in workers:
+        w.join()
+    return threads * calls / (time.perf_counter() - began)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=64)
+    parser.add_argument('--calls', type=int, default=10)
+    parser.add_argument('--latency-ms', type=float, default=50.0)
+    parser.add_argument('--streams-per-connection', type=int, default=16)
+    parser.add_argument('--sizes', default='1,2,4,8')
+    parser.add_argument('--strategy', default=channel_pool.ROUND_ROBIN,
+                        choices=(channel_pool.ROUND_ROBIN,
+                                 channel_pool.LEAST_OUTSTANDING))
+    args = parser.parse_args()
+
+    server, address = _serve(args.latency_ms / 1000,
+                             args.streams_per_connection)
+    try:
+        for size in (int(s) for s in args.sizes.split(',')):
+            pool = channel_pool.ChannelPool(
+                [
+                    grpc.insecure_channel(address, options=[
+                        ('grpc.use_local_subchannel_pool', 1),
+                    ])
+                    for _ in range(size)
+                ],
+                strategy=args.strategy,
+            )
+            for channel in pool.channels:
+                # Connect before timing.
+                grpc.channel_ready_future(channel).result(timeout=10)
+            client = EchoClient(
+                transport=transports.EchoGrpcTransport(channel=pool),
+            )
+            qps = _run(client, args.threads, args.calls)
+            print('{:2d} channel(s): {:9.1f} calls/s'.format(size, qps))
+            pool.close()
+    finally:
+        server.stop(None)
+
+
+if __name__ == '__main__':
+    main()
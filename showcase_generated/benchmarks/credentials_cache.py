@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Compare the cost of building a client with and without the credentials cache.
+
+Each client is built without credentials, so that its transport looks up
+the default credentials. The environment points them at an authorized
+user file with a token that is still valid, as ``gcloud auth
+application-default login`` writes; no request leaves the process. The
+clients are built first with the cache cleared before each one, which is
+what every client paid before the cache, and then with the cache kept.
+
+Usage::
+
+    python benchmarks/credentials_cache.py [--clients N]
+"""
+
+import argparse
+import datetime
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from google.showcase_v1beta1 import credentials_cache
+from google.showcase_v1beta1.services.echo import EchoClient
+
+
+def _credentials_file(directory: str) -> str:
+    expiry = datetime.datetime.utcnow() + datetime.timedelta(days=1)
+    path = os.path.join(directory, 'application_default_credentials.json')
+    with open(path, 'w') as f:
+        json.dump({
+            'type': 'authorized_user',
+            'client_id': 'benchmark.apps.googleusercontent.com',
+            'client_secret': 'secret',
+            'refresh_token': 'refresh-token',
+            'token': 'token',
+            'expiry': expiry.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        }, f)
+    return path
+
+
+def _build(clients: int, cached: bool) -> list:
+    # The microseconds taken to build each client.
+    micros = []
+    for _ in range(clients):
+        if not cached:
+            credentials_cache.clear()
+        start = time.perf_counter()
+        EchoClient()
+        micros.append((time.perf_counter() - start) * 1e6)
+    return micros
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = _credentials_file(directory)
+        # Warm up the imports and the file cache.
+        _build(10, cached=False)
+        for name, cached in (('without cache', False), ('with cache', True)):
+            micros = _build(args.clients, cached)
+            print('{:>13}: median {:8.1f} us, mean {:8.1f} us per client'.format(
+                name, statistics.median(micros), statistics.mean(micros)))
+        credentials_cache.clear()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Compare listing the blurbs of every room one room at a time and fanned out.
+
+A :class:`LocalServer` holds rooms with a few pages of blurbs each, and
+answers ListRooms and ListBlurbs after an artificial delay. The blurbs of
+every room are listed in turn, as an audit would, then with
+``MessagingClient.fan_out`` at increasing concurrency; the wall time of
+each run is reported.
+
+Usage::
+
+    python benchmarks/fan_out.py [--rooms N] [--pages N] [--latency-ms MS] [--concurrency 4,16,64]
+"""
+
+import argparse
+import time
+
+from google.showcase_v1beta1.local_server import LocalServer
+from google.showcase_v1beta1.services.messaging import MessagingClient
+from google.showcase_v1beta1.services.messaging import transports
+from google.showcase_v1beta1.types import messaging
+
+import grpc  # type: ignore
+
+
+_PAGE_SIZE = 10
+
+
+def _populate(client: MessagingClient, rooms: int, pages: int) -> None:
+    for i in range(rooms):
+        room = client.create_room({'room': {'display_name': str(i)}})
+        result = client.bulk_create_blurbs(room.name, [
+            messaging.Blurb(text='benchmark') for _ in range(pages * _PAGE_SIZE)])
+        assert not result.errors
+
+
+def _sequential(client: MessagingClient) -> int:
+    blurbs = 0
+    for room in client.list_rooms():
+        blurbs += sum(1 for _ in client.list_blurbs(parent=room.name))
+    return blurbs
+
+
+def _fanned_out(client: MessagingClient, concurrency: int) -> int:
+    rooms = [{'parent': room.name} for room in client.list_rooms()]
+    blurbs = 0
+    for outcome in client.fan_out(
+            'list_blurbs', rooms, max_concurrency=concurrency):
+        if outcome.error is not None:
+            raise outcome.error
+        blurbs += len(outcome.response)
+    return blurbs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rooms', type=int, default=100)
+    parser.add_argument('--pages', type=int, default=3)
+    parser.add_argument('--latency-ms', type=float, default=5.0)
+    parser.add_argument('--concurrency', default='4,16,64')
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+    server = LocalServer(
+        latency={'ListRooms': latency, 'ListBlurbs': latency},
+        page_size=_PAGE_SIZE,
+    ).start()
+    channel = server.channel()
+    try:
+        # Connect before timing.
+        grpc.channel_ready_future(channel).result(timeout=10)
+        client = MessagingClient(
+            transport=transports.MessagingGrpcTransport(channel=channel),
+        )
+        _populate(client, args.rooms, args.pages)
+        runs = [('sequential', lambda: _sequential(client))]
+        for concurrency in (int(c) for c in args.concurrency.split(',')):
+            runs.append((
+                'fan-out x{}'.format(concurrency),
+                lambda c=concurrency: _fanned_out(client, c),
+            ))
+        for name, run in runs:
+            began = time.perf_counter()
+            blurbs = run()
+            elapsed = time.perf_counter() - began
+            print('{:>14}: {:8.3f} s  {:9.1f} blurbs/s'.format(
+                name, elapsed, blurbs / elapsed))
+    finally:
+        channel.close()
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
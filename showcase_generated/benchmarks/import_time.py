@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Measure the cold import time of each entry point into the package.
+
+Every entry point is imported in a fresh interpreter run with
+``python -X importtime``, several times over; the median total import time
+is reported, along with the modules that took longest in the median run.
+
+Usage::
+
+    python benchmarks/import_time.py [--runs N] [--top N] [ENTRY_POINT ...]
+
+An entry point is a module, or ``module:name`` to import one name from it.
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import List, Tuple
+
+
+ENTRY_POINTS = (
+    'google.showcase',
+    'google.showcase:EchoClient',
+    'google.showcase_v1beta1:EchoClient',
+    'google.showcase_v1beta1.services.echo:EchoClient',
+    'google.showcase_v1beta1.services.echo:EchoAsyncClient',
+    'google.showcase_v1beta1.services.identity:IdentityClient',
+    'google.showcase_v1beta1.services.messaging:MessagingClient',
+    'google.showcase_v1beta1.services.testing:TestingClient',
+    'google.showcase_v1beta1.types.echo',
+)
+
+# One line of `-X importtime` output: self and cumulative microseconds, and
+# the module name indented by its nesting depth.
+_IMPORTTIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$')
+
+
+def _statement(entry_point: str) -> str:
+    module, _, name = entry_point.partition(':')
+    if name:
+        return 'from {} import {}'.format(module, name)
+    return 'import {}'.format(module)
+
+
+def _import_time(entry_point: str) -> Tuple[int, List[Tuple[int, str]]]:
+    """Return the total import time, and each module's own time, in us."""
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _statement(entry_point)],
+        stderr=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+        env=dict(os.environ, PYTHONDONTWRITEBYTECODE='1'),
+    ).stderr
+    total = 0
+    modules = []
+    for line in output.splitlines():
+        match = _IMPORTTIME.match(line)
+        if not match:
+            continue
+        own, cumulative, indent, module = match.groups()
+        modules.append((int(own), module))
+        if len(indent) == 1:
+            # A top-level import; its cumulative time covers its children.
+            total += int(cumulative)
+    return total, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=0,
+                        help='Also list the N slowest modules per entry point.')
+    parser.add_argument('entry_points', nargs='*', default=ENTRY_POINTS)
+    args = parser.parse_args()
+
+    for entry_point in args.entry_points:
+        runs = sorted(
+            (_import_time(entry_point) for _ in range(args.runs)),
+            key=lambda run: run[0],
+        )
+        total, modules = runs[len(runs) // 2]
+        print('{:>9.1f} ms  {}'.format(
+            statistics.median(run[0] for run in runs) / 1000, entry_point))
+        for own, module in sorted(modules, reverse=True)[:args.top]:
+            print('{:>20.1f} ms  {}'.format(own / 1000, module))
+
+
+if __name__ == '__main__':
+    main()
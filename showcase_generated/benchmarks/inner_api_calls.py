@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Measure the client-side cost of wrapping an RPC method.
+
+The transport is replaced with one whose ``echo`` stub returns immediately,
+so the numbers below are pure client overhead: building the retry/timeout
+decorator chain (``wrap_method``) versus looking it up in the client's
+``_inner_api_calls`` cache.
+
+Usage::
+
+    python benchmarks/inner_api_calls.py [--number N] [--repeat R]
+"""
+
+import argparse
+import timeit
+
+from google.api_core import gapic_v1  # type: ignore
+from google.auth import credentials  # type: ignore
+
+from google.showcase_v1beta1.services.echo import EchoClient
+from google.showcase_v1beta1.services.echo import client as echo_client
+from google.showcase_v1beta1.services.echo import transports
+from google.showcase_v1beta1.types import echo as gs_echo
+
+
+class _NullEchoTransport(transports.EchoGrpcTransport):
+    """An Echo transport whose unary stub never touches the network."""
+
+    _response = gs_echo.EchoResponse(content='benchmark')
+
+    @property
+    def echo(self):
+        return self._echo
+
+    def _echo(self, request, timeout=None, metadata=None):
+        return self._response
+
+
+def _per_call_usec(stmt, number: int, repeat: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    transport = _NullEchoTransport(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    client = EchoClient(transport=transport)
+    request = gs_echo.EchoRequest(content='benchmark')
+
+    def wrap_every_call():
+        # What every client method used to do before the cache.
+        coerced = gs_echo.EchoRequest(request)
+        rpc = gapic_v1.method.wrap_method(
+            transport.echo,
+            default_timeout=None,
+            client_info=echo_client._get_client_info(),
+        )
+        return rpc(coerced, retry=gapic_v1.method.DEFAULT, timeout=None,
+                   metadata=())
+
+    def cached():
+        return client.echo(request)
+
+    before = _per_call_usec(wrap_every_call, args.number, args.repeat)
+    after = _per_call_usec(cached, args.number, args.repeat)
+    print('wrap per call:      {:8.2f} us/call'.format(before))
+    print('cached wrapped rpc: {:8.2f} us/call'.format(after))
+    print('saved:              {:8.2f} us/call ({:.1f}x)'.format(
+        before - after, before / after))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Measure the memory of decoding pages of blurbs with and without images.
+
+A serialized ``ListBlurbsResponse`` of blurbs with large images is decoded
+and the ``name`` and ``text`` of every blurb are read: first with the
+proto-plus deserializer the transport uses by default, then with
+:func:`~.lazy_images.parse_blurbs_page`, which a transport made with
+``lazy_blurb_images=True`` uses. The memory allocated while decoding, and
+held by the decoded page, is traced with ``tracemalloc``. The serialized
+page is not counted: the lazy page keeps it alive in place of the copies.
+
+Usage::
+
+    python benchmarks/lazy_images.py [--blurbs N] [--image-size BYTES] [--number N]
+"""
+
+import argparse
+import timeit
+import tracemalloc
+
+from google.showcase_v1beta1.services.messaging import lazy_images
+from google.showcase_v1beta1.types import messaging
+
+
+def _traced(decode, data):
+    tracemalloc.start()
+    page = decode(data)
+    for blurb in page.blurbs:
+        blurb.name, blurb.text
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, held
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--blurbs', type=int, default=50)
+    parser.add_argument('--image-size', type=int, default=64 * 1024)
+    parser.add_argument('--number', type=int, default=20)
+    args = parser.parse_args()
+
+    data = messaging.ListBlurbsResponse.serialize(messaging.ListBlurbsResponse(
+        blurbs=[
+            messaging.Blurb(
+                name='rooms/1/blurbs/{}'.format(i),
+                user='users/1',
+                text='a blurb with a picture',
+                image=bytes(args.image_size),
+            )
+            for i in range(args.blurbs)
+        ],
+    ))
+    print('page of {} blurbs: {:,} bytes serialized'.format(args.blurbs, len(data)))
+
+    for name, decode in (
+            ('proto-plus', messaging.ListBlurbsResponse.deserialize),
+            ('lazy images', lazy_images.parse_blurbs_page)):
+        peak, held = _traced(decode, data)
+        seconds = min(timeit.repeat(
+            lambda: [(b.name, b.text) for b in decode(data).blurbs],
+            number=args.number, repeat=3)) / args.number
+        print('{:>12}: {:12,} B peak  {:12,} B held  {:8.3f} ms/page'.format(
+            name, peak, held, seconds * 1000))
+
+
+if __name__ == '__main__':
+    main()
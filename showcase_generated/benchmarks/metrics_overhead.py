@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Measure the cost per call of the metrics interceptor.
+
+The interceptor is first driven directly, with a continuation that
+answers at once, so that only its own work is timed; the time the bare
+continuation takes is subtracted. Then Echo is called through an
+in-process server on a plain channel and on one with the interceptor
+installed, for scale; a channel with an interceptor that does nothing
+shows the cost of gRPC's own interception machinery.
+
+Usage::
+
+    python benchmarks/metrics_overhead.py [--calls N] [--rpcs N]
+"""
+
+import argparse
+import collections
+from concurrent import futures
+import time
+
+from google.showcase_v1beta1 import metrics
+from google.showcase_v1beta1.services.echo import EchoClient
+from google.showcase_v1beta1.services.echo import transports
+from google.showcase_v1beta1.types import echo as gs_echo
+
+import grpc  # type: ignore
+
+
+_Details = collections.namedtuple('_Details', ('method', 'timeout', 'metadata', 'credentials'))
+
+
+class _Done:
+    """A call that is already over, as the interceptor chain returns it."""
+    def __init__(self, response):
+        self._response = response
+
+    def add_done_callback(self, fn):
+        fn(self)
+
+    def cancelled(self):
+        return False
+
+    def exception(self):
+        return None
+
+    def code(self):
+        return grpc.StatusCode.OK
+
+    def result(self):
+        return self._response
+
+    def __next__(self):
+        raise StopIteration
+
+
+class _PassThrough(grpc.UnaryUnaryClientInterceptor):
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        return continuation(client_call_details, request)
+
+
+def _per_call(fn, calls):
+    began = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - began) / calls
+
+
+def _direct(calls):
+    interceptor = metrics.MetricsInterceptor()
+    details = _Details('/google.showcase.v1beta1.Echo/Echo', None, None, None)
+    request = gs_echo.EchoRequest(content='benchmark')
+    done = _Done(gs_echo.EchoResponse(content='benchmark'))
+
+    def continuation(details, request):
+        return done
+
+    def drain(details, requests):
+        for _ in requests:
+            pass
+        return done
+
+    baseline = _per_call(lambda: continuation(details, request), calls)
+    shapes = [
+        ('unary-unary', lambda: interceptor.intercept_unary_unary(
+            continuation, details, request)),
+        ('unary-stream', lambda: list(interceptor.intercept_unary_stream(
+            continuation, details, request))),
+        ('stream-unary', lambda: interceptor.intercept_stream_unary(
+            drain, details, iter((request,)))),
+        ('stream-stream', lambda: list(interceptor.intercept_stream_stream(
+            drain, details, iter((request,))))),
+    ]
+    for name, fn in shapes:
+        print('{:>14}: {:6.2f} us/call'.format(
+            name, (_per_call(fn, calls) - baseline) * 1e6))
+
+
+def _serve():
+    def echo(request, context):
+        return gs_echo.EchoResponse(content=request.content)
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler(
+        'google.showcase.v1beta1.Echo', {
+            'Echo': grpc.unary_unary_rpc_method_handler(
+                echo,
+                request_deserializer=gs_echo.EchoRequest.deserialize,
+                response_serializer=gs_echo.EchoResponse.serialize,
+            ),
+        }),))
+    port = server.add_insecure_port('localhost:0')
+    server.start()
+    return server, 'localhost:{}'.format(port)
+
+
+def _end_to_end(rpcs):
+    server, address = _serve()
+    request = gs_echo.EchoRequest(content='benchmark')
+    try:
+        for name, interceptors in (
+                ('plain', ()),
+                ('pass-through', (_PassThrough(),)),
+                ('metrics', (metrics.MetricsInterceptor(),))):
+            channel = grpc.intercept_channel(
+                grpc.insecure_channel(address), *interceptors)
+            client = EchoClient(transport=transports.EchoGrpcTransport(channel=channel))
+            # Warm up.
+            for _ in range(100):
+                client.echo(request)
+            print('{:>14}: {:6.1f} us/call'.format(
+                name, _per_call(lambda: client.echo(request), rpcs) * 1e6))
+            channel.close()
+    finally:
+        server.stop(None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=100000)
+    parser.add_argument('--rpcs', type=int, default=2000)
+    args = parser.parse_args()
+
+    print('Interceptor alone:')
+    _direct(args.calls)
+    print('Echo through an in-process server:')
+    _end_to_end(args.rpcs)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Compare unary Echo calls with Echo multiplexed over shared Chat streams.
+
+An in-process server answers Echo and Chat alike. Many client threads
+call ``EchoClient.echo`` at once, first as plain unary calls and then
+multiplexed over increasing numbers of Chat streams; the throughput and
+the median and 99th percentile latency of each run are reported.
+
+Usage::
+
+    python benchmarks/multiplex_echo.py [--threads N] [--calls N] [--streams 1,2,4]
+"""
+
+import argparse
+from concurrent import futures
+import threading
+import time
+
+from google.showcase_v1beta1.services.echo import EchoClient
+from google.showcase_v1beta1.services.echo import transports
+from google.showcase_v1beta1.types import echo as gs_echo
+
+import grpc  # type: ignore
+
+
+def _serve():
+    def echo(request, context):
+        return gs_echo.EchoResponse(content=request.content)
+
+    def chat(requests, context):
+        for request in requests:
+            yield gs_echo.EchoResponse(content=request.content)
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=64))
+    server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler(
+        'google.showcase.v1beta1.Echo', {
+            'Echo': grpc.unary_unary_rpc_method_handler(
+                echo,
+                request_deserializer=gs_echo.EchoRequest.deserialize,
+                response_serializer=gs_echo.EchoResponse.serialize,
+            ),
+            'Chat': grpc.stream_stream_rpc_method_handler(
+                chat,
+                request_deserializer=gs_echo.EchoRequest.deserialize,
+                response_serializer=gs_echo.EchoResponse.serialize,
+            ),
+        }),))
+    port = server.add_insecure_port('localhost:0')
+    server.start()
+    return server, 'localhost:{}'.format(port)
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _run(client: EchoClient, threads: int, calls: int):
+    request = gs_echo.EchoRequest(content='benchmark')
+    start = threading.Barrier(threads + 1)
+    latencies = []
+
+    def worker():
+        mine = []
+        start.wait()
+        for _ in range(calls):
+            began = time.perf_counter()
+            client.echo(request)
+            mine.append(time.perf_counter() - began)
+        latencies.extend(mine)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for w in workers:
+        w.start()
+    start.wait()
+    began = time.perf_counter()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - began
+    latencies.sort()
+    return (threads * calls / elapsed,
+            _percentile(latencies, 0.5), _percentile(latencies, 0.99))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=64)
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--streams', default='1,2,4')
+    args = parser.parse_args()
+
+    server, address = _serve()
+    try:
+        for streams in [0] + [int(s) for s in args.streams.split(',')]:
+            channel = grpc.insecure_channel(address)
+            # Connect before timing.
+            grpc.channel_ready_future(channel).result(timeout=10)
+            client = EchoClient(
+                transport=transports.EchoGrpcTransport(channel=channel),
+                multiplex_echo_streams=streams,
+            )
+            # Warm up, opening the Chat streams.
+            _run(client, args.threads, 1)
+            qps, p50, p99 = _run(client, args.threads, args.calls)
+            print('{:>12}: {:9.1f} calls/s  p50 {:7.2f} ms  p99 {:7.2f} ms'.format(
+                '{} stream(s)'.format(streams) if streams else 'unary',
+                qps, p50 * 1000, p99 * 1000))
+            channel.close()
+    finally:
+        server.stop(None)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Compare end-to-end PagedExpand listing time with and without prefetching.
+
+An in-process server answers every PagedExpand after a fixed delay, as a
+backend across a high-latency link would. The caller lists every page and
+spends some time on each one before moving on; the listing is timed with
+page prefetching off and at increasing prefetch depths.
+
+Usage::
+
+    python benchmarks/prefetch_pagers.py [--pages N] [--depths 0,1,2]
+"""
+
+import argparse
+from concurrent import futures
+import time
+
+from google.showcase_v1beta1.services.echo import EchoClient
+from google.showcase_v1beta1.services.echo import transports
+from google.showcase_v1beta1.types import echo as gs_echo
+
+import grpc  # type: ignore
+
+
+def _serve(latency: float):
+    def paged_expand(request, context):
+        words = request.content.split(' ')
+        start = int(request.page_token or 0)
+        end = start + request.page_size
+        time.sleep(latency)
+        return gs_echo.PagedExpandResponse(
+            responses=[gs_echo.EchoResponse(content=word)
+                       for word in words[start:end]],
+            next_page_token=str(end) if end < len(words) else '',
+        )
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=16))
+    server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler(
+        'google.showcase.v1beta1.Echo', {
+            'PagedExpand': grpc.unary_unary_rpc_method_handler(
+                paged_expand,
+                request_deserializer=gs_echo.PagedExpandRequest.deserialize,
+                response_serializer=gs_echo.PagedExpandResponse.serialize,
+            ),
+        }),))
+    port = server.add_insecure_port('localhost:0')
+    server.start()
+    return server, 'localhost:{}'.format(port)
+
+
+def _run(client: EchoClient, request: gs_echo.PagedExpandRequest,
+         work: float) -> float:
+    began = time.perf_counter()
+    for _ in client.paged_expand(request).pages:
+        # Stand in for whatever the caller does with each page.
+        time.sleep(work)
+    return time.perf_counter() - began
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--page-size', type=int, default=10)
+    parser.add_argument('--latency-ms', type=float, default=50.0)
+    parser.add_argument('--work-ms', type=float, default=30.0)
+    parser.add_argument('--depths', default='0,1,2,4')
+    args = parser.parse_args()
+
+    request = gs_echo.PagedExpandRequest(
+        content=' '.join('word{}'.format(i)
+                         for i in range(args.pages * args.page_size)),
+        page_size=args.page_size,
+    )
+    server, address = _serve(args.latency_ms / 1000)
+    try:
+        channel = grpc.insecure_channel(address)
+        # Connect before timing.
+        grpc.channel_ready_future(channel).result(timeout=10)
+        transport = transports.EchoGrpcTransport(channel=channel)
+        for depth in (int(d) for d in args.depths.split(',')):
+            client = EchoClient(
+                transport=transport,
+                page_prefetch_depth=depth,
+            )
+            elapsed = _run(client, request, args.work_ms / 1000)
+            print('prefetch depth {:2d}: {:7.3f} s for {} pages'.format(
+                depth, elapsed, args.pages))
+        channel.close()
+    finally:
+        server.stop(None)
+
+
+if __name__ == '__main__':
+    main()
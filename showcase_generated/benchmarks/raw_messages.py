@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Measure the per-message cost of proto-plus against raw protobuf messages.
+
+Each response is decoded from bytes and one or two of its fields are read,
+as a loop over an ``expand`` or ``stream_blurbs`` stream does: first with
+the proto-plus deserializer the transports use by default, then with the
+one a transport made with ``raw_messages=True`` uses.
+
+Each request is built, taken in by the client and serialized: first as a
+proto-plus message, then as a raw protobuf message, which the client
+wraps and the raw transport serializes.
+
+Usage::
+
+    python benchmarks/raw_messages.py [--number N] [--repeat R]
+"""
+
+import argparse
+import timeit
+
+from google.protobuf import timestamp_pb2  # type: ignore
+
+from google.showcase_v1beta1 import raw_protobuf
+from google.showcase_v1beta1.types import echo as gs_echo
+from google.showcase_v1beta1.types import messaging
+
+
+def _per_message_usec(stmt, number: int, repeat: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number * 1e6
+
+
+def _cases():
+    word = gs_echo.EchoResponse.serialize(gs_echo.EchoResponse(content='word'))
+    event = messaging.StreamBlurbsResponse.serialize(
+        messaging.StreamBlurbsResponse(
+            blurb=messaging.Blurb(
+                name='rooms/1/blurbs/1',
+                user='users/1',
+                text='a blurb of a typical length for a chat message',
+                create_time=timestamp_pb2.Timestamp(seconds=1600000000),
+                update_time=timestamp_pb2.Timestamp(seconds=1600000000),
+            ),
+            action=messaging.StreamBlurbsResponse.Action.CREATE,
+        ))
+
+    def read_word(deserialize):
+        return lambda: deserialize(word).content
+
+    def read_event(deserialize):
+        def read():
+            response = deserialize(event)
+            return response.action, response.blurb.text
+        return read
+
+    return [
+        ('expand: content', gs_echo.EchoResponse, read_word),
+        ('stream_blurbs: action, blurb.text', messaging.StreamBlurbsResponse,
+         read_event),
+    ]
+
+
+def _request_cases():
+    blurb = dict(
+        user='users/1',
+        text='a blurb of a typical length for a chat message',
+    )
+
+    def echo_request(message_class):
+        return lambda: message_class(content='word')
+
+    def blurb_request(message_class, blurb_class):
+        return lambda: message_class(parent='rooms/1', blurb=blurb_class(**blurb))
+
+    return [
+        ('echo: EchoRequest', gs_echo.EchoRequest,
+         echo_request(gs_echo.EchoRequest),
+         echo_request(gs_echo.EchoRequest.pb())),
+        ('create_blurb: CreateBlurbRequest', messaging.CreateBlurbRequest,
+         blurb_request(messaging.CreateBlurbRequest, messaging.Blurb),
+         blurb_request(messaging.CreateBlurbRequest.pb(), messaging.Blurb.pb())),
+    ]
+
+
+def _send(message_class, build, serialize):
+    pb_class = message_class.pb()
+
+    def send():
+        request = build()
+        # As the client takes the request in.
+        if isinstance(request, pb_class):
+            request = message_class.wrap(request)
+        return serialize(request)
+    return send
+
+
+def _print(name, plus, raw, unit):
+    print('{}:'.format(name))
+    print('  proto-plus:   {:8.2f} us/{}'.format(plus, unit))
+    print('  raw protobuf: {:8.2f} us/{} ({:.1f}x)'.format(
+        raw, unit, plus / raw))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for name, message_class, read in _cases():
+        plus = _per_message_usec(
+            read(message_class.deserialize), args.number, args.repeat)
+        raw = _per_message_usec(
+            read(raw_protobuf.deserializer(message_class)),
+            args.number, args.repeat)
+        _print(name, plus, raw, 'message')
+
+    for name, message_class, build_plus, build_raw in _request_cases():
+        plus = _per_message_usec(
+            _send(message_class, build_plus, message_class.serialize),
+            args.number, args.repeat)
+        raw = _per_message_usec(
+            _send(message_class, build_raw, raw_protobuf.serializer(message_class)),
+            args.number, args.repeat)
+        _print(name, plus, raw, 'request')
+
+
+if __name__ == '__main__':
+    main()
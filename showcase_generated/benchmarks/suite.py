@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Benchmark the clients on every RPC shape, and write the results as JSON.
+
+A :class:`LocalServer` runs in a child process, so that only the client's
+work is measured here. Each scenario makes one kind of call over and over:
+
+* ``echo``: unary.
+* ``expand``: server streaming, read to the end.
+* ``collect``: client streaming.
+* ``chat``: bidirectional streaming, one response per request.
+* ``paged_expand`` and ``list_blurbs``: paged, every page read.
+* ``wait`` and ``search_blurbs``: long-running, to the result.
+
+For each, the calls per second and the median and 99th percentile latency
+are reported, with the peak of the memory traced by ``tracemalloc`` while
+a call is in flight, the memory blocks still held after it, and the
+messages a call sends and receives and their serialized bytes. The
+messages are counted by an interceptor, on clients of their own so that
+the timed calls do not go through it. The results, with the versions
+they were taken with, are written as JSON; ``--compare`` prints the
+change from an earlier run::
+
+    nox -s benchmark -- --compare baseline.json
+
+Usage::
+
+    python benchmarks/suite.py [--calls N] [--only echo,chat] [--output FILE] [--compare FILE]
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import grpc  # type: ignore
+from google import protobuf  # type: ignore
+import proto  # type: ignore
+
+from google.showcase_v1beta1.local_server import LocalServer
+from google.showcase_v1beta1.services.echo import EchoClient
+from google.showcase_v1beta1.services.echo import transports as echo_transports
+from google.showcase_v1beta1.services.messaging import MessagingClient
+from google.showcase_v1beta1.services.messaging import transports as messaging_transports
+from google.showcase_v1beta1.types import echo as gs_echo
+from google.showcase_v1beta1.types import messaging
+
+
+# The words of an Expand, Collect, Chat or PagedExpand call, and the size
+# of the pages.
+_WORDS = 10
+_PAGES = 5
+
+
+def _serve(connection) -> None:
+    # Runs in the child process until the parent says to stop.
+    server = LocalServer(page_size=_WORDS).start()
+    connection.send(server.address)
+    connection.recv()
+    server.stop()
+
+
+def _size(message) -> int:
+    # A proto-plus message, or a protobuf one as the operations client's.
+    if isinstance(message, proto.Message):
+        message = type(message).pb(message)
+    return message.ByteSize()
+
+
+class _CountedStream:
+    # A response stream whose responses are counted as they are read.
+    def __init__(self, call, counter: '_MessageCounter') -> None:
+        self._call = call
+        self._counter = counter
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        response = next(self._call)
+        self._counter.received(response)
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self._call, name)
+
+
+class _MessageCounter(grpc.UnaryUnaryClientInterceptor,
+                      grpc.UnaryStreamClientInterceptor,
+                      grpc.StreamUnaryClientInterceptor,
+                      grpc.StreamStreamClientInterceptor):
+    # Count the messages of every call, and their serialized bytes.
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.requests = self.request_bytes = 0
+        self.responses = self.response_bytes = 0
+
+    def sent(self, request) -> None:
+        self.requests += 1
+        self.request_bytes += _size(request)
+
+    def received(self, response) -> None:
+        self.responses += 1
+        self.response_bytes += _size(response)
+
+    def _send(self, request_iterator):
+        for request in request_iterator:
+            self.sent(request)
+            yield request
+
+    def _receive(self, outcome) -> None:
+        if outcome.exception() is None:
+            self.received(outcome.result())
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        self.sent(request)
+        outcome = continuation(client_call_details, request)
+        outcome.add_done_callback(self._receive)
+        return outcome
+
+    def intercept_unary_stream(self, continuation, client_call_details,
+                               request):
+        self.sent(request)
+        return _CountedStream(continuation(client_call_details, request), self)
+
+    def intercept_stream_unary(self, continuation, client_call_details,
+                               request_iterator):
+        outcome = continuation(client_call_details, self._send(request_iterator))
+        outcome.add_done_callback(self._receive)
+        return outcome
+
+    def intercept_stream_stream(self, continuation, client_call_details,
+                                request_iterator):
+        return _CountedStream(
+            continuation(client_call_details, self._send(request_iterator)), self)
+
+
+def _scenarios(echo: EchoClient, messages: MessagingClient):
+    """Return the call of each scenario.
+
+    Collect and Chat go through the bare stubs: the generated methods
+    take a single request, not an iterator of them.
+    """
+    words = ' '.join('word{}'.format(i) for i in range(_WORDS))
+    echo_request = gs_echo.EchoRequest(content='benchmark')
+    stream = [gs_echo.EchoRequest(content='word')] * _WORDS
+    expand_request = gs_echo.ExpandRequest(content=words)
+    paged_request = gs_echo.PagedExpandRequest(
+        content=' '.join([words] * _PAGES))
+    wait_request = gs_echo.WaitRequest(success={'content': 'done'})
+
+    room = messages.create_room({'room': {'display_name': 'benchmark'}})
+    result = messages.bulk_create_blurbs(room.name, [
+        messaging.Blurb(user='users/benchmark', text='benchmark blurb')
+        for _ in range(_WORDS * _PAGES)
+    ])
+    assert not result.errors
+    list_request = messaging.ListBlurbsRequest(parent=room.name)
+    search_request = messaging.SearchBlurbsRequest(
+        query='benchmark', parent=room.name, page_size=_WORDS)
+
+    transport = echo._transport
+    return {
+        'echo': lambda: echo.echo(echo_request),
+        'expand': lambda: sum(1 for _ in echo.expand(expand_request)),
+        'collect': lambda: transport.collect(iter(stream)),
+        'chat': lambda: sum(1 for _ in transport.chat(iter(stream))),
+        'paged_expand': lambda: sum(1 for _ in echo.paged_expand(paged_request)),
+        'list_blurbs': lambda: sum(1 for _ in messages.list_blurbs(list_request)),
+        'wait': lambda: echo.wait(wait_request).result(),
+        'search_blurbs': lambda: messages.search_blurbs(search_request).result(),
+    }
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _measure(call, calls: int) -> dict:
+    for _ in range(max(10, calls // 10)):
+        call()
+
+    latencies = []
+    began = time.perf_counter()
+    for _ in range(calls):
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+    elapsed = time.perf_counter() - began
+    latencies.sort()
+
+    # Memory is traced in a run of its own, as tracing slows every call.
+    samples = max(1, calls // 10)
+    tracemalloc.start()
+    peaks = 0
+    for _ in range(samples):
+        # Forget what was traced before the call, and its peak.
+        tracemalloc.clear_traces()
+        call()
+        peaks += tracemalloc.get_traced_memory()[1]
+    blocks = sys.getallocatedblocks()
+    for _ in range(samples):
+        call()
+    retained = sys.getallocatedblocks() - blocks
+    tracemalloc.stop()
+
+    return {
+        'calls': calls,
+        'calls_per_second': calls / elapsed,
+        'p50_ms': _percentile(latencies, 0.5) * 1000,
+        'p99_ms': _percentile(latencies, 0.99) * 1000,
+        'peak_traced_bytes_per_call': peaks / samples,
+        'retained_blocks_per_call': retained / samples,
+    }
+
+
+def _count(call, counter: _MessageCounter, calls: int) -> dict:
+    # The messages of a call, on the clients ``counter`` intercepts.
+    samples = max(1, calls // 10)
+    counter.reset()
+    for _ in range(samples):
+        call()
+    return {
+        'requests_per_call': counter.requests / samples,
+        'request_bytes_per_call': counter.request_bytes / samples,
+        'responses_per_call': counter.responses / samples,
+        'response_bytes_per_call': counter.response_bytes / samples,
+    }
+
+
+def _clients(channel):
+    return (
+        EchoClient(transport=echo_transports.EchoGrpcTransport(channel=channel)),
+        MessagingClient(
+            transport=messaging_transports.MessagingGrpcTransport(channel=channel)),
+    )
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL,
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _compare(results: dict, baseline: dict) -> None:
+    print('\nChange from {}:'.format(baseline['commit'] or 'the baseline'))
+    for name, result in results.items():
+        before = baseline['results'].get(name)
+        if before is None:
+            continue
+        print('{:>14}: {:+7.1%} calls/s  {:+7.1%} p50  {:+7.1%} peak traced'.format(
+            name,
+            result['calls_per_second'] / before['calls_per_second'] - 1,
+            result['p50_ms'] / before['p50_ms'] - 1,
+            (result['peak_traced_bytes_per_call']
+             / (before['peak_traced_bytes_per_call'] or 1)) - 1,
+        ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=500)
+    parser.add_argument('--only', default='',
+                        help='comma-separated scenarios to run; all by default')
+    parser.add_argument('--output', default='benchmark.json')
+    parser.add_argument('--compare', default=None,
+                        help='an earlier output to compare with')
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context('spawn')
+    connection, child_connection = context.Pipe()
+    child = context.Process(target=_serve, args=(child_connection,), daemon=True)
+    child.start()
+    address = connection.recv()
+
+    channel = grpc.insecure_channel(address)
+    counter = _MessageCounter()
+    try:
+        # Connect before timing.
+        grpc.channel_ready_future(channel).result(timeout=10)
+        scenarios = _scenarios(*_clients(channel))
+        counted = _scenarios(*_clients(grpc.intercept_channel(channel, counter)))
+        only = [name for name in args.only.split(',') if name]
+        results = {}
+        for name, call in scenarios.items():
+            if only and name not in only:
+                continue
+            result = _measure(call, args.calls)
+            result.update(_count(counted[name], counter, args.calls))
+            results[name] = result
+            print('{:>14}: {:9.1f} calls/s  p50 {:7.3f} ms  p99 {:7.3f} ms  '
+                  '{:9.0f} B peak traced  {:6.1f} blocks retained  '
+                  '{:7.0f}/{:7.0f} B sent/received'.format(
+                      name, result['calls_per_second'], result['p50_ms'],
+                      result['p99_ms'], result['peak_traced_bytes_per_call'],
+                      result['retained_blocks_per_call'],
+                      result['request_bytes_per_call'],
+                      result['response_bytes_per_call']))
+    finally:
+        channel.close()
+        connection.send('stop')
+        child.join()
+
+    report = {
+        'commit': _git_commit(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'grpc': grpc.__version__,
+        'protobuf': protobuf.__version__,
+        'calls': args.calls,
+        'results': results,
+    }
+    with open(args.output, 'w') as output:
+        json.dump(report, output, indent=2, sort_keys=True)
+    print('\nWrote {}'.format(args.output))
+
+    if args.compare:
+        with open(args.compare) as baseline:
+            _compare(results, json.load(baseline))
+
+
+if __name__ == '__main__':
+    main()
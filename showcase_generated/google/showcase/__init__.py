@@ -15,70 +15,92 @@
 # limitations under the License.
 #
 
-from google.showcase_v1beta1.services.echo.client import EchoClient
-from google.showcase_v1beta1.services.identity.client import IdentityClient
-from google.showcase_v1beta1.services.messaging.client import MessagingClient
-from google.showcase_v1beta1.services.testing.client import TestingClient
-from google.showcase_v1beta1.types.echo import BlockRequest
-from google.showcase_v1beta1.types.echo import BlockResponse
-from google.showcase_v1beta1.types.echo import EchoRequest
-from google.showcase_v1beta1.types.echo import EchoResponse
-from google.showcase_v1beta1.types.echo import ExpandRequest
-from google.showcase_v1beta1.types.echo import PagedExpandRequest
-from google.showcase_v1beta1.types.echo import PagedExpandResponse
-from google.showcase_v1beta1.types.echo import WaitMetadata
-from google.showcase_v1beta1.types.echo import WaitRequest
-from google.showcase_v1beta1.types.echo import WaitResponse
-from google.showcase_v1beta1.types.identity import CreateUserRequest
-from google.showcase_v1beta1.types.identity import DeleteUserRequest
-from google.showcase_v1beta1.types.identity import GetUserRequest
-from google.showcase_v1beta1.types.identity import ListUsersRequest
-from google.showcase_v1beta1.types.identity import ListUsersResponse
-from google.showcase_v1beta1.types.identity import UpdateUserRequest
-from google.showcase_v1beta1.types.identity import User
-from google.showcase_v1beta1.types.messaging import Blurb
-from google.showcase_v1beta1.types.messaging import ConnectRequest
-from google.showcase_v1beta1.types.messaging import CreateBlurbRequest
-from google.showcase_v1beta1.types.messaging import CreateRoomRequest
-from google.showcase_v1beta1.types.messaging import DeleteBlurbRequest
-from google.showcase_v1beta1.types.messaging import DeleteRoomRequest
-from google.showcase_v1beta1.types.messaging import GetBlurbRequest
-from google.showcase_v1beta1.types.messaging import GetRoomRequest
-from google.showcase_v1beta1.types.messaging import ListBlurbsRequest
-from google.showcase_v1beta1.types.messaging import ListBlurbsResponse
-from google.showcase_v1beta1.types.messaging import ListRoomsRequest
-from google.showcase_v1beta1.types.messaging import ListRoomsResponse
-from google.showcase_v1beta1.types.messaging import Room
-from google.showcase_v1beta1.types.messaging import SearchBlurbsMetadata
-from google.showcase_v1beta1.types.messaging import SearchBlurbsRequest
-from google.showcase_v1beta1.types.messaging import SearchBlurbsResponse
-from google.showcase_v1beta1.types.messaging import SendBlurbsResponse
-from google.showcase_v1beta1.types.messaging import StreamBlurbsRequest
-from google.showcase_v1beta1.types.messaging import StreamBlurbsResponse
-from google.showcase_v1beta1.types.messaging import UpdateBlurbRequest
-from google.showcase_v1beta1.types.messaging import UpdateRoomRequest
-from google.showcase_v1beta1.types.testing import CreateSessionRequest
-from google.showcase_v1beta1.types.testing import DeleteSessionRequest
-from google.showcase_v1beta1.types.testing import DeleteTestRequest
-from google.showcase_v1beta1.types.testing import GetSessionRequest
-from google.showcase_v1beta1.types.testing import Issue
-from google.showcase_v1beta1.types.testing import ListSessionsRequest
-from google.showcase_v1beta1.types.testing import ListSessionsResponse
-from google.showcase_v1beta1.types.testing import ListTestsRequest
-from google.showcase_v1beta1.types.testing import ListTestsResponse
-from google.showcase_v1beta1.types.testing import ReportSessionRequest
-from google.showcase_v1beta1.types.testing import ReportSessionResponse
-from google.showcase_v1beta1.types.testing import Session
-from google.showcase_v1beta1.types.testing import Test
-from google.showcase_v1beta1.types.testing import TestRun
-from google.showcase_v1beta1.types.testing import VerifyTestRequest
-from google.showcase_v1beta1.types.testing import VerifyTestResponse
+from google.showcase_v1beta1 import lazy_import
+
+
+# The clients and types are imported on first use.
+__getattr__, __dir__ = lazy_import.attach(__name__, {
+    'google.showcase_v1beta1.services.echo.async_client': ('EchoAsyncClient',),
+    'google.showcase_v1beta1.services.echo.client': ('EchoClient',),
+    'google.showcase_v1beta1.services.identity.async_client': ('IdentityAsyncClient',),
+    'google.showcase_v1beta1.services.identity.client': ('IdentityClient',),
+    'google.showcase_v1beta1.services.messaging.async_client': ('MessagingAsyncClient',),
+    'google.showcase_v1beta1.services.messaging.client': ('MessagingClient',),
+    'google.showcase_v1beta1.services.testing.async_client': ('TestingAsyncClient',),
+    'google.showcase_v1beta1.services.testing.client': ('TestingClient',),
+    'google.showcase_v1beta1.types.echo': (
+        'BlockRequest',
+        'BlockResponse',
+        'EchoRequest',
+        'EchoResponse',
+        'ExpandRequest',
+        'PagedExpandRequest',
+        'PagedExpandResponse',
+        'WaitMetadata',
+        'WaitRequest',
+        'WaitResponse',
+    ),
+    'google.showcase_v1beta1.types.identity': (
+        'CreateUserRequest',
+        'DeleteUserRequest',
+        'GetUserRequest',
+        'ListUsersRequest',
+        'ListUsersResponse',
+        'UpdateUserRequest',
+        'User',
+    ),
+    'google.showcase_v1beta1.types.messaging': (
+        'Blurb',
+        'ConnectRequest',
+        'CreateBlurbRequest',
+        'CreateRoomRequest',
+        'DeleteBlurbRequest',
+        'DeleteRoomRequest',
+        'GetBlurbRequest',
+        'GetRoomRequest',
+        'ListBlurbsRequest',
+        'ListBlurbsResponse',
+        'ListRoomsRequest',
+        'ListRoomsResponse',
+        'Room',
+        'SearchBlurbsMetadata',
+        'SearchBlurbsRequest',
+        'SearchBlurbsResponse',
+        'SendBlurbsResponse',
+        'StreamBlurbsRequest',
+        'StreamBlurbsResponse',
+        'UpdateBlurbRequest',
+        'UpdateRoomRequest',
+    ),
+    'google.showcase_v1beta1.types.testing': (
+        'CreateSessionRequest',
+        'DeleteSessionRequest',
+        'DeleteTestRequest',
+        'GetSessionRequest',
+        'Issue',
+        'ListSessionsRequest',
+        'ListSessionsResponse',
+        'ListTestsRequest',
+        'ListTestsResponse',
+        'ReportSessionRequest',
+        'ReportSessionResponse',
+        'Session',
+        'Test',
+        'TestRun',
+        'VerifyTestRequest',
+        'VerifyTestResponse',
+    ),
+})
 
 
 __all__ = (
+    'EchoAsyncClient',
     'EchoClient',
+    'IdentityAsyncClient',
     'IdentityClient',
+    'MessagingAsyncClient',
     'MessagingClient',
+    'TestingAsyncClient',
     'TestingClient',
     'BlockRequest',
     'BlockResponse',
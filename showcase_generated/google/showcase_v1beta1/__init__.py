@@ -15,64 +15,90 @@
 # limitations under the License.
 #
 
-from .services.echo import EchoClient
-from .services.identity import IdentityClient
-from .services.messaging import MessagingClient
-from .services.testing import TestingClient
-from .types.echo import BlockRequest
-from .types.echo import BlockResponse
-from .types.echo import EchoRequest
-from .types.echo import EchoResponse
-from .types.echo import ExpandRequest
-from .types.echo import PagedExpandRequest
-from .types.echo import PagedExpandResponse
-from .types.echo import WaitMetadata
-from .types.echo import WaitRequest
-from .types.echo import WaitResponse
-from .types.identity import CreateUserRequest
-from .types.identity import DeleteUserRequest
-from .types.identity import GetUserRequest
-from .types.identity import ListUsersRequest
-from .types.identity import ListUsersResponse
-from .types.identity import UpdateUserRequest
-from .types.identity import User
-from .types.messaging import Blurb
-from .types.messaging import ConnectRequest
-from .types.messaging import CreateBlurbRequest
-from .types.messaging import CreateRoomRequest
-from .types.messaging import DeleteBlurbRequest
-from .types.messaging import DeleteRoomRequest
-from .types.messaging import GetBlurbRequest
-from .types.messaging import GetRoomRequest
-from .types.messaging import ListBlurbsRequest
-from .types.messaging import ListBlurbsResponse
-from .types.messaging import ListRoomsRequest
-from .types.messaging import ListRoomsResponse
-from .types.messaging import Room
-from .types.messaging import SearchBlurbsMetadata
-from .types.messaging import SearchBlurbsRequest
-from .types.messaging import SearchBlurbsResponse
-from .types.messaging import SendBlurbsResponse
-from .types.messaging import StreamBlurbsRequest
-from .types.messaging import StreamBlurbsResponse
-from .types.messaging import UpdateBlurbRequest
-from .types.messaging import UpdateRoomRequest
-from .types.testing import CreateSessionRequest
-from .types.testing import DeleteSessionRequest
-from .types.testing import DeleteTestRequest
-from .types.testing import GetSessionRequest
-from .types.testing import Issue
-from .types.testing import ListSessionsRequest
-from .types.testing import ListSessionsResponse
-from .types.testing import ListTestsRequest
-from .types.testing import ListTestsResponse
-from .types.testing import ReportSessionRequest
-from .types.testing import ReportSessionResponse
-from .types.testing import Session
-from .types.testing import Test
-from .types.testing import TestRun
-from .types.testing import VerifyTestRequest
-from .types.testing import VerifyTestResponse
+from . import lazy_import
+
+
+# The clients and types are imported on first use.
+__getattr__, __dir__ = lazy_import.attach(__name__, {
+    '.services.echo': (
+        'EchoAsyncClient',
+        'EchoClient',
+    ),
+    '.services.identity': (
+        'IdentityAsyncClient',
+        'IdentityClient',
+    ),
+    '.services.messaging': (
+        'MessagingAsyncClient',
+        'MessagingClient',
+    ),
+    '.services.testing': (
+        'TestingAsyncClient',
+        'TestingClient',
+    ),
+    '.types.echo': (
+        'BlockRequest',
+        'BlockResponse',
+        'EchoRequest',
+        'EchoResponse',
+        'ExpandRequest',
+        'PagedExpandRequest',
+        'PagedExpandResponse',
+        'WaitMetadata',
+        'WaitRequest',
+        'WaitResponse',
+    ),
+    '.types.identity': (
+        'CreateUserRequest',
+        'DeleteUserRequest',
+        'GetUserRequest',
+        'ListUsersRequest',
+        'ListUsersResponse',
+        'UpdateUserRequest',
+        'User',
+    ),
+    '.types.messaging': (
+        'Blurb',
+        'ConnectRequest',
+        'CreateBlurbRequest',
+        'CreateRoomRequest',
+        'DeleteBlurbRequest',
+        'DeleteRoomRequest',
+        'GetBlurbRequest',
+        'GetRoomRequest',
+        'ListBlurbsRequest',
+        'ListBlurbsResponse',
+        'ListRoomsRequest',
+        'ListRoomsResponse',
+        'Room',
+        'SearchBlurbsMetadata',
+        'SearchBlurbsRequest',
+        'SearchBlurbsResponse',
+        'SendBlurbsResponse',
+        'StreamBlurbsRequest',
+        'StreamBlurbsResponse',
+        'UpdateBlurbRequest',
+        'UpdateRoomRequest',
+    ),
+    '.types.testing': (
+        'CreateSessionRequest',
+        'DeleteSessionRequest',
+        'DeleteTestRequest',
+        'GetSessionRequest',
+        'Issue',
+        'ListSessionsRequest',
+        'ListSessionsResponse',
+        'ListTestsRequest',
+        'ListTestsResponse',
+        'ReportSessionRequest',
+        'ReportSessionResponse',
+        'Session',
+        'Test',
+        'TestRun',
+        'VerifyTestRequest',
+        'VerifyTestResponse',
+    ),
+})
 
 
 __all__ = (
@@ -89,6 +115,7 @@ __all__ = (
     'DeleteSessionRequest',
     'DeleteTestRequest',
     'DeleteUserRequest',
+    'EchoAsyncClient',
     'EchoClient',
     'EchoRequest',
     'EchoResponse',
@@ -97,6 +124,7 @@ __all__ = (
     'GetRoomRequest',
     'GetSessionRequest',
     'GetUserRequest',
+    'IdentityAsyncClient',
     'IdentityClient',
     'Issue',
     'ListBlurbsRequest',
@@ -109,6 +137,7 @@ __all__ = (
     'ListTestsResponse',
     'ListUsersRequest',
     'ListUsersResponse',
+    'MessagingAsyncClient',
     'MessagingClient',
     'PagedExpandRequest',
     'PagedExpandResponse',
@@ -133,5 +162,6 @@ __all__ = (
     'WaitMetadata',
     'WaitRequest',
     'WaitResponse',
+'TestingAsyncClient',
 'TestingClient',
 )
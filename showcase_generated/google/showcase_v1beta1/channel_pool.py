@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Spread RPCs to one endpoint over several gRPC channels.
+
+A single channel carries every RPC over one HTTP/2 connection, so its
+throughput is capped by the server's concurrent stream limit. A
+:class:`ChannelPool` holds several channels, each with its own connection,
+and is itself a :class:`grpc.Channel`; it can be handed to any transport
+(or to ``grpc.intercept_channel``) in place of a plain channel.
+"""
+
+import itertools
+import threading
+import time
+from typing import Any, Dict, Sequence, Tuple
+
+from google.api_core import exceptions    # type: ignore
+from google.api_core import grpc_helpers  # type: ignore
+from google.auth import credentials       # type: ignore
+
+import grpc  # type: ignore
+
+
+ROUND_ROBIN = 'round_robin'
+LEAST_OUTSTANDING = 'least_outstanding'
+
+_STRATEGIES = (ROUND_ROBIN, LEAST_OUTSTANDING)
+
+
+class ChannelPool(grpc.Channel):
+    """A fixed set of gRPC channels to the same endpoint.
+
+    Every call made through a method obtained from the pool runs on one of
+    its channels, picked either in turn (:data:`ROUND_ROBIN`) or as the one
+    with the fewest RPCs in flight (:data:`LEAST_OUTSTANDING`).
+    """
+    def __init__(self,
+            channels: Sequence[grpc.Channel],
+            *,
+            strategy: str = ROUND_ROBIN) -> None:
+        """Instantiate the pool.
+
+        Args:
+            channels (Sequence[grpc.Channel]): The channels to spread calls
+                over. The pool takes ownership of them.
+            strategy (str): How to pick the channel for each call; one of
+                :data:`ROUND_ROBIN` or :data:`LEAST_OUTSTANDING`.
+        """
+        if not channels:
+            raise ValueError('A channel pool needs at least one channel.')
+        if strategy not in _STRATEGIES:
+            raise ValueError('Unknown channel pool strategy: {!r}'.format(
+                strategy))
+        self._channels = tuple(channels)
+        self._strategy = strategy
+        self._outstanding = [0] * len(self._channels)
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls,
+            host: str,
+            *,
+            size: int = 4,
+            credentials: credentials.Credentials = None,
+            scopes: Sequence[str] = None,
+            strategy: str = ROUND_ROBIN,
+            **kwargs) -> 'ChannelPool':
+        """Create a pool of secure channels to ``host``.
+
+        Args:
+            host (str): The endpoint to connect to.
+            size (int): The number of channels in the pool.
+            credentials (Optional[google.auth.credentials.Credentials]): The
+                authorization credentials to attach to requests.
+            scopes (Optional[Sequence[str]]): The OAuth scopes to request.
+            strategy (str): How to pick the channel for each call.
+            kwargs: Additional arguments to pass to
+                :func:`google.api_core.grpc_helpers.create_channel`.
+
+        Returns:
+            ChannelPool: The new pool.
+        """
+        # Channels created with identical arguments share their connections
+        # through gRPC's global subchannel pool, which would defeat the
+        # purpose; give every channel its own.
+        options = list(kwargs.pop('options', ()))
+        options.append(('grpc.use_local_subchannel_pool', 1))
+        channels = [
+            grpc_helpers.create_channel(
+                host,
+                credentials=credentials,
+                scopes=scopes,
+                options=options,
+                **kwargs
+            )
+            for _ in range(size)
+        ]
+        return cls(channels, strategy=strategy)
+
+    @property
+    def channels(self) -> Tuple[grpc.Channel, ...]:
+        """Return the channels in the pool."""
+        return self._channels
+
+    @property
+    def outstanding(self) -> Tuple[int, ...]:
+        """Return the number of RPCs currently in flight on each channel."""
+        with self._lock:
+            return tuple(self._outstanding)
+
+    def _acquire(self) -> int:
+        with self._lock:
+            if self._strategy == LEAST_OUTSTANDING:
+                index = min(range(len(self._channels)),
+                            key=self._outstanding.__getitem__)
+            else:
+                index = next(self._counter) % len(self._channels)
+            self._outstanding[index] += 1
+        return index
+
+    def _release(self, index: int) -> None:
+        with self._lock:
+            self._outstanding[index] -= 1
+
+    def unary_unary(self, method, request_serializer=None,
+                    response_deserializer=None, **kwargs):
+        return _UnaryUnaryMultiCallable(self, [
+            channel.unary_unary(method, request_serializer,
+                                response_deserializer, **kwargs)
+            for channel in self._channels
+        ])
+
+    def unary_stream(self, method, request_serializer=None,
+                     response_deserializer=None, **kwargs):
+        return _UnaryStreamMultiCallable(self, [
+            channel.unary_stream(method, request_serializer,
+                                 response_deserializer, **kwargs)
+            for channel in self._channels
+        ])
+
+    def stream_unary(self, method, request_serializer=None,
+                     response_deserializer=None, **kwargs):
+        return _StreamUnaryMultiCallable(self, [
+            channel.stream_unary(method, request_serializer,
+                                 response_deserializer, **kwargs)
+            for channel in self._channels
+        ])
+
+    def stream_stream(self, method, request_serializer=None,
+                      response_deserializer=None, **kwargs):
+        return _StreamStreamMultiCallable(self, [
+            channel.stream_stream(method, request_serializer,
+                                  response_deserializer, **kwargs)
+            for channel in self._channels
+        ])
+
+    def subscribe(self, callback, try_to_connect=False):
+        for channel in self._channels:
+            channel.subscribe(callback, try_to_connect=try_to_connect)
+
+    def unsubscribe(self, callback):
+        for channel in self._channels:
+            channel.unsubscribe(callback)
+
+    def close(self):
+        with _shared_pools_lock:
+            for key, pool in list(_shared_pools.items()):
+                if pool is self:
+                    del _shared_pools[key]
+        for channel in self._channels:
+            channel.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def __repr__(self) -> str:
+        return '{0}<size={1}, strategy={2!r}>'.format(
+            self.__class__.__name__, len(self._channels), self._strategy)
+
+
+class _PooledMultiCallable:
+    """Route each call of one RPC method to a channel of the pool."""
+    def __init__(self, pool: ChannelPool, callables: Sequence) -> None:
+        self._pool = pool
+        self._callables = callables
+
+    def _blocking(self, attr, args, kwargs):
+        # The RPC is over once the call returns.
+        index = self._pool._acquire()
+        try:
+            return getattr(self._callables[index], attr)(*args, **kwargs)
+        finally:
+            self._pool._release(index)
+
+    def _async(self, attr, args, kwargs):
+        # The RPC is over once the returned call (a future) is done.
+        index = self._pool._acquire()
+        try:
+            call = getattr(self._callables[index], attr)(*args, **kwargs)
+        except BaseException:
+            self._pool._release(index)
+            raise
+        call.add_done_callback(lambda _: self._pool._release(index))
+        return call
+
+
+class _UnaryUnaryMultiCallable(_PooledMultiCallable,
+                               grpc.UnaryUnaryMultiCallable):
+    def __call__(self, *args, **kwargs):
+        return self._blocking('__call__', args, kwargs)
+
+    def with_call(self, *args, **kwargs):
+        return self._blocking('with_call', args, kwargs)
+
+    def future(self, *args, **kwargs):
+        return self._async('future', args, kwargs)
+
+
+class _UnaryStreamMultiCallable(_PooledMultiCallable,
+                                grpc.UnaryStreamMultiCallable):
+    def __call__(self, *args, **kwargs):
+        return self._async('__call__', args, kwargs)
+
+
+class _StreamUnaryMultiCallable(_PooledMultiCallable,
+                                grpc.StreamUnaryMultiCallable):
+    def __call__(self, *args, **kwargs):
+        return self._blocking('__call__', args, kwargs)
+
+    def with_call(self, *args, **kwargs):
+        return self._blocking('with_call', args, kwargs)
+
+    def future(self, *args, **kwargs):
+        return self._async('future', args, kwargs)
+
+
+class _StreamStreamMultiCallable(_PooledMultiCallable,
+                                 grpc.StreamStreamMultiCallable):
+    def __call__(self, *args, **kwargs):
+        return self._async('__call__', args, kwargs)
+
+
+_shared_pools = {}  # type: Dict[tuple, ChannelPool]
+_shared_pools_lock = threading.Lock()
+
+
+def shared_pool(host: str,
+        *,
+        size: int,
+        credentials: credentials.Credentials = None,
+        scopes: Sequence[str] = None,
+        options: Sequence[Tuple[str, Any]] = ()) -> ChannelPool:
+    """Return the process-wide channel pool for an endpoint.
+
+    Transports for different services that connect to the same host with
+    the same credentials, pool size and options get the same pool, and
+    therefore share its connections. The pool is created on first use.
+
+    Args:
+        host (str): The endpoint to connect to.
+        size (int): The number of channels in the pool.
+        credentials (Optional[google.auth.credentials.Credentials]): The
+            authorization credentials to attach to requests.
+        scopes (Optional[Sequence[str]]): The OAuth scopes to request.
+        options (Sequence[Tuple[str, Any]]): The options of its channels.
+
+    Returns:
+        ChannelPool: The shared pool.
+    """
+    key = (host, size, credentials, tuple(scopes or ()), tuple(options))
+    with _shared_pools_lock:
+        if key not in _shared_pools:
+            _shared_pools[key] = ChannelPool.create(
+                host,
+                size=size,
+                credentials=credentials,
+                scopes=scopes,
+                options=options,
+            )
+        return _shared_pools[key]
+
+
+def wait_for_ready(channel: grpc.Channel, timeout: float = None) -> None:
+    """Connect ``channel``, or every channel of a pool, and wait until ready.
+
+    Args:
+        channel (grpc.Channel): The channel or :class:`ChannelPool`.
+        timeout (Optional[float]): The most seconds to wait for every
+            channel; None waits for as long as it takes.
+
+    Raises:
+        google.api_core.exceptions.DeadlineExceeded: If a channel was not
+            ready in time.
+    """
+    channels = channel.channels if isinstance(channel, ChannelPool) else (channel,)
+    # Every channel starts connecting at once.
+    ready = [grpc.channel_ready_future(c) for c in channels]
+    deadline = None if timeout is None else time.monotonic() + timeout
+    try:
+        for future in ready:
+            future.result(timeout=None if deadline is None
+                          else max(0.0, deadline - time.monotonic()))
+    except grpc.FutureTimeoutError:
+        for future in ready:
+            future.cancel()
+        raise exceptions.DeadlineExceeded(
+            'The channel was not ready within {}s.'.format(timeout))
+
+
+__all__ = (
+    'ChannelPool',
+    'LEAST_OUTSTANDING',
+    'ROUND_ROBIN',
+    'shared_pool',
+    'wait_for_ready',
+)
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Resolve the default credentials once per process, and keep them fresh.
+
+``google.auth.default()`` probes the environment, reads files and may ask
+the metadata server, which a transport made without credentials would
+otherwise pay for every time. :func:`default` resolves them once for each
+set of scopes and hands every later transport the same credentials::
+
+    credentials, project = credentials_cache.default(scopes=())
+
+A background thread then fetches their token before it is needed, and a
+new one some minutes before it expires, so that neither a call made right
+after a client is built nor one made as the token runs out waits for it.
+A call may still refresh the credentials itself, as gRPC's auth plugin
+does for ones that are not valid, and it does so without waiting for the
+thread: the two only fetch a token each, both good, and the credentials
+keep whichever came last, so the work is doubled at most, never wrong.
+The environment is read once; :func:`clear` forgets what was resolved,
+for a process whose environment changed.
+"""
+
+import datetime
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from google import auth
+from google.auth import _helpers     # type: ignore
+from google.auth import credentials  # type: ignore
+
+
+_LOGGER = logging.getLogger(__name__)
+
+# A token is refreshed this long before it expires.
+_MARGIN = datetime.timedelta(minutes=5)
+
+# A failed refresh, and a refreshed token that is already within the
+# margin, are tried again after this long.
+_RETRY = datetime.timedelta(seconds=30)
+
+
+def _due(creds: credentials.Credentials,
+        now: datetime.datetime) -> Optional[datetime.datetime]:
+    # When the credentials should next be refreshed; None if never, as for
+    # credentials without a token that expires.
+    if not creds.valid:
+        return now
+    if creds.expiry is None:
+        return None
+    return creds.expiry - _MARGIN
+
+
+class _Refresher(threading.Thread):
+    # Refreshes the cached credentials as they come due.
+    def __init__(self) -> None:
+        super().__init__(name='showcase-credentials-refresher', daemon=True)
+        self._credentials = []  # type: List[credentials.Credentials]
+        self._retry_at = {}  # type: Dict[Any, datetime.datetime]
+        self._added = False
+        self._changed = threading.Condition()
+        self._request = None  # type: Any
+
+    def add(self, creds: credentials.Credentials) -> None:
+        with self._changed:
+            self._credentials.append(creds)
+            self._added = True
+            self._changed.notify_all()
+
+    def clear(self) -> None:
+        with self._changed:
+            del self._credentials[:]
+            self._retry_at.clear()
+
+    def _refresh(self, creds: credentials.Credentials) -> None:
+        if self._request is None:
+            # Imported here, as the transport pulls in requests.
+            from google.auth.transport import requests
+            self._request = requests.Request()
+        creds.refresh(self._request)
+
+    def refresh_due(self, now: datetime.datetime) -> Optional[float]:
+        # Refresh the credentials that are due, and return the seconds
+        # until the next ones are; None if none ever will be.
+        with self._changed:
+            pending = list(self._credentials)
+        wait = None
+        for creds in pending:
+            at = _due(creds, now)
+            if at is None:
+                continue
+            at = max(at, self._retry_at.get(creds, at))
+            if at <= now:
+                try:
+                    self._refresh(creds)
+                except Exception as exc:
+                    # Whatever went wrong, the thread must live on to
+                    # refresh the others, and these again later.
+                    _LOGGER.warning('Could not refresh %r: %s', creds, exc)
+                    at = now + _RETRY
+                else:
+                    at = _due(creds, now)
+                    if at is None:
+                        continue
+                    at = max(at, now + _RETRY)
+                self._retry_at[creds] = at
+            seconds = (at - now).total_seconds()
+            wait = seconds if wait is None else min(wait, seconds)
+        return wait
+
+    def run(self) -> None:  # pragma: NO COVER
+        while True:
+            wait = self.refresh_due(_helpers.utcnow())
+            with self._changed:
+                if not self._added:
+                    self._changed.wait(wait)
+                self._added = False
+
+
+_cache = {}  # type: Dict[Tuple[str, ...], Tuple[credentials.Credentials, Optional[str]]]
+_cache_lock = threading.Lock()
+_refresher = None  # type: Optional[_Refresher]
+
+
+def default(scopes: Sequence[str] = ()) -> Tuple[credentials.Credentials, Optional[str]]:
+    """Return the default credentials for ``scopes``, and their project.
+
+    The first call for a set of scopes resolves them with
+    ``google.auth.default()``; every later one returns the same
+    credentials, which are kept fresh in the background.
+
+    Args:
+        scopes (Sequence[str]): The OAuth scopes to request.
+
+    Returns:
+        Tuple[google.auth.credentials.Credentials, Optional[str]]: The
+            credentials, and the project they belong to, if known.
+
+    Raises:
+        google.auth.exceptions.DefaultCredentialsError: If no credentials
+            were found.
+    """
+    global _refresher
+    key = tuple(scopes)
+    with _cache_lock:
+        if key not in _cache:
+            _cache[key] = auth.default(scopes=scopes)
+            creds = _cache[key][0]
+            if _due(creds, _helpers.utcnow()) is not None:
+                if _refresher is None:
+                    _refresher = _Refresher()
+                    _refresher.start()
+                _refresher.add(creds)
+        return _cache[key]
+
+
+def clear() -> None:
+    """Forget the credentials resolved so far.
+
+    The transports made afterwards resolve the default credentials again;
+    the ones resolved before are no longer refreshed.
+    """
+    with _cache_lock:
+        _cache.clear()
+        if _refresher is not None:
+            _refresher.clear()
+
+
+__all__ = (
+    'clear',
+    'default',
+)
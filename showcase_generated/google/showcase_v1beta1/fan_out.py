@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Run many ``get_*`` and ``list_*`` calls at once.
+
+A :class:`FanOut` sends one call per request on a thread pool, with at
+most ``max_concurrency`` calls in flight, and yields each outcome as soon
+as its call finishes, whatever the order of the requests. A ``list_*``
+call is read to its last page by the worker that made it, so its outcome
+is the complete list. A failed call is reported in its outcome rather
+than raised, and the other calls carry on::
+
+    rooms = [{'parent': room.name} for room in client.list_rooms()]
+    for outcome in client.fan_out('list_blurbs', rooms):
+        if outcome.error is None:
+            audit(outcome.request, outcome.response)
+"""
+
+from concurrent import futures
+import threading
+from typing import Any, Callable, Iterable, Iterator, Optional, Set
+
+
+class FanOutResult:
+    """The outcome of one call of a :class:`FanOut`.
+
+    Attributes:
+        index (int): The position of the request in the input.
+        request (Any): The request the call was made with.
+        response (Any): The response to the call; for a ``list_*`` call,
+            the list of every resource on every page. None if the call
+            failed.
+        error (Optional[Exception]): The error the call failed with.
+    """
+    def __init__(self,
+            index: int,
+            request: Any,
+            response: Any = None,
+            error: Exception = None) -> None:
+        self.index = index
+        self.request = request
+        self.response = response
+        self.error = error
+
+    def __repr__(self) -> str:
+        return '{0}<index={1}, {2}>'.format(
+            self.__class__.__name__, self.index,
+            'failed' if self.error is not None else 'ok')
+
+
+class FanOut:
+    """Iterate over the outcomes of concurrent calls as they finish.
+
+    The calls start when the outcomes are first iterated, so a fan-out
+    that is never iterated holds no threads. The requests are read
+    lazily, as room for another call frees up. :meth:`cancel` stops
+    sending the rest.
+    """
+    def __init__(self,
+            call: Callable[[Any], Any],
+            requests: Iterable[Any],
+            *,
+            max_concurrency: int = 8) -> None:
+        """Prepare the calls.
+
+        Args:
+            call (Callable[[Any], Any]): Makes one call, given its request.
+            requests (Iterable[Any]): The requests to make calls with.
+            max_concurrency (int): The most calls in flight at once.
+        """
+        if max_concurrency < 1:
+            raise ValueError('A fan-out needs at least one call in flight.')
+        self._call = call
+        self._requests = enumerate(requests)
+        self._max_concurrency = max_concurrency
+        self._executor = None  # type: Optional[futures.ThreadPoolExecutor]
+        self._lock = threading.Lock()
+        self._in_flight = set()  # type: Set[futures.Future]
+        self._cancelled = False
+
+    def _start(self) -> futures.ThreadPoolExecutor:
+        # Make the pool, and send the first calls.
+        executor = self._executor = futures.ThreadPoolExecutor(
+            max_workers=self._max_concurrency,
+            thread_name_prefix='FanOut',
+        )
+        for _ in range(self._max_concurrency):
+            if not self._submit_next(executor):
+                break
+        return executor
+
+    def _run(self, index: int, request: Any) -> FanOutResult:
+        try:
+            return FanOutResult(index, request, response=self._call(request))
+        except Exception as exc:
+            return FanOutResult(index, request, error=exc)
+
+    def _submit_next(self, executor: futures.ThreadPoolExecutor) -> bool:
+        with self._lock:
+            if self._cancelled:
+                return False
+            for index, request in self._requests:
+                self._in_flight.add(
+                    executor.submit(self._run, index, request))
+                return True
+        return False
+
+    def __iter__(self) -> Iterator[FanOutResult]:
+        executor = self._executor
+        if executor is None:
+            executor = self._start()
+        try:
+            while True:
+                with self._lock:
+                    pending = set(self._in_flight)
+                if not pending:
+                    return
+                done, _ = futures.wait(
+                    pending, return_when=futures.FIRST_COMPLETED)
+                for future in done:
+                    with self._lock:
+                        self._in_flight.discard(future)
+                    self._submit_next(executor)
+                    yield future.result()
+        finally:
+            executor.shutdown(wait=False)
+
+    def cancel(self) -> None:
+        """Send no more calls.
+
+        The calls already in flight run to the end, and their outcomes are
+        still yielded.
+        """
+        with self._lock:
+            self._cancelled = True
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def __repr__(self) -> str:
+        return '{0}<in_flight={1}, cancelled={2}>'.format(
+            self.__class__.__name__, len(self._in_flight), self._cancelled)
+
+
+def fan_out_method(client: Any,
+        method: str,
+        requests: Iterable[Any],
+        *,
+        max_concurrency: int,
+        timeout: Optional[float],
+        metadata: Iterable) -> FanOut:
+    """Fan ``requests`` out to the ``get_*`` or ``list_*`` method of a client.
+
+    Raises:
+        ValueError: If ``method`` is not a ``get_*`` or ``list_*`` method
+            of ``client``.
+    """
+    if (not method.startswith(('get_', 'list_'))
+            or not callable(getattr(client, method, None))):
+        raise ValueError(
+            '{!r} is not a get_* or list_* method of {}.'.format(
+                method, type(client).__name__))
+    rpc = getattr(client, method)
+
+    def call(request):
+        response = rpc(request, timeout=timeout, metadata=metadata)
+        if method.startswith('list_'):
+            # Read every page here, on the worker.
+            return list(response)
+        return response
+
+    return FanOut(call, requests, max_concurrency=max_concurrency)
+
+
+__all__ = (
+    'FanOut',
+    'FanOutResult',
+    'fan_out_method',
+)
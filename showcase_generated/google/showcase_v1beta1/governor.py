@@ -0,0 +1,389 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Limit the rate and concurrency of calls, per method.
+
+A :class:`Governor` holds each call of a method until the method's token
+bucket has a token for it and fewer than its ``max_in_flight`` calls are
+under way. A client made with ``governor=...`` sends each attempt of its
+unary methods through the governor, retries included, so that a bursty
+job is smoothed out instead of overwhelming the backend::
+
+    governor = Governor(
+        rate={'/google.showcase.v1beta1.Messaging/CreateBlurb': 50.0},
+        max_in_flight=8,
+    )
+    client = MessagingClient(governor=governor)
+
+A governor may be shared by several clients and threads, which then
+share its budgets. The async clients take a governor too: their calls
+wait for it with :meth:`Governor.acquire_async`, which sleeps on the
+event loop instead of blocking it. Other code that must not block can
+call :meth:`Governor.try_acquire` and :meth:`Governor.release` around a
+call itself.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Union
+
+from grpc import aio  # type: ignore
+
+from google.api_core import exceptions  # type: ignore
+
+from google.showcase_v1beta1.metrics import LatencyHistogram
+
+
+# A coroutine waiting for a call in flight to finish cannot be woken by
+# release(), so it checks again after these many seconds, doubling.
+_SLOT_POLL = 0.001
+_MAX_SLOT_POLL = 0.05
+
+class GovernorStats:
+    """What was recorded for the calls of one method.
+
+    Attributes:
+        acquired (int): How many calls were let through.
+        rejected (int): How many calls were turned away, by
+            :meth:`Governor.try_acquire` or because their timeout ran out
+            while they waited.
+        in_flight (int): How many calls are under way.
+        queue_delay (~.metrics.LatencyHistogram): How long each call that
+            was let through waited for its turn.
+    """
+    def __init__(self) -> None:
+        self.acquired = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self.queue_delay = LatencyHistogram()
+
+    def copy(self) -> 'GovernorStats':
+        stats = GovernorStats()
+        stats.acquired = self.acquired
+        stats.rejected = self.rejected
+        stats.in_flight = self.in_flight
+        stats.queue_delay = self.queue_delay.copy()
+        return stats
+
+    def __repr__(self) -> str:
+        return '{0}<acquired={1}, rejected={2}, in_flight={3}>'.format(
+            self.__class__.__name__, self.acquired, self.rejected,
+            self.in_flight)
+
+
+class _Bucket:
+    # The limits and state of one method.
+    __slots__ = ('rate', 'burst', 'max_in_flight', 'tokens', 'updated', 'stats')
+
+    def __init__(self, rate, burst, max_in_flight, now):
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.tokens = burst
+        self.updated = now
+        self.stats = GovernorStats()
+
+
+def _limit(value: Any, method: str) -> Any:
+    if isinstance(value, Mapping):
+        return value.get(method)
+    return value
+
+
+def _limits(value: Any) -> List[Any]:
+    if isinstance(value, Mapping):
+        return [limit for limit in value.values() if limit is not None]
+    return [] if value is None else [value]
+
+
+class Governor:
+    """A token bucket and a limit of calls in flight, for each method.
+
+    Every limit may be given once for all methods, or as a mapping from
+    full method names (``'/google.showcase.v1beta1.Messaging/CreateBlurb'``)
+    for each method on its own; the methods a mapping leaves out have no
+    such limit.
+    """
+    def __init__(self, *,
+            rate: Union[float, Mapping[str, float]] = None,
+            burst: Union[float, Mapping[str, float]] = None,
+            max_in_flight: Union[int, Mapping[str, int]] = None,
+            clock: Callable[[], float] = time.monotonic) -> None:
+        """Instantiate the governor.
+
+        Args:
+            rate (Union[float, Mapping[str, float]]): The most calls per
+                second, on average; None for no limit.
+            burst (Union[float, Mapping[str, float]]): The most calls let
+                through at once after a quiet spell; one second's worth of
+                ``rate`` (and at least one call) by default.
+            max_in_flight (Union[int, Mapping[str, int]]): The most calls
+                under way at once; None for no limit.
+            clock (Callable[[], float]): The source of the current time, in
+                seconds.
+        """
+        if (any(limit <= 0 for limit in _limits(rate)) or
+                any(limit < 1 for limit in _limits(burst)) or
+                any(limit < 1 for limit in _limits(max_in_flight))):
+            raise ValueError('The rates must be positive, and the bursts and '
+                             'calls in flight at least one.')
+        self._rate = rate
+        self._burst = burst
+        self._max_in_flight = max_in_flight
+        self._clock = clock
+        self._buckets = {}  # type: Dict[str, _Bucket]
+        self._changed = threading.Condition()
+
+    def _bucket(self, method: str) -> _Bucket:
+        # Called with the lock held.
+        bucket = self._buckets.get(method)
+        if bucket is None:
+            rate = _limit(self._rate, method)
+            burst = _limit(self._burst, method)
+            if rate is not None and burst is None:
+                burst = max(1.0, rate)
+            bucket = self._buckets[method] = _Bucket(
+                rate, burst, _limit(self._max_in_flight, method), self._clock())
+        return bucket
+
+    def _take(self, bucket: _Bucket) -> Optional[float]:
+        # Called with the lock held. Take a token and a slot and return
+        # 0; or else return how long until the next token, or None if the
+        # call waits for a slot.
+        if bucket.max_in_flight is not None and bucket.stats.in_flight >= bucket.max_in_flight:
+            return None
+        if bucket.rate is not None:
+            now = self._clock()
+            bucket.tokens = min(
+                bucket.burst, bucket.tokens + (now - bucket.updated) * bucket.rate)
+            bucket.updated = now
+            if bucket.tokens < 1.0:
+                return (1.0 - bucket.tokens) / bucket.rate
+            bucket.tokens -= 1.0
+        bucket.stats.in_flight += 1
+        bucket.stats.acquired += 1
+        return 0.0
+
+    def acquire(self, method: str, timeout: float = None) -> float:
+        """Wait for a call of ``method`` to be let through.
+
+        Every call let through must be followed by :meth:`release` once it
+        is over.
+
+        Args:
+            method (str): The full name of the method.
+            timeout (Optional[float]): The most seconds to wait; None waits
+                for as long as it takes.
+
+        Returns:
+            float: The seconds the call waited.
+
+        Raises:
+            google.api_core.exceptions.DeadlineExceeded: If the call was
+                not let through in time.
+        """
+        start = self._clock()
+        with self._changed:
+            bucket = self._bucket(method)
+            while True:
+                wait = self._take(bucket)
+                if wait == 0.0:
+                    break
+                waited = self._clock() - start
+                if timeout is not None:
+                    if waited >= timeout:
+                        bucket.stats.rejected += 1
+                        raise exceptions.DeadlineExceeded(
+                            'Not let through by the governor within '
+                            '{}s.'.format(timeout))
+                    left = timeout - waited
+                    wait = left if wait is None else min(wait, left)
+                self._changed.wait(wait)
+            delay = self._clock() - start
+            bucket.stats.queue_delay.record(int(delay * 1e6))
+        return delay
+
+    async def acquire_async(self, method: str, timeout: float = None) -> float:
+        """Wait for a call of ``method`` to be let through, on the event
+        loop.
+
+        This is :meth:`acquire` for coroutines: instead of blocking, it
+        sleeps until the next token, or backs off while the method has
+        too many calls in flight.
+
+        Args:
+            method (str): The full name of the method.
+            timeout (Optional[float]): The most seconds to wait; None waits
+                for as long as it takes.
+
+        Returns:
+            float: The seconds the call waited.
+
+        Raises:
+            google.api_core.exceptions.DeadlineExceeded: If the call was
+                not let through in time.
+        """
+        start = self._clock()
+        poll = _SLOT_POLL
+        while True:
+            with self._changed:
+                bucket = self._bucket(method)
+                wait = self._take(bucket)
+                if wait == 0.0:
+                    delay = self._clock() - start
+                    bucket.stats.queue_delay.record(int(delay * 1e6))
+                    return delay
+                waited = self._clock() - start
+                if timeout is not None and waited >= timeout:
+                    bucket.stats.rejected += 1
+                    raise exceptions.DeadlineExceeded(
+                        'Not let through by the governor within '
+                        '{}s.'.format(timeout))
+            if wait is None:
+                wait = poll
+                poll = min(poll * 2, _MAX_SLOT_POLL)
+            if timeout is not None:
+                wait = min(wait, timeout - waited)
+            await asyncio.sleep(wait)
+
+    def try_acquire(self, method: str) -> bool:
+        """Let a call of ``method`` through only if it need not wait.
+
+        Returns:
+            bool: Whether the call was let through; if so, it must be
+            followed by :meth:`release` once it is over.
+        """
+        with self._changed:
+            bucket = self._bucket(method)
+            if self._take(bucket) == 0.0:
+                bucket.stats.queue_delay.record(0)
+                return True
+            bucket.stats.rejected += 1
+            return False
+
+    def release(self, method: str) -> None:
+        """Say that a call of ``method`` that was let through is over."""
+        with self._changed:
+            self._buckets[method].stats.in_flight -= 1
+            self._changed.notify_all()
+
+    def govern(self, stub: Any, method: str) -> Callable:
+        """Return a callable that sends the calls of a unary stub through
+        the governor.
+
+        A call waits for its turn for no longer than its timeout, and has
+        what is left of the timeout once let through.
+
+        Args:
+            stub (grpc.UnaryUnaryMultiCallable): The stub of the method.
+            method (str): The full name of the method.
+        """
+        return _GovernedCallable(stub, self, method)
+
+    def snapshot(self) -> Dict[str, GovernorStats]:
+        """Return a copy of the stats recorded so far, by full method name."""
+        with self._changed:
+            return {
+                method: bucket.stats.copy()
+                for method, bucket in self._buckets.items()
+            }
+
+    def __repr__(self) -> str:
+        return '{0}<methods={1}>'.format(
+            self.__class__.__name__, len(self._buckets))
+
+
+class _GovernedCallable:
+    def __init__(self, stub: Any, governor: Governor, method: str) -> None:
+        self._stub = stub
+        self._governor = governor
+        self._method = method
+
+    def __call__(self, request, timeout=None, **kwargs):
+        delay = self._governor.acquire(self._method, timeout)
+        if timeout is not None:
+            timeout = max(0.0, timeout - delay)
+        try:
+            return self._stub(request, timeout=timeout, **kwargs)
+        finally:
+            self._governor.release(self._method)
+
+
+class _AsyncGovernedCallable(aio.UnaryUnaryMultiCallable):
+    # A unary multicallable itself, so that api-core wraps its calls as
+    # unary ones.
+    def __init__(self, stub: Any, governor: Governor, method: str) -> None:
+        self._stub = stub
+        self._governor = governor
+        self._method = method
+
+    def __call__(self, request, *, timeout=None, **kwargs):
+        return self._call(request, timeout, kwargs)
+
+    async def _call(self, request, timeout, kwargs):
+        delay = await self._governor.acquire_async(self._method, timeout)
+        if timeout is not None:
+            timeout = max(0.0, timeout - delay)
+        try:
+            return await self._stub(request, timeout=timeout, **kwargs)
+        finally:
+            self._governor.release(self._method)
+
+
+def wrap(stub: Any,
+        governor: Optional[Governor],
+        service: str,
+        method: str) -> Callable:
+    """Return a unary stub, governed if there is a governor.
+
+    Args:
+        stub (grpc.UnaryUnaryMultiCallable): The stub of the method.
+        governor (Optional[Governor]): The client's governor.
+        service (str): The full name of the service, like
+            ``google.showcase.v1beta1.Messaging``.
+        method (str): The name of the method, like ``CreateBlurb``.
+    """
+    if governor is None:
+        return stub
+    return governor.govern(stub, '/{}/{}'.format(service, method))
+
+
+def wrap_async(stub: Any,
+        governor: Optional[Governor],
+        service: str,
+        method: str) -> Any:
+    """Return a unary asyncio stub, governed if there is a governor.
+
+    Args:
+        stub (grpc.aio.UnaryUnaryMultiCallable): The stub of the method.
+        governor (Optional[Governor]): The client's governor.
+        service (str): The full name of the service, like
+            ``google.showcase.v1beta1.Messaging``.
+        method (str): The name of the method, like ``CreateBlurb``.
+    """
+    if governor is None:
+        return stub
+    return _AsyncGovernedCallable(stub, governor, '/{}/{}'.format(service, method))
+
+
+__all__ = (
+    'Governor',
+    'GovernorStats',
+    'wrap',
+    'wrap_async',
+)
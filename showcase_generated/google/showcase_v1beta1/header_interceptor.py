@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Attach headers and call credentials to every outgoing RPC.
+
+A :class:`HeaderInterceptor` keeps the metadata it adds as one ready-made
+tuple, so a call costs a copy of its own metadata and one concatenation
+at most, whatever its shape.
+Headers whose value changes over time, such as a one-time password, are
+fetched on a schedule by a background thread that swaps in a new tuple;
+calls never wait on a fetch::
+
+    interceptor = HeaderInterceptor(
+        [('x-team', 'showcase')],
+        rotating_headers={'one-time-password': fetch_password},
+        refresh_interval=30,
+    )
+    channel = grpc.intercept_channel(grpc.insecure_channel(host), interceptor)
+"""
+
+import collections
+import logging
+import threading
+from typing import Callable, Mapping, Optional, Sequence, Tuple
+
+import grpc  # type: ignore
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _ClientCallDetails(
+        collections.namedtuple(
+            '_ClientCallDetails',
+            ('method', 'timeout', 'metadata', 'credentials',
+             'wait_for_ready', 'compression')),
+        grpc.ClientCallDetails):
+    pass
+
+
+class HeaderInterceptor(grpc.UnaryUnaryClientInterceptor,
+                        grpc.UnaryStreamClientInterceptor,
+                        grpc.StreamUnaryClientInterceptor,
+                        grpc.StreamStreamClientInterceptor):
+    """A client interceptor that adds the same metadata to every call.
+
+    The interceptor is safe to share between channels and threads. If it
+    has rotating headers, :meth:`close` stops their refresh.
+    """
+    def __init__(self,
+            headers: Sequence[Tuple[str, str]] = (),
+            *,
+            rotating_headers: Mapping[str, Callable[[], str]] = None,
+            refresh_interval: float = 30.0,
+            call_credentials: grpc.CallCredentials = None) -> None:
+        """Instantiate the interceptor.
+
+        Args:
+            headers (Sequence[Tuple[str, str]]): The metadata to add as is.
+            rotating_headers (Optional[Mapping[str, Callable[[], str]]]):
+                Metadata keys, and the functions that return their current
+                value. Every value is fetched once here, and again every
+                ``refresh_interval`` seconds in the background; a failed
+                fetch keeps the values already in use.
+            refresh_interval (float): How often, in seconds, to fetch the
+                values of ``rotating_headers``.
+            call_credentials (Optional[grpc.CallCredentials]): The
+                credentials for calls that were not given any.
+        """
+        if refresh_interval <= 0:
+            raise ValueError('The refresh interval must be positive.')
+        self._headers = tuple(headers)
+        self._rotating = tuple((rotating_headers or {}).items())
+        self._refresh_interval = refresh_interval
+        self._call_credentials = call_credentials
+        self._metadata = self._headers
+        self._closed = threading.Event()
+        self._refresher = None  # type: Optional[threading.Thread]
+        if self._rotating:
+            self.refresh()
+            self._refresher = threading.Thread(
+                target=self._refresh_periodically,
+                name='HeaderInterceptor',
+                daemon=True,
+            )
+            self._refresher.start()
+
+    @property
+    def metadata(self) -> Tuple[Tuple[str, str], ...]:
+        """The metadata currently added to every call."""
+        return self._metadata
+
+    def refresh(self) -> None:
+        """Fetch the values of the rotating headers now."""
+        values = tuple((key, fetch()) for key, fetch in self._rotating)
+        # Calls in flight keep the tuple they already read.
+        self._metadata = self._headers + values
+
+    def _refresh_periodically(self) -> None:
+        while not self._closed.wait(self._refresh_interval):
+            try:
+                self.refresh()
+            except Exception:
+                _LOGGER.warning(
+                    'Could not refresh the rotating headers; the previous '
+                    'values stay in use.', exc_info=True)
+
+    def close(self) -> None:
+        """Stop refreshing the rotating headers."""
+        self._closed.set()
+        if self._refresher is not None:
+            self._refresher.join()
+
+    def _details(self, details: grpc.ClientCallDetails) -> grpc.ClientCallDetails:
+        metadata = self._metadata
+        if details.metadata:
+            # api-core hands over a list, which is copied into a tuple;
+            # a tuple, as a bare stub may be given, is used as it is.
+            extra = details.metadata
+            if not isinstance(extra, tuple):
+                extra = tuple(extra)
+            metadata = extra + metadata
+        # _make skips the keyword handling of the namedtuple constructor,
+        # which is most of the cost of building the details.
+        return _ClientCallDetails._make((
+            details.method,
+            details.timeout,
+            metadata,
+            details.credentials or self._call_credentials,
+            getattr(details, 'wait_for_ready', None),
+            getattr(details, 'compression', None),
+        ))
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        return continuation(self._details(client_call_details), request)
+
+    def intercept_unary_stream(self, continuation, client_call_details,
+                               request):
+        return continuation(self._details(client_call_details), request)
+
+    def intercept_stream_unary(self, continuation, client_call_details,
+                               request_iterator):
+        return continuation(self._details(client_call_details), request_iterator)
+
+    def intercept_stream_stream(self, continuation, client_call_details,
+                                request_iterator):
+        return continuation(self._details(client_call_details), request_iterator)
+
+    def __repr__(self) -> str:
+        return '{0}<headers={1}, rotating={2}>'.format(
+            self.__class__.__name__,
+            [key for key, _ in self._headers],
+            [key for key, _ in self._rotating],
+        )
+
+
+__all__ = (
+    'HeaderInterceptor',
+)
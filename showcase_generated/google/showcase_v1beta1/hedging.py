@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Hedge the idempotent reads against a slow backend.
+
+A call that has no answer after a while is sent a second time, and the
+first answer of the two is used; the other call is cancelled. A client
+made with ``hedging_policy=...`` hedges its unary methods that the
+service config allows to retry (``Echo``, ``PagedExpand``, ``GetRoom``,
+``ListRooms``, ``GetBlurb``, ``ListBlurbs``, ``GetUser`` and
+``ListUsers``), and so does an async client::
+
+    policy = HedgingPolicy(percentile=0.95)
+    client = MessagingClient(hedging_policy=policy)
+    blurb = client.get_blurb(name=name)
+    print(policy.snapshot())
+
+The second call is sent after a fixed ``delay``, or else once a call
+takes longer than the given ``percentile`` of the method's latency so
+far. Each method has a budget: the hedges of a method never outnumber
+``budget`` times its calls, so that a slow backend is not sent a
+flood of extra load. The budget is the only bound on the hedges: a
+client's governor lets each call through once, and its hedge is sent
+within the same slot, without taking a token of its own.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Union
+
+from grpc import aio  # type: ignore
+
+from google.showcase_v1beta1 import service_config
+from google.showcase_v1beta1.metrics import LatencyHistogram
+
+
+# At most this many hedges of a method can be saved up while it is quiet.
+_BURST = 10.0
+
+# The delay taken from a method's latency is worked out again after this
+# many more of its calls have answered.
+_REFRESH = 50
+
+
+class HedgingStats:
+    """What was recorded for the hedged calls of one method.
+
+    Attributes:
+        calls (int): How many calls were made.
+        hedges (int): How many second calls were sent.
+        wins (int): How many second calls answered first, and successfully.
+        throttled (int): How many second calls were not sent, because the
+            method's budget was spent.
+        latency (~.metrics.LatencyHistogram): The time from starting each
+            successful call until its answer.
+    """
+    def __init__(self) -> None:
+        self.calls = 0
+        self.hedges = 0
+        self.wins = 0
+        self.throttled = 0
+        self.latency = LatencyHistogram()
+        self._tokens = 0.0
+        self._delay = None  # type: Optional[float]
+        self._delay_count = 0
+
+    def copy(self) -> 'HedgingStats':
+        stats = HedgingStats()
+        stats.calls = self.calls
+        stats.hedges = self.hedges
+        stats.wins = self.wins
+        stats.throttled = self.throttled
+        stats.latency = self.latency.copy()
+        stats._tokens = self._tokens
+        return stats
+
+    def __repr__(self) -> str:
+        return '{0}<calls={1}, hedges={2}, wins={3}, throttled={4}>'.format(
+            self.__class__.__name__, self.calls, self.hedges, self.wins,
+            self.throttled)
+
+
+class HedgingPolicy:
+    """When to hedge a call, and how many calls to hedge.
+
+    The policy is safe to share between clients and threads; the calls
+    of the same method are counted together across all of them.
+    """
+    def __init__(self, *,
+            delay: float = None,
+            percentile: float = 0.95,
+            min_samples: int = 20,
+            budget: Union[float, Mapping[str, float]] = 0.1,
+            clock: Callable[[], float] = time.monotonic) -> None:
+        """Instantiate the policy.
+
+        Args:
+            delay (Optional[float]): The seconds to wait for an answer
+                before hedging. If not set, the delay is the
+                ``percentile`` of the method's latency so far.
+            percentile (float): The fraction of the calls that answer
+                before the delay, if ``delay`` is not set.
+            min_samples (int): The successful calls of a method to see
+                before its calls are hedged, if ``delay`` is not set.
+            budget (Union[float, Mapping[str, float]]): The most hedges
+                per call of a method; a mapping from full method names
+                (``'/google.showcase.v1beta1.Messaging/GetBlurb'``) gives
+                each method its own, and methods it leaves out none.
+            clock (Callable[[], float]): The source of the current time, in
+                seconds.
+        """
+        if delay is not None and delay < 0:
+            raise ValueError('The hedging delay must not be negative.')
+        if not 0.0 < percentile < 1.0:
+            raise ValueError('The percentile must be between 0 and 1.')
+        self._delay = delay
+        self._percentile = percentile
+        self._min_samples = min_samples
+        self._budget = budget
+        self._clock = clock
+        self._methods = {}  # type: Dict[str, HedgingStats]
+        self._lock = threading.Lock()
+
+    def _start(self, method: str) -> Optional[float]:
+        # Count a call, and return how long to wait before hedging it; or
+        # None not to hedge it.
+        budget = self._budget
+        if isinstance(budget, Mapping):
+            budget = budget.get(method, 0.0)
+        with self._lock:
+            stats = self._methods.get(method)
+            if stats is None:
+                stats = self._methods[method] = HedgingStats()
+            stats.calls += 1
+            stats._tokens = min(_BURST, stats._tokens + budget)
+            if self._delay is not None:
+                return self._delay
+            delay = stats._delay
+            count = stats.latency.count
+            if count < self._min_samples or (
+                    delay is not None and count < stats._delay_count + _REFRESH):
+                return delay
+            # This call works the delay out again; the others meanwhile
+            # keep the one they have.
+            stats._delay_count = count
+            latency = stats.latency.copy()
+
+        # The percentile scans the histogram, so it is taken outside the lock.
+        delay = stats._delay = latency.percentile(self._percentile)
+        return delay
+
+    def _spend(self, method: str) -> bool:
+        # Take a hedge out of the method's budget, if there is one left.
+        with self._lock:
+            stats = self._methods[method]
+            if stats._tokens < 1.0:
+                stats.throttled += 1
+                return False
+            stats._tokens -= 1.0
+            stats.hedges += 1
+            return True
+
+    def _finish(self, method: str, start: float, won: bool) -> None:
+        micros = int((self._clock() - start) * 1e6)
+        with self._lock:
+            stats = self._methods[method]
+            stats.latency.record(micros)
+            if won:
+                stats.wins += 1
+
+    def hedge(self, stub: Any, method: str) -> Callable:
+        """Return a callable that hedges the calls of a unary stub.
+
+        Args:
+            stub (grpc.UnaryUnaryMultiCallable): The stub of the method.
+            method (str): The full name of the method, which its stats
+                are kept under.
+        """
+        return _HedgedCallable(stub, self, method)
+
+    def snapshot(self) -> Dict[str, HedgingStats]:
+        """Return a copy of the stats recorded so far, by full method name."""
+        with self._lock:
+            return {
+                method: stats.copy()
+                for method, stats in self._methods.items()
+            }
+
+    def __repr__(self) -> str:
+        return '{0}<delay={1!r}, percentile={2!r}, methods={3}>'.format(
+            self.__class__.__name__, self._delay, self._percentile,
+            len(self._methods))
+
+
+class _HedgedCallable:
+    def __init__(self, stub: Any, policy: HedgingPolicy, method: str) -> None:
+        self._stub = stub
+        self._policy = policy
+        self._method = method
+
+    def __call__(self, request, timeout=None, **kwargs):
+        policy = self._policy
+        start = policy._clock()
+        delay = policy._start(self._method)
+
+        answers = queue.Queue()  # type: queue.Queue
+        first = self._stub.future(request, timeout=timeout, **kwargs)
+        first.add_done_callback(answers.put)
+        answer = None
+        if delay is not None:
+            try:
+                answer = answers.get(timeout=delay)
+            except queue.Empty:
+                if policy._spend(self._method):
+                    answer = self._race(first, answers, request, start, timeout, kwargs)
+        if answer is None:
+            answer = answers.get()
+
+        # Raise the error of a failed call, for the retry to judge.
+        response = answer.result()
+        policy._finish(self._method, start, answer is not first)
+        return response
+
+    def _race(self, first, answers, request, start, timeout, kwargs):
+        # The second call has what is left of the first one's timeout.
+        if timeout is not None:
+            timeout = max(0.0, timeout - (self._policy._clock() - start))
+        second = self._stub.future(request, timeout=timeout, **kwargs)
+        second.add_done_callback(answers.put)
+
+        # Take the first success. If both calls fail, the first call's
+        # error is raised; the hedge's may only be that its timeout ran
+        # out sooner.
+        answer = answers.get()
+        if answer.exception() is not None:
+            answer = answers.get()
+            if answer.exception() is not None:
+                return first
+        (second if answer is first else first).cancel()
+        return answer
+
+
+class _AsyncHedgedCallable(aio.UnaryUnaryMultiCallable):
+    # The asyncio counterpart of _HedgedCallable; a unary multicallable
+    # itself, so that api-core wraps its calls as unary ones.
+    def __init__(self, stub: Any, policy: HedgingPolicy, method: str) -> None:
+        self._stub = stub
+        self._policy = policy
+        self._method = method
+
+    def __call__(self, request, *, timeout=None, **kwargs):
+        return self._call(request, timeout, kwargs)
+
+    async def _call(self, request, timeout, kwargs):
+        policy = self._policy
+        start = policy._clock()
+        delay = policy._start(self._method)
+
+        calls = [asyncio.ensure_future(
+            self._stub(request, timeout=timeout, **kwargs))]
+        answer = calls[0]
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(calls, timeout=delay)
+                if not done and policy._spend(self._method):
+                    # The second call has what is left of the first one's
+                    # timeout.
+                    if timeout is not None:
+                        timeout = max(0.0, timeout - (policy._clock() - start))
+                    calls.append(asyncio.ensure_future(
+                        self._stub(request, timeout=timeout, **kwargs)))
+                    answer = await _race(calls)
+            # Raise the error of a failed call, for the retry to judge.
+            response = await answer
+        finally:
+            for call in calls:
+                # A call that already answered is not cancelled; its error,
+                # if any, is retrieved so that asyncio does not log it.
+                if not call.cancel() and not call.cancelled():
+                    call.exception()
+        policy._finish(self._method, start, answer is not calls[0])
+        return response
+
+
+async def _race(calls: List[asyncio.Future]) -> asyncio.Future:
+    # Take the first success. If both calls fail, the first call's error
+    # is raised; the hedge's may only be that its timeout ran out sooner.
+    first, second = calls
+    done, _ = await asyncio.wait(calls, return_when=asyncio.FIRST_COMPLETED)
+    answer = first if first in done else second
+    if answer.exception() is not None:
+        other = second if answer is first else first
+        await asyncio.wait([other])
+        answer = first if other.exception() is not None else other
+    return answer
+
+
+def wrap(stub: Any,
+        policy: Optional[HedgingPolicy],
+        service: str,
+        method: str) -> Callable:
+    """Return a unary stub, hedged if there is a policy and the service
+    config allows the method to be retried.
+
+    Args:
+        stub (grpc.UnaryUnaryMultiCallable): The stub of the method.
+        policy (Optional[HedgingPolicy]): The client's hedging policy.
+        service (str): The full name of the service, like
+            ``google.showcase.v1beta1.Messaging``.
+        method (str): The name of the method, like ``GetBlurb``.
+    """
+    if policy is None or service_config.method_config(service, method).retry is None:
+        return stub
+    return policy.hedge(stub, '/{}/{}'.format(service, method))
+
+
+def wrap_async(stub: Any,
+        policy: Optional[HedgingPolicy],
+        service: str,
+        method: str) -> Any:
+    """Return a unary asyncio stub, hedged as :func:`wrap` hedges one.
+
+    Args:
+        stub (grpc.aio.UnaryUnaryMultiCallable): The stub of the method.
+        policy (Optional[HedgingPolicy]): The client's hedging policy.
+        service (str): The full name of the service, like
+            ``google.showcase.v1beta1.Messaging``.
+        method (str): The name of the method, like ``GetBlurb``.
+    """
+    if policy is None or service_config.method_config(service, method).retry is None:
+        return stub
+    return _AsyncHedgedCallable(stub, policy, '/{}/{}'.format(service, method))
+
+
+__all__ = (
+    'HedgingPolicy',
+    'HedgingStats',
+    'wrap',
+    'wrap_async',
+)
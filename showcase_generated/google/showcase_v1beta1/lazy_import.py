@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Load the names a package exports only when they are first used.
+
+Importing every client, transport and type up front makes importing any
+one of them as slow as importing all of them. A package ``__init__``
+instead passes the names it exports to :func:`attach`, and installs the
+module-level ``__getattr__`` and ``__dir__`` (PEP 562) it returns.
+"""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+
+def attach(package: str,
+        exports: Dict[str, Sequence[str]],
+        ) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Return a ``__getattr__`` and ``__dir__`` for ``package``.
+
+    Args:
+        package (str): The ``__name__`` of the package.
+        exports (Dict[str, Sequence[str]]): The names the package exports,
+            keyed by the module that defines them. Module names may be
+            relative to ``package``.
+
+    Returns:
+        Tuple[Callable, Callable]: The package's ``__getattr__``, which
+            imports a name's module the first time the name is looked up,
+            and its ``__dir__``.
+    """
+    origins = {
+        name: module
+        for module, names in exports.items()
+        for name in names
+    }
+
+    def __getattr__(name: str) -> Any:
+        try:
+            module = origins[name]
+        except KeyError:
+            raise AttributeError('module {!r} has no attribute {!r}'.format(
+                package, name)) from None
+        value = getattr(importlib.import_module(module, package), name)
+        # Save the value on the package, so that it is only looked up once.
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(origins))
+
+    if sys.version_info < (3, 7):  # pragma: NO COVER
+        # Module __getattr__ is only honoured from Python 3.7 on.
+        for name in origins:
+            __getattr__(name)
+
+    return __getattr__, __dir__
+
+
+__all__ = (
+    'attach',
+)
@@ -0,0 +1,774 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""An in-process stand-in for the Showcase server.
+
+:class:`LocalServer` serves the Echo, Messaging, Identity and Testing
+services from memory, along with the ``google.longrunning.Operations``
+service their long-running methods are polled through. It is meant for
+hermetic tests and benchmarks of the clients, so it checks only what the
+clients rely on: resources must exist, page tokens must be valid, and a
+request for an error gets it. The latency of each method, a rate of
+injected failures, the default page size and the pace of server streams
+are tunable::
+
+    with LocalServer(latency={'ListBlurbs': 0.005}, page_size=50) as server:
+        client = MessagingClient(
+            transport=MessagingGrpcTransport(channel=server.channel()),
+        )
+        ...
+
+The server binds to a free ``localhost`` port by default, or to any
+address ``grpc.Server.add_insecure_port`` takes, such as
+``unix:/tmp/showcase.sock``.
+
+The Testing service keeps sessions, but has no conformance tests to list
+or verify.
+"""
+
+from concurrent import futures
+import itertools
+import queue
+import random
+import re
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+import grpc  # type: ignore
+
+from google.longrunning import operations_pb2  # type: ignore
+from google.protobuf import empty_pb2           # type: ignore
+from google.protobuf import timestamp_pb2       # type: ignore
+from google.rpc import status_pb2               # type: ignore
+
+from google.showcase_v1beta1.types import echo as gs_echo
+from google.showcase_v1beta1.types import identity
+from google.showcase_v1beta1.types import messaging
+from google.showcase_v1beta1.types import testing
+
+
+# The servicers work on the raw protobuf messages.
+_EchoResponse = gs_echo.EchoResponse.pb()
+_StreamBlurbsResponse = messaging.StreamBlurbsResponse.pb()
+
+_STATUS_CODES = {code.value[0]: code for code in grpc.StatusCode}
+
+# Ends a stream of blurb events.
+_CLOSE = object()
+
+
+class _Failure(Exception):
+    """Fails the call with ``code``."""
+    def __init__(self, code: grpc.StatusCode, details: str) -> None:
+        super().__init__(details)
+        self.code = code
+        self.details = details
+
+
+def _raise_status(status: status_pb2.Status) -> None:
+    # An OK status asks for an empty response instead.
+    if status.code:
+        raise _Failure(
+            _STATUS_CODES.get(status.code, grpc.StatusCode.UNKNOWN),
+            status.message,
+        )
+
+
+def _now() -> timestamp_pb2.Timestamp:
+    timestamp = timestamp_pb2.Timestamp()
+    timestamp.GetCurrentTime()
+    return timestamp
+
+
+def _page(items: List, page_size: int, page_token: str) -> Tuple[List, str]:
+    """Return the page of ``items`` at ``page_token``, and the next token."""
+    start = int(page_token) if page_token.isdigit() else 0
+    if page_token and not 0 < start <= len(items):
+        raise _Failure(grpc.StatusCode.INVALID_ARGUMENT,
+                       'Invalid page token: {!r}'.format(page_token))
+    end = start + page_size
+    return items[start:end], str(end) if end < len(items) else ''
+
+
+class _Behavior:
+    """The latency, failures and pace the services are tuned with."""
+    def __init__(self,
+            latency: Union[float, Mapping[str, float]],
+            error_rate: float,
+            error_code: grpc.StatusCode,
+            page_size: int,
+            stream_interval: float,
+            seed: Optional[int]) -> None:
+        self._latency = latency
+        self._error_rate = error_rate
+        self._error_code = error_code
+        self._page_size = page_size
+        self._stream_interval = stream_interval
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def before(self, method: str) -> None:
+        """Delay a call to ``method``, and fail it at the error rate."""
+        latency = self._latency
+        if isinstance(latency, Mapping):
+            latency = latency.get(method, 0.0)
+        if latency:
+            time.sleep(latency)
+        if self._error_rate:
+            with self._lock:
+                failed = self._random.random() < self._error_rate
+            if failed:
+                raise _Failure(self._error_code, 'Injected failure.')
+
+    def page_size(self, requested: int) -> int:
+        return requested if requested > 0 else self._page_size
+
+    def pace(self) -> None:
+        """Wait before the next response on a server stream."""
+        if self._stream_interval:
+            time.sleep(self._stream_interval)
+
+
+class _Collection:
+    """Resources of one kind, by name, in creation order."""
+    def __init__(self, kind: str, name_format: str, ids: Iterator[int],
+            timestamps: bool = True) -> None:
+        self._kind = kind
+        self._name_format = name_format
+        self._ids = ids
+        # Whether the resources have a create and an update time; only the
+        # ones that have them can be updated.
+        self._timestamps = timestamps
+        self._resources = {}  # type: Dict[str, object]
+        self._lock = threading.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._resources
+
+    def create(self, resource):
+        created = type(resource)()
+        created.CopyFrom(resource)
+        if self._timestamps:
+            created.create_time.CopyFrom(_now())
+            created.update_time.CopyFrom(created.create_time)
+        with self._lock:
+            created.name = self._name_format.format(next(self._ids))
+            self._resources[created.name] = created
+        return created
+
+    def get(self, name: str):
+        resource = self._resources.get(name)
+        if resource is None:
+            raise _Failure(grpc.StatusCode.NOT_FOUND,
+                           '{} not found: {}'.format(self._kind, name))
+        return resource
+
+    def update(self, patch, update_mask):
+        """Update the resource named by ``patch``, as ``update_mask`` says."""
+        with self._lock:
+            stored = self.get(patch.name)
+            updated = type(stored)()
+            if update_mask.paths:
+                if not update_mask.IsValidForDescriptor(stored.DESCRIPTOR):
+                    raise _Failure(
+                        grpc.StatusCode.INVALID_ARGUMENT,
+                        'Invalid update mask: {}'.format(list(update_mask.paths)))
+                updated.CopyFrom(stored)
+                update_mask.MergeMessage(patch, updated)
+            else:
+                updated.CopyFrom(patch)
+                updated.create_time.CopyFrom(stored.create_time)
+            updated.update_time.CopyFrom(_now())
+            self._resources[updated.name] = updated
+        return updated
+
+    def delete(self, name: str):
+        with self._lock:
+            return self._resources.pop(self.get(name).name)
+
+    def values(self) -> List:
+        with self._lock:
+            return list(self._resources.values())
+
+    def list(self, page_size: int, page_token: str) -> Tuple[List, str]:
+        return _page(self.values(), page_size, page_token)
+
+
+class _Operations:
+    """The long-running operations, polled through GetOperation."""
+    def __init__(self) -> None:
+        self._ids = itertools.count(1)
+        self._polls = {}  # type: Dict[str, Callable[[operations_pb2.Operation], None]]
+
+    def start(self, method: str,
+            poll: Callable[[operations_pb2.Operation], None]) -> operations_pb2.Operation:
+        """Start an operation, whose state ``poll`` fills in when asked."""
+        name = 'operations/google.showcase.v1beta1.{}/{}'.format(
+            method, next(self._ids))
+        self._polls[name] = poll
+        return self._get(name)
+
+    def _get(self, name: str) -> operations_pb2.Operation:
+        operation = operations_pb2.Operation(name=name)
+        self._polls[name](operation)
+        return operation
+
+    def get_operation(self, request, context):
+        if request.name not in self._polls:
+            raise _Failure(grpc.StatusCode.NOT_FOUND,
+                           'Operation not found: {}'.format(request.name))
+        return self._get(request.name)
+
+
+class _EchoServicer:
+    def __init__(self, behavior: _Behavior, operations: _Operations) -> None:
+        self._behavior = behavior
+        self._operations = operations
+
+    def echo(self, request, context):
+        if request.HasField('error'):
+            _raise_status(request.error)
+        return _EchoResponse(content=request.content)
+
+    def expand(self, request, context):
+        for word in request.content.split():
+            self._behavior.pace()
+            yield _EchoResponse(content=word)
+        if request.HasField('error'):
+            _raise_status(request.error)
+
+    def collect(self, requests, context):
+        words = []
+        for request in requests:
+            if request.HasField('error'):
+                _raise_status(request.error)
+            words.append(request.content)
+        return _EchoResponse(content=' '.join(words))
+
+    def chat(self, requests, context):
+        for request in requests:
+            if request.HasField('error'):
+                _raise_status(request.error)
+            self._behavior.pace()
+            yield _EchoResponse(content=request.content)
+
+    def paged_expand(self, request, context):
+        words, next_page_token = _page(
+            request.content.split(),
+            self._behavior.page_size(request.page_size),
+            request.page_token,
+        )
+        return gs_echo.PagedExpandResponse.pb()(
+            responses=[_EchoResponse(content=word) for word in words],
+            next_page_token=next_page_token,
+        )
+
+    def wait(self, request, context):
+        end_time = timestamp_pb2.Timestamp()
+        if request.HasField('end_time'):
+            end_time.CopyFrom(request.end_time)
+        else:
+            end_time.FromNanoseconds(
+                _now().ToNanoseconds() + request.ttl.ToNanoseconds())
+        metadata = gs_echo.WaitMetadata.pb()(end_time=end_time)
+
+        def poll(operation):
+            operation.metadata.Pack(metadata)
+            if _now().ToNanoseconds() < end_time.ToNanoseconds():
+                return
+            operation.done = True
+            if request.HasField('error'):
+                operation.error.CopyFrom(request.error)
+            else:
+                operation.response.Pack(request.success)
+
+        return self._operations.start('Echo/Wait', poll)
+
+    def block(self, request, context):
+        time.sleep(request.response_delay.ToNanoseconds() / 1e9)
+        if request.HasField('error'):
+            _raise_status(request.error)
+        return request.success
+
+
+class _IdentityServicer:
+    def __init__(self, behavior: _Behavior, ids: Iterator[int]) -> None:
+        self._behavior = behavior
+        self.users = _Collection('User', 'users/{}', ids)
+
+    def create_user(self, request, context):
+        return self.users.create(request.user)
+
+    def get_user(self, request, context):
+        return self.users.get(request.name)
+
+    def update_user(self, request, context):
+        return self.users.update(request.user, request.update_mask)
+
+    def delete_user(self, request, context):
+        self.users.delete(request.name)
+        return empty_pb2.Empty()
+
+    def list_users(self, request, context):
+        users, next_page_token = self.users.list(
+            self._behavior.page_size(request.page_size), request.page_token)
+        return identity.ListUsersResponse.pb()(
+            users=users, next_page_token=next_page_token)
+
+
+class _MessagingServicer:
+    def __init__(self,
+            behavior: _Behavior,
+            operations: _Operations,
+            ids: Iterator[int],
+            users: _Collection) -> None:
+        self._behavior = behavior
+        self._operations = operations
+        self._ids = ids
+        self._users = users
+        self._rooms = _Collection('Room', 'rooms/{}', ids)
+        # The blurbs of each room or profile, and the event queues of the
+        # streams following it. Changes and their events are in one order.
+        self._blurbs = {}  # type: Dict[str, _Collection]
+        self._subscribers = {}  # type: Dict[str, List[queue.Queue]]
+        self._lock = threading.Lock()
+
+    def create_room(self, request, context):
+        return self._rooms.create(request.room)
+
+    def get_room(self, request, context):
+        return self._rooms.get(request.name)
+
+    def update_room(self, request, context):
+        return self._rooms.update(request.room, request.update_mask)
+
+    def delete_room(self, request, context):
+        with self._lock:
+            self._rooms.delete(request.name)
+            self._blurbs.pop(request.name, None)
+        return empty_pb2.Empty()
+
+    def list_rooms(self, request, context):
+        rooms, next_page_token = self._rooms.list(
+            self._behavior.page_size(request.page_size), request.page_token)
+        return messaging.ListRoomsResponse.pb()(
+            rooms=rooms, next_page_token=next_page_token)
+
+    def _publish(self, parent: str, action: int, blurb) -> None:
+        for events in self._subscribers.get(parent, ()):
+            events.put(_StreamBlurbsResponse(blurb=blurb, action=action))
+
+    def _blurbs_of(self, parent: str) -> _Collection:
+        blurbs = self._blurbs.get(parent)
+        if blurbs is None:
+            profile = re.fullmatch(r'(users/[^/]+)/profile', parent)
+            if not (parent in self._rooms
+                    or profile and profile.group(1) in self._users):
+                raise _Failure(grpc.StatusCode.NOT_FOUND,
+                               'Parent not found: {}'.format(parent))
+            blurbs = self._blurbs[parent] = _Collection(
+                'Blurb', parent + '/blurbs/{}', self._ids)
+        return blurbs
+
+    def _create_blurb(self, parent: str, blurb):
+        with self._lock:
+            created = self._blurbs_of(parent).create(blurb)
+            self._publish(parent, _StreamBlurbsResponse.CREATE, created)
+        return created
+
+    def create_blurb(self, request, context):
+        return self._create_blurb(request.parent, request.blurb)
+
+    def get_blurb(self, request, context):
+        parent = request.name.rpartition('/blurbs/')[0]
+        with self._lock:
+            return self._blurbs_of(parent).get(request.name)
+
+    def update_blurb(self, request, context):
+        parent = request.blurb.name.rpartition('/blurbs/')[0]
+        with self._lock:
+            updated = self._blurbs_of(parent).update(
+                request.blurb, request.update_mask)
+            self._publish(parent, _StreamBlurbsResponse.UPDATE, updated)
+        return updated
+
+    def delete_blurb(self, request, context):
+        parent = request.name.rpartition('/blurbs/')[0]
+        with self._lock:
+            deleted = self._blurbs_of(parent).delete(request.name)
+            self._publish(parent, _StreamBlurbsResponse.DELETE, deleted)
+        return empty_pb2.Empty()
+
+    def list_blurbs(self, request, context):
+        with self._lock:
+            blurbs = self._blurbs_of(request.parent)
+        blurbs, next_page_token = blurbs.list(
+            self._behavior.page_size(request.page_size), request.page_token)
+        return messaging.ListBlurbsResponse.pb()(
+            blurbs=blurbs, next_page_token=next_page_token)
+
+    def search_blurbs(self, request, context):
+        # A blurb matches if its text has any word of the query.
+        words = set(request.query.split())
+        with self._lock:
+            searched = [
+                blurbs for parent, blurbs in self._blurbs.items()
+                if parent == request.parent or not request.parent
+            ]
+        matches = [
+            blurb
+            for blurbs in searched
+            for blurb in blurbs.values()
+            if words.intersection(blurb.text.split())
+        ]
+        blurbs, next_page_token = _page(
+            matches,
+            self._behavior.page_size(request.page_size),
+            request.page_token,
+        )
+        response = messaging.SearchBlurbsResponse.pb()(
+            blurbs=blurbs, next_page_token=next_page_token)
+
+        def poll(operation):
+            operation.done = True
+            operation.response.Pack(response)
+
+        return self._operations.start('Messaging/SearchBlurbs', poll)
+
+    def _subscribe(self, parent: str, context: grpc.ServicerContext) -> queue.Queue:
+        events = queue.Queue()
+        # A cancelled stream stops waiting for events.
+        context.add_callback(lambda: events.put(_CLOSE))
+        with self._lock:
+            self._blurbs_of(parent)
+            self._subscribers.setdefault(parent, []).append(events)
+        # Callers may wait for the headers to know that every change from
+        # now on is reported.
+        context.send_initial_metadata(())
+        return events
+
+    def _follow(self, parent: str, events: queue.Queue,
+            expire_time: Optional[float] = None):
+        """Yield the events queued for ``parent`` until the stream ends."""
+        try:
+            while True:
+                timeout = None
+                if expire_time is not None:
+                    timeout = max(0.0, expire_time - time.time())
+                try:
+                    event = events.get(timeout=timeout)
+                except queue.Empty:
+                    return
+                if event is _CLOSE:
+                    return
+                if isinstance(event, Exception):
+                    raise event
+                self._behavior.pace()
+                yield event
+        finally:
+            with self._lock:
+                self._subscribers[parent].remove(events)
+
+    def stream_blurbs(self, request, context):
+        expire_time = None
+        if request.HasField('expire_time'):
+            expire_time = request.expire_time.ToNanoseconds() / 1e9
+        events = self._subscribe(request.name, context)
+        yield from self._follow(request.name, events, expire_time)
+
+    def send_blurbs(self, requests, context):
+        names = [
+            self._create_blurb(request.parent, request.blurb).name
+            for request in requests
+        ]
+        return messaging.SendBlurbsResponse.pb()(names=names)
+
+    def connect(self, requests, context):
+        first = next(requests, None)
+        if first is None or not first.HasField('config'):
+            raise _Failure(grpc.StatusCode.INVALID_ARGUMENT,
+                           'The first request must have a config.')
+        parent = first.config.parent
+        events = self._subscribe(parent, context)
+
+        # The blurbs are created as they arrive; the stream ends once the
+        # client has sent them all.
+        def create():
+            try:
+                for request in requests:
+                    self._create_blurb(parent, request.blurb)
+            except Exception as exc:
+                events.put(exc)
+            else:
+                events.put(_CLOSE)
+
+        threading.Thread(target=create, name='LocalServer', daemon=True).start()
+        yield from self._follow(parent, events)
+
+
+class _TestingServicer:
+    def __init__(self, behavior: _Behavior, ids: Iterator[int]) -> None:
+        self._behavior = behavior
+        self._sessions = _Collection(
+            'Session', 'sessions/{}', ids, timestamps=False)
+
+    def create_session(self, request, context):
+        return self._sessions.create(request.session)
+
+    def get_session(self, request, context):
+        return self._sessions.get(request.name)
+
+    def list_sessions(self, request, context):
+        sessions, next_page_token = self._sessions.list(
+            self._behavior.page_size(request.page_size), request.page_token)
+        return testing.ListSessionsResponse.pb()(
+            sessions=sessions, next_page_token=next_page_token)
+
+    def delete_session(self, request, context):
+        self._sessions.delete(request.name)
+        return empty_pb2.Empty()
+
+    def report_session(self, request, context):
+        self._sessions.get(request.name)
+        return testing.ReportSessionResponse.pb()(
+            result=testing.ReportSessionResponse.Result.PASSED)
+
+    def list_tests(self, request, context):
+        self._sessions.get(request.parent)
+        return testing.ListTestsResponse.pb()()
+
+    def delete_test(self, request, context):
+        raise _Failure(grpc.StatusCode.NOT_FOUND,
+                       'Test not found: {}'.format(request.name))
+
+    def verify_test(self, request, context):
+        raise _Failure(grpc.StatusCode.NOT_FOUND,
+                       'Test not found: {}'.format(request.name))
+
+
+# The methods of each service: their name, whether they stream requests
+# and responses, and their message types.
+_METHODS = {
+    'google.showcase.v1beta1.Echo': (
+        ('Echo', False, False, gs_echo.EchoRequest, gs_echo.EchoResponse),
+        ('Expand', False, True, gs_echo.ExpandRequest, gs_echo.EchoResponse),
+        ('Collect', True, False, gs_echo.EchoRequest, gs_echo.EchoResponse),
+        ('Chat', True, True, gs_echo.EchoRequest, gs_echo.EchoResponse),
+        ('PagedExpand', False, False, gs_echo.PagedExpandRequest,
+         gs_echo.PagedExpandResponse),
+        ('Wait', False, False, gs_echo.WaitRequest, operations_pb2.Operation),
+        ('Block', False, False, gs_echo.BlockRequest, gs_echo.BlockResponse),
+    ),
+    'google.showcase.v1beta1.Identity': (
+        ('CreateUser', False, False, identity.CreateUserRequest, identity.User),
+        ('GetUser', False, False, identity.GetUserRequest, identity.User),
+        ('UpdateUser', False, False, identity.UpdateUserRequest, identity.User),
+        ('DeleteUser', False, False, identity.DeleteUserRequest, empty_pb2.Empty),
+        ('ListUsers', False, False, identity.ListUsersRequest,
+         identity.ListUsersResponse),
+    ),
+    'google.showcase.v1beta1.Messaging': (
+        ('CreateRoom', False, False, messaging.CreateRoomRequest, messaging.Room),
+        ('GetRoom', False, False, messaging.GetRoomRequest, messaging.Room),
+        ('UpdateRoom', False, False, messaging.UpdateRoomRequest, messaging.Room),
+        ('DeleteRoom', False, False, messaging.DeleteRoomRequest, empty_pb2.Empty),
+        ('ListRooms', False, False, messaging.ListRoomsRequest,
+         messaging.ListRoomsResponse),
+        ('CreateBlurb', False, False, messaging.CreateBlurbRequest, messaging.Blurb),
+        ('GetBlurb', False, False, messaging.GetBlurbRequest, messaging.Blurb),
+        ('UpdateBlurb', False, False, messaging.UpdateBlurbRequest, messaging.Blurb),
+        ('DeleteBlurb', False, False, messaging.DeleteBlurbRequest, empty_pb2.Empty),
+        ('ListBlurbs', False, False, messaging.ListBlurbsRequest,
+         messaging.ListBlurbsResponse),
+        ('SearchBlurbs', False, False, messaging.SearchBlurbsRequest,
+         operations_pb2.Operation),
+        ('StreamBlurbs', False, True, messaging.StreamBlurbsRequest,
+         messaging.StreamBlurbsResponse),
+        ('SendBlurbs', True, False, messaging.CreateBlurbRequest,
+         messaging.SendBlurbsResponse),
+        ('Connect', True, True, messaging.ConnectRequest,
+         messaging.StreamBlurbsResponse),
+    ),
+    'google.showcase.v1beta1.Testing': (
+        ('CreateSession', False, False, testing.CreateSessionRequest,
+         testing.Session),
+        ('GetSession', False, False, testing.GetSessionRequest, testing.Session),
+        ('ListSessions', False, False, testing.ListSessionsRequest,
+         testing.ListSessionsResponse),
+        ('DeleteSession', False, False, testing.DeleteSessionRequest,
+         empty_pb2.Empty),
+        ('ReportSession', False, False, testing.ReportSessionRequest,
+         testing.ReportSessionResponse),
+        ('ListTests', False, False, testing.ListTestsRequest,
+         testing.ListTestsResponse),
+        ('DeleteTest', False, False, testing.DeleteTestRequest, empty_pb2.Empty),
+        ('VerifyTest', False, False, testing.VerifyTestRequest,
+         testing.VerifyTestResponse),
+    ),
+    'google.longrunning.Operations': (
+        ('GetOperation', False, False, operations_pb2.GetOperationRequest,
+         operations_pb2.Operation),
+    ),
+}
+
+_HANDLERS = {
+    (False, False): grpc.unary_unary_rpc_method_handler,
+    (False, True): grpc.unary_stream_rpc_method_handler,
+    (True, False): grpc.stream_unary_rpc_method_handler,
+    (True, True): grpc.stream_stream_rpc_method_handler,
+}
+
+
+def _pb(message_type):
+    # The protobuf class of a proto-plus message class.
+    return message_type.pb() if hasattr(message_type, 'pb') else message_type
+
+
+class LocalServer:
+    """An in-process Showcase server, for tests and benchmarks.
+
+    The server is started by :meth:`start`, or by entering it as a
+    context manager, which stops it on exit.
+
+    Attributes:
+        address (str): The address the server listens on, with the port
+            it was given.
+    """
+    def __init__(self,
+            address: str = 'localhost:0',
+            *,
+            latency: Union[float, Mapping[str, float]] = 0.0,
+            error_rate: float = 0.0,
+            error_code: grpc.StatusCode = grpc.StatusCode.UNAVAILABLE,
+            page_size: int = 10,
+            stream_interval: float = 0.0,
+            max_workers: int = 64,
+            seed: int = None) -> None:
+        """Instantiate the server, bound to ``address``.
+
+        Args:
+            address (str): Where to listen, such as ``'localhost:0'`` for
+                a free port, or ``'unix:/tmp/showcase.sock'``.
+            latency (Union[float, Mapping[str, float]]): The seconds every
+                call waits before it is handled, or a mapping from method
+                names, such as ``'ListBlurbs'``, to their own delay.
+            error_rate (float): The fraction of calls, picked at random,
+                that fail with ``error_code`` before they are handled.
+            error_code (grpc.StatusCode): The status of the injected
+                failures.
+            page_size (int): The page size of the list methods, for the
+                requests that do not set one.
+            stream_interval (float): The seconds between two responses on
+                a server stream.
+            max_workers (int): The most calls handled at once; each open
+                stream takes one.
+            seed (Optional[int]): Seeds the choice of the calls that fail,
+                for runs that fail the same calls.
+        """
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError('The error rate must be between 0 and 1.')
+        if page_size < 1:
+            raise ValueError('The page size must be positive.')
+        self._behavior = _Behavior(
+            latency, error_rate, error_code, page_size, stream_interval, seed)
+
+        # The resources of every service share one sequence of ids.
+        ids = itertools.count(1)
+        operations = _Operations()
+        identity_servicer = _IdentityServicer(self._behavior, ids)
+        servicers = {
+            'google.showcase.v1beta1.Echo': _EchoServicer(
+                self._behavior, operations),
+            'google.showcase.v1beta1.Identity': identity_servicer,
+            'google.showcase.v1beta1.Messaging': _MessagingServicer(
+                self._behavior, operations, ids, identity_servicer.users),
+            'google.showcase.v1beta1.Testing': _TestingServicer(
+                self._behavior, ids),
+            'google.longrunning.Operations': operations,
+        }
+
+        self._server = grpc.server(futures.ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='LocalServer',
+        ))
+        self._server.add_generic_rpc_handlers(tuple(
+            grpc.method_handlers_generic_handler(service, {
+                name: _HANDLERS[streams_requests, streams_responses](
+                    self._handler(
+                        name,
+                        getattr(servicers[service],
+                                re.sub(r'(?<!^)(?=[A-Z])', '_', name).lower()),
+                        streams_responses,
+                    ),
+                    request_deserializer=_pb(request_type).FromString,
+                    response_serializer=_pb(response_type).SerializeToString,
+                )
+                for name, streams_requests, streams_responses, request_type,
+                    response_type in methods
+            })
+            for service, methods in _METHODS.items()
+        ))
+        port = self._server.add_insecure_port(address)
+        self.address = address
+        if not address.startswith('unix:'):
+            self.address = '{}:{}'.format(address.rpartition(':')[0], port)
+
+    def _handler(self, method: str, handle: Callable, streams_responses: bool):
+        behavior = self._behavior
+        if streams_responses:
+            def handler(request, context):
+                try:
+                    behavior.before(method)
+                    yield from handle(request, context)
+                except _Failure as failure:
+                    context.abort(failure.code, failure.details)
+        else:
+            def handler(request, context):
+                try:
+                    behavior.before(method)
+                    return handle(request, context)
+                except _Failure as failure:
+                    context.abort(failure.code, failure.details)
+        return handler
+
+    def start(self) -> 'LocalServer':
+        """Start serving."""
+        self._server.start()
+        return self
+
+    def stop(self, grace: float = None) -> None:
+        """Stop serving, after ``grace`` seconds for the calls in flight."""
+        self._server.stop(grace).wait()
+
+    def channel(self, options=()) -> grpc.Channel:
+        """Open an insecure channel to the server."""
+        return grpc.insecure_channel(self.address, options=options)
+
+    def __enter__(self) -> 'LocalServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def __repr__(self) -> str:
+        return '{0}<address={1!r}>'.format(self.__class__.__name__, self.address)
+
+
+__all__ = (
+    'LocalServer',
+)
@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Poll many long-running operations from one thread.
+
+An operation future from api-core polls its operation on a thread of its
+own, so a thousand outstanding operations are a thousand pollers. An
+:class:`OperationPoller` tracks any number of operations on a single
+scheduler thread instead: whenever operations are due, it sends their
+``GetOperation`` calls all at once and resolves the futures of those that
+finished. Each operation backs off on its own between polls, unless its
+metadata carries a ``retry_info`` hint, as ``SearchBlurbsMetadata`` does,
+in which case it is polled again after the delay the server asked for.
+
+A client made with ``operation_poller=...`` returns the futures of its
+long-running methods from the poller; the poller may be shared by the
+clients of every service::
+
+    poller = OperationPoller()
+    client = MessagingClient(operation_poller=poller)
+    searches = [client.search_blurbs(query=q) for q in queries]
+    for search in futures.as_completed(searches):
+        print(search.result())
+"""
+
+from concurrent import futures
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, List, Optional
+
+import grpc  # type: ignore
+
+from google.api_core import exceptions  # type: ignore
+from google.api_core import operation as ga_operation  # type: ignore
+from google.api_core import protobuf_helpers  # type: ignore
+from google.longrunning import operations_pb2  # type: ignore
+
+
+# The polling errors after which an operation is polled again later.
+_RETRYABLE = (
+    exceptions.DeadlineExceeded,
+    exceptions.ServiceUnavailable,
+)
+
+
+class PolledOperation(futures.Future):
+    """The future of an operation tracked by an :class:`OperationPoller`.
+
+    Its result is the operation's response, and its exception the
+    operation's error. Cancelling the future stops the polling; the
+    operation itself carries on on the server.
+
+    It has the ``operation`` and ``metadata`` of an api-core
+    :class:`~.operation.Operation`, but is a
+    :class:`concurrent.futures.Future` rather than a polling future: its
+    ``result()`` and ``done()`` take no ``retry``, and ``cancel()`` and
+    ``cancelled()`` are about the polling, not the server's operation.
+
+    Attributes:
+        operation (~.operations_pb2.Operation): The operation as last
+            polled.
+        polls (int): How many times the operation was polled.
+    """
+    def __init__(self,
+            operation: operations_pb2.Operation,
+            result_type: Any,
+            metadata_type: Any = None) -> None:
+        super().__init__()
+        self.operation = operation
+        self.polls = 0
+        self._result_type = result_type
+        self._metadata_type = metadata_type
+
+    @property
+    def metadata(self) -> Optional[Any]:
+        """The operation's metadata as last polled, if any."""
+        if self._metadata_type is None or not self.operation.HasField('metadata'):
+            return None
+        return protobuf_helpers.from_any_pb(
+            self._metadata_type, self.operation.metadata)
+
+    def _resolve(self) -> bool:
+        # Resolve the future if the operation is done, and say whether it
+        # needs no more polling.
+        if not self.operation.done:
+            return self.cancelled()
+        if not self.set_running_or_notify_cancel():
+            return True
+        if self.operation.HasField('response'):
+            self.set_result(protobuf_helpers.from_any_pb(
+                self._result_type, self.operation.response))
+        elif self.operation.HasField('error'):
+            self.set_exception(exceptions.from_grpc_status(
+                status_code=self.operation.error.code,
+                message=self.operation.error.message,
+                errors=(self.operation.error,),
+                response=self.operation,
+            ))
+        else:
+            self.set_exception(exceptions.GoogleAPICallError(
+                'Unexpected state: Long-running operation had neither '
+                'response nor error set.'))
+        return True
+
+    def _fail(self, exc: Exception) -> None:
+        # The future is already running if resolving it failed.
+        if self.running() or self.set_running_or_notify_cancel():
+            self.set_exception(exc)
+
+    def __repr__(self) -> str:
+        return '{0}<name={1!r}, polls={2}, done={3}>'.format(
+            self.__class__.__name__, self.operation.name, self.polls,
+            self.done())
+
+
+class _Entry:
+    # An operation being tracked, and when to poll it.
+    __slots__ = ('future', 'get_operation', 'interval')
+
+    def __init__(self, future, get_operation, interval):
+        self.future = future
+        self.get_operation = get_operation
+        self.interval = interval
+
+
+def _retry_delay(metadata: Any) -> Optional[float]:
+    # The delay asked for by the metadata's retry_info, if any.
+    retry_info = getattr(metadata, 'retry_info', None)
+    if retry_info is None or not retry_info.HasField('retry_delay'):
+        return None
+    return retry_info.retry_delay.ToTimedelta().total_seconds()
+
+
+class OperationPoller:
+    """Track long-running operations, polling them on one thread.
+
+    The thread starts with the first operation tracked, and stops when
+    the poller is closed.
+
+    Attributes:
+        polls (int): How many ``GetOperation`` calls were answered.
+        batches (int): How many times a batch of calls was sent.
+    """
+    def __init__(self, *,
+            initial: float = 1.0,
+            maximum: float = 60.0,
+            multiplier: float = 1.5,
+            max_batch: int = 100,
+            poll_timeout: float = 30.0) -> None:
+        """Instantiate the poller.
+
+        Args:
+            initial (float): The seconds before an operation is first
+                polled.
+            maximum (float): The most seconds between two polls of an
+                operation, unless the server asks for a longer delay.
+            multiplier (float): How much longer each wait between polls
+                of an operation is than the one before.
+            max_batch (int): The most ``GetOperation`` calls in flight at
+                once.
+            poll_timeout (float): The timeout of each ``GetOperation`` call.
+        """
+        if initial <= 0 or maximum < initial or multiplier < 1:
+            raise ValueError(
+                'The poll interval must be positive, and grow to its maximum.')
+        if max_batch < 1:
+            raise ValueError('A poller must send at least one call at once.')
+        self._initial = initial
+        self._maximum = maximum
+        self._multiplier = multiplier
+        self._max_batch = max_batch
+        self._poll_timeout = poll_timeout
+
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._due = []  # type: List
+        self._order = itertools.count()
+        self._closed = False
+        self._thread = None  # type: Optional[threading.Thread]
+        self.polls = 0
+        self.batches = 0
+
+    def track(self,
+            operations_client: Any,
+            operation: Any,
+            result_type: Any,
+            *,
+            metadata_type: Any = None) -> PolledOperation:
+        """Track an operation until it is done.
+
+        Args:
+            operations_client (~.operations_v1.OperationsClient): The client
+                of the operations service the operation lives on.
+            operation (Union[~.operations_pb2.Operation, ~.operation.Operation]):
+                The operation, as returned by the method that started it.
+            result_type (type): The type of the operation's response.
+            metadata_type (Optional[type]): The type of its metadata.
+
+        Returns:
+            PolledOperation: The future of the operation.
+
+        Raises:
+            ValueError: If the poller is closed.
+        """
+        if isinstance(operation, ga_operation.Operation):
+            operation = operation.operation
+        future = PolledOperation(operation, result_type, metadata_type)
+        if future._resolve():
+            return future
+        entry = _Entry(
+            future,
+            operations_client.operations_stub.GetOperation,
+            self._initial,
+        )
+        with self._lock:
+            if self._closed:
+                raise ValueError('The operation poller is closed.')
+            self._schedule(entry, _retry_delay(future.metadata))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name='OperationPoller',
+                    daemon=True,
+                )
+                self._thread.start()
+        return future
+
+    def _schedule(self, entry: _Entry, hint: Optional[float]) -> None:
+        # Called with the lock held.
+        if hint is not None:
+            delay = hint
+        else:
+            delay = entry.interval
+            entry.interval = min(entry.interval * self._multiplier, self._maximum)
+        heapq.heappush(
+            self._due, (time.monotonic() + delay, next(self._order), entry))
+        self._wake.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._closed:
+                    now = time.monotonic()
+                    if self._due and self._due[0][0] <= now:
+                        break
+                    self._wake.wait(self._due[0][0] - now if self._due else None)
+                if self._closed:
+                    return
+                batch = []  # type: List[_Entry]
+                while (self._due and self._due[0][0] <= now
+                       and len(batch) < self._max_batch):
+                    batch.append(heapq.heappop(self._due)[2])
+            self._poll(batch)
+
+    def _poll(self, batch: List[_Entry]) -> None:
+        # Send the whole batch before waiting for any of it. Whatever goes
+        # wrong with one operation fails its future alone; the others, and
+        # the polling thread, carry on.
+        calls = []
+        for entry in batch:
+            if entry.future.cancelled():
+                continue
+            request = operations_pb2.GetOperationRequest(
+                name=entry.future.operation.name)
+            try:
+                call = entry.get_operation.future(
+                    request, timeout=self._poll_timeout)
+            except Exception as exc:
+                entry.future._fail(exc)
+                continue
+            calls.append((entry, call))
+        self.batches += 1
+
+        for entry, call in calls:
+            try:
+                self._check(entry, call)
+            except Exception as exc:
+                entry.future._fail(exc)
+
+    def _check(self, entry: _Entry, call: Any) -> None:
+        # Resolve the entry's future from its answer, or schedule its next
+        # poll.
+        future = entry.future
+        try:
+            future.operation = call.result()
+        except grpc.RpcError as exc:
+            error = exceptions.from_grpc_error(exc)
+            if not isinstance(error, _RETRYABLE):
+                future._fail(error)
+                return
+            hint = None
+        else:
+            future.polls += 1
+            self.polls += 1
+            if future._resolve():
+                return
+            hint = _retry_delay(future.metadata)
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                self._schedule(entry, hint)
+        if closed:
+            future.cancel()
+
+    def close(self) -> None:
+        """Stop polling, and cancel the futures of the operations left."""
+        with self._lock:
+            self._closed = True
+            pending = [entry for _, _, entry in self._due]
+            self._due = []
+            self._wake.notify()
+        for entry in pending:
+            entry.future.cancel()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> 'OperationPoller':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return '{0}<tracking={1}, polls={2}>'.format(
+            self.__class__.__name__, len(self._due), self.polls)
+
+
+__all__ = (
+    'OperationPoller',
+    'PolledOperation',
+)
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Fetch the pages of a paged listing ahead of the caller.
+
+A pager normally asks for page N+1 only once the caller is done with page
+N, so the caller waits a full round trip at every page boundary. The
+helpers here keep requesting the following pages in the background as
+soon as each one arrives, holding at most ``depth`` pages that the caller
+has not reached yet.
+"""
+
+import asyncio
+import collections
+import threading
+from typing import AsyncIterator, Awaitable, Callable, Iterator, Optional, TypeVar
+
+
+Page = TypeVar('Page')
+
+
+class _PageBuffer:
+    """The pages fetched by a background thread, bounded to ``depth``."""
+    def __init__(self, depth: int) -> None:
+        self._depth = depth
+        self._pages = collections.deque()
+        self._done = False
+        self._error = None  # type: Optional[Exception]
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def put(self, page) -> bool:
+        """Add a page, waiting for room; return False once closed."""
+        with self._cond:
+            while len(self._pages) >= self._depth and not self._closed:
+                self._cond.wait()
+            if self._closed:
+                return False
+            self._pages.append(page)
+            self._cond.notify_all()
+            return True
+
+    def finish(self, error: Optional[Exception] = None) -> None:
+        """Mark the listing as complete, or failed with ``error``."""
+        with self._cond:
+            self._done = True
+            self._error = error
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        """Stop the producer; the caller no longer wants any pages."""
+        with self._cond:
+            self._closed = True
+            self._pages.clear()
+            self._cond.notify_all()
+
+    def __iter__(self):
+        while True:
+            with self._cond:
+                while not self._pages and not self._done:
+                    self._cond.wait()
+                if not self._pages:
+                    if self._error is not None:
+                        raise self._error
+                    return
+                page = self._pages.popleft()
+                self._cond.notify_all()
+            yield page
+
+
+def prefetch_pages(response: Page,
+        fetch_next: Callable[[Page], Page],
+        depth: int) -> Iterator[Page]:
+    """Yield ``response`` and every following page, fetching ahead.
+
+    Args:
+        response: The first page, already fetched.
+        fetch_next (Callable): Given a page with a ``next_page_token``,
+            fetch and return the page after it. It is called from a
+            background thread, one page at a time.
+        depth (int): The most pages to hold ahead of the caller. At most
+            one more request is in flight at any time.
+
+    Yields:
+        The pages, in order. An error raised by ``fetch_next`` is raised
+        to the caller after the pages fetched before it.
+    """
+    if depth < 1:
+        raise ValueError('The prefetch depth must be at least 1.')
+    yield response
+    if not response.next_page_token:
+        return
+
+    buffer = _PageBuffer(depth)
+
+    def produce(page):
+        try:
+            while page.next_page_token:
+                page = fetch_next(page)
+                if not buffer.put(page):
+                    return
+        except Exception as exc:
+            buffer.finish(exc)
+        else:
+            buffer.finish()
+
+    thread = threading.Thread(
+        target=produce,
+        args=(response,),
+        name='PagePrefetcher',
+        daemon=True,
+    )
+    thread.start()
+    try:
+        yield from buffer
+    finally:
+        buffer.close()
+
+
+async def prefetch_pages_async(response: Page,
+        fetch_next: Callable[[Page], Awaitable[Page]],
+        depth: int) -> AsyncIterator[Page]:
+    """Yield ``response`` and every following page, fetching ahead.
+
+    This is the asyncio counterpart of :func:`prefetch_pages`; the pages
+    are fetched by a task on the running event loop.
+    """
+    if depth < 1:
+        raise ValueError('The prefetch depth must be at least 1.')
+    yield response
+    if not response.next_page_token:
+        return
+
+    # The queue holds (page, error) pairs; a missing page ends the listing.
+    queue = asyncio.Queue(maxsize=depth)
+
+    async def produce(page):
+        try:
+            while page.next_page_token:
+                page = await fetch_next(page)
+                await queue.put((page, None))
+        except Exception as exc:
+            await queue.put((None, exc))
+        else:
+            await queue.put((None, None))
+
+    task = asyncio.ensure_future(produce(response))
+    try:
+        while True:
+            page, error = await queue.get()
+            if page is None:
+                if error is not None:
+                    raise error
+                return
+            yield page
+    finally:
+        task.cancel()
+
+
+__all__ = (
+    'prefetch_pages',
+    'prefetch_pages_async',
+)
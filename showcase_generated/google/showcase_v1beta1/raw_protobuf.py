@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Send and receive the raw protobuf messages under the proto-plus types.
+
+Every field read from a proto-plus message goes through its marshal,
+which costs more than the read itself. A transport made with
+``raw_messages=True`` skips that layer: the responses its stubs return
+are the underlying protobuf messages, as returned by ``Type.pb()``, and
+its stubs take requests of either kind. The clients take raw requests
+too, and wrap them in their proto-plus type without a copy::
+
+    transport = EchoGrpcTransport(channel=channel, raw_messages=True)
+    client = EchoClient(transport=transport)
+    for response in client.expand(content='a b c'):
+        print(response.content)  # an echo_pb2.EchoResponse
+
+The fields have the same names, but the messages are not interchangeable
+with the proto-plus types: repeated and map fields are protobuf
+containers, enums are ints and timestamps are ``Timestamp`` messages.
+"""
+
+from typing import Any, Callable, Type
+
+import proto  # type: ignore
+
+
+def wrap(message_class: Type[proto.Message], request: Any) -> Any:
+    """Return a raw protobuf ``request`` as a ``message_class``.
+
+    The message is wrapped rather than copied; anything else is returned
+    as it is.
+    """
+    if isinstance(request, message_class.pb()):
+        return message_class.wrap(request)
+    return request
+
+
+def serializer(message_class: Type[proto.Message]) -> Callable[[Any], bytes]:
+    """Return a serializer for requests of either kind of ``message_class``."""
+    pb_class = message_class.pb()
+
+    def serialize(message: Any) -> bytes:
+        if isinstance(message, pb_class):
+            return message.SerializeToString()
+        return message_class.serialize(message)
+
+    return serialize
+
+
+def deserializer(message_class: Type[proto.Message]) -> Callable[[bytes], Any]:
+    """Return a deserializer to the raw protobuf message of ``message_class``."""
+    return message_class.pb().FromString
+
+
+__all__ = (
+    'deserializer',
+    'serializer',
+    'wrap',
+)
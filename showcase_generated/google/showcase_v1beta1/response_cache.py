@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Cache resources fetched by name on the client.
+
+A :class:`ResponseCache` handed to a client (``response_cache=...``) serves
+repeated ``get_*`` calls for the same resource name without a round trip.
+Entries expire after a fixed time, the least recently used entries are
+dropped once the cache is full, and a client drops the entry for a
+resource whenever it updates or deletes that resource.
+
+A ``get_*`` call still in flight when its resource is dropped must not
+cache the old resource again. The cache counts the drops in a
+generation: :meth:`ResponseCache.lookup` hands the caller the generation
+it saw, and :meth:`ResponseCache.put` ignores a resource fetched under a
+generation that the resource's name has since been dropped in.
+"""
+
+import collections
+import threading
+import time
+from typing import Any, Callable, Optional, Tuple
+
+from google.protobuf import message  # type: ignore
+
+
+def _copy(resource: Any) -> Any:
+    if isinstance(resource, message.Message):
+        # A raw protobuf message, from a transport with raw_messages.
+        copy = type(resource)()
+        copy.CopyFrom(resource)
+        return copy
+    return type(resource)(resource)
+
+
+class ResponseCache:
+    """A bounded, expiring map of resource names to resources.
+
+    The cache is safe to share between threads, and between clients of
+    different services; resource names do not collide across services.
+
+    Attributes:
+        hits (int): How many lookups were served from the cache.
+        misses (int): How many lookups found nothing, or an expired entry.
+        evictions (int): How many entries were dropped to make room.
+    """
+    def __init__(self,
+            max_size: int = 1024,
+            ttl: float = 60.0,
+            *,
+            clock: Callable[[], float] = time.monotonic) -> None:
+        """Instantiate the cache.
+
+        Args:
+            max_size (int): The most resources to hold.
+            ttl (float): How long, in seconds, a resource is served from the
+                cache after it was fetched.
+            clock (Callable[[], float]): The source of the current time.
+        """
+        if max_size < 1:
+            raise ValueError('A response cache must hold at least one entry.')
+        if ttl <= 0:
+            raise ValueError('The time to live must be positive.')
+        self._max_size = max_size
+        self._ttl = ttl
+        self._clock = clock
+        self._entries = collections.OrderedDict()
+        # The generation each recently dropped name, or ``name/`` for the
+        # names beneath it, was dropped in. Once it is full, the oldest
+        # are forgotten, and what was fetched before them is ignored.
+        self._dropped = collections.OrderedDict()
+        self._generation = 0
+        self._floor = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, name: str) -> Optional[Any]:
+        """Return a copy of the resource cached under ``name``, if fresh."""
+        return self.lookup(name)[0]
+
+    def lookup(self, name: str) -> Tuple[Optional[Any], int]:
+        """Return a copy of the resource cached under ``name``, if fresh.
+
+        Returns:
+            Tuple[Optional[Any], int]: The resource, or None; and the
+            generation to :meth:`put` the resource fetched instead under.
+        """
+        with self._lock:
+            generation = self._generation
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(name)
+                self.hits += 1
+                resource = entry[1]
+            else:
+                if entry is not None:
+                    del self._entries[name]
+                self.misses += 1
+                return None, generation
+        # Callers own what they are given; the cached resource stays intact.
+        return _copy(resource), generation
+
+    def put(self, name: str, resource: Any, generation: int = None) -> None:
+        """Cache a copy of ``resource`` under ``name``.
+
+        Args:
+            name (str): The resource name.
+            resource (Any): The resource.
+            generation (Optional[int]): The generation :meth:`lookup`
+                returned before the resource was fetched. If ``name`` was
+                dropped since, the resource may be out of date, and is not
+                cached.
+        """
+        resource = _copy(resource)
+        with self._lock:
+            if generation is not None and self._stale(name, generation):
+                return
+            self._entries[name] = (self._clock() + self._ttl, resource)
+            self._entries.move_to_end(name)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, name: str, *, descendants: bool = False) -> None:
+        """Drop ``name`` from the cache.
+
+        Args:
+            name (str): The resource name to drop.
+            descendants (bool): If True, also drop every resource beneath
+                ``name``; deleting a room deletes its blurbs, so the
+                entries of ``rooms/r/blurbs/*`` go along with ``rooms/r``.
+        """
+        with self._lock:
+            self._generation += 1
+            self._drop(name)
+            self._entries.pop(name, None)
+            if descendants:
+                prefix = name + '/'
+                self._drop(prefix)
+                for key in [k for k in self._entries if k.startswith(prefix)]:
+                    del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop every entry; the counters are kept."""
+        with self._lock:
+            self._generation += 1
+            self._floor = self._generation
+            self._dropped.clear()
+            self._entries.clear()
+
+    def _drop(self, key: str) -> None:
+        # Called with the lock held.
+        self._dropped[key] = self._generation
+        self._dropped.move_to_end(key)
+        while len(self._dropped) > self._max_size:
+            self._floor = self._dropped.popitem(last=False)[1]
+
+    def _stale(self, name: str, generation: int) -> bool:
+        # Called with the lock held. Whether ``name``, or a name above it
+        # with its descendants, was dropped after ``generation``.
+        if generation < self._floor:
+            return True
+        keys = [name] + [name[:i + 1] for i, c in enumerate(name) if c == '/']
+        return any(self._dropped.get(key, -1) > generation for key in keys)
+
+    def __repr__(self) -> str:
+        return '{0}<size={1}, hits={2}, misses={3}, evictions={4}>'.format(
+            self.__class__.__name__, len(self), self.hits, self.misses,
+            self.evictions)
+
+
+__all__ = (
+    'ResponseCache',
+)
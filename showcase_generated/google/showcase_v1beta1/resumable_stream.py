@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Server streams that survive a dropped connection.
+
+A :class:`ResumableStream` is iterated like the stream it wraps. When the
+stream fails with an error its retry accepts, it is opened again after a
+backoff, asking the server for only what is still missing; responses
+the caller has already seen are not repeated. Each service's stream
+knows how to track its progress; see ``services/*/resumable.py``.
+"""
+
+import collections
+from typing import Any, Deque, Iterable, Iterator, Optional
+
+from google.api_core import exceptions        # type: ignore
+from google.api_core import retry as retries  # type: ignore
+
+
+# The errors of a connection that dropped, after which the stream can
+# be opened again.
+DEFAULT_RETRY = retries.Retry(
+    predicate=retries.if_exception_type(
+        exceptions.ServiceUnavailable,
+    ),
+)
+
+
+class _Finished(Exception):
+    # Carries the error that ended a complete stream past its retry.
+    def __init__(self, error: Exception) -> None:
+        super().__init__(error)
+        self.error = error
+
+
+class ResumableStream:
+    """Iterate over a server stream, reopening it where it broke off.
+
+    Subclasses open each attempt with :meth:`_open`, and record the
+    progress made with :meth:`_accept`.
+
+    Attributes:
+        attempts (int): How many times opening the stream was tried.
+    """
+    def __init__(self, retry: Optional[retries.Retry]) -> None:
+        """Instantiate the stream.
+
+        Args:
+            retry (Optional[google.api_core.retry.Retry]): Which errors
+                reopen the stream, and the backoff between attempts. The
+                backoff starts over whenever a response arrives. If None,
+                the first error is raised.
+        """
+        self._call = None  # type: Optional[Iterator]
+        self._backlog = collections.deque()  # type: Deque
+        self.attempts = 0
+        self._next = self._next_once
+        if retry is not None:
+            self._next = retry(self._next_once, on_error=self._drop)
+
+    def _open(self) -> Iterator:
+        """Open an attempt that picks up after the progress made so far."""
+        raise NotImplementedError()
+
+    def _reopened(self) -> Iterable:
+        """Return the responses missed while no stream was open.
+
+        This is called after each attempt but the first is opened.
+        """
+        return ()
+
+    def _complete(self) -> bool:
+        """Return whether every response was received.
+
+        An error after that is raised as it is, without reopening.
+        """
+        return False
+
+    def _accept(self, response: Any) -> bool:
+        """Record the progress ``response`` makes.
+
+        Returns:
+            bool: False if the response was seen before, and is dropped.
+        """
+        raise NotImplementedError()
+
+    def _drop(self, exc: Exception) -> None:
+        self._call = None
+
+    def _next_once(self) -> Any:
+        if self._call is None:
+            self.attempts += 1
+            self._call = self._open()
+            if self.attempts > 1:
+                self._backlog.extend(self._reopened())
+        if self._backlog:
+            return self._backlog.popleft()
+        while True:
+            try:
+                response = next(self._call)
+            except StopIteration:
+                raise
+            except Exception as exc:
+                if self._complete():
+                    raise _Finished(exc)
+                raise
+            if self._accept(response):
+                return response
+
+    def __iter__(self) -> 'ResumableStream':
+        return self
+
+    def __next__(self) -> Any:
+        try:
+            return self._next()
+        except _Finished as finished:
+            raise finished.error
+
+    def trailing_metadata(self):
+        """Return the trailing metadata of the current attempt, which is
+        the one that finished the stream once it is exhausted.
+        """
+        return self._call.trailing_metadata() if self._call is not None else None
+
+    def cancel(self) -> None:
+        """Cancel the current attempt."""
+        if self._call is not None:
+            self._call.cancel()
+
+    def __repr__(self) -> str:
+        return '{0}<attempts={1}>'.format(
+            self.__class__.__name__, self.attempts)
+
+
+__all__ = (
+    'DEFAULT_RETRY',
+    'ResumableStream',
+)
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Bound the retries a client sends to an overloaded backend.
+
+Every client retrying every failed call multiplies the load on a backend
+that is failing because it is overloaded. A :class:`RetryBudget` allows
+the retries of a method only while they are few next to its requests
+over a sliding window; past that, a failed call is not retried, and its
+error is raised at once. A client made with ``retry_budget=...`` applies
+the budget to the retries of each of its methods, whether the default
+retry from the service config or one passed by the caller::
+
+    budget = RetryBudget(ratio=0.1, window=10.0)
+    client = MessagingClient(retry_budget=budget)
+    ...
+    print(budget.snapshot())
+
+A budget may be shared by several clients and threads, which then share
+the requests and retries of each method. The window slides a tenth of
+its length at a time, so a budget takes the same memory whatever the
+rate of calls.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+from google.api_core import gapic_v1  # type: ignore
+
+from google.showcase_v1beta1 import service_config
+
+
+# The window is counted in this many buckets of equal spans of time.
+_BUCKETS = 10
+
+
+class RetryBudgetStats:
+    """What was recorded for the calls of one method.
+
+    Attributes:
+        requests (int): How many calls were made, not counting retries.
+        retries (int): How many retries were allowed.
+        suppressed (int): How many retries were not allowed, because the
+            budget was spent.
+        window_requests (int): How many calls were made within the window.
+        window_retries (int): How many retries were allowed within the
+            window.
+    """
+    def __init__(self) -> None:
+        self.requests = 0
+        self.retries = 0
+        self.suppressed = 0
+        self.window_requests = 0
+        self.window_retries = 0
+
+    def copy(self) -> 'RetryBudgetStats':
+        stats = RetryBudgetStats()
+        stats.requests = self.requests
+        stats.retries = self.retries
+        stats.suppressed = self.suppressed
+        stats.window_requests = self.window_requests
+        stats.window_retries = self.window_retries
+        return stats
+
+    def __repr__(self) -> str:
+        return '{0}<requests={1}, retries={2}, suppressed={3}>'.format(
+            self.__class__.__name__, self.requests, self.retries,
+            self.suppressed)
+
+
+class _Window:
+    # The requests and retries of one method in the window, counted in a
+    # ring of buckets; each bucket counts one span of time.
+    __slots__ = ('spans', 'requests', 'retries', 'stats')
+
+    def __init__(self) -> None:
+        self.spans = [-1] * _BUCKETS  # type: List[int]
+        self.requests = [0] * _BUCKETS  # type: List[int]
+        self.retries = [0] * _BUCKETS  # type: List[int]
+        self.stats = RetryBudgetStats()
+
+    def bucket(self, span: int) -> int:
+        # The bucket of a span, emptied if it still counts an older one.
+        bucket = span % _BUCKETS
+        if self.spans[bucket] != span:
+            self.spans[bucket] = span
+            self.requests[bucket] = self.retries[bucket] = 0
+        return bucket
+
+    def totals(self, span: int) -> Tuple[int, int]:
+        # The requests and retries of the window that ends with a span.
+        requests = retries = 0
+        for bucket in range(_BUCKETS):
+            if self.spans[bucket] > span - _BUCKETS:
+                requests += self.requests[bucket]
+                retries += self.retries[bucket]
+        return requests, retries
+
+
+class RetryBudget:
+    """How many retries each method may send, next to its requests.
+
+    A retry is allowed while the retries within the window stay below
+    ``ratio`` times the requests within it, or below ``min_retries``, so
+    that a method called rarely may still retry.
+    """
+    def __init__(self, *,
+            ratio: Union[float, Mapping[str, float]] = 0.1,
+            window: float = 10.0,
+            min_retries: int = 10,
+            clock: Callable[[], float] = time.monotonic) -> None:
+        """Instantiate the budget.
+
+        Args:
+            ratio (Union[float, Mapping[str, float]]): The most retries per
+                request of a method; a mapping from full method names
+                (``'/google.showcase.v1beta1.Messaging/GetBlurb'``) gives
+                each method its own, and methods it leaves out no limit.
+            window (float): The seconds of requests and retries counted,
+                to a tenth of the window.
+            min_retries (int): The retries within the window that are
+                allowed whatever the ratio.
+            clock (Callable[[], float]): The source of the current time, in
+                seconds.
+        """
+        if window <= 0:
+            raise ValueError('The retry budget window must be positive.')
+        if min_retries < 0:
+            raise ValueError('The minimum of retries must not be negative.')
+        self._ratio = ratio
+        self._window = window
+        self._span = window / _BUCKETS
+        self._min_retries = min_retries
+        self._clock = clock
+        self._windows = {}  # type: Dict[str, _Window]
+        self._lock = threading.Lock()
+
+    def _slide(self, method: str) -> Tuple[_Window, int]:
+        # Called with the lock held. Return the method's window, and the
+        # span of time it now ends with.
+        window = self._windows.get(method)
+        if window is None:
+            window = self._windows[method] = _Window()
+        return window, int(self._clock() // self._span)
+
+    def _request(self, method: str) -> None:
+        with self._lock:
+            window, span = self._slide(method)
+            window.requests[window.bucket(span)] += 1
+            window.stats.requests += 1
+
+    def _allow(self, method: str) -> bool:
+        # Spend a retry of the method, if the budget has one left.
+        if isinstance(self._ratio, Mapping):
+            ratio = self._ratio.get(method)  # type: Optional[float]
+        else:
+            ratio = self._ratio
+        with self._lock:
+            window, span = self._slide(method)
+            requests, retries = window.totals(span)
+            if (ratio is not None and retries >= self._min_retries and
+                    retries >= ratio * requests):
+                window.stats.suppressed += 1
+                return False
+            window.retries[window.bucket(span)] += 1
+            window.stats.retries += 1
+            return True
+
+    def budget(self, retry: Any, method: str,
+            predicate: Callable[[Exception], bool]) -> Any:
+        """Return a copy of a retry that retries only within the budget.
+
+        Args:
+            retry (Union[~.retries.Retry, ~.retry_async.AsyncRetry]): How
+                the call would be retried.
+            method (str): The full name of the method, which its requests
+                and retries are counted under.
+            predicate (Callable[[Exception], bool]): Whether ``retry``
+                retries an error.
+        """
+        def budgeted(exc):
+            return predicate(exc) and self._allow(method)
+
+        return retry.with_predicate(budgeted)
+
+    def snapshot(self) -> Dict[str, RetryBudgetStats]:
+        """Return a copy of the stats recorded so far, by full method name."""
+        with self._lock:
+            snapshot = {}
+            for method in list(self._windows):
+                window, span = self._slide(method)
+                stats = snapshot[method] = window.stats.copy()
+                stats.window_requests, stats.window_retries = window.totals(span)
+            return snapshot
+
+    def __repr__(self) -> str:
+        return '{0}<ratio={1!r}, window={2!r}, methods={3}>'.format(
+            self.__class__.__name__, self._ratio, self._window,
+            len(self._windows))
+
+
+class _BudgetedCallable:
+    def __init__(self, rpc: Callable, budget: RetryBudget, method: str,
+            default_retry: Any) -> None:
+        self._rpc = rpc
+        self._budget = budget
+        self._method = method
+        self._default_retry = default_retry
+
+    def __call__(self, *args, retry=gapic_v1.method.DEFAULT, **kwargs):
+        if retry is gapic_v1.method.DEFAULT:
+            retry = self._default_retry
+        elif retry is not None:
+            # api-core offers no public way to read a retry's predicate.
+            retry = self._budget.budget(retry, self._method, retry._predicate)
+        self._budget._request(self._method)
+        return self._rpc(*args, retry=retry, **kwargs)
+
+
+def wrap(rpc: Callable,
+        budget: Optional[RetryBudget],
+        service: str,
+        method: str,
+        default_retry: Any) -> Callable:
+    """Return a wrapped method, its retries budgeted if there is a budget.
+
+    Args:
+        rpc (Callable): The method, as wrapped by ``wrap_method``.
+        budget (Optional[RetryBudget]): The client's retry budget.
+        service (str): The full name of the service, like
+            ``google.showcase.v1beta1.Messaging``.
+        method (str): The name of the method, like ``GetBlurb``.
+        default_retry (Union[~.retries.Retry, ~.retry_async.AsyncRetry]):
+            The retry the method was wrapped with, from the service config,
+            used for the calls that do not pass one.
+    """
+    if budget is None:
+        return rpc
+    full_name = '/{}/{}'.format(service, method)
+    if default_retry is not None:
+        predicate = service_config.method_config(service, method).predicate
+        if predicate is None:
+            predicate = default_retry._predicate
+        default_retry = budget.budget(default_retry, full_name, predicate)
+    return _BudgetedCallable(rpc, budget, full_name, default_retry)
+
+
+__all__ = (
+    'RetryBudget',
+    'RetryBudgetStats',
+    'wrap',
+)
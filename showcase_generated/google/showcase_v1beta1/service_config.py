@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""The retry and timeout policy of every method, from the service config.
+
+``showcase_grpc_service_config.json`` gives each method a timeout, and some
+of them a retry policy. It is read once, when this module is imported,
+into a :class:`MethodConfig` per method; the clients wrap their methods
+with its ``retry`` and ``timeout`` as defaults, so that a call with
+neither argument is bounded as the service intends::
+
+    config = method_config('google.showcase.v1beta1.Echo', 'Echo')
+    config.timeout  # 10.0
+    config.retry    # retries UNAVAILABLE and UNKNOWN, for up to 10s
+
+The retries of a call stop at its timeout. An api-core ``Retry`` has no
+limit on the number of attempts, so ``maxAttempts`` is honored by gRPC
+itself only, on a channel given the config as its ``grpc.service_config``
+option (:data:`SERVICE_CONFIG_JSON`); the transports do so when made with
+``grpc_service_config=True``.
+"""
+
+import json
+import pkgutil
+import re
+from typing import Callable, Dict, Optional, Tuple
+
+import grpc  # type: ignore
+
+from google.api_core import exceptions                 # type: ignore
+from google.api_core import retry as retries           # type: ignore
+from google.api_core import retry_async                # type: ignore
+
+
+def _read(resource: str) -> str:
+    # A file shipped in this package, as text.
+    missing = 'The {!r} shipped with this package is missing.'.format(resource)
+    try:
+        data = pkgutil.get_data(__name__.rpartition('.')[0], resource)
+    except OSError as exc:
+        raise ImportError(missing) from exc
+    if data is None:
+        # The package's loader cannot read files.
+        raise ImportError(missing)
+    return data.decode('utf-8')
+
+
+SERVICE_CONFIG_JSON = _read('showcase_grpc_service_config.json')
+
+_DURATION = re.compile(r'^(\d+(?:\.\d+)?)s$')
+
+
+class MethodConfig:
+    """The retry and timeout policy of one method.
+
+    Attributes:
+        timeout (Optional[float]): The seconds a call may take, retries
+            included; None for no limit.
+        retry (Optional[~.retries.Retry]): How to retry a call; None not
+            to.
+        async_retry (Optional[~.retry_async.AsyncRetry]): The same, for
+            the async clients.
+        max_attempts (Optional[int]): The most attempts gRPC makes of a
+            call, on a channel given the service config.
+        predicate (Optional[Callable[[Exception], bool]]): Whether
+            ``retry`` and ``async_retry`` retry an error.
+    """
+    def __init__(self,
+            timeout: Optional[float] = None,
+            retry: Optional[retries.Retry] = None,
+            async_retry: Optional[retry_async.AsyncRetry] = None,
+            max_attempts: Optional[int] = None,
+            predicate: Optional[Callable[[Exception], bool]] = None) -> None:
+        self.timeout = timeout
+        self.retry = retry
+        self.async_retry = async_retry
+        self.max_attempts = max_attempts
+        self.predicate = predicate
+
+    def __repr__(self) -> str:
+        return '{0}<timeout={1!r}, max_attempts={2!r}>'.format(
+            self.__class__.__name__, self.timeout, self.max_attempts)
+
+
+def _seconds(duration: str) -> float:
+    # A duration as protobuf's JSON mapping writes it, like "0.1s".
+    match = _DURATION.match(duration)
+    if match is None:
+        raise ValueError('Not a duration: {!r}.'.format(duration))
+    return float(match.group(1))
+
+
+def _method_config(entry: dict) -> MethodConfig:
+    timeout = _seconds(entry['timeout']) if 'timeout' in entry else None
+    policy = entry.get('retryPolicy')
+    if policy is None:
+        return MethodConfig(timeout)
+
+    predicate = retries.if_exception_type(*(
+        exceptions.exception_class_for_grpc_status(grpc.StatusCode[code])
+        for code in policy['retryableStatusCodes']
+    ))
+    backoff = dict(
+        initial=_seconds(policy['initialBackoff']),
+        maximum=_seconds(policy['maxBackoff']),
+        multiplier=float(policy['backoffMultiplier']),
+        deadline=timeout,
+    )
+    return MethodConfig(
+        timeout,
+        retries.Retry(predicate, **backoff),
+        retry_async.AsyncRetry(predicate, **backoff),
+        int(policy['maxAttempts']),
+        predicate,
+    )
+
+
+def _parse(service_config: str) -> Dict[Tuple[str, Optional[str]], MethodConfig]:
+    # Index the config of each method, and each service's default, by
+    # (service, method); the method is None for the default.
+    configs = {}
+    for entry in json.loads(service_config).get('methodConfig', ()):
+        config = _method_config(entry)
+        for name in entry['name']:
+            configs[(name['service'], name.get('method'))] = config
+    return configs
+
+
+_CONFIGS = _parse(SERVICE_CONFIG_JSON)
+_NONE = MethodConfig()
+
+
+def method_config(service: str, method: str) -> MethodConfig:
+    """Return the policy of a method.
+
+    Args:
+        service (str): The full name of the service, like
+            ``google.showcase.v1beta1.Echo``.
+        method (str): The name of the method, like ``Echo``.
+
+    Returns:
+        MethodConfig: The method's own policy, or else its service's; one
+        with neither a retry nor a timeout if the config has neither.
+    """
+    config = _CONFIGS.get((service, method))
+    if config is None:
+        config = _CONFIGS.get((service, None), _NONE)
+    return config
+
+
+__all__ = (
+    'MethodConfig',
+    'SERVICE_CONFIG_JSON',
+    'method_config',
+)
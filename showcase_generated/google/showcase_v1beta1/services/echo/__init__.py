@@ -15,8 +15,16 @@
 # limitations under the License.
 #
 
-from .client import EchoClient
+from google.showcase_v1beta1 import lazy_import
+
+
+# The clients are imported on first use.
+__getattr__, __dir__ = lazy_import.attach(__name__, {
+    '.async_client': ('EchoAsyncClient',),
+    '.client': ('EchoClient',),
+})
 
 __all__ = (
+    'EchoAsyncClient',
     'EchoClient',
 )
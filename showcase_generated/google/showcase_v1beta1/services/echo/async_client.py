@@ -0,0 +1,625 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import functools
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Sequence, Tuple, Union
+
+import google.api_core.client_options as ClientOptions # type: ignore
+from google.api_core import exceptions                 # type: ignore
+from google.api_core import gapic_v1                   # type: ignore
+from google.api_core import retry as retries           # type: ignore
+from google.auth import credentials                    # type: ignore
+from google.oauth2 import service_account              # type: ignore
+
+from google.api_core import operation_async
+from google.protobuf import duration_pb2 as duration  # type: ignore
+from google.protobuf import timestamp_pb2 as timestamp  # type: ignore
+from google.rpc import status_pb2 as status  # type: ignore
+from google.showcase_v1beta1 import governor
+from google.showcase_v1beta1 import hedging
+from google.showcase_v1beta1 import retry_budget
+from google.showcase_v1beta1 import service_config
+from google.showcase_v1beta1.governor import Governor
+from google.showcase_v1beta1.hedging import HedgingPolicy
+from google.showcase_v1beta1.retry_budget import RetryBudget
+from google.showcase_v1beta1.services.echo import pagers
+from google.showcase_v1beta1.types import echo
+from google.showcase_v1beta1.types import echo as gs_echo
+
+from .client import EchoClient, _SERVICE, _get_client_info
+from .transports.base import EchoTransport
+from .transports.grpc_asyncio import EchoGrpcAsyncIOTransport
+
+
+class EchoAsyncClient:
+    """This service is used showcase the four main types of rpcs -
+    unary, server side streaming, client side streaming, and
+    bidirectional streaming. This service also exposes methods that
+    explicitly implement server delay, and paginated calls. Set the
+    'showcase-trailer' metadata key on any method to have the values
+    echoed in the response trailers.
+    """
+
+    DEFAULT_OPTIONS = EchoClient.DEFAULT_OPTIONS
+
+    get_transport_class = functools.partial(
+        type(EchoClient).get_transport_class,
+        type(EchoClient),
+    )
+
+    @classmethod
+    def from_service_account_file(cls, filename: str, *args, **kwargs):
+        """Creates an instance of this client using the provided credentials
+        file.
+
+        Args:
+            filename (str): The path to the service account private key json
+                file.
+            args: Additional arguments to pass to the constructor.
+            kwargs: Additional arguments to pass to the constructor.
+
+        Returns:
+            {@api.name}: The constructed client.
+        """
+        credentials = service_account.Credentials.from_service_account_file(
+            filename)
+        kwargs['credentials'] = credentials
+        return cls(*args, **kwargs)
+
+    from_service_account_json = from_service_account_file
+
+    def __init__(self, *,
+            credentials: credentials.Credentials = None,
+            transport: Union[str, EchoTransport] = 'grpc_asyncio',
+            client_options: ClientOptions = DEFAULT_OPTIONS,
+            take_request_ownership: bool = False,
+            page_prefetch_depth: int = 0,
+            hedging_policy: HedgingPolicy = None,
+            governor: Governor = None,
+            retry_budget: RetryBudget = None,
+            ) -> None:
+        """Instantiate the echo client.
+
+        Args:
+            credentials (Optional[google.auth.credentials.Credentials]): The
+                authorization credentials to attach to requests. These
+                credentials identify the application to the service; if none
+                are specified, the client will attempt to ascertain the
+                credentials from the environment.
+            transport (Union[str, ~.EchoTransport]): The
+                transport to use. It must be an asyncio transport, such as
+                ~.EchoGrpcAsyncIOTransport; by default one is created.
+            client_options (ClientOptions): Custom options for the client.
+            take_request_ownership (bool): If True, the caller hands over
+                every request message it passes to this client, and must
+                not use it again afterwards. This lets paged methods
+                advance the request's ``page_token`` in place instead of
+                copying the request first.
+            page_prefetch_depth (int): If set, the pagers returned by paged
+                methods request the following pages in the background, and
+                hold up to this many pages ahead of the caller. This hides
+                the round trip at each page boundary on high-latency links.
+            hedging_policy (~.HedgingPolicy): If set, the unary methods
+                the service config allows to retry are hedged: a call with
+                no answer in time is sent again, and the first answer is
+                used.
+            governor (~.Governor): If set, every attempt of a unary
+                method waits for the governor to let it through, within
+                the rate and concurrency limits of its method. The wait
+                sleeps on the event loop instead of blocking it.
+            retry_budget (~.RetryBudget): If set, the calls are retried
+                only while their retries are few next to their requests,
+                as the budget allows; past that, a failed call raises its
+                error at once.
+        """
+        # The synchronous client validates the options and creates the
+        # transport; this client only awaits the transport's calls.
+        self._client = EchoClient(
+            credentials=credentials,
+            transport=transport,
+            client_options=client_options,
+            take_request_ownership=take_request_ownership,
+            page_prefetch_depth=page_prefetch_depth,
+            hedging_policy=hedging_policy,
+            governor=governor,
+            retry_budget=retry_budget,
+        )
+
+        # Save a dictionary of cached API call functions.
+        # These are the actual callables which invoke the proper
+        # transport methods, wrapped with `wrap_method` to add retry,
+        # timeout, and the like.
+        self._inner_api_calls = {}  # type: Dict[str, Callable]
+
+    async def echo(self,
+            request: gs_echo.EchoRequest = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> gs_echo.EchoResponse:
+        r"""This method simply echos the request. This method is
+        showcases unary rpcs.
+
+        Args:
+            request (:class:`~.gs_echo.EchoRequest`):
+                The request object. The request message used for the
+                Echo, Collect and Chat methods. If content is set in
+                this message then the request will succeed. If status is
+                set in  this message then the status will be returned as
+                an error.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.gs_echo.EchoResponse:
+                The response message for the Echo
+                methods.
+
+        """
+        # Create or coerce a protobuf request object.
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        if not isinstance(request, gs_echo.EchoRequest):
+            request = gs_echo.EchoRequest(request)
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'echo' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'Echo')
+            self._inner_api_calls['echo'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    governor.wrap_async(
+                        hedging.wrap_async(self._client._transport.echo,
+                                           self._client._hedging_policy,
+                                           _SERVICE, 'Echo'),
+                        self._client._governor, _SERVICE, 'Echo'),
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'Echo', config.async_retry)
+        rpc = self._inner_api_calls['echo']
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # Done; return the response.
+        return response
+
+    def expand(self,
+            request: gs_echo.ExpandRequest = None,
+            *,
+            content: str = None,
+            error: status.Status = None,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> Awaitable[AsyncIterable[gs_echo.EchoResponse]]:
+        r"""This method split the given content into words and
+        will pass each word back through the stream. This method
+        showcases server-side streaming rpcs.
+
+        Args:
+            request (:class:`~.gs_echo.ExpandRequest`):
+                The request object. The request message for the Expand
+                method.
+            content (:class:`str`):
+                The content that will be split into
+                words and returned on the stream.
+                This corresponds to the ``content`` field
+                on the ``request`` instance; if ``request`` is provided, this
+                should not be set.
+            error (:class:`~.status.Status`):
+                The error that is thrown after all
+                words are sent on the stream.
+                This corresponds to the ``error`` field
+                on the ``request`` instance; if ``request`` is provided, this
+                should not be set.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            AsyncIterable[~.gs_echo.EchoResponse]:
+                The response message for the Echo
+                methods.
+
+        """
+        # Create or coerce a protobuf request object.
+        # Sanity check: If we got a request object, we should *not* have
+        # gotten any keyword arguments that map to the request.
+        if request is not None and any([content, error]):
+            raise ValueError('If the `request` argument is set, then none of '
+                             'the individual field arguments should be set.')
+
+        # If we have keyword arguments corresponding to fields on the
+        # request, apply these. Without any, a request of exactly this
+        # type is used as-is rather than copied.
+        if (not isinstance(request, gs_echo.ExpandRequest) or
+                any(arg is not None for arg in (content, error))):
+            request = gs_echo.ExpandRequest(request)
+        if content is not None:
+            request.content = content
+        if error is not None:
+            request.error = error
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'expand' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'Expand')
+            self._inner_api_calls['expand'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    self._client._transport.expand,
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'Expand', config.async_retry)
+        rpc = self._inner_api_calls['expand']
+
+        # Send the request. The stream is set up once the returned
+        # coroutine is awaited.
+        response = rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # Done; return the response.
+        return response
+
+    async def collect(self,
+            requests: AsyncIterator[gs_echo.EchoRequest] = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> gs_echo.EchoResponse:
+        r"""This method will collect the words given to it. When
+        the stream is closed by the client, this method will
+        return the a concatenation of the strings passed to it.
+        This method showcases client-side streaming rpcs.
+
+        Args:
+            requests (AsyncIterator[`~.gs_echo.EchoRequest`]):
+                The request object AsyncIterator. The request message used for the
+                Echo, Collect and Chat methods. If content is set in
+                this message then the request will succeed. If status is
+                set in  this message then the status will be returned as
+                an error.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.gs_echo.EchoResponse:
+                The response message for the Echo
+                methods.
+
+        """
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'collect' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'Collect')
+            # A stream of requests cannot be sent again, so the call is
+            # never retried by default.
+            self._inner_api_calls['collect'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    self._client._transport.collect,
+                    default_retry=None,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'Collect', None)
+        rpc = self._inner_api_calls['collect']
+
+        # Send the request, and wait for the single response once
+        # the stream is set up.
+        call = await rpc(
+            requests,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+        response = await call
+
+        # Done; return the response.
+        return response
+
+    def chat(self,
+            requests: AsyncIterator[gs_echo.EchoRequest] = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> Awaitable[AsyncIterable[gs_echo.EchoResponse]]:
+        r"""This method, upon receiving a request on the stream,
+        the same content will be passed  back on the stream.
+        This method showcases bidirectional streaming rpcs.
+
+        Args:
+            requests (AsyncIterator[`~.gs_echo.EchoRequest`]):
+                The request object AsyncIterator. The request message used for the
+                Echo, Collect and Chat methods. If content is set in
+                this message then the request will succeed. If status is
+                set in  this message then the status will be returned as
+                an error.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            AsyncIterable[~.gs_echo.EchoResponse]:
+                The response message for the Echo
+                methods.
+
+        """
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'chat' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'Chat')
+            # A stream of requests cannot be sent again, so the call is
+            # never retried by default.
+            self._inner_api_calls['chat'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    self._client._transport.chat,
+                    default_retry=None,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'Chat', None)
+        rpc = self._inner_api_calls['chat']
+
+        # Send the request. The stream is set up once the returned
+        # coroutine is awaited.
+        response = rpc(
+            requests,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # Done; return the response.
+        return response
+
+    async def paged_expand(self,
+            request: gs_echo.PagedExpandRequest = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> pagers.PagedExpandAsyncPager:
+        r"""This is similar to the Expand method but instead of
+        returning a stream of expanded words, this method
+        returns a paged list of expanded words.
+
+        Args:
+            request (:class:`~.gs_echo.PagedExpandRequest`):
+                The request object. The request for the PagedExpand
+                method.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.pagers.PagedExpandAsyncPager:
+                The response for the PagedExpand
+                method.
+                Iterating over this object will yield
+                results and resolve additional pages
+                automatically.
+
+        """
+        # Create or coerce a protobuf request object.
+        # A request of exactly this type is used as-is rather than copied.
+        # It then still belongs to the caller, so the pager (which
+        # advances `page_token` in place) works on a copy of it, unless
+        # the caller has handed ownership of its requests to the client.
+        owns_request = self._client._take_request_ownership
+        if not isinstance(request, gs_echo.PagedExpandRequest):
+            request = gs_echo.PagedExpandRequest(request)
+            owns_request = True
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'paged_expand' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'PagedExpand')
+            self._inner_api_calls['paged_expand'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    governor.wrap_async(
+                        hedging.wrap_async(self._client._transport.paged_expand,
+                                           self._client._hedging_policy,
+                                           _SERVICE, 'PagedExpand'),
+                        self._client._governor, _SERVICE, 'PagedExpand'),
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'PagedExpand', config.async_retry)
+        rpc = self._inner_api_calls['paged_expand']
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # This method is paged; wrap the response in a pager, which provides
+        # an `__aiter__` convenience method.
+        response = pagers.PagedExpandAsyncPager(
+            method=rpc,
+            request=request,
+            response=response,
+            owns_request=owns_request,
+            prefetch_depth=self._client._page_prefetch_depth,
+        )
+
+        # Done; return the response.
+        return response
+
+    async def wait(self,
+            request: gs_echo.WaitRequest = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> operation_async.AsyncOperation:
+        r"""This method will wait the requested amount of and
+        then return. This method showcases how a client handles
+        a request timing out.
+
+        Args:
+            request (:class:`~.gs_echo.WaitRequest`):
+                The request object. The request for Wait method.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.operation_async.AsyncOperation:
+                An object representing a long-running operation.
+
+                The result type for the operation will be
+                :class:``~.echo.WaitResponse``: The result of the Wait
+                operation.
+
+        """
+        # Create or coerce a protobuf request object.
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        if not isinstance(request, gs_echo.WaitRequest):
+            request = gs_echo.WaitRequest(request)
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'wait' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'Wait')
+            self._inner_api_calls['wait'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    governor.wrap_async(self._client._transport.wait,
+                                        self._client._governor,
+                                        _SERVICE, 'Wait'),
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'Wait', config.async_retry)
+        rpc = self._inner_api_calls['wait']
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # Wrap the response in an operation future.
+        response = operation_async.from_gapic(
+            response,
+            self._client._transport.operations_client,
+            echo.WaitResponse,
+            metadata_type=echo.WaitMetadata,
+        )
+
+        # Done; return the response.
+        return response
+
+    async def block(self,
+            request: gs_echo.BlockRequest = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> gs_echo.BlockResponse:
+        r"""This method will block (wait) for the requested
+        amount of time  and then return the response or error.
+        This method showcases how a client handles delays or
+        retries.
+
+        Args:
+            request (:class:`~.gs_echo.BlockRequest`):
+                The request object. The request for Block method.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.gs_echo.BlockResponse:
+                The response for Block method.
+        """
+        # Create or coerce a protobuf request object.
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        if not isinstance(request, gs_echo.BlockRequest):
+            request = gs_echo.BlockRequest(request)
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'block' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'Block')
+            self._inner_api_calls['block'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    governor.wrap_async(self._client._transport.block,
+                                        self._client._governor,
+                                        _SERVICE, 'Block'),
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'Block', config.async_retry)
+        rpc = self._inner_api_calls['block']
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # Done; return the response.
+        return response
+
+
+__all__ = (
+    'EchoAsyncClient',
+)
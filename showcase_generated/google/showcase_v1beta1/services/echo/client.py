@@ -16,8 +16,8 @@
 #
 
 from collections import OrderedDict
-from typing import Dict, Sequence, Tuple, Type, Union
-import pkg_resources
+import functools
+from typing import Callable, Dict, Iterator, Optional, Sequence, Tuple, Type, Union
 
 import google.api_core.client_options as ClientOptions # type: ignore
 from google.api_core import exceptions                 # type: ignore
@@ -28,14 +28,33 @@ from google.oauth2 import service_account              # type: ignore
 
 from google.api_core import operation
 from google.protobuf import duration_pb2 as duration  # type: ignore
+from google.protobuf import message as protobuf_message  # type: ignore
 from google.protobuf import timestamp_pb2 as timestamp  # type: ignore
 from google.rpc import status_pb2 as status  # type: ignore
+from google.showcase_v1beta1 import governor
+from google.showcase_v1beta1 import hedging
+from google.showcase_v1beta1 import raw_protobuf
+from google.showcase_v1beta1 import resumable_stream
+from google.showcase_v1beta1 import retry_budget
+from google.showcase_v1beta1 import service_config
+from google.showcase_v1beta1.governor import Governor
+from google.showcase_v1beta1.hedging import HedgingPolicy
+from google.showcase_v1beta1.operation_poller import OperationPoller
+from google.showcase_v1beta1.operation_poller import PolledOperation
+from google.showcase_v1beta1.retry_budget import RetryBudget
+from google.showcase_v1beta1.services.echo import multiplex
 from google.showcase_v1beta1.services.echo import pagers
+from google.showcase_v1beta1.services.echo import resumable
 from google.showcase_v1beta1.types import echo
 from google.showcase_v1beta1.types import echo as gs_echo
 
 from .transports.base import EchoTransport
 from .transports.grpc import EchoGrpcTransport
+from .transports.grpc_asyncio import EchoGrpcAsyncIOTransport
+
+
+# The service's full name, as the service config knows it.
+_SERVICE = 'google.showcase.v1beta1.Echo'
 
 
 class EchoClientMeta(type):
@@ -47,6 +66,7 @@ class EchoClientMeta(type):
     """
     _transport_registry = OrderedDict()  # type: Dict[str, Type[EchoTransport]]
     _transport_registry['grpc'] = EchoGrpcTransport
+    _transport_registry['grpc_asyncio'] = EchoGrpcAsyncIOTransport
 
     def get_transport_class(cls,
             label: str = None,
@@ -105,6 +125,13 @@ class EchoClient(metaclass=EchoClientMeta):
             credentials: credentials.Credentials = None,
             transport: Union[str, EchoTransport] = None,
             client_options: ClientOptions = DEFAULT_OPTIONS,
+            take_request_ownership: bool = False,
+            page_prefetch_depth: int = 0,
+            multiplex_echo_streams: int = 0,
+            operation_poller: OperationPoller = None,
+            hedging_policy: HedgingPolicy = None,
+            governor: Governor = None,
+            retry_budget: RetryBudget = None,
             ) -> None:
         """Instantiate the echo client.
 
@@ -118,6 +145,39 @@ class EchoClient(metaclass=EchoClientMeta):
                 transport to use. If set to None, a transport is chosen
                 automatically.
             client_options (ClientOptions): Custom options for the client.
+            take_request_ownership (bool): If True, the caller hands over
+                every request message it passes to this client, and must
+                not use it again afterwards. This lets paged methods
+                advance the request's ``page_token`` in place instead of
+                copying the request first.
+            page_prefetch_depth (int): If set, the pagers returned by paged
+                methods request the following pages in the background, and
+                hold up to this many pages ahead of the caller. This hides
+                the round trip at each page boundary on high-latency links.
+            multiplex_echo_streams (int): If set, concurrent :meth:`echo`
+                calls are carried over up to this many shared ``Chat``
+                streams instead of one unary call each, until the client
+                is closed. A stream is opened only when every open one is
+                busy. Calls that ask for
+                an error, or carry their own metadata or retry, are still
+                sent on their own, as are calls whose stream fails or
+                leaves a call unanswered for ten seconds. The
+                governor lets the calls on a stream through as it does
+                unary ones, but they are neither hedged nor retried.
+            operation_poller (~.OperationPoller): If set, the futures of
+                long-running methods are tracked by this poller, on its one
+                polling thread, instead of each polling on its own.
+            hedging_policy (~.HedgingPolicy): If set, the unary methods
+                the service config allows to retry are hedged: a call with
+                no answer in time is sent again, and the first answer is
+                used.
+            governor (~.Governor): If set, every attempt of a unary
+                method waits for the governor to let it through, within
+                the rate and concurrency limits of its method.
+            retry_budget (~.RetryBudget): If set, the calls are retried
+                only while their retries are few next to their requests,
+                as the budget allows; past that, a failed call raises its
+                error at once.
         """
         if isinstance(client_options, dict):
             client_options = ClientOptions.from_dict(client_options)
@@ -137,13 +197,47 @@ class EchoClient(metaclass=EchoClientMeta):
                 host=client_options.api_endpoint or 'localhost:7469',
             )
 
+        # Save a dictionary of cached API call functions.
+        # These are the actual callables which invoke the proper
+        # transport methods, wrapped with `wrap_method` to add retry,
+        # timeout, and the like.
+        self._inner_api_calls = {}  # type: Dict[str, Callable]
+
+        # Save whether request messages may be modified once they are sent.
+        self._take_request_ownership = take_request_ownership
+
+        # Save how many pages the pagers may fetch ahead of the caller.
+        self._page_prefetch_depth = page_prefetch_depth
+
+        # Save the shared Chat streams for echo(), if enabled. They use the
+        # bare stub: the wrapped method waits for a first response before
+        # it returns, and none comes until a request is sent.
+        self._echo_multiplexer = None  # type: Optional[multiplex.ChatMultiplexer]
+        if multiplex_echo_streams:
+            self._echo_multiplexer = multiplex.ChatMultiplexer(
+                self._open_echo_stream,
+                multiplex_echo_streams,
+            )
+
+        # Save the poller of long-running operations, if any.
+        self._operation_poller = operation_poller
+
+        # Save the hedging policy of the idempotent reads, if any.
+        self._hedging_policy = hedging_policy
+
+        # Save the governor of the unary calls, if any.
+        self._governor = governor
+
+        # Save the retry budget of the calls, if any.
+        self._retry_budget = retry_budget
+
     def echo(self,
             request: gs_echo.EchoRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
-            ) -> gs_echo.EchoResponse:
+            ) -> Union[gs_echo.EchoResponse, protobuf_message.Message]:
         r"""This method simply echos the request. This method is
         showcases unary rpcs.
 
@@ -167,15 +261,46 @@ class EchoClient(metaclass=EchoClientMeta):
 
         """
         # Create or coerce a protobuf request object.
-        request = gs_echo.EchoRequest(request)
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        # A raw protobuf request is wrapped in its proto-plus type.
+        request = raw_protobuf.wrap(gs_echo.EchoRequest, request)
+        if not isinstance(request, gs_echo.EchoRequest):
+            request = gs_echo.EchoRequest(request)
+
+        # Send the request over a shared Chat stream, if enabled. A request
+        # for an error would end the stream for everyone on it, a stream
+        # has only the metadata it was opened with, and a request sent on
+        # it is not retried.
+        if (self._echo_multiplexer is not None and
+                retry is gapic_v1.method.DEFAULT and
+                'error' not in request and not metadata):
+            if timeout is gapic_v1.method.DEFAULT:
+                timeout = service_config.method_config(_SERVICE, 'Echo').timeout
+            multiplexed = governor.wrap(self._echo_multiplexer.echo,
+                                        self._governor, _SERVICE, 'Echo')
+            try:
+                return multiplexed(request, timeout=timeout)
+            except multiplex.StreamError:
+                # The stream failed; send the request on its own instead.
+                pass
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.echo,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'echo' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'Echo')
+            self._inner_api_calls['echo'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    governor.wrap(
+                        hedging.wrap(self._transport.echo, self._hedging_policy,
+                                     _SERVICE, 'Echo'),
+                        self._governor, _SERVICE, 'Echo'),
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'Echo', config.retry)
+        rpc = self._inner_api_calls['echo']
 
         # Send the request.
         response = rpc(
@@ -194,9 +319,9 @@ class EchoClient(metaclass=EchoClientMeta):
             content: str = None,
             error: status.Status = None,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
-            ) -> gs_echo.EchoResponse:
+            ) -> Union[gs_echo.EchoResponse, protobuf_message.Message]:
         r"""This method split the given content into words and
         will pass each word back through the stream. This method
         showcases server-side streaming rpcs.
@@ -237,8 +362,13 @@ class EchoClient(metaclass=EchoClientMeta):
                              'the individual field arguments should be set.')
 
         # If we have keyword arguments corresponding to fields on the
-        # request, apply these.
-        request = gs_echo.ExpandRequest(request)
+        # request, apply these. Without any, a request of exactly this
+        # type is used as-is rather than copied.
+        # A raw protobuf request is wrapped in its proto-plus type.
+        request = raw_protobuf.wrap(gs_echo.ExpandRequest, request)
+        if (not isinstance(request, gs_echo.ExpandRequest) or
+                any(arg is not None for arg in (content, error))):
+            request = gs_echo.ExpandRequest(request)
         if content is not None:
             request.content = content
         if error is not None:
@@ -246,11 +376,17 @@ class EchoClient(metaclass=EchoClientMeta):
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.expand,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'expand' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'Expand')
+            self._inner_api_calls['expand'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    self._transport.expand,
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'Expand', config.retry)
+        rpc = self._inner_api_calls['expand']
 
         # Send the request.
         response = rpc(
@@ -263,13 +399,76 @@ class EchoClient(metaclass=EchoClientMeta):
         # Done; return the response.
         return response
 
+    def resumable_expand(self,
+            request: gs_echo.ExpandRequest = None,
+            *,
+            content: str = None,
+            error: status.Status = None,
+            retry: retries.Retry = resumable_stream.DEFAULT_RETRY,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> resumable.ResumableExpand:
+        r"""Call :meth:`expand`, reopening the stream if it drops.
+
+        The words received are counted; when the stream fails with an
+        error accepted by ``retry``, it is opened again, after a backoff,
+        with only the words not received yet. The caller sees every word
+        once, in order.
+
+        Args:
+            request (:class:`~.gs_echo.ExpandRequest`):
+                The request object. The request message for the Expand
+                method.
+            content (:class:`str`):
+                The content that will be split into
+                words and returned on the stream.
+            error (:class:`~.status.Status`):
+                The error that is thrown after all
+                words are sent on the stream.
+            retry (google.api_core.retry.Retry): Designation of what errors,
+                if any, should reopen the stream, and how long to back off.
+            timeout (float): The timeout for each attempt.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with each attempt as metadata.
+
+        Returns:
+            ~.resumable.ResumableExpand:
+                An iterator over the response messages, whose
+                ``trailing_metadata()`` is that of the attempt that
+                finished the stream.
+        """
+        if request is not None and any([content, error]):
+            raise ValueError('If the `request` argument is set, then none of '
+                             'the individual field arguments should be set.')
+        # A raw protobuf request is wrapped in its proto-plus type.
+        request = raw_protobuf.wrap(gs_echo.ExpandRequest, request)
+        if (not isinstance(request, gs_echo.ExpandRequest) or
+                any(arg is not None for arg in (content, error))):
+            request = gs_echo.ExpandRequest(request)
+        if content is not None:
+            request.content = content
+        if error is not None:
+            request.error = error
+
+        return resumable.ResumableExpand(
+            lambda request: self.expand(
+                request,
+                # The attempts are retried here, not by the method.
+                retry=None,
+                timeout=timeout,
+                metadata=metadata,
+            ),
+            request,
+            retry,
+        )
+
     def collect(self,
             request: gs_echo.EchoRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
-            ) -> gs_echo.EchoResponse:
+            ) -> Union[gs_echo.EchoResponse, protobuf_message.Message]:
         r"""This method will collect the words given to it. When
         the stream is closed by the client, this method will
         return the a concatenation of the strings passed to it.
@@ -295,15 +494,28 @@ class EchoClient(metaclass=EchoClientMeta):
 
         """
         # Create or coerce a protobuf request object.
-        request = gs_echo.EchoRequest(request)
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        # A raw protobuf request is wrapped in its proto-plus type.
+        request = raw_protobuf.wrap(gs_echo.EchoRequest, request)
+        if not isinstance(request, gs_echo.EchoRequest):
+            request = gs_echo.EchoRequest(request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.collect,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'collect' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'Collect')
+            # A stream of requests cannot be sent again, so the call is
+            # never retried by default.
+            self._inner_api_calls['collect'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    self._transport.collect,
+                    default_retry=None,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'Collect', None)
+        rpc = self._inner_api_calls['collect']
 
         # Send the request.
         response = rpc(
@@ -316,13 +528,22 @@ class EchoClient(metaclass=EchoClientMeta):
         # Done; return the response.
         return response
 
+    def _open_echo_stream(self,
+            requests: Iterator[gs_echo.EchoRequest],
+            ) -> Iterator[gs_echo.EchoResponse]:
+        # Open a shared Chat stream for echo(), with the client's metadata.
+        return self._transport.chat(
+            requests,
+            metadata=(_get_client_info().to_grpc_metadata(),),
+        )
+
     def chat(self,
             request: gs_echo.EchoRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
-            ) -> gs_echo.EchoResponse:
+            ) -> Union[gs_echo.EchoResponse, protobuf_message.Message]:
         r"""This method, upon receiving a request on the stream,
         the same content will be passed  back on the stream.
         This method showcases bidirectional streaming rpcs.
@@ -347,15 +568,28 @@ class EchoClient(metaclass=EchoClientMeta):
 
         """
         # Create or coerce a protobuf request object.
-        request = gs_echo.EchoRequest(request)
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        # A raw protobuf request is wrapped in its proto-plus type.
+        request = raw_protobuf.wrap(gs_echo.EchoRequest, request)
+        if not isinstance(request, gs_echo.EchoRequest):
+            request = gs_echo.EchoRequest(request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.chat,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'chat' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'Chat')
+            # A stream of requests cannot be sent again, so the call is
+            # never retried by default.
+            self._inner_api_calls['chat'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    self._transport.chat,
+                    default_retry=None,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'Chat', None)
+        rpc = self._inner_api_calls['chat']
 
         # Send the request.
         response = rpc(
@@ -372,7 +606,7 @@ class EchoClient(metaclass=EchoClientMeta):
             request: gs_echo.PagedExpandRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> pagers.PagedExpandPager:
         r"""This is similar to the Expand method but instead of
@@ -399,15 +633,33 @@ class EchoClient(metaclass=EchoClientMeta):
 
         """
         # Create or coerce a protobuf request object.
-        request = gs_echo.PagedExpandRequest(request)
+        # A request of exactly this type is used as-is rather than copied.
+        # It then still belongs to the caller, so the pager (which
+        # advances `page_token` in place) works on a copy of it, unless
+        # the caller has handed ownership of its requests to the client.
+        owns_request = self._take_request_ownership
+        # A raw protobuf request is wrapped in its proto-plus type.
+        request = raw_protobuf.wrap(gs_echo.PagedExpandRequest, request)
+        if not isinstance(request, gs_echo.PagedExpandRequest):
+            request = gs_echo.PagedExpandRequest(request)
+            owns_request = True
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.paged_expand,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'paged_expand' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'PagedExpand')
+            self._inner_api_calls['paged_expand'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    governor.wrap(
+                        hedging.wrap(self._transport.paged_expand, self._hedging_policy,
+                                     _SERVICE, 'PagedExpand'),
+                        self._governor, _SERVICE, 'PagedExpand'),
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'PagedExpand', config.retry)
+        rpc = self._inner_api_calls['paged_expand']
 
         # Send the request.
         response = rpc(
@@ -423,6 +675,8 @@ class EchoClient(metaclass=EchoClientMeta):
             method=rpc,
             request=request,
             response=response,
+            owns_request=owns_request,
+            prefetch_depth=self._page_prefetch_depth,
         )
 
         # Done; return the response.
@@ -432,9 +686,9 @@ class EchoClient(metaclass=EchoClientMeta):
             request: gs_echo.WaitRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
-            ) -> operation.Operation:
+            ) -> Union[operation.Operation, PolledOperation]:
         r"""This method will wait the requested amount of and
         then return. This method showcases how a client handles
         a request timing out.
@@ -449,24 +703,43 @@ class EchoClient(metaclass=EchoClientMeta):
                 sent along with the request as metadata.
 
         Returns:
-            ~.operation.Operation:
+            Union[~.operation.Operation, ~.PolledOperation]:
                 An object representing a long-running operation.
 
                 The result type for the operation will be
                 :class:``~.echo.WaitResponse``: The result of the Wait
                 operation.
 
+                With an ``operation_poller``, it is a
+                :class:`~.PolledOperation` instead: a
+                :class:`concurrent.futures.Future` whose ``result()``
+                takes no ``retry``, and whose ``cancel()`` and
+                ``cancelled()`` stop and report the polling, not the
+                operation on the server.
+
         """
         # Create or coerce a protobuf request object.
-        request = gs_echo.WaitRequest(request)
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        # A raw protobuf request is wrapped in its proto-plus type.
+        request = raw_protobuf.wrap(gs_echo.WaitRequest, request)
+        if not isinstance(request, gs_echo.WaitRequest):
+            request = gs_echo.WaitRequest(request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.wait,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'wait' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'Wait')
+            self._inner_api_calls['wait'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    governor.wrap(self._transport.wait, self._governor,
+                                  _SERVICE, 'Wait'),
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'Wait', config.retry)
+        rpc = self._inner_api_calls['wait']
 
         # Send the request.
         response = rpc(
@@ -476,7 +749,15 @@ class EchoClient(metaclass=EchoClientMeta):
             metadata=metadata,
         )
 
-        # Wrap the response in an operation future.
+        # Wrap the response in an operation future; the shared poller's,
+        # if there is one.
+        if self._operation_poller is not None:
+            return self._operation_poller.track(
+                self._transport.operations_client,
+                response,
+                echo.WaitResponse,
+                metadata_type=echo.WaitMetadata,
+            )
         response = operation.from_gapic(
             response,
             self._transport.operations_client,
@@ -491,9 +772,9 @@ class EchoClient(metaclass=EchoClientMeta):
             request: gs_echo.BlockRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
-            ) -> gs_echo.BlockResponse:
+            ) -> Union[gs_echo.BlockResponse, protobuf_message.Message]:
         r"""This method will block (wait) for the requested
         amount of time  and then return the response or error.
         This method showcases how a client handles delays or
@@ -513,15 +794,27 @@ class EchoClient(metaclass=EchoClientMeta):
                 The response for Block method.
         """
         # Create or coerce a protobuf request object.
-        request = gs_echo.BlockRequest(request)
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        # A raw protobuf request is wrapped in its proto-plus type.
+        request = raw_protobuf.wrap(gs_echo.BlockRequest, request)
+        if not isinstance(request, gs_echo.BlockRequest):
+            request = gs_echo.BlockRequest(request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.block,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'block' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'Block')
+            self._inner_api_calls['block'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    governor.wrap(self._transport.block, self._governor,
+                                  _SERVICE, 'Block'),
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'Block', config.retry)
+        rpc = self._inner_api_calls['block']
 
         # Send the request.
         response = rpc(
@@ -534,18 +827,39 @@ class EchoClient(metaclass=EchoClientMeta):
         # Done; return the response.
         return response
 
+    def close(self) -> None:
+        """Close the shared Chat streams of :meth:`echo`, if any.
+
+        The streams are finished once the calls waiting on them are
+        answered, and their reader threads are joined. A later call opens
+        them again.
+        """
+        if self._echo_multiplexer is not None:
+            self._echo_multiplexer.close()
+
+    def __enter__(self) -> 'EchoClient':
+        return self
 
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
 
 
-try:
-    _client_info = gapic_v1.client_info.ClientInfo(
-        gapic_version=pkg_resources.get_distribution(
-            'google-showcase',
-        ).version,
-    )
-except pkg_resources.DistributionNotFound:
-    _client_info = gapic_v1.client_info.ClientInfo()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_client_info() -> gapic_v1.client_info.ClientInfo:
+    # Looking up the installed version is slow, so it is done when the
+    # first method is wrapped rather than when this module is imported.
+    import pkg_resources
+    try:
+        return gapic_v1.client_info.ClientInfo(
+            gapic_version=pkg_resources.get_distribution(
+                'google-showcase',
+            ).version,
+        )
+    except pkg_resources.DistributionNotFound:
+        return gapic_v1.client_info.ClientInfo()
 
 
 __all__ = (
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Carry unary Echo calls over a few long-lived Chat streams.
+
+``Chat`` answers every request on its stream with one response, in order.
+A :class:`ChatMultiplexer` keeps a small set of ``Chat`` streams and
+queues each caller's request on an idle one, opening another only when
+every open stream is busy; the stream's reader hands every response to the
+oldest caller still waiting on that stream. When a stream fails, or leaves
+a caller unanswered for too long, the callers waiting on it get a
+:class:`StreamError` and can send their request on its own instead; the
+stream is replaced on next use.
+"""
+
+import collections
+from concurrent import futures
+import queue
+import threading
+from typing import Callable, Deque, Iterator, List, Optional, Tuple
+
+from google.api_core import exceptions  # type: ignore
+
+from google.showcase_v1beta1.types import echo as gs_echo
+
+
+# Ends a stream's request iterator.
+_CLOSE = object()
+
+
+class StreamError(Exception):
+    """The Chat stream failed before answering the request.
+
+    The request may or may not have reached the server; it may be sent
+    again on its own.
+    """
+
+
+class _ChatStream:
+    """One Chat stream, and the callers waiting on it in order."""
+    def __init__(self,
+            chat: Callable[[Iterator[gs_echo.EchoRequest]],
+                Iterator[gs_echo.EchoResponse]]) -> None:
+        self._requests = queue.Queue()  # type: queue.Queue
+        self._pending = collections.deque()  # type: Deque[futures.Future]
+        self._lock = threading.Lock()
+        self.broken = False
+        self._call = chat(iter(self._requests.get, _CLOSE))
+        self._reader = threading.Thread(
+            target=self._read,
+            name='ChatMultiplexer',
+            daemon=True,
+        )
+        self._reader.start()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def send(self, request: gs_echo.EchoRequest) -> futures.Future:
+        future = futures.Future()  # type: futures.Future
+        # The request joins the stream in the same order as its caller
+        # joins the queue of callers.
+        with self._lock:
+            if self.broken:
+                raise StreamError('The Chat stream is closed.')
+            self._pending.append(future)
+            self._requests.put(request)
+        return future
+
+    def _read(self) -> None:
+        error = None  # type: Optional[Exception]
+        try:
+            for response in self._call:
+                with self._lock:
+                    future = self._pending.popleft()
+                future.set_result(response)
+        except Exception as exc:
+            error = exc
+        self._fail('The Chat stream ended before answering: {!r}'.format(error))
+
+    def _fail(self, message: str) -> None:
+        # Break the stream, and fail every caller still waiting on it.
+        with self._lock:
+            self.broken = True
+            pending, self._pending = self._pending, collections.deque()
+        for future in pending:
+            future.set_exception(StreamError(message))
+
+    def abandon(self, waited: float) -> None:
+        """Give up on a stream that left a caller unanswered.
+
+        The stream is finished and cancelled, and every caller waiting on
+        it gets a :class:`StreamError`; the answers still to come are
+        dropped.
+        """
+        with self._lock:
+            if self.broken:
+                return
+            self.broken = True
+        self._requests.put(_CLOSE)
+        cancel = getattr(self._call, 'cancel', None)
+        if cancel is not None:
+            cancel()
+        self._fail('No answer on the Chat stream within {}s.'.format(waited))
+
+    def close(self) -> None:
+        with self._lock:
+            self.broken = True
+        self._requests.put(_CLOSE)
+        self._reader.join()
+
+
+class ChatMultiplexer:
+    """Send Echo requests over a bounded number of shared Chat streams."""
+    def __init__(self,
+            chat: Callable[[Iterator[gs_echo.EchoRequest]],
+                Iterator[gs_echo.EchoResponse]],
+            streams: int,
+            stall_timeout: float = 10.0) -> None:
+        """Instantiate the multiplexer.
+
+        Args:
+            chat (Callable): Opens a Chat stream, given the iterator of
+                requests to send on it, and returns its responses.
+            streams (int): The most Chat streams to keep open.
+            stall_timeout (float): How long, in seconds, a caller waits on
+                a stream before the stream is taken for broken.
+        """
+        if streams < 1:
+            raise ValueError('A multiplexer needs at least one stream.')
+        self._chat = chat
+        self._streams = [None] * streams  # type: List[Optional[_ChatStream]]
+        self._stall_timeout = stall_timeout
+        self._lock = threading.Lock()
+
+    def _send(self,
+            request: gs_echo.EchoRequest) -> Tuple[_ChatStream, futures.Future]:
+        with self._lock:
+            # Pick the open stream with the fewest callers waiting; open
+            # one more, in the first free slot, only if that one is busy.
+            streams = [stream for stream in self._streams
+                if stream is not None and not stream.broken]
+            stream = min(streams, key=len, default=None)
+            if stream is None or len(stream):
+                for index, slot in enumerate(self._streams):
+                    if slot is None or slot.broken:
+                        stream = self._streams[index] = _ChatStream(self._chat)
+                        break
+            assert stream is not None
+            return stream, stream.send(request)
+
+    def echo(self,
+            request: gs_echo.EchoRequest,
+            timeout: float = None) -> gs_echo.EchoResponse:
+        """Echo ``request`` over one of the shared streams.
+
+        Raises:
+            StreamError: If the stream failed, or gave no answer within
+                the multiplexer's ``stall_timeout``, before answering.
+            google.api_core.exceptions.DeadlineExceeded: If no answer came
+                within ``timeout`` seconds.
+        """
+        stream, future = self._send(request)
+        stall = self._stall_timeout
+        try:
+            return future.result(
+                timeout=stall if timeout is None else min(timeout, stall))
+        except futures.TimeoutError:
+            if timeout is not None and timeout <= stall:
+                # The answer still arrives later, and is dropped.
+                raise exceptions.DeadlineExceeded(
+                    'No answer on the Chat stream within {}s.'.format(timeout))
+        # The stream has stalled: every caller on it, this one included
+        # unless its answer came just now, is failed over.
+        stream.abandon(stall)
+        return future.result()
+
+    def close(self) -> None:
+        """Finish every stream once the callers waiting on it are answered."""
+        with self._lock:
+            streams, self._streams = self._streams, [None] * len(self._streams)
+        for stream in streams:
+            if stream is not None:
+                stream.close()
+
+
+__all__ = (
+    'ChatMultiplexer',
+    'StreamError',
+)
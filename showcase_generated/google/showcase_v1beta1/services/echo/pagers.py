@@ -15,8 +15,9 @@
 # limitations under the License.
 #
 
-from typing import Any, Callable, Iterable
+from typing import Any, AsyncIterable, Awaitable, Callable, Iterable
 
+from google.showcase_v1beta1 import page_prefetch
 from google.showcase_v1beta1.types import echo as gs_echo
 
 
@@ -41,7 +42,9 @@ class PagedExpandPager:
             method: Callable[[gs_echo.PagedExpandRequest],
                 gs_echo.PagedExpandResponse],
             request: gs_echo.PagedExpandRequest,
-            response: gs_echo.PagedExpandResponse):
+            response: gs_echo.PagedExpandResponse,
+            owns_request: bool = False,
+            prefetch_depth: int = 0):
         """Instantiate the pager.
 
         Args:
@@ -51,25 +54,124 @@ class PagedExpandPager:
                 The initial request object.
             response (:class:`~.gs_echo.PagedExpandResponse`):
                 The initial response object.
+            owns_request (bool): If True, the pager takes ownership of
+                ``request`` and advances its ``page_token`` in place instead
+                of working on a copy.
+            prefetch_depth (int): If set, the following pages are requested
+                in the background as soon as each page arrives, and up to
+                this many of them are held until they are iterated over.
         """
         self._method = method
-        self._request = gs_echo.PagedExpandRequest(request)
+        self._request = request if owns_request else gs_echo.PagedExpandRequest(request)
         self._response = response
+        self._prefetch_depth = prefetch_depth
 
     def __getattr__(self, name: str) -> Any:
         return getattr(self._response, name)
 
     @property
     def pages(self) -> Iterable[gs_echo.PagedExpandResponse]:
+        if self._prefetch_depth:
+            pages = page_prefetch.prefetch_pages(
+                self._response, self._fetch_page, self._prefetch_depth)
+            for page in pages:
+                self._response = page
+                yield page
+            return
         yield self._response
         while self._response.next_page_token:
             self._request.page_token = self._response.next_page_token
             self._response = self._method(self._request)
             yield self._response
 
+    def _fetch_page(self, response):
+        # Runs on the prefetching thread; only it touches the request.
+        self._request.page_token = response.next_page_token
+        return self._method(self._request)
+
     def __iter__(self) -> Iterable[gs_echo.EchoResponse]:
         for page in self.pages:
             yield from page.responses
 
     def __repr__(self) -> str:
         return '{0}<{1!r}>'.format(self.__class__.__name__, self._response)
+
+
+class PagedExpandAsyncPager:
+    """A pager for iterating through ``paged_expand`` requests.
+
+    This class thinly wraps an initial
+    :class:`~.gs_echo.PagedExpandResponse` object, and
+    provides an ``__aiter__`` method to iterate through its
+    ``responses`` field.
+
+    If there are more pages, the ``__aiter__`` method will make additional
+    ``PagedExpand`` requests and continue to iterate
+    through the ``responses`` field on the
+    corresponding responses.
+
+    All the usual :class:`~.gs_echo.PagedExpandResponse`
+    attributes are available on the pager. If multiple requests are made, only
+    the most recent response is retained, and thus used for attribute lookup.
+    """
+    def __init__(self,
+            method: Callable[[gs_echo.PagedExpandRequest],
+                Awaitable[gs_echo.PagedExpandResponse]],
+            request: gs_echo.PagedExpandRequest,
+            response: gs_echo.PagedExpandResponse,
+            owns_request: bool = False,
+            prefetch_depth: int = 0):
+        """Instantiate the pager.
+
+        Args:
+            method (Callable): The method that was originally called, and
+                which instantiated this pager.
+            request (:class:`~.gs_echo.PagedExpandRequest`):
+                The initial request object.
+            response (:class:`~.gs_echo.PagedExpandResponse`):
+                The initial response object.
+            owns_request (bool): If True, the pager takes ownership of
+                ``request`` and advances its ``page_token`` in place instead
+                of working on a copy.
+            prefetch_depth (int): If set, the following pages are requested
+                in the background as soon as each page arrives, and up to
+                this many of them are held until they are iterated over.
+        """
+        self._method = method
+        self._request = request if owns_request else gs_echo.PagedExpandRequest(request)
+        self._response = response
+        self._prefetch_depth = prefetch_depth
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._response, name)
+
+    @property
+    async def pages(self) -> AsyncIterable[gs_echo.PagedExpandResponse]:
+        if self._prefetch_depth:
+            pages = page_prefetch.prefetch_pages_async(
+                self._response, self._fetch_page, self._prefetch_depth)
+            async for page in pages:
+                self._response = page
+                yield page
+            return
+        yield self._response
+        while self._response.next_page_token:
+            self._request.page_token = self._response.next_page_token
+            self._response = await self._method(self._request)
+            yield self._response
+
+    async def _fetch_page(self, response):
+        # Runs in the prefetching task; only it touches the request.
+        self._request.page_token = response.next_page_token
+        return await self._method(self._request)
+
+    def __aiter__(self) -> AsyncIterable[gs_echo.EchoResponse]:
+        async def async_generator():
+            async for page in self.pages:
+                for response in page.responses:
+                    yield response
+
+        return async_generator()
+
+    def __repr__(self) -> str:
+        return '{0}<{1!r}>'.format(self.__class__.__name__, self._response)
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Resume an ``Expand`` stream after the words already received.
+
+``Expand`` answers with one response per word of the request's content,
+in order, so the count of responses received is the position to resume
+from: the stream is opened again with only the words after it. Once every
+word was received, the request's own ``error`` is what ends the stream,
+and it is raised without reopening.
+"""
+
+from typing import Callable, Iterator, Optional
+
+from google.api_core import retry as retries  # type: ignore
+
+from google.showcase_v1beta1.resumable_stream import ResumableStream
+from google.showcase_v1beta1.types import echo as gs_echo
+
+
+class ResumableExpand(ResumableStream):
+    """An ``Expand`` stream that reopens after the last word received.
+
+    Attributes:
+        position (int): How many words were received.
+    """
+    def __init__(self,
+            expand: Callable[[gs_echo.ExpandRequest], Iterator[gs_echo.EchoResponse]],
+            request: gs_echo.ExpandRequest,
+            retry: Optional[retries.Retry]) -> None:
+        super().__init__(retry)
+        self._expand = expand
+        self._request = request
+        self._words = request.content.split()
+        self.position = 0
+
+    def _open(self) -> Iterator[gs_echo.EchoResponse]:
+        if not self.position:
+            return self._expand(self._request)
+        request = gs_echo.ExpandRequest(self._request)
+        request.content = ' '.join(self._words[self.position:])
+        return self._expand(request)
+
+    def _complete(self) -> bool:
+        return self.position >= len(self._words)
+
+    def _accept(self, response: gs_echo.EchoResponse) -> bool:
+        self.position += 1
+        return True
+
+
+__all__ = (
+    'ResumableExpand',
+)
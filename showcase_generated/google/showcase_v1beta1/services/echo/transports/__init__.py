@@ -20,14 +20,17 @@ from typing import Dict, Type
 
 from .base import EchoTransport
 from .grpc import EchoGrpcTransport
+from .grpc_asyncio import EchoGrpcAsyncIOTransport
 
 
 # Compile a registry of transports.
 _transport_registry = OrderedDict()  # type: Dict[str, Type[EchoTransport]]
 _transport_registry['grpc'] = EchoGrpcTransport
+_transport_registry['grpc_asyncio'] = EchoGrpcAsyncIOTransport
 
 
 __all__ = (
     'EchoTransport',
     'EchoGrpcTransport',
+    'EchoGrpcAsyncIOTransport',
 )
@@ -15,7 +15,8 @@
 # limitations under the License.
 #
 
-from typing import Callable, Dict
+import time
+from typing import Callable, Dict, Optional
 
 from google.api_core import grpc_helpers   # type: ignore
 from google.api_core import operations_v1  # type: ignore
@@ -24,6 +25,9 @@ from google.auth import credentials        # type: ignore
 import grpc  # type: ignore
 
 from google.longrunning import operations_pb2 as operations  # type: ignore
+from google.showcase_v1beta1 import channel_pool
+from google.showcase_v1beta1 import raw_protobuf
+from google.showcase_v1beta1 import service_config
 from google.showcase_v1beta1.types import echo as gs_echo
 
 from .base import EchoTransport
@@ -46,10 +50,25 @@ class EchoGrpcTransport(EchoTransport):
     It sends protocol buffers over the wire using gRPC (which is built on
     top of HTTP/2); the ``grpcio`` package must be installed.
     """
+    # The methods whose stubs are created by warm_up().
+    _METHODS = (
+        'echo',
+        'expand',
+        'collect',
+        'chat',
+        'paged_expand',
+        'wait',
+        'block',
+    )
+
     def __init__(self, *,
             host: str = 'localhost:7469',
             credentials: credentials.Credentials = None,
-            channel: grpc.Channel = None) -> None:
+            channel: grpc.Channel = None,
+            channel_pool_size: int = None,
+            connect_timeout: float = None,
+            raw_messages: bool = False,
+            grpc_service_config: bool = False) -> None:
         """Instantiate the transport.
 
         Args:
@@ -62,6 +81,25 @@ class EchoGrpcTransport(EchoTransport):
                 This argument is ignored if ``channel`` is provided.
             channel (Optional[grpc.Channel]): A ``Channel`` instance through
                 which to make calls.
+            channel_pool_size (Optional[int]): If set, spread calls over a
+                :class:`~.channel_pool.ChannelPool` of this many channels
+                instead of using a single one. The pool is shared with every
+                other transport for the same host, credentials and pool
+                size. This argument is ignored if ``channel`` is provided.
+            connect_timeout (Optional[float]): If set, connect at once
+                rather than on the first call: :meth:`warm_up` waits up to
+                this many seconds for the channel to be ready, and creates
+                the stub of every method.
+            raw_messages (bool): If True, the stubs return the raw protobuf
+                messages under the proto-plus types, and take requests of
+                either kind; see :mod:`~.raw_protobuf`. Long-running
+                operations are unaffected.
+            grpc_service_config (bool): If True, the channel is created
+                with the service config as its ``grpc.service_config``
+                option, so that gRPC itself retries the calls the
+                config allows it to, up to their ``maxAttempts``; see
+                :mod:`~.service_config`. This argument is ignored if
+                ``channel`` is provided.
         """
         # Sanity check: Ensure that channel and credentials are not both
         # provided.
@@ -71,11 +109,19 @@ class EchoGrpcTransport(EchoTransport):
         # Run the base constructor.
         super().__init__(host=host, credentials=credentials)
         self._stubs = {}  # type: Dict[str, Callable]
+        self._channel_pool_size = channel_pool_size
+        self._raw_messages = raw_messages
+        self._grpc_service_config = grpc_service_config
 
         # If a channel was explicitly provided, set it.
         if channel:
             self._grpc_channel = channel
 
+        # How long the warm-up took, once there was one.
+        self.warm_up_time = None  # type: Optional[float]
+        if connect_timeout is not None:
+            self.warm_up(connect_timeout)
+
     @property
     def grpc_channel(self) -> grpc.Channel:
         """Create the channel designed to connect to this service.
@@ -86,15 +132,64 @@ class EchoGrpcTransport(EchoTransport):
         # Sanity check: Only create a new channel if we do not already
         # have one.
         if not hasattr(self, '_grpc_channel'):
-            self._grpc_channel = grpc_helpers.create_channel(
-                self._host,
-                credentials=self._credentials,
-                scopes=self.AUTH_SCOPES,
-            )
+            options = []
+            if self._grpc_service_config:
+                options.append(
+                    ('grpc.service_config', service_config.SERVICE_CONFIG_JSON))
+            if self._channel_pool_size:
+                self._grpc_channel = channel_pool.shared_pool(
+                    self._host,
+                    size=self._channel_pool_size,
+                    credentials=self._credentials,
+                    scopes=self.AUTH_SCOPES,
+                    options=options,
+                )
+            else:
+                self._grpc_channel = grpc_helpers.create_channel(
+                    self._host,
+                    credentials=self._credentials,
+                    scopes=self.AUTH_SCOPES,
+                    options=options,
+                )
 
         # Return the channel from cache.
         return self._grpc_channel
 
+    def warm_up(self, timeout: float = None) -> float:
+        """Connect the channel, and create the stub of every method.
+
+        This moves the cost of name resolution, the handshakes and the
+        HTTP/2 setup from the first call to here.
+
+        Args:
+            timeout (Optional[float]): The most seconds to wait for the
+                channel to be ready; None waits for as long as it takes.
+
+        Returns:
+            float: The seconds the warm-up took; also saved as
+            ``warm_up_time``.
+
+        Raises:
+            google.api_core.exceptions.DeadlineExceeded: If the channel was
+                not ready in time.
+        """
+        started = time.monotonic()
+        for method in self._METHODS:
+            getattr(self, method)
+        channel_pool.wait_for_ready(self.grpc_channel, timeout)
+        self.warm_up_time = time.monotonic() - started
+        return self.warm_up_time
+
+    def _serializer(self, message_class):
+        if self._raw_messages:
+            return raw_protobuf.serializer(message_class)
+        return message_class.serialize
+
+    def _deserializer(self, message_class):
+        if self._raw_messages:
+            return raw_protobuf.deserializer(message_class)
+        return message_class.deserialize
+
     @property
     def operations_client(self) -> operations_v1.OperationsClient:
         """Create the client designed to process long-running operations.
@@ -133,8 +228,8 @@ class EchoGrpcTransport(EchoTransport):
         if 'echo' not in self._stubs:
             self._stubs['echo'] = self.grpc_channel.unary_unary(
                 '/google.showcase.v1beta1.Echo/Echo',
-                request_serializer=gs_echo.EchoRequest.serialize,
-                response_deserializer=gs_echo.EchoResponse.deserialize,
+                request_serializer=self._serializer(gs_echo.EchoRequest),
+                response_deserializer=self._deserializer(gs_echo.EchoResponse),
             )
         return self._stubs['echo']
 
@@ -161,8 +256,8 @@ class EchoGrpcTransport(EchoTransport):
         if 'expand' not in self._stubs:
             self._stubs['expand'] = self.grpc_channel.unary_stream(
                 '/google.showcase.v1beta1.Echo/Expand',
-                request_serializer=gs_echo.ExpandRequest.serialize,
-                response_deserializer=gs_echo.EchoResponse.deserialize,
+                request_serializer=self._serializer(gs_echo.ExpandRequest),
+                response_deserializer=self._deserializer(gs_echo.EchoResponse),
             )
         return self._stubs['expand']
 
@@ -190,8 +285,8 @@ class EchoGrpcTransport(EchoTransport):
         if 'collect' not in self._stubs:
             self._stubs['collect'] = self.grpc_channel.stream_unary(
                 '/google.showcase.v1beta1.Echo/Collect',
-                request_serializer=gs_echo.EchoRequest.serialize,
-                response_deserializer=gs_echo.EchoResponse.deserialize,
+                request_serializer=self._serializer(gs_echo.EchoRequest),
+                response_deserializer=self._deserializer(gs_echo.EchoResponse),
             )
         return self._stubs['collect']
 
@@ -218,8 +313,8 @@ class EchoGrpcTransport(EchoTransport):
         if 'chat' not in self._stubs:
             self._stubs['chat'] = self.grpc_channel.stream_stream(
                 '/google.showcase.v1beta1.Echo/Chat',
-                request_serializer=gs_echo.EchoRequest.serialize,
-                response_deserializer=gs_echo.EchoResponse.deserialize,
+                request_serializer=self._serializer(gs_echo.EchoRequest),
+                response_deserializer=self._deserializer(gs_echo.EchoResponse),
             )
         return self._stubs['chat']
 
@@ -246,8 +341,8 @@ class EchoGrpcTransport(EchoTransport):
         if 'paged_expand' not in self._stubs:
             self._stubs['paged_expand'] = self.grpc_channel.unary_unary(
                 '/google.showcase.v1beta1.Echo/PagedExpand',
-                request_serializer=gs_echo.PagedExpandRequest.serialize,
-                response_deserializer=gs_echo.PagedExpandResponse.deserialize,
+                request_serializer=self._serializer(gs_echo.PagedExpandRequest),
+                response_deserializer=self._deserializer(gs_echo.PagedExpandResponse),
             )
         return self._stubs['paged_expand']
 
@@ -274,7 +369,7 @@ class EchoGrpcTransport(EchoTransport):
         if 'wait' not in self._stubs:
             self._stubs['wait'] = self.grpc_channel.unary_unary(
                 '/google.showcase.v1beta1.Echo/Wait',
-                request_serializer=gs_echo.WaitRequest.serialize,
+                request_serializer=self._serializer(gs_echo.WaitRequest),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs['wait']
@@ -303,8 +398,8 @@ class EchoGrpcTransport(EchoTransport):
         if 'block' not in self._stubs:
             self._stubs['block'] = self.grpc_channel.unary_unary(
                 '/google.showcase.v1beta1.Echo/Block',
-                request_serializer=gs_echo.BlockRequest.serialize,
-                response_deserializer=gs_echo.BlockResponse.deserialize,
+                request_serializer=self._serializer(gs_echo.BlockRequest),
+                response_deserializer=self._deserializer(gs_echo.BlockResponse),
             )
         return self._stubs['block']
 
@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from typing import Awaitable, Callable, Dict
+
+from google.api_core import grpc_helpers_async  # type: ignore
+from google.api_core import operations_v1       # type: ignore
+from google.auth import credentials             # type: ignore
+
+from grpc import aio  # type: ignore
+
+from google.longrunning import operations_pb2 as operations  # type: ignore
+from google.showcase_v1beta1 import service_config
+from google.showcase_v1beta1.types import echo as gs_echo
+
+from .base import EchoTransport
+
+
+class EchoGrpcAsyncIOTransport(EchoTransport):
+    """gRPC AsyncIO backend transport for Echo.
+
+    This service is used showcase the four main types of rpcs -
+    unary, server side streaming, client side streaming, and
+    bidirectional streaming. This service also exposes methods that
+    explicitly implement server delay, and paginated calls. Set the
+    'showcase-trailer' metadata key on any method to have the values
+    echoed in the response trailers.
+
+    This class defines the same methods as the primary client, so the
+    primary client can load the underlying transport implementation
+    and call it.
+
+    It sends protocol buffers over the wire using gRPC (which is built on
+    top of HTTP/2) through the ``grpc.aio`` API; every method returns
+    an awaitable call, so it must be used from within an event loop.
+    """
+    def __init__(self, *,
+            host: str = 'localhost:7469',
+            credentials: credentials.Credentials = None,
+            channel: aio.Channel = None,
+            grpc_service_config: bool = False) -> None:
+        """Instantiate the transport.
+
+        Args:
+            host (Optional[str]): The hostname to connect to.
+            credentials (Optional[google.auth.credentials.Credentials]): The
+                authorization credentials to attach to requests. These
+                credentials identify the application to the service; if none
+                are specified, the client will attempt to ascertain the
+                credentials from the environment.
+                This argument is ignored if ``channel`` is provided.
+            channel (Optional[aio.Channel]): A ``Channel`` instance through
+                which to make calls. Pass a channel created with
+                ``interceptors`` to run coroutine interceptors on every
+                call.
+            grpc_service_config (bool): If True, the channel is created
+                with the service config as its ``grpc.service_config``
+                option, so that gRPC itself retries the calls the
+                config allows it to, up to their ``maxAttempts``; see
+                :mod:`~.service_config`. This argument is ignored if
+                ``channel`` is provided.
+        """
+        # Sanity check: Ensure that channel and credentials are not both
+        # provided.
+        if channel:
+            credentials = False
+
+        # Run the base constructor.
+        super().__init__(host=host, credentials=credentials)
+        self._stubs = {}  # type: Dict[str, Callable]
+        self._grpc_service_config = grpc_service_config
+
+        # If a channel was explicitly provided, set it.
+        if channel:
+            self._grpc_channel = channel
+
+    @property
+    def grpc_channel(self) -> aio.Channel:
+        """Create the channel designed to connect to this service.
+
+        This property caches on the instance; repeated calls return
+        the same channel.
+        """
+        # Sanity check: Only create a new channel if we do not already
+        # have one.
+        if not hasattr(self, '_grpc_channel'):
+            options = []
+            if self._grpc_service_config:
+                options.append(
+                    ('grpc.service_config', service_config.SERVICE_CONFIG_JSON))
+            self._grpc_channel = grpc_helpers_async.create_channel(
+                self._host,
+                credentials=self._credentials,
+                scopes=self.AUTH_SCOPES,
+                options=options,
+            )
+
+        # Return the channel from cache.
+        return self._grpc_channel
+
+    @property
+    def operations_client(self) -> operations_v1.OperationsAsyncClient:
+        """Create the client designed to process long-running operations.
+
+        This property caches on the instance; repeated calls return the same
+        client.
+        """
+        # Sanity check: Only create a new client if we do not already have one.
+        if 'operations_client' not in self.__dict__:
+            self.__dict__['operations_client'] = operations_v1.OperationsAsyncClient(
+                self.grpc_channel
+            )
+
+        # Return the client from cache.
+        return self.__dict__['operations_client']
+
+    @property
+    def echo(self) -> Callable[
+            [gs_echo.EchoRequest],
+            Awaitable[gs_echo.EchoResponse]]:
+        r"""Return a callable for the echo method over gRPC.
+
+        This method simply echos the request. This method is
+        showcases unary rpcs.
+
+        Returns:
+            Callable[[~.EchoRequest],
+                    Awaitable[~.EchoResponse]]:
+                A function that, when called, will call the underlying RPC
+                on the server.
+        """
+        # Generate a "stub function" on-the-fly which will actually make
+        # the request.
+        # gRPC handles serialization and deserialization, so we just need
+        # to pass in the functions for each.
+        if 'echo' not in self._stubs:
+            self._stubs['echo'] = self.grpc_channel.unary_unary(
+                '/google.showcase.v1beta1.Echo/Echo',
+                request_serializer=gs_echo.EchoRequest.serialize,
+                response_deserializer=gs_echo.EchoResponse.deserialize,
+            )
+        return self._stubs['echo']
+
+    @property
+    def expand(self) -> Callable[
+            [gs_echo.ExpandRequest],
+            Awaitable[gs_echo.EchoResponse]]:
+        r"""Return a callable for the expand method over gRPC.
+
+        This method split the given content into words and
+        will pass each word back through the stream. This method
+        showcases server-side streaming rpcs.
+
+        Returns:
+            Callable[[~.ExpandRequest],
+                    Awaitable[~.EchoResponse]]:
+                A function that, when called, will call the underlying RPC
+                on the server.
+        """
+        # Generate a "stub function" on-the-fly which will actually make
+        # the request.
+        # gRPC handles serialization and deserialization, so we just need
+        # to pass in the functions for each.
+        if 'expand' not in self._stubs:
+            self._stubs['expand'] = self.grpc_channel.unary_stream(
+                '/google.showcase.v1beta1.Echo/Expand',
+                request_serializer=gs_echo.ExpandRequest.serialize,
+                response_deserializer=gs_echo.EchoResponse.deserialize,
+            )
+        return self._stubs['expand']
+
+    @property
+    def collect(self) -> Callable[
+            [gs_echo.EchoRequest],
+            Awaitable[gs_echo.EchoResponse]]:
+        r"""Return a callable for the collect method over gRPC.
+
+        This method will collect the words given to it. When
+        the stream is closed by the client, this method will
+        return the a concatenation of the strings passed to it.
+        This method showcases client-side streaming rpcs.
+
+        Returns:
+            Callable[[~.EchoRequest],
+                    Awaitable[~.EchoResponse]]:
+                A function that, when called, will call the underlying RPC
+                on the server.
+        """
+        # Generate a "stub function" on-the-fly which will actually make
+        # the request.
+        # gRPC handles serialization and deserialization, so we just need
+        # to pass in the functions for each.
+        if 'collect' not in self._stubs:
+            self._stubs['collect'] = self.grpc_channel.stream_unary(
+                '/google.showcase.v1beta1.Echo/Collect',
+                request_serializer=gs_echo.EchoRequest.serialize,
+                response_deserializer=gs_echo.EchoResponse.deserialize,
+            )
+        return self._stubs['collect']
+
+    @property
+    def chat(self) -> Callable[
+            [gs_echo.EchoRequest],
+            Awaitable[gs_echo.EchoResponse]]:
+        r"""Return a callable for the chat method over gRPC.
+
+        This method, upon receiving a request on the stream,
+        the same content will be passed  back on the stream.
+        This method showcases bidirectional streaming rpcs.
+
+        Returns:
+            Callable[[~.EchoRequest],
+                    Awaitable[~.EchoResponse]]:
+                A function that, when called, will call the underlying RPC
+                on the server.
+        """
+        # Generate a "stub function" on-the-fly which will actually make
+        # the request.
+        # gRPC handles serialization and deserialization, so we just need
+        # to pass in the functions for each.
+        if 'chat' not in self._stubs:
+            self._stubs['chat'] = self.grpc_channel.stream_stream(
+                '/google.showcase.v1beta1.Echo/Chat',
+                request_serializer=gs_echo.EchoRequest.serialize,
+                response_deserializer=gs_echo.EchoResponse.deserialize,
+            )
+        return self._stubs['chat']
+
+    @property
+    def paged_expand(self) -> Callable[
+            [gs_echo.PagedExpandRequest],
+            Awaitable[gs_echo.PagedExpandResponse]]:
+        r"""Return a callable for the paged expand method over gRPC.
+
+        This is similar to the Expand method but instead of
+        returning a stream of expanded words, this method
+        returns a paged list of expanded words.
+
+        Returns:
+            Callable[[~.PagedExpandRequest],
+                    Awaitable[~.PagedExpandResponse]]:
+                A function that, when called, will call the underlying RPC
+                on the server.
+        """
+        # Generate a "stub function" on-the-fly which will actually make
+        # the request.
+        # gRPC handles serialization and deserialization, so we just need
+        # to pass in the functions for each.
+        if 'paged_expand' not in self._stubs:
+            self._stubs['paged_expand'] = self.grpc_channel.unary_unary(
+                '/google.showcase.v1beta1.Echo/PagedExpand',
+                request_serializer=gs_echo.PagedExpandRequest.serialize,
+                response_deserializer=gs_echo.PagedExpandResponse.deserialize,
+            )
+        return self._stubs['paged_expand']
+
+    @property
+    def wait(self) -> Callable[
+            [gs_echo.WaitRequest],
+            Awaitable[operations.Operation]]:
+        r"""Return a callable for the wait method over gRPC.
+
+        This method will wait the requested amount of and
+        then return. This method showcases how a client handles
+        a request timing out.
+
+        Returns:
+            Callable[[~.WaitRequest],
+                    Awaitable[~.Operation]]:
+                A function that, when called, will call the underlying RPC
+                on the server.
+        """
+        # Generate a "stub function" on-the-fly which will actually make
+        # the request.
+        # gRPC handles serialization and deserialization, so we just need
+        # to pass in the functions for each.
+        if 'wait' not in self._stubs:
+            self._stubs['wait'] = self.grpc_channel.unary_unary(
+                '/google.showcase.v1beta1.Echo/Wait',
+                request_serializer=gs_echo.WaitRequest.serialize,
+                response_deserializer=operations.Operation.FromString,
+            )
+        return self._stubs['wait']
+
+    @property
+    def block(self) -> Callable[
+            [gs_echo.BlockRequest],
+            Awaitable[gs_echo.BlockResponse]]:
+        r"""Return a callable for the block method over gRPC.
+
+        This method will block (wait) for the requested
+        amount of time  and then return the response or error.
+        This method showcases how a client handles delays or
+        retries.
+
+        Returns:
+            Callable[[~.BlockRequest],
+                    Awaitable[~.BlockResponse]]:
+                A function that, when called, will call the underlying RPC
+                on the server.
+        """
+        # Generate a "stub function" on-the-fly which will actually make
+        # the request.
+        # gRPC handles serialization and deserialization, so we just need
+        # to pass in the functions for each.
+        if 'block' not in self._stubs:
+            self._stubs['block'] = self.grpc_channel.unary_unary(
+                '/google.showcase.v1beta1.Echo/Block',
+                request_serializer=gs_echo.BlockRequest.serialize,
+                response_deserializer=gs_echo.BlockResponse.deserialize,
+            )
+        return self._stubs['block']
+
+
+__all__ = (
+    'EchoGrpcAsyncIOTransport',
+)
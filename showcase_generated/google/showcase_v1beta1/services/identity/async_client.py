@@ -0,0 +1,534 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import functools
+from typing import Callable, Dict, Sequence, Tuple, Union
+
+import google.api_core.client_options as ClientOptions # type: ignore
+from google.api_core import exceptions                 # type: ignore
+from google.api_core import gapic_v1                   # type: ignore
+from google.api_core import retry as retries           # type: ignore
+from google.auth import credentials                    # type: ignore
+from google.oauth2 import service_account              # type: ignore
+
+from google.protobuf import field_mask_pb2 as field_mask  # type: ignore
+from google.showcase_v1beta1 import governor
+from google.showcase_v1beta1 import hedging
+from google.showcase_v1beta1 import retry_budget
+from google.showcase_v1beta1 import service_config
+from google.showcase_v1beta1.governor import Governor
+from google.showcase_v1beta1.hedging import HedgingPolicy
+from google.showcase_v1beta1.response_cache import ResponseCache
+from google.showcase_v1beta1.retry_budget import RetryBudget
+from google.showcase_v1beta1.services.identity import pagers
+from google.showcase_v1beta1.types import identity
+
+from .client import IdentityClient, _SERVICE, _get_client_info
+from .transports.base import IdentityTransport
+from .transports.grpc_asyncio import IdentityGrpcAsyncIOTransport
+
+
+class IdentityAsyncClient:
+    """A simple identity service."""
+
+    DEFAULT_OPTIONS = IdentityClient.DEFAULT_OPTIONS
+
+    user_path = staticmethod(IdentityClient.user_path)
+
+    get_transport_class = functools.partial(
+        type(IdentityClient).get_transport_class,
+        type(IdentityClient),
+    )
+
+    @classmethod
+    def from_service_account_file(cls, filename: str, *args, **kwargs):
+        """Creates an instance of this client using the provided credentials
+        file.
+
+        Args:
+            filename (str): The path to the service account private key json
+                file.
+            args: Additional arguments to pass to the constructor.
+            kwargs: Additional arguments to pass to the constructor.
+
+        Returns:
+            {@api.name}: The constructed client.
+        """
+        credentials = service_account.Credentials.from_service_account_file(
+            filename)
+        kwargs['credentials'] = credentials
+        return cls(*args, **kwargs)
+
+    from_service_account_json = from_service_account_file
+
+    def __init__(self, *,
+            credentials: credentials.Credentials = None,
+            transport: Union[str, IdentityTransport] = 'grpc_asyncio',
+            client_options: ClientOptions = DEFAULT_OPTIONS,
+            take_request_ownership: bool = False,
+            page_prefetch_depth: int = 0,
+            response_cache: ResponseCache = None,
+            hedging_policy: HedgingPolicy = None,
+            governor: Governor = None,
+            retry_budget: RetryBudget = None,
+            ) -> None:
+        """Instantiate the identity client.
+
+        Args:
+            credentials (Optional[google.auth.credentials.Credentials]): The
+                authorization credentials to attach to requests. These
+                credentials identify the application to the service; if none
+                are specified, the client will attempt to ascertain the
+                credentials from the environment.
+            transport (Union[str, ~.IdentityTransport]): The
+                transport to use. It must be an asyncio transport, such as
+                ~.IdentityGrpcAsyncIOTransport; by default one is created.
+            client_options (ClientOptions): Custom options for the client.
+            take_request_ownership (bool): If True, the caller hands over
+                every request message it passes to this client, and must
+                not use it again afterwards. This lets paged methods
+                advance the request's ``page_token`` in place instead of
+                copying the request first.
+            page_prefetch_depth (int): If set, the pagers returned by paged
+                methods request the following pages in the background, and
+                hold up to this many pages ahead of the caller. This hides
+                the round trip at each page boundary on high-latency links.
+            response_cache (~.ResponseCache): If set, resources fetched by
+                name are served from this cache while they are fresh. The
+                client drops a resource from it when it updates or deletes
+                that resource.
+            hedging_policy (~.HedgingPolicy): If set, the unary methods
+                the service config allows to retry are hedged: a call with
+                no answer in time is sent again, and the first answer is
+                used.
+            governor (~.Governor): If set, every attempt of a unary
+                method waits for the governor to let it through, within
+                the rate and concurrency limits of its method. The wait
+                sleeps on the event loop instead of blocking it.
+            retry_budget (~.RetryBudget): If set, the calls are retried
+                only while their retries are few next to their requests,
+                as the budget allows; past that, a failed call raises its
+                error at once.
+        """
+        # The synchronous client validates the options and creates the
+        # transport; this client only awaits the transport's calls.
+        self._client = IdentityClient(
+            credentials=credentials,
+            transport=transport,
+            client_options=client_options,
+            take_request_ownership=take_request_ownership,
+            page_prefetch_depth=page_prefetch_depth,
+            response_cache=response_cache,
+            hedging_policy=hedging_policy,
+            governor=governor,
+            retry_budget=retry_budget,
+        )
+
+        # Save a dictionary of cached API call functions.
+        # These are the actual callables which invoke the proper
+        # transport methods, wrapped with `wrap_method` to add retry,
+        # timeout, and the like.
+        self._inner_api_calls = {}  # type: Dict[str, Callable]
+
+    async def create_user(self,
+            request: identity.CreateUserRequest = None,
+            *,
+            display_name: str = None,
+            email: str = None,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> identity.User:
+        r"""Creates a user.
+
+        Args:
+            request (:class:`~.identity.CreateUserRequest`):
+                The request object. The request message for the
+                google.showcase.v1beta1.Identity\CreateUser method.
+            display_name (:class:`str`):
+                The display_name of the user.
+                This corresponds to the ``user.display_name`` field
+                on the ``request`` instance; if ``request`` is provided, this
+                should not be set.
+            email (:class:`str`):
+                The email address of the user.
+                This corresponds to the ``user.email`` field
+                on the ``request`` instance; if ``request`` is provided, this
+                should not be set.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.identity.User:
+                A user.
+        """
+        # Create or coerce a protobuf request object.
+        # Sanity check: If we got a request object, we should *not* have
+        # gotten any keyword arguments that map to the request.
+        if request is not None and any([display_name, email]):
+            raise ValueError('If the `request` argument is set, then none of '
+                             'the individual field arguments should be set.')
+
+        # If we have keyword arguments corresponding to fields on the
+        # request, apply these. Without any, a request of exactly this
+        # type is used as-is rather than copied.
+        if (not isinstance(request, identity.CreateUserRequest) or
+                any(arg is not None for arg in (display_name, email))):
+            request = identity.CreateUserRequest(request)
+        if display_name is not None:
+            request.user.display_name = display_name
+        if email is not None:
+            request.user.email = email
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'create_user' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'CreateUser')
+            self._inner_api_calls['create_user'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    governor.wrap_async(self._client._transport.create_user,
+                                        self._client._governor,
+                                        _SERVICE, 'CreateUser'),
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'CreateUser', config.async_retry)
+        rpc = self._inner_api_calls['create_user']
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # Done; return the response.
+        return response
+
+    async def get_user(self,
+            request: identity.GetUserRequest = None,
+            *,
+            name: str = None,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> identity.User:
+        r"""Retrieves the User with the given uri.
+
+        Args:
+            request (:class:`~.identity.GetUserRequest`):
+                The request object. The request message for the
+                google.showcase.v1beta1.Identity\GetUser method.
+            name (:class:`str`):
+                The resource name of the requested
+                user.
+                This corresponds to the ``name`` field
+                on the ``request`` instance; if ``request`` is provided, this
+                should not be set.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.identity.User:
+                A user.
+        """
+        # Create or coerce a protobuf request object.
+        # Sanity check: If we got a request object, we should *not* have
+        # gotten any keyword arguments that map to the request.
+        if request is not None and any([name]):
+            raise ValueError('If the `request` argument is set, then none of '
+                             'the individual field arguments should be set.')
+
+        # If we have keyword arguments corresponding to fields on the
+        # request, apply these. Without any, a request of exactly this
+        # type is used as-is rather than copied.
+        if (not isinstance(request, identity.GetUserRequest) or
+                any(arg is not None for arg in (name,))):
+            request = identity.GetUserRequest(request)
+        if name is not None:
+            request.name = name
+
+        # Serve the user from the response cache, if it is there.
+        if self._client._response_cache is not None:
+            response, generation = self._client._response_cache.lookup(request.name)
+            if response is not None:
+                return response
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'get_user' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'GetUser')
+            self._inner_api_calls['get_user'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    governor.wrap_async(
+                        hedging.wrap_async(self._client._transport.get_user,
+                                           self._client._hedging_policy,
+                                           _SERVICE, 'GetUser'),
+                        self._client._governor, _SERVICE, 'GetUser'),
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'GetUser', config.async_retry)
+        rpc = self._inner_api_calls['get_user']
+
+        # Certain fields should be provided within the metadata header;
+        # add these here.
+        metadata = tuple(metadata) + (
+            gapic_v1.routing_header.to_grpc_metadata((
+                ('name', request.name),
+            )),
+        )
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # Keep the user for the next lookup.
+        if self._client._response_cache is not None:
+            self._client._response_cache.put(request.name, response, generation)
+
+        # Done; return the response.
+        return response
+
+    async def update_user(self,
+            request: identity.UpdateUserRequest = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> identity.User:
+        r"""Updates a user.
+
+        Args:
+            request (:class:`~.identity.UpdateUserRequest`):
+                The request object. The request message for the
+                google.showcase.v1beta1.Identity\UpdateUser method.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.identity.User:
+                A user.
+        """
+        # Create or coerce a protobuf request object.
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        if not isinstance(request, identity.UpdateUserRequest):
+            request = identity.UpdateUserRequest(request)
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'update_user' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'UpdateUser')
+            self._inner_api_calls['update_user'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    governor.wrap_async(self._client._transport.update_user,
+                                        self._client._governor,
+                                        _SERVICE, 'UpdateUser'),
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'UpdateUser', config.async_retry)
+        rpc = self._inner_api_calls['update_user']
+
+        # Send the request. Whatever the outcome, a cached copy of the
+        # user may now be stale.
+        try:
+            response = await rpc(
+                request,
+                retry=retry,
+                timeout=timeout,
+                metadata=metadata,
+            )
+        finally:
+            if self._client._response_cache is not None:
+                self._client._response_cache.invalidate(request.user.name)
+
+        # Done; return the response.
+        return response
+
+    async def delete_user(self,
+            request: identity.DeleteUserRequest = None,
+            *,
+            name: str = None,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> None:
+        r"""Deletes a user, their profile, and all of their
+        authored messages.
+
+        Args:
+            request (:class:`~.identity.DeleteUserRequest`):
+                The request object. The request message for the
+                google.showcase.v1beta1.Identity\DeleteUser method.
+            name (:class:`str`):
+                The resource name of the user to
+                delete.
+                This corresponds to the ``name`` field
+                on the ``request`` instance; if ``request`` is provided, this
+                should not be set.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+        """
+        # Create or coerce a protobuf request object.
+        # Sanity check: If we got a request object, we should *not* have
+        # gotten any keyword arguments that map to the request.
+        if request is not None and any([name]):
+            raise ValueError('If the `request` argument is set, then none of '
+                             'the individual field arguments should be set.')
+
+        # If we have keyword arguments corresponding to fields on the
+        # request, apply these. Without any, a request of exactly this
+        # type is used as-is rather than copied.
+        if (not isinstance(request, identity.DeleteUserRequest) or
+                any(arg is not None for arg in (name,))):
+            request = identity.DeleteUserRequest(request)
+        if name is not None:
+            request.name = name
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'delete_user' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'DeleteUser')
+            self._inner_api_calls['delete_user'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    governor.wrap_async(self._client._transport.delete_user,
+                                        self._client._governor,
+                                        _SERVICE, 'DeleteUser'),
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'DeleteUser', config.async_retry)
+        rpc = self._inner_api_calls['delete_user']
+
+        # Send the request. Whatever the outcome, a cached copy of the
+        # user may now be stale.
+        try:
+            await rpc(
+                request,
+                retry=retry,
+                timeout=timeout,
+                metadata=metadata,
+            )
+        finally:
+            if self._client._response_cache is not None:
+                self._client._response_cache.invalidate(request.name, descendants=True)
+
+    async def list_users(self,
+            request: identity.ListUsersRequest = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> pagers.ListUsersAsyncPager:
+        r"""Lists all users.
+
+        Args:
+            request (:class:`~.identity.ListUsersRequest`):
+                The request object. The request message for the
+                google.showcase.v1beta1.Identity\ListUsers method.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.pagers.ListUsersAsyncPager:
+                The response message for the
+                google.showcase.v1beta1.Identity\ListUsers
+                method.
+                Iterating over this object will yield
+                results and resolve additional pages
+                automatically.
+
+        """
+        # Create or coerce a protobuf request object.
+        # A request of exactly this type is used as-is rather than copied.
+        # It then still belongs to the caller, so the pager (which
+        # advances `page_token` in place) works on a copy of it, unless
+        # the caller has handed ownership of its requests to the client.
+        owns_request = self._client._take_request_ownership
+        if not isinstance(request, identity.ListUsersRequest):
+            request = identity.ListUsersRequest(request)
+            owns_request = True
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'list_users' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'ListUsers')
+            self._inner_api_calls['list_users'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    governor.wrap_async(
+                        hedging.wrap_async(self._client._transport.list_users,
+                                           self._client._hedging_policy,
+                                           _SERVICE, 'ListUsers'),
+                        self._client._governor, _SERVICE, 'ListUsers'),
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'ListUsers', config.async_retry)
+        rpc = self._inner_api_calls['list_users']
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # This method is paged; wrap the response in a pager, which provides
+        # an `__aiter__` convenience method.
+        response = pagers.ListUsersAsyncPager(
+            method=rpc,
+            request=request,
+            response=response,
+            owns_request=owns_request,
+            prefetch_depth=self._client._page_prefetch_depth,
+        )
+
+        # Done; return the response.
+        return response
+
+
+__all__ = (
+    'IdentityAsyncClient',
+)
@@ -16,8 +16,8 @@
 #
 
 from collections import OrderedDict
-from typing import Dict, Sequence, Tuple, Type, Union
-import pkg_resources
+import functools
+from typing import Callable, Dict, Iterable, Sequence, Tuple, Type, Union
 
 import google.api_core.client_options as ClientOptions # type: ignore
 from google.api_core import exceptions                 # type: ignore
@@ -27,11 +27,25 @@ from google.auth import credentials                    # type: ignore
 from google.oauth2 import service_account              # type: ignore
 
 from google.protobuf import field_mask_pb2 as field_mask  # type: ignore
+from google.showcase_v1beta1 import fan_out
+from google.showcase_v1beta1 import governor
+from google.showcase_v1beta1 import hedging
+from google.showcase_v1beta1 import retry_budget
+from google.showcase_v1beta1 import service_config
+from google.showcase_v1beta1.governor import Governor
+from google.showcase_v1beta1.hedging import HedgingPolicy
+from google.showcase_v1beta1.response_cache import ResponseCache
+from google.showcase_v1beta1.retry_budget import RetryBudget
 from google.showcase_v1beta1.services.identity import pagers
 from google.showcase_v1beta1.types import identity
 
 from .transports.base import IdentityTransport
 from .transports.grpc import IdentityGrpcTransport
+from .transports.grpc_asyncio import IdentityGrpcAsyncIOTransport
+
+
+# The service's full name, as the service config knows it.
+_SERVICE = 'google.showcase.v1beta1.Identity'
 
 
 class IdentityClientMeta(type):
@@ -43,6 +57,7 @@ class IdentityClientMeta(type):
     """
     _transport_registry = OrderedDict()  # type: Dict[str, Type[IdentityTransport]]
     _transport_registry['grpc'] = IdentityGrpcTransport
+    _transport_registry['grpc_asyncio'] = IdentityGrpcAsyncIOTransport
 
     def get_transport_class(cls,
             label: str = None,
@@ -100,6 +115,12 @@ class IdentityClient(metaclass=IdentityClientMeta):
             credentials: credentials.Credentials = None,
             transport: Union[str, IdentityTransport] = None,
             client_options: ClientOptions = DEFAULT_OPTIONS,
+            take_request_ownership: bool = False,
+            page_prefetch_depth: int = 0,
+            response_cache: ResponseCache = None,
+            hedging_policy: HedgingPolicy = None,
+            governor: Governor = None,
+            retry_budget: RetryBudget = None,
             ) -> None:
         """Instantiate the identity client.
 
@@ -113,6 +134,30 @@ class IdentityClient(metaclass=IdentityClientMeta):
                 transport to use. If set to None, a transport is chosen
                 automatically.
             client_options (ClientOptions): Custom options for the client.
+            take_request_ownership (bool): If True, the caller hands over
+                every request message it passes to this client, and must
+                not use it again afterwards. This lets paged methods
+                advance the request's ``page_token`` in place instead of
+                copying the request first.
+            page_prefetch_depth (int): If set, the pagers returned by paged
+                methods request the following pages in the background, and
+                hold up to this many pages ahead of the caller. This hides
+                the round trip at each page boundary on high-latency links.
+            response_cache (~.ResponseCache): If set, resources fetched by
+                name are served from this cache while they are fresh. The
+                client drops a resource from it when it updates or deletes
+                that resource.
+            hedging_policy (~.HedgingPolicy): If set, the unary methods
+                the service config allows to retry are hedged: a call with
+                no answer in time is sent again, and the first answer is
+                used.
+            governor (~.Governor): If set, every attempt of a unary
+                method waits for the governor to let it through, within
+                the rate and concurrency limits of its method.
+            retry_budget (~.RetryBudget): If set, the calls are retried
+                only while their retries are few next to their requests,
+                as the budget allows; past that, a failed call raises its
+                error at once.
         """
         if isinstance(client_options, dict):
             client_options = ClientOptions.from_dict(client_options)
@@ -132,13 +177,37 @@ class IdentityClient(metaclass=IdentityClientMeta):
                 host=client_options.api_endpoint or 'localhost:7469',
             )
 
+        # Save a dictionary of cached API call functions.
+        # These are the actual callables which invoke the proper
+        # transport methods, wrapped with `wrap_method` to add retry,
+        # timeout, and the like.
+        self._inner_api_calls = {}  # type: Dict[str, Callable]
+
+        # Save whether request messages may be modified once they are sent.
+        self._take_request_ownership = take_request_ownership
+
+        # Save how many pages the pagers may fetch ahead of the caller.
+        self._page_prefetch_depth = page_prefetch_depth
+
+        # Save the cache of resources fetched by name, if any.
+        self._response_cache = response_cache
+
+        # Save the hedging policy of the idempotent reads, if any.
+        self._hedging_policy = hedging_policy
+
+        # Save the governor of the unary calls, if any.
+        self._governor = governor
+
+        # Save the retry budget of the calls, if any.
+        self._retry_budget = retry_budget
+
     def create_user(self,
             request: identity.CreateUserRequest = None,
             *,
             display_name: str = None,
             email: str = None,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> identity.User:
         r"""Creates a user.
@@ -175,8 +244,11 @@ class IdentityClient(metaclass=IdentityClientMeta):
                              'the individual field arguments should be set.')
 
         # If we have keyword arguments corresponding to fields on the
-        # request, apply these.
-        request = identity.CreateUserRequest(request)
+        # request, apply these. Without any, a request of exactly this
+        # type is used as-is rather than copied.
+        if (not isinstance(request, identity.CreateUserRequest) or
+                any(arg is not None for arg in (display_name, email))):
+            request = identity.CreateUserRequest(request)
         if display_name is not None:
             request.user.display_name = display_name
         if email is not None:
@@ -184,11 +256,18 @@ class IdentityClient(metaclass=IdentityClientMeta):
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.create_user,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'create_user' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'CreateUser')
+            self._inner_api_calls['create_user'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    governor.wrap(self._transport.create_user, self._governor,
+                                  _SERVICE, 'CreateUser'),
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'CreateUser', config.retry)
+        rpc = self._inner_api_calls['create_user']
 
         # Send the request.
         response = rpc(
@@ -206,7 +285,7 @@ class IdentityClient(metaclass=IdentityClientMeta):
             *,
             name: str = None,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> identity.User:
         r"""Retrieves the User with the given uri.
@@ -239,18 +318,36 @@ class IdentityClient(metaclass=IdentityClientMeta):
                              'the individual field arguments should be set.')
 
         # If we have keyword arguments corresponding to fields on the
-        # request, apply these.
-        request = identity.GetUserRequest(request)
+        # request, apply these. Without any, a request of exactly this
+        # type is used as-is rather than copied.
+        if (not isinstance(request, identity.GetUserRequest) or
+                any(arg is not None for arg in (name,))):
+            request = identity.GetUserRequest(request)
         if name is not None:
             request.name = name
 
+        # Serve the user from the response cache, if it is there.
+        if self._response_cache is not None:
+            response, generation = self._response_cache.lookup(request.name)
+            if response is not None:
+                return response
+
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.get_user,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'get_user' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'GetUser')
+            self._inner_api_calls['get_user'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    governor.wrap(
+                        hedging.wrap(self._transport.get_user, self._hedging_policy,
+                                     _SERVICE, 'GetUser'),
+                        self._governor, _SERVICE, 'GetUser'),
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'GetUser', config.retry)
+        rpc = self._inner_api_calls['get_user']
 
         # Certain fields should be provided within the metadata header;
         # add these here.
@@ -268,6 +365,10 @@ class IdentityClient(metaclass=IdentityClientMeta):
             metadata=metadata,
         )
 
+        # Keep the user for the next lookup.
+        if self._response_cache is not None:
+            self._response_cache.put(request.name, response, generation)
+
         # Done; return the response.
         return response
 
@@ -275,7 +376,7 @@ class IdentityClient(metaclass=IdentityClientMeta):
             request: identity.UpdateUserRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> identity.User:
         r"""Updates a user.
@@ -295,23 +396,38 @@ class IdentityClient(metaclass=IdentityClientMeta):
                 A user.
         """
         # Create or coerce a protobuf request object.
-        request = identity.UpdateUserRequest(request)
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        if not isinstance(request, identity.UpdateUserRequest):
+            request = identity.UpdateUserRequest(request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.update_user,
-            default_timeout=None,
-            client_info=_client_info,
-        )
-
-        # Send the request.
-        response = rpc(
-            request,
-            retry=retry,
-            timeout=timeout,
-            metadata=metadata,
-        )
+        if 'update_user' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'UpdateUser')
+            self._inner_api_calls['update_user'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    governor.wrap(self._transport.update_user, self._governor,
+                                  _SERVICE, 'UpdateUser'),
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'UpdateUser', config.retry)
+        rpc = self._inner_api_calls['update_user']
+
+        # Send the request. Whatever the outcome, a cached copy of the
+        # user may now be stale.
+        try:
+            response = rpc(
+                request,
+                retry=retry,
+                timeout=timeout,
+                metadata=metadata,
+            )
+        finally:
+            if self._response_cache is not None:
+                self._response_cache.invalidate(request.user.name)
 
         # Done; return the response.
         return response
@@ -321,7 +437,7 @@ class IdentityClient(metaclass=IdentityClientMeta):
             *,
             name: str = None,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> None:
         r"""Deletes a user, their profile, and all of their
@@ -351,32 +467,47 @@ class IdentityClient(metaclass=IdentityClientMeta):
                              'the individual field arguments should be set.')
 
         # If we have keyword arguments corresponding to fields on the
-        # request, apply these.
-        request = identity.DeleteUserRequest(request)
+        # request, apply these. Without any, a request of exactly this
+        # type is used as-is rather than copied.
+        if (not isinstance(request, identity.DeleteUserRequest) or
+                any(arg is not None for arg in (name,))):
+            request = identity.DeleteUserRequest(request)
         if name is not None:
             request.name = name
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.delete_user,
-            default_timeout=None,
-            client_info=_client_info,
-        )
-
-        # Send the request.
-        rpc(
-            request,
-            retry=retry,
-            timeout=timeout,
-            metadata=metadata,
-        )
+        if 'delete_user' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'DeleteUser')
+            self._inner_api_calls['delete_user'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    governor.wrap(self._transport.delete_user, self._governor,
+                                  _SERVICE, 'DeleteUser'),
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'DeleteUser', config.retry)
+        rpc = self._inner_api_calls['delete_user']
+
+        # Send the request. Whatever the outcome, a cached copy of the
+        # user may now be stale.
+        try:
+            rpc(
+                request,
+                retry=retry,
+                timeout=timeout,
+                metadata=metadata,
+            )
+        finally:
+            if self._response_cache is not None:
+                self._response_cache.invalidate(request.name, descendants=True)
 
     def list_users(self,
             request: identity.ListUsersRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> pagers.ListUsersPager:
         r"""Lists all users.
@@ -402,15 +533,31 @@ class IdentityClient(metaclass=IdentityClientMeta):
 
         """
         # Create or coerce a protobuf request object.
-        request = identity.ListUsersRequest(request)
+        # A request of exactly this type is used as-is rather than copied.
+        # It then still belongs to the caller, so the pager (which
+        # advances `page_token` in place) works on a copy of it, unless
+        # the caller has handed ownership of its requests to the client.
+        owns_request = self._take_request_ownership
+        if not isinstance(request, identity.ListUsersRequest):
+            request = identity.ListUsersRequest(request)
+            owns_request = True
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.list_users,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'list_users' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'ListUsers')
+            self._inner_api_calls['list_users'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    governor.wrap(
+                        hedging.wrap(self._transport.list_users, self._hedging_policy,
+                                     _SERVICE, 'ListUsers'),
+                        self._governor, _SERVICE, 'ListUsers'),
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'ListUsers', config.retry)
+        rpc = self._inner_api_calls['list_users']
 
         # Send the request.
         response = rpc(
@@ -426,23 +573,75 @@ class IdentityClient(metaclass=IdentityClientMeta):
             method=rpc,
             request=request,
             response=response,
+            owns_request=owns_request,
+            prefetch_depth=self._page_prefetch_depth,
         )
 
         # Done; return the response.
         return response
 
+    def fan_out(self,
+            method: str,
+            requests: Iterable,
+            *,
+            max_concurrency: int = 8,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> fan_out.FanOut:
+        r"""Call a ``get_*`` or ``list_*`` method once per request, at once.
+
+        The calls run on a thread pool, at most ``max_concurrency`` at a
+        time, and their outcomes are yielded as they finish; each
+        ``list_*`` call is read to its last page. For example::
 
+            client.fan_out('get_user', [{'name': n} for n in names])
+
+        Args:
+            method (str): The name of the method to call, such as
+                ``'get_user'``.
+            requests (Iterable): The request object, or dict, for each
+                call. They are read lazily.
+            max_concurrency (int): The most calls in flight at once.
+            timeout (float): The timeout for each call.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with each call as metadata.
+
+        Returns:
+            ~.fan_out.FanOut:
+                An iterator over the outcome of every call, in the order
+                they finish. A call's error is reported in its outcome
+                rather than raised.
+
+        Raises:
+            ValueError: If ``method`` is not a ``get_*`` or ``list_*``
+                method of this client.
+        """
+        return fan_out.fan_out_method(
+            self,
+            method,
+            requests,
+            max_concurrency=max_concurrency,
+            timeout=timeout,
+            metadata=metadata,
+        )
 
 
 
-try:
-    _client_info = gapic_v1.client_info.ClientInfo(
-        gapic_version=pkg_resources.get_distribution(
-            'google-showcase',
-        ).version,
-    )
-except pkg_resources.DistributionNotFound:
-    _client_info = gapic_v1.client_info.ClientInfo()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_client_info() -> gapic_v1.client_info.ClientInfo:
+    # Looking up the installed version is slow, so it is done when the
+    # first method is wrapped rather than when this module is imported.
+    import pkg_resources
+    try:
+        return gapic_v1.client_info.ClientInfo(
+            gapic_version=pkg_resources.get_distribution(
+                'google-showcase',
+            ).version,
+        )
+    except pkg_resources.DistributionNotFound:
+        return gapic_v1.client_info.ClientInfo()
 
 
 __all__ = (
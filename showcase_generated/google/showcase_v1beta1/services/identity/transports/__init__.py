@@ -20,14 +20,17 @@ from typing import Dict, Type
 
 from .base import IdentityTransport
 from .grpc import IdentityGrpcTransport
+from .grpc_asyncio import IdentityGrpcAsyncIOTransport
 
 
 # Compile a registry of transports.
 _transport_registry = OrderedDict()  # type: Dict[str, Type[IdentityTransport]]
 _transport_registry['grpc'] = IdentityGrpcTransport
+_transport_registry['grpc_asyncio'] = IdentityGrpcAsyncIOTransport
 
 
 __all__ = (
     'IdentityTransport',
     'IdentityGrpcTransport',
+    'IdentityGrpcAsyncIOTransport',
 )
@@ -18,10 +18,10 @@
 import abc
 import typing
 
-from google import auth
 from google.auth import credentials  # type: ignore
 
 from google.protobuf import empty_pb2 as empty  # type: ignore
+from google.showcase_v1beta1 import credentials_cache
 from google.showcase_v1beta1.types import identity
 
 
@@ -52,9 +52,9 @@ class IdentityTransport(metaclass=abc.ABCMeta):
         self._host = host
 
         # If no credentials are provided, then determine the appropriate
-        # defaults.
+        # defaults, once per process.
         if credentials is None:
-            credentials, _ = auth.default(scopes=self.AUTH_SCOPES)
+            credentials, _ = credentials_cache.default(scopes=self.AUTH_SCOPES)
 
         # Save the credentials.
         self._credentials = credentials
@@ -0,0 +1,1248 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import functools
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Sequence, Tuple, Union
+
+import google.api_core.client_options as ClientOptions # type: ignore
+from google.api_core import exceptions                 # type: ignore
+from google.api_core import gapic_v1                   # type: ignore
+from google.api_core import retry as retries           # type: ignore
+from google.auth import credentials                    # type: ignore
+from google.oauth2 import service_account              # type: ignore
+
+from google.api_core import operation_async
+from google.protobuf import field_mask_pb2 as field_mask  # type: ignore
+from google.protobuf import timestamp_pb2 as timestamp  # type: ignore
+from google.showcase_v1beta1 import governor
+from google.showcase_v1beta1 import hedging
+from google.showcase_v1beta1 import retry_budget
+from google.showcase_v1beta1 import service_config
+from google.showcase_v1beta1.governor import Governor
+from google.showcase_v1beta1.hedging import HedgingPolicy
+from google.showcase_v1beta1.response_cache import ResponseCache
+from google.showcase_v1beta1.retry_budget import RetryBudget
+from google.showcase_v1beta1.services.messaging import pagers
+from google.showcase_v1beta1.types import messaging
+
+from .client import MessagingClient, _SERVICE, _get_client_info
+from .transports.base import MessagingTransport
+from .transports.grpc_asyncio import MessagingGrpcAsyncIOTransport
+
+
+class MessagingAsyncClient:
+    """A simple messaging service that implements chat rooms and
+    profile posts.
+    This messaging service showcases the features that API clients
+    generated by gapic-generators implement.
+    """
+
+    DEFAULT_OPTIONS = MessagingClient.DEFAULT_OPTIONS
+
+    room_path = staticmethod(MessagingClient.room_path)
+    blurb_path = staticmethod(MessagingClient.blurb_path)
+
+    get_transport_class = functools.partial(
+        type(MessagingClient).get_transport_class,
+        type(MessagingClient),
+    )
+
+    @classmethod
+    def from_service_account_file(cls, filename: str, *args, **kwargs):
+        """Creates an instance of this client using the provided credentials
+        file.
+
+        Args:
+            filename (str): The path to the service account private key json
+                file.
+            args: Additional arguments to pass to the constructor.
+            kwargs: Additional arguments to pass to the constructor.
+
+        Returns:
+            {@api.name}: The constructed client.
+        """
+        credentials = service_account.Credentials.from_service_account_file(
+            filename)
+        kwargs['credentials'] = credentials
+        return cls(*args, **kwargs)
+
+    from_service_account_json = from_service_account_file
+
+    def __init__(self, *,
+            credentials: credentials.Credentials = None,
+            transport: Union[str, MessagingTransport] = 'grpc_asyncio',
+            client_options: ClientOptions = DEFAULT_OPTIONS,
+            take_request_ownership: bool = False,
+            page_prefetch_depth: int = 0,
+            response_cache: ResponseCache = None,
+            hedging_policy: HedgingPolicy = None,
+            governor: Governor = None,
+            retry_budget: RetryBudget = None,
+            ) -> None:
+        """Instantiate the messaging client.
+
+        Args:
+            credentials (Optional[google.auth.credentials.Credentials]): The
+                authorization credentials to attach to requests. These
+                credentials identify the application to the service; if none
+                are specified, the client will attempt to ascertain the
+                credentials from the environment.
+            transport (Union[str, ~.MessagingTransport]): The
+                transport to use. It must be an asyncio transport, such as
+                ~.MessagingGrpcAsyncIOTransport; by default one is created.
+            client_options (ClientOptions): Custom options for the client.
+            take_request_ownership (bool): If True, the caller hands over
+                every request message it passes to this client, and must
+                not use it again afterwards. This lets paged methods
+                advance the request's ``page_token`` in place instead of
+                copying the request first.
+            page_prefetch_depth (int): If set, the pagers returned by paged
+                methods request the following pages in the background, and
+                hold up to this many pages ahead of the caller. This hides
+                the round trip at each page boundary on high-latency links.
+            response_cache (~.ResponseCache): If set, resources fetched by
+                name are served from this cache while they are fresh. The
+                client drops a resource from it when it updates or deletes
+                that resource.
+            hedging_policy (~.HedgingPolicy): If set, the unary methods
+                the service config allows to retry are hedged: a call with
+                no answer in time is sent again, and the first answer is
+                used.
+            governor (~.Governor): If set, every attempt of a unary
+                method waits for the governor to let it through, within
+                the rate and concurrency limits of its method. The wait
+                sleeps on the event loop instead of blocking it.
+            retry_budget (~.RetryBudget): If set, the calls are retried
+                only while their retries are few next to their requests,
+                as the budget allows; past that, a failed call raises its
+                error at once.
+        """
+        # The synchronous client validates the options and creates the
+        # transport; this client only awaits the transport's calls.
+        self._client = MessagingClient(
+            credentials=credentials,
+            transport=transport,
+            client_options=client_options,
+            take_request_ownership=take_request_ownership,
+            page_prefetch_depth=page_prefetch_depth,
+            response_cache=response_cache,
+            hedging_policy=hedging_policy,
+            governor=governor,
+            retry_budget=retry_budget,
+        )
+
+        # Save a dictionary of cached API call functions.
+        # These are the actual callables which invoke the proper
+        # transport methods, wrapped with `wrap_method` to add retry,
+        # timeout, and the like.
+        self._inner_api_calls = {}  # type: Dict[str, Callable]
+
+    async def create_room(self,
+            request: messaging.CreateRoomRequest = None,
+            *,
+            display_name: str = None,
+            description: str = None,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> messaging.Room:
+        r"""Creates a room.
+
+        Args:
+            request (:class:`~.messaging.CreateRoomRequest`):
+                The request object. The request message for the
+                google.showcase.v1beta1.Messaging\CreateRoom method.
+            display_name (:class:`str`):
+                The human readable name of the chat
+                room.
+                This corresponds to the ``room.display_name`` field
+                on the ``request`` instance; if ``request`` is provided, this
+                should not be set.
+            description (:class:`str`):
+                The description of the chat room.
+                This corresponds to the ``room.description`` field
+                on the ``request`` instance; if ``request`` is provided, this
+                should not be set.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.messaging.Room:
+                A chat room.
+        """
+        # Create or coerce a protobuf request object.
+        # Sanity check: If we got a request object, we should *not* have
+        # gotten any keyword arguments that map to the request.
+        if request is not None and any([display_name, description]):
+            raise ValueError('If the `request` argument is set, then none of '
+                             'the individual field arguments should be set.')
+
+        # If we have keyword arguments corresponding to fields on the
+        # request, apply these. Without any, a request of exactly this
+        # type is used as-is rather than copied.
+        if (not isinstance(request, messaging.CreateRoomRequest) or
+                any(arg is not None for arg in (display_name, description))):
+            request = messaging.CreateRoomRequest(request)
+        if display_name is not None:
+            request.room.display_name = display_name
+        if description is not None:
+            request.room.description = description
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'create_room' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'CreateRoom')
+            self._inner_api_calls['create_room'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    governor.wrap_async(self._client._transport.create_room,
+                                        self._client._governor,
+                                        _SERVICE, 'CreateRoom'),
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'CreateRoom', config.async_retry)
+        rpc = self._inner_api_calls['create_room']
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # Done; return the response.
+        return response
+
+    async def get_room(self,
+            request: messaging.GetRoomRequest = None,
+            *,
+            name: str = None,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> messaging.Room:
+        r"""Retrieves the Room with the given resource name.
+
+        Args:
+            request (:class:`~.messaging.GetRoomRequest`):
+                The request object. The request message for the
+                google.showcase.v1beta1.Messaging\GetRoom method.
+            name (:class:`str`):
+                The resource name of the requested
+                room.
+                This corresponds to the ``name`` field
+                on the ``request`` instance; if ``request`` is provided, this
+                should not be set.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.messaging.Room:
+                A chat room.
+        """
+        # Create or coerce a protobuf request object.
+        # Sanity check: If we got a request object, we should *not* have
+        # gotten any keyword arguments that map to the request.
+        if request is not None and any([name]):
+            raise ValueError('If the `request` argument is set, then none of '
+                             'the individual field arguments should be set.')
+
+        # If we have keyword arguments corresponding to fields on the
+        # request, apply these. Without any, a request of exactly this
+        # type is used as-is rather than copied.
+        if (not isinstance(request, messaging.GetRoomRequest) or
+                any(arg is not None for arg in (name,))):
+            request = messaging.GetRoomRequest(request)
+        if name is not None:
+            request.name = name
+
+        # Serve the room from the response cache, if it is there.
+        if self._client._response_cache is not None:
+            response, generation = self._client._response_cache.lookup(request.name)
+            if response is not None:
+                return response
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'get_room' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'GetRoom')
+            self._inner_api_calls['get_room'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    governor.wrap_async(
+                        hedging.wrap_async(self._client._transport.get_room,
+                                           self._client._hedging_policy,
+                                           _SERVICE, 'GetRoom'),
+                        self._client._governor, _SERVICE, 'GetRoom'),
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'GetRoom', config.async_retry)
+        rpc = self._inner_api_calls['get_room']
+
+        # Certain fields should be provided within the metadata header;
+        # add these here.
+        metadata = tuple(metadata) + (
+            gapic_v1.routing_header.to_grpc_metadata((
+                ('name', request.name),
+            )),
+        )
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # Keep the room for the next lookup.
+        if self._client._response_cache is not None:
+            self._client._response_cache.put(request.name, response, generation)
+
+        # Done; return the response.
+        return response
+
+    async def update_room(self,
+            request: messaging.UpdateRoomRequest = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> messaging.Room:
+        r"""Updates a room.
+
+        Args:
+            request (:class:`~.messaging.UpdateRoomRequest`):
+                The request object. The request message for the
+                google.showcase.v1beta1.Messaging\UpdateRoom method.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.messaging.Room:
+                A chat room.
+        """
+        # Create or coerce a protobuf request object.
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        if not isinstance(request, messaging.UpdateRoomRequest):
+            request = messaging.UpdateRoomRequest(request)
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'update_room' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'UpdateRoom')
+            self._inner_api_calls['update_room'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    governor.wrap_async(self._client._transport.update_room,
+                                        self._client._governor,
+                                        _SERVICE, 'UpdateRoom'),
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'UpdateRoom', config.async_retry)
+        rpc = self._inner_api_calls['update_room']
+
+        # Send the request. Whatever the outcome, a cached copy of the
+        # room may now be stale.
+        try:
+            response = await rpc(
+                request,
+                retry=retry,
+                timeout=timeout,
+                metadata=metadata,
+            )
+        finally:
+            if self._client._response_cache is not None:
+                self._client._response_cache.invalidate(request.room.name)
+
+        # Done; return the response.
+        return response
+
+    async def delete_room(self,
+            request: messaging.DeleteRoomRequest = None,
+            *,
+            name: str = None,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> None:
+        r"""Deletes a room and all of its blurbs.
+
+        Args:
+            request (:class:`~.messaging.DeleteRoomRequest`):
+                The request object. The request message for the
+                google.showcase.v1beta1.Messaging\DeleteRoom method.
+            name (:class:`str`):
+                The resource name of the requested
+                room.
+                This corresponds to the ``name`` field
+                on the ``request`` instance; if ``request`` is provided, this
+                should not be set.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+        """
+        # Create or coerce a protobuf request object.
+        # Sanity check: If we got a request object, we should *not* have
+        # gotten any keyword arguments that map to the request.
+        if request is not None and any([name]):
+            raise ValueError('If the `request` argument is set, then none of '
+                             'the individual field arguments should be set.')
+
+        # If we have keyword arguments corresponding to fields on the
+        # request, apply these. Without any, a request of exactly this
+        # type is used as-is rather than copied.
+        if (not isinstance(request, messaging.DeleteRoomRequest) or
+                any(arg is not None for arg in (name,))):
+            request = messaging.DeleteRoomRequest(request)
+        if name is not None:
+            request.name = name
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'delete_room' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'DeleteRoom')
+            self._inner_api_calls['delete_room'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    governor.wrap_async(self._client._transport.delete_room,
+                                        self._client._governor,
+                                        _SERVICE, 'DeleteRoom'),
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'DeleteRoom', config.async_retry)
+        rpc = self._inner_api_calls['delete_room']
+
+        # Send the request. Whatever the outcome, a cached copy of the
+        # room may now be stale.
+        try:
+            await rpc(
+                request,
+                retry=retry,
+                timeout=timeout,
+                metadata=metadata,
+            )
+        finally:
+            if self._client._response_cache is not None:
+                self._client._response_cache.invalidate(request.name, descendants=True)
+
+    async def list_rooms(self,
+            request: messaging.ListRoomsRequest = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> pagers.ListRoomsAsyncPager:
+        r"""Lists all chat rooms.
+
+        Args:
+            request (:class:`~.messaging.ListRoomsRequest`):
+                The request object. The request message for the
+                google.showcase.v1beta1.Messaging\ListRooms method.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.pagers.ListRoomsAsyncPager:
+                The response message for the
+                google.showcase.v1beta1.Messaging\ListRooms
+                method.
+                Iterating over this object will yield
+                results and resolve additional pages
+                automatically.
+
+        """
+        # Create or coerce a protobuf request object.
+        # A request of exactly this type is used as-is rather than copied.
+        # It then still belongs to the caller, so the pager (which
+        # advances `page_token` in place) works on a copy of it, unless
+        # the caller has handed ownership of its requests to the client.
+        owns_request = self._client._take_request_ownership
+        if not isinstance(request, messaging.ListRoomsRequest):
+            request = messaging.ListRoomsRequest(request)
+            owns_request = True
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'list_rooms' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'ListRooms')
+            self._inner_api_calls['list_rooms'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    governor.wrap_async(
+                        hedging.wrap_async(self._client._transport.list_rooms,
+                                           self._client._hedging_policy,
+                                           _SERVICE, 'ListRooms'),
+                        self._client._governor, _SERVICE, 'ListRooms'),
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'ListRooms', config.async_retry)
+        rpc = self._inner_api_calls['list_rooms']
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # This method is paged; wrap the response in a pager, which provides
+        # an `__aiter__` convenience method.
+        response = pagers.ListRoomsAsyncPager(
+            method=rpc,
+            request=request,
+            response=response,
+            owns_request=owns_request,
+            prefetch_depth=self._client._page_prefetch_depth,
+        )
+
+        # Done; return the response.
+        return response
+
+    async def create_blurb(self,
+            request: messaging.CreateBlurbRequest = None,
+            *,
+            parent: str = None,
+            user: str = None,
+            text: str = None,
+            image: bytes = None,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> messaging.Blurb:
+        r"""Creates a blurb. If the parent is a room, the blurb
+        is understood to be a message in that room. If the
+        parent is a profile, the blurb is understood to be a
+        post on the profile.
+
+        Args:
+            request (:class:`~.messaging.CreateBlurbRequest`):
+                The request object. The request message for the
+                google.showcase.v1beta1.Messaging\CreateBlurb method.
+            parent (:class:`str`):
+                The resource name of the chat room or
+                user profile that this blurb will be
+                tied to.
+                This corresponds to the ``parent`` field
+                on the ``request`` instance; if ``request`` is provided, this
+                should not be set.
+            user (:class:`str`):
+                The resource name of the blurb's
+                author.
+                This corresponds to the ``blurb.user`` field
+                on the ``request`` instance; if ``request`` is provided, this
+                should not be set.
+            text (:class:`str`):
+                The textual content of this blurb.
+                This corresponds to the ``blurb.text`` field
+                on the ``request`` instance; if ``request`` is provided, this
+                should not be set.
+            image (:class:`bytes`):
+                The image content of this blurb.
+                This corresponds to the ``blurb.image`` field
+                on the ``request`` instance; if ``request`` is provided, this
+                should not be set.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.messaging.Blurb:
+                This protocol buffer message
+                represents a blurb sent to a chat room
+                or posted on a user profile.
+
+        """
+        # Create or coerce a protobuf request object.
+        # Sanity check: If we got a request object, we should *not* have
+        # gotten any keyword arguments that map to the request.
+        if request is not None and any([parent, user, text, image]):
+            raise ValueError('If the `request` argument is set, then none of '
+                             'the individual field arguments should be set.')
+
+        # If we have keyword arguments corresponding to fields on the
+        # request, apply these. Without any, a request of exactly this
+        # type is used as-is rather than copied.
+        if (not isinstance(request, messaging.CreateBlurbRequest) or
+                any(arg is not None for arg in (parent, user, text, image))):
+            request = messaging.CreateBlurbRequest(request)
+        if parent is not None:
+            request.parent = parent
+        if user is not None:
+            request.blurb.user = user
+        if text is not None:
+            request.blurb.text = text
+        if image is not None:
+            request.blurb.image = image
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'create_blurb' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'CreateBlurb')
+            self._inner_api_calls['create_blurb'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    governor.wrap_async(self._client._transport.create_blurb,
+                                        self._client._governor,
+                                        _SERVICE, 'CreateBlurb'),
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'CreateBlurb', config.async_retry)
+        rpc = self._inner_api_calls['create_blurb']
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # Done; return the response.
+        return response
+
+    async def get_blurb(self,
+            request: messaging.GetBlurbRequest = None,
+            *,
+            name: str = None,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> messaging.Blurb:
+        r"""Retrieves the Blurb with the given resource name.
+
+        Args:
+            request (:class:`~.messaging.GetBlurbRequest`):
+                The request object. The request message for the
+                google.showcase.v1beta1.Messaging\GetBlurb method.
+            name (:class:`str`):
+                The resource name of the requested
+                blurb.
+                This corresponds to the ``name`` field
+                on the ``request`` instance; if ``request`` is provided, this
+                should not be set.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.messaging.Blurb:
+                This protocol buffer message
+                represents a blurb sent to a chat room
+                or posted on a user profile.
+
+        """
+        # Create or coerce a protobuf request object.
+        # Sanity check: If we got a request object, we should *not* have
+        # gotten any keyword arguments that map to the request.
+        if request is not None and any([name]):
+            raise ValueError('If the `request` argument is set, then none of '
+                             'the individual field arguments should be set.')
+
+        # If we have keyword arguments corresponding to fields on the
+        # request, apply these. Without any, a request of exactly this
+        # type is used as-is rather than copied.
+        if (not isinstance(request, messaging.GetBlurbRequest) or
+                any(arg is not None for arg in (name,))):
+            request = messaging.GetBlurbRequest(request)
+        if name is not None:
+            request.name = name
+
+        # Serve the blurb from the response cache, if it is there.
+        if self._client._response_cache is not None:
+            response, generation = self._client._response_cache.lookup(request.name)
+            if response is not None:
+                return response
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'get_blurb' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'GetBlurb')
+            self._inner_api_calls['get_blurb'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    governor.wrap_async(
+                        hedging.wrap_async(self._client._transport.get_blurb,
+                                           self._client._hedging_policy,
+                                           _SERVICE, 'GetBlurb'),
+                        self._client._governor, _SERVICE, 'GetBlurb'),
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'GetBlurb', config.async_retry)
+        rpc = self._inner_api_calls['get_blurb']
+
+        # Certain fields should be provided within the metadata header;
+        # add these here.
+        metadata = tuple(metadata) + (
+            gapic_v1.routing_header.to_grpc_metadata((
+                ('name', request.name),
+            )),
+        )
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # Keep the blurb for the next lookup.
+        if self._client._response_cache is not None:
+            self._client._response_cache.put(request.name, response, generation)
+
+        # Done; return the response.
+        return response
+
+    async def update_blurb(self,
+            request: messaging.UpdateBlurbRequest = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> messaging.Blurb:
+        r"""Updates a blurb.
+
+        Args:
+            request (:class:`~.messaging.UpdateBlurbRequest`):
+                The request object. The request message for the
+                google.showcase.v1beta1.Messaging\UpdateBlurb method.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.messaging.Blurb:
+                This protocol buffer message
+                represents a blurb sent to a chat room
+                or posted on a user profile.
+
+        """
+        # Create or coerce a protobuf request object.
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        if not isinstance(request, messaging.UpdateBlurbRequest):
+            request = messaging.UpdateBlurbRequest(request)
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'update_blurb' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'UpdateBlurb')
+            self._inner_api_calls['update_blurb'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    governor.wrap_async(self._client._transport.update_blurb,
+                                        self._client._governor,
+                                        _SERVICE, 'UpdateBlurb'),
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'UpdateBlurb', config.async_retry)
+        rpc = self._inner_api_calls['update_blurb']
+
+        # Send the request. Whatever the outcome, a cached copy of the
+        # blurb may now be stale.
+        try:
+            response = await rpc(
+                request,
+                retry=retry,
+                timeout=timeout,
+                metadata=metadata,
+            )
+        finally:
+            if self._client._response_cache is not None:
+                self._client._response_cache.invalidate(request.blurb.name)
+
+        # Done; return the response.
+        return response
+
+    async def delete_blurb(self,
+            request: messaging.DeleteBlurbRequest = None,
+            *,
+            name: str = None,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> None:
+        r"""Deletes a blurb.
+
+        Args:
+            request (:class:`~.messaging.DeleteBlurbRequest`):
+                The request object. The request message for the
+                google.showcase.v1beta1.Messaging\DeleteBlurb method.
+            name (:class:`str`):
+                The resource name of the requested
+                blurb.
+                This corresponds to the ``name`` field
+                on the ``request`` instance; if ``request`` is provided, this
+                should not be set.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+        """
+        # Create or coerce a protobuf request object.
+        # Sanity check: If we got a request object, we should *not* have
+        # gotten any keyword arguments that map to the request.
+        if request is not None and any([name]):
+            raise ValueError('If the `request` argument is set, then none of '
+                             'the individual field arguments should be set.')
+
+        # If we have keyword arguments corresponding to fields on the
+        # request, apply these. Without any, a request of exactly this
+        # type is used as-is rather than copied.
+        if (not isinstance(request, messaging.DeleteBlurbRequest) or
+                any(arg is not None for arg in (name,))):
+            request = messaging.DeleteBlurbRequest(request)
+        if name is not None:
+            request.name = name
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'delete_blurb' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'DeleteBlurb')
+            self._inner_api_calls['delete_blurb'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    governor.wrap_async(self._client._transport.delete_blurb,
+                                        self._client._governor,
+                                        _SERVICE, 'DeleteBlurb'),
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'DeleteBlurb', config.async_retry)
+        rpc = self._inner_api_calls['delete_blurb']
+
+        # Send the request. Whatever the outcome, a cached copy of the
+        # blurb may now be stale.
+        try:
+            await rpc(
+                request,
+                retry=retry,
+                timeout=timeout,
+                metadata=metadata,
+            )
+        finally:
+            if self._client._response_cache is not None:
+                self._client._response_cache.invalidate(request.name, descendants=True)
+
+    async def list_blurbs(self,
+            request: messaging.ListBlurbsRequest = None,
+            *,
+            parent: str = None,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> pagers.ListBlurbsAsyncPager:
+        r"""Lists blurbs for a specific chat room or user profile
+        depending on the parent resource name.
+
+        Args:
+            request (:class:`~.messaging.ListBlurbsRequest`):
+                The request object. The request message for the
+                google.showcase.v1beta1.Messaging\ListBlurbs method.
+            parent (:class:`str`):
+                The resource name of the requested
+                room or profile whos blurbs to list.
+                This corresponds to the ``parent`` field
+                on the ``request`` instance; if ``request`` is provided, this
+                should not be set.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.pagers.ListBlurbsAsyncPager:
+                The response message for the
+                google.showcase.v1beta1.Messaging\ListBlurbs
+                method.
+                Iterating over this object will yield
+                results and resolve additional pages
+                automatically.
+
+        """
+        # Create or coerce a protobuf request object.
+        # Sanity check: If we got a request object, we should *not* have
+        # gotten any keyword arguments that map to the request.
+        if request is not None and any([parent]):
+            raise ValueError('If the `request` argument is set, then none of '
+                             'the individual field arguments should be set.')
+
+        # If we have keyword arguments corresponding to fields on the
+        # request, apply these. Without any, a request of exactly this
+        # type is used as-is rather than copied.
+        # A reused request still belongs to the caller, so the pager (which
+        # advances `page_token` in place) works on a copy of it, unless
+        # the caller has handed ownership of its requests to the client.
+        owns_request = self._client._take_request_ownership
+        if (not isinstance(request, messaging.ListBlurbsRequest) or
+                any(arg is not None for arg in (parent,))):
+            request = messaging.ListBlurbsRequest(request)
+            owns_request = True
+        if parent is not None:
+            request.parent = parent
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'list_blurbs' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'ListBlurbs')
+            self._inner_api_calls['list_blurbs'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    governor.wrap_async(
+                        hedging.wrap_async(self._client._transport.list_blurbs,
+                                           self._client._hedging_policy,
+                                           _SERVICE, 'ListBlurbs'),
+                        self._client._governor, _SERVICE, 'ListBlurbs'),
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'ListBlurbs', config.async_retry)
+        rpc = self._inner_api_calls['list_blurbs']
+
+        # Certain fields should be provided within the metadata header;
+        # add these here.
+        metadata = tuple(metadata) + (
+            gapic_v1.routing_header.to_grpc_metadata((
+                ('parent', request.parent),
+            )),
+        )
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # This method is paged; wrap the response in a pager, which provides
+        # an `__aiter__` convenience method.
+        response = pagers.ListBlurbsAsyncPager(
+            method=rpc,
+            request=request,
+            response=response,
+            owns_request=owns_request,
+            prefetch_depth=self._client._page_prefetch_depth,
+        )
+
+        # Done; return the response.
+        return response
+
+    async def search_blurbs(self,
+            request: messaging.SearchBlurbsRequest = None,
+            *,
+            query: str = None,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> operation_async.AsyncOperation:
+        r"""This method searches through all blurbs across all
+        rooms and profiles for blurbs containing to words found
+        in the query. Only posts that contain an exact match of
+        a queried word will be returned.
+
+        Args:
+            request (:class:`~.messaging.SearchBlurbsRequest`):
+                The request object. The request message for the
+                google.showcase.v1beta1.Messaging\SearchBlurbs method.
+            query (:class:`str`):
+                The query used to search for blurbs
+                containing to words of this string. Only
+                posts that contain an exact match of a
+                queried word will be returned.
+                This corresponds to the ``query`` field
+                on the ``request`` instance; if ``request`` is provided, this
+                should not be set.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.operation_async.AsyncOperation:
+                An object representing a long-running operation.
+
+                The result type for the operation will be
+                :class:``~.messaging.SearchBlurbsResponse``: The
+                operation response message for the
+                google.showcase.v1beta1.Messaging\SearchBlurbs method.
+
+        """
+        # Create or coerce a protobuf request object.
+        # Sanity check: If we got a request object, we should *not* have
+        # gotten any keyword arguments that map to the request.
+        if request is not None and any([query]):
+            raise ValueError('If the `request` argument is set, then none of '
+                             'the individual field arguments should be set.')
+
+        # If we have keyword arguments corresponding to fields on the
+        # request, apply these. Without any, a request of exactly this
+        # type is used as-is rather than copied.
+        if (not isinstance(request, messaging.SearchBlurbsRequest) or
+                any(arg is not None for arg in (query,))):
+            request = messaging.SearchBlurbsRequest(request)
+        if query is not None:
+            request.query = query
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'search_blurbs' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'SearchBlurbs')
+            self._inner_api_calls['search_blurbs'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    governor.wrap_async(self._client._transport.search_blurbs,
+                                        self._client._governor,
+                                        _SERVICE, 'SearchBlurbs'),
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'SearchBlurbs', config.async_retry)
+        rpc = self._inner_api_calls['search_blurbs']
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # Wrap the response in an operation future.
+        response = operation_async.from_gapic(
+            response,
+            self._client._transport.operations_client,
+            messaging.SearchBlurbsResponse,
+            metadata_type=messaging.SearchBlurbsMetadata,
+        )
+
+        # Done; return the response.
+        return response
+
+    def stream_blurbs(self,
+            request: messaging.StreamBlurbsRequest = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> Awaitable[AsyncIterable[messaging.StreamBlurbsResponse]]:
+        r"""This returns a stream that emits the blurbs that are
+        created for a particular chat room or user profile.
+
+        Args:
+            request (:class:`~.messaging.StreamBlurbsRequest`):
+                The request object. The request message for the
+                google.showcase.v1beta1.Messaging\StreamBlurbs method.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            AsyncIterable[~.messaging.StreamBlurbsResponse]:
+                The response message for the
+                google.showcase.v1beta1.Messaging\StreamBlurbs
+                method.
+
+        """
+        # Create or coerce a protobuf request object.
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        if not isinstance(request, messaging.StreamBlurbsRequest):
+            request = messaging.StreamBlurbsRequest(request)
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'stream_blurbs' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'StreamBlurbs')
+            self._inner_api_calls['stream_blurbs'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    self._client._transport.stream_blurbs,
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'StreamBlurbs', config.async_retry)
+        rpc = self._inner_api_calls['stream_blurbs']
+
+        # Send the request. The stream is set up once the returned
+        # coroutine is awaited.
+        response = rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # Done; return the response.
+        return response
+
+    async def send_blurbs(self,
+            requests: AsyncIterator[messaging.CreateBlurbRequest] = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> messaging.SendBlurbsResponse:
+        r"""This is a stream to create multiple blurbs. If an
+        invalid blurb is requested to be created, the stream
+        will close with an error.
+
+        Args:
+            requests (AsyncIterator[`~.messaging.CreateBlurbRequest`]):
+                The request object AsyncIterator. The request message for the
+                google.showcase.v1beta1.Messaging\CreateBlurb method.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.messaging.SendBlurbsResponse:
+                The response message for the
+                google.showcase.v1beta1.Messaging\SendBlurbs
+                method.
+
+        """
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'send_blurbs' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'SendBlurbs')
+            # A stream of requests cannot be sent again, so the call is
+            # never retried by default.
+            self._inner_api_calls['send_blurbs'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    self._client._transport.send_blurbs,
+                    default_retry=None,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'SendBlurbs', None)
+        rpc = self._inner_api_calls['send_blurbs']
+
+        # Send the request, and wait for the single response once
+        # the stream is set up.
+        call = await rpc(
+            requests,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+        response = await call
+
+        # Done; return the response.
+        return response
+
+    def connect(self,
+            requests: AsyncIterator[messaging.ConnectRequest] = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> Awaitable[AsyncIterable[messaging.StreamBlurbsResponse]]:
+        r"""This method starts a bidirectional stream that
+        receives all blurbs that are being created after the
+        stream has started and sends requests to create blurbs.
+        If an invalid blurb is requested to be created, the
+        stream will close with an error.
+
+        Args:
+            requests (AsyncIterator[`~.messaging.ConnectRequest`]):
+                The request object AsyncIterator. The request message for the
+                google.showcase.v1beta1.Messaging\Connect method.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            AsyncIterable[~.messaging.StreamBlurbsResponse]:
+                The response message for the
+                google.showcase.v1beta1.Messaging\StreamBlurbs
+                method.
+
+        """
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'connect' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'Connect')
+            # A stream of requests cannot be sent again, so the call is
+            # never retried by default.
+            self._inner_api_calls['connect'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    self._client._transport.connect,
+                    default_retry=None,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'Connect', None)
+        rpc = self._inner_api_calls['connect']
+
+        # Send the request. The stream is set up once the returned
+        # coroutine is awaited.
+        response = rpc(
+            requests,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # Done; return the response.
+        return response
+
+
+__all__ = (
+    'MessagingAsyncClient',
+)
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Create many blurbs over concurrent ``SendBlurbs`` streams.
+
+``SendBlurbs`` only reports the names it created once the whole stream
+has been closed, so the input is cut into chunks of bounded size and each
+chunk is sent as a stream of its own. A chunk is acknowledged when its
+stream closes; the chunks acknowledged before a failed one are kept.
+
+The server creates each blurb as it reads it, so a stream that fails may
+already have created some of its chunk's blurbs. A failed chunk is
+therefore not sent again unless a retry is given, and a chunk sent again
+from its start may create those blurbs twice.
+"""
+
+from concurrent import futures
+import itertools
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from google.api_core import exceptions        # type: ignore
+from google.api_core import retry as retries  # type: ignore
+
+from google.showcase_v1beta1.types import messaging
+
+
+class BulkCreateBlurbsResult:
+    """The outcome of :meth:`~.MessagingClient.bulk_create_blurbs`.
+
+    Attributes:
+        names (List[Optional[str]]): The name of the blurb created for
+            each input blurb, in input order; ``None`` where it failed.
+        errors (Dict[int, Exception]): The error for each input blurb that
+            could not be created, keyed by its position in the input.
+        streams (int): How many ``SendBlurbs`` streams were opened,
+            counting the ones that were retried.
+        retries (int): How many streams failed and were retried.
+        elapsed (float): The wall time taken, in seconds.
+    """
+    def __init__(self) -> None:
+        self.names = []  # type: List[Optional[str]]
+        self.errors = {}  # type: Dict[int, Exception]
+        self.streams = 0
+        self.retries = 0
+        self.elapsed = 0.0
+
+    @property
+    def created(self) -> int:
+        """The number of blurbs created."""
+        return sum(name is not None for name in self.names)
+
+    @property
+    def blurbs_per_second(self) -> float:
+        """The rate at which blurbs were created."""
+        return self.created / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self) -> str:
+        return '{0}<created={1}, failed={2}, streams={3}, retries={4}, elapsed={5:.3f}s>'.format(
+            self.__class__.__name__, self.created, len(self.errors),
+            self.streams, self.retries, self.elapsed)
+
+
+def create_blurbs(
+        send: Callable[[Iterator[messaging.CreateBlurbRequest]],
+            messaging.SendBlurbsResponse],
+        parent: str,
+        blurbs: Iterable[messaging.Blurb],
+        *,
+        chunk_size: int,
+        max_concurrent_streams: int,
+        retry: Optional[retries.Retry],
+        ) -> BulkCreateBlurbsResult:
+    """Create ``blurbs`` under ``parent``, one ``send`` stream per chunk.
+
+    The input is read lazily; at most ``max_concurrent_streams`` chunks
+    are held in memory at a time.
+    """
+    if chunk_size < 1:
+        raise ValueError('The chunk size must be at least 1.')
+    if max_concurrent_streams < 1:
+        raise ValueError('At least one stream must be allowed.')
+
+    result = BulkCreateBlurbsResult()
+    lock = threading.Lock()
+
+    def send_chunk(chunk):
+        attempts = itertools.count()
+
+        def attempt():
+            # Every attempt after the first is a retry.
+            with lock:
+                result.streams += 1
+                if next(attempts):
+                    result.retries += 1
+            # A fresh request iterator each time; a retry starts over.
+            return send(
+                messaging.CreateBlurbRequest(parent=parent, blurb=blurb)
+                for blurb in chunk
+            )
+
+        if retry is None:
+            return attempt()
+        return retry(attempt)()
+
+    began = time.monotonic()
+    blurbs = iter(blurbs)
+    in_flight = {}  # type: Dict[futures.Future, range]
+    with futures.ThreadPoolExecutor(
+            max_workers=max_concurrent_streams,
+            thread_name_prefix='SendBlurbs') as executor:
+        while True:
+            # Top up the streams in flight with the next chunks of input.
+            while len(in_flight) < max_concurrent_streams:
+                chunk = list(itertools.islice(blurbs, chunk_size))
+                if not chunk:
+                    break
+                positions = range(len(result.names),
+                                  len(result.names) + len(chunk))
+                result.names.extend([None] * len(chunk))
+                in_flight[executor.submit(send_chunk, chunk)] = positions
+            if not in_flight:
+                break
+
+            done, _ = futures.wait(in_flight,
+                                   return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                positions = in_flight.pop(future)
+                try:
+                    response = future.result()
+                except (exceptions.GoogleAPICallError,
+                        exceptions.RetryError) as exc:
+                    for position in positions:
+                        result.errors[position] = exc
+                else:
+                    for position, name in zip(positions, response.names):
+                        result.names[position] = name
+    result.elapsed = time.monotonic() - began
+    return result
+
+
+__all__ = (
+    'BulkCreateBlurbsResult',
+    'create_blurbs',
+)
@@ -16,8 +16,8 @@
 #
 
 from collections import OrderedDict
-from typing import Dict, Sequence, Tuple, Type, Union
-import pkg_resources
+import functools
+from typing import Callable, Dict, Iterable, Sequence, Tuple, Type, Union
 
 import google.api_core.client_options as ClientOptions # type: ignore
 from google.api_core import exceptions                 # type: ignore
@@ -28,12 +28,34 @@ from google.oauth2 import service_account              # type: ignore
 
 from google.api_core import operation
 from google.protobuf import field_mask_pb2 as field_mask  # type: ignore
+from google.protobuf import message as protobuf_message  # type: ignore
 from google.protobuf import timestamp_pb2 as timestamp  # type: ignore
+from google.showcase_v1beta1 import fan_out
+from google.showcase_v1beta1 import governor
+from google.showcase_v1beta1 import hedging
+from google.showcase_v1beta1 import raw_protobuf
+from google.showcase_v1beta1 import resumable_stream
+from google.showcase_v1beta1 import retry_budget
+from google.showcase_v1beta1 import service_config
+from google.showcase_v1beta1.governor import Governor
+from google.showcase_v1beta1.hedging import HedgingPolicy
+from google.showcase_v1beta1.operation_poller import OperationPoller
+from google.showcase_v1beta1.operation_poller import PolledOperation
+from google.showcase_v1beta1.response_cache import ResponseCache
+from google.showcase_v1beta1.retry_budget import RetryBudget
+from google.showcase_v1beta1.services.messaging import bulk
+from google.showcase_v1beta1.services.messaging import connect
 from google.showcase_v1beta1.services.messaging import pagers
+from google.showcase_v1beta1.services.messaging import resumable
 from google.showcase_v1beta1.types import messaging
 
 from .transports.base import MessagingTransport
 from .transports.grpc import MessagingGrpcTransport
+from .transports.grpc_asyncio import MessagingGrpcAsyncIOTransport
+
+
+# The service's full name, as the service config knows it.
+_SERVICE = 'google.showcase.v1beta1.Messaging'
 
 
 class MessagingClientMeta(type):
@@ -45,6 +67,7 @@ class MessagingClientMeta(type):
     """
     _transport_registry = OrderedDict()  # type: Dict[str, Type[MessagingTransport]]
     _transport_registry['grpc'] = MessagingGrpcTransport
+    _transport_registry['grpc_asyncio'] = MessagingGrpcAsyncIOTransport
 
     def get_transport_class(cls,
             label: str = None,
@@ -110,6 +133,13 @@ class MessagingClient(metaclass=MessagingClientMeta):
             credentials: credentials.Credentials = None,
             transport: Union[str, MessagingTransport] = None,
             client_options: ClientOptions = DEFAULT_OPTIONS,
+            take_request_ownership: bool = False,
+            page_prefetch_depth: int = 0,
+            response_cache: ResponseCache = None,
+            operation_poller: OperationPoller = None,
+            hedging_policy: HedgingPolicy = None,
+            governor: Governor = None,
+            retry_budget: RetryBudget = None,
             ) -> None:
         """Instantiate the messaging client.
 
@@ -123,6 +153,33 @@ class MessagingClient(metaclass=MessagingClientMeta):
                 transport to use. If set to None, a transport is chosen
                 automatically.
             client_options (ClientOptions): Custom options for the client.
+            take_request_ownership (bool): If True, the caller hands over
+                every request message it passes to this client, and must
+                not use it again afterwards. This lets paged methods
+                advance the request's ``page_token`` in place instead of
+                copying the request first.
+            page_prefetch_depth (int): If set, the pagers returned by paged
+                methods request the following pages in the background, and
+                hold up to this many pages ahead of the caller. This hides
+                the round trip at each page boundary on high-latency links.
+            response_cache (~.ResponseCache): If set, resources fetched by
+                name are served from this cache while they are fresh. The
+                client drops a resource from it when it updates or deletes
+                that resource.
+            operation_poller (~.OperationPoller): If set, the futures of
+                long-running methods are tracked by this poller, on its one
+                polling thread, instead of each polling on its own.
+            hedging_policy (~.HedgingPolicy): If set, the unary methods
+                the service config allows to retry are hedged: a call with
+                no answer in time is sent again, and the first answer is
+                used.
+            governor (~.Governor): If set, every attempt of a unary
+                method waits for the governor to let it through, within
+                the rate and concurrency limits of its method.
+            retry_budget (~.RetryBudget): If set, the calls are retried
+                only while their retries are few next to their requests,
+                as the budget allows; past that, a failed call raises its
+                error at once.
         """
         if isinstance(client_options, dict):
             client_options = ClientOptions.from_dict(client_options)
@@ -142,15 +199,42 @@ class MessagingClient(metaclass=MessagingClientMeta):
                 host=client_options.api_endpoint or 'localhost:7469',
             )
 
+        # Save a dictionary of cached API call functions.
+        # These are the actual callables which invoke the proper
+        # transport methods, wrapped with `wrap_method` to add retry,
+        # timeout, and the like.
+        self._inner_api_calls = {}  # type: Dict[str, Callable]
+
+        # Save whether request messages may be modified once they are sent.
+        self._take_request_ownership = take_request_ownership
+
+        # Save how many pages the pagers may fetch ahead of the caller.
+        self._page_prefetch_depth = page_prefetch_depth
+
+        # Save the cache of resources fetched by name, if any.
+        self._response_cache = response_cache
+
+        # Save the poller of long-running operations, if any.
+        self._operation_poller = operation_poller
+
+        # Save the hedging policy of the idempotent reads, if any.
+        self._hedging_policy = hedging_policy
+
+        # Save the governor of the unary calls, if any.
+        self._governor = governor
+
+        # Save the retry budget of the calls, if any.
+        self._retry_budget = retry_budget
+
     def create_room(self,
             request: messaging.CreateRoomRequest = None,
             *,
             display_name: str = None,
             description: str = None,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
-            ) -> messaging.Room:
+            ) -> Union[messaging.Room, protobuf_message.Message]:
         r"""Creates a room.
 
         Args:
@@ -186,8 +270,13 @@ class MessagingClient(metaclass=MessagingClientMeta):
                              'the individual field arguments should be set.')
 
         # If we have keyword arguments corresponding to fields on the
-        # request, apply these.
-        request = messaging.CreateRoomRequest(request)
+        # request, apply these. Without any, a request of exactly this
+        # type is used as-is rather than copied.
+        # A raw protobuf request is wrapped in its proto-plus type.
+        request = raw_protobuf.wrap(messaging.CreateRoomRequest, request)
+        if (not isinstance(request, messaging.CreateRoomRequest) or
+                any(arg is not None for arg in (display_name, description))):
+            request = messaging.CreateRoomRequest(request)
         if display_name is not None:
             request.room.display_name = display_name
         if description is not None:
@@ -195,11 +284,18 @@ class MessagingClient(metaclass=MessagingClientMeta):
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.create_room,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'create_room' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'CreateRoom')
+            self._inner_api_calls['create_room'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    governor.wrap(self._transport.create_room, self._governor,
+                                  _SERVICE, 'CreateRoom'),
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'CreateRoom', config.retry)
+        rpc = self._inner_api_calls['create_room']
 
         # Send the request.
         response = rpc(
@@ -217,9 +313,9 @@ class MessagingClient(metaclass=MessagingClientMeta):
             *,
             name: str = None,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
-            ) -> messaging.Room:
+            ) -> Union[messaging.Room, protobuf_message.Message]:
         r"""Retrieves the Room with the given resource name.
 
         Args:
@@ -250,18 +346,38 @@ class MessagingClient(metaclass=MessagingClientMeta):
                              'the individual field arguments should be set.')
 
         # If we have keyword arguments corresponding to fields on the
-        # request, apply these.
-        request = messaging.GetRoomRequest(request)
+        # request, apply these. Without any, a request of exactly this
+        # type is used as-is rather than copied.
+        # A raw protobuf request is wrapped in its proto-plus type.
+        request = raw_protobuf.wrap(messaging.GetRoomRequest, request)
+        if (not isinstance(request, messaging.GetRoomRequest) or
+                any(arg is not None for arg in (name,))):
+            request = messaging.GetRoomRequest(request)
         if name is not None:
             request.name = name
 
+        # Serve the room from the response cache, if it is there.
+        if self._response_cache is not None:
+            response, generation = self._response_cache.lookup(request.name)
+            if response is not None:
+                return response
+
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.get_room,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'get_room' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'GetRoom')
+            self._inner_api_calls['get_room'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    governor.wrap(
+                        hedging.wrap(self._transport.get_room, self._hedging_policy,
+                                     _SERVICE, 'GetRoom'),
+                        self._governor, _SERVICE, 'GetRoom'),
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'GetRoom', config.retry)
+        rpc = self._inner_api_calls['get_room']
 
         # Certain fields should be provided within the metadata header;
         # add these here.
@@ -279,6 +395,10 @@ class MessagingClient(metaclass=MessagingClientMeta):
             metadata=metadata,
         )
 
+        # Keep the room for the next lookup.
+        if self._response_cache is not None:
+            self._response_cache.put(request.name, response, generation)
+
         # Done; return the response.
         return response
 
@@ -286,9 +406,9 @@ class MessagingClient(metaclass=MessagingClientMeta):
             request: messaging.UpdateRoomRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
-            ) -> messaging.Room:
+            ) -> Union[messaging.Room, protobuf_message.Message]:
         r"""Updates a room.
 
         Args:
@@ -306,23 +426,40 @@ class MessagingClient(metaclass=MessagingClientMeta):
                 A chat room.
         """
         # Create or coerce a protobuf request object.
-        request = messaging.UpdateRoomRequest(request)
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        # A raw protobuf request is wrapped in its proto-plus type.
+        request = raw_protobuf.wrap(messaging.UpdateRoomRequest, request)
+        if not isinstance(request, messaging.UpdateRoomRequest):
+            request = messaging.UpdateRoomRequest(request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.update_room,
-            default_timeout=None,
-            client_info=_client_info,
-        )
-
-        # Send the request.
-        response = rpc(
-            request,
-            retry=retry,
-            timeout=timeout,
-            metadata=metadata,
-        )
+        if 'update_room' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'UpdateRoom')
+            self._inner_api_calls['update_room'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    governor.wrap(self._transport.update_room, self._governor,
+                                  _SERVICE, 'UpdateRoom'),
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'UpdateRoom', config.retry)
+        rpc = self._inner_api_calls['update_room']
+
+        # Send the request. Whatever the outcome, a cached copy of the
+        # room may now be stale.
+        try:
+            response = rpc(
+                request,
+                retry=retry,
+                timeout=timeout,
+                metadata=metadata,
+            )
+        finally:
+            if self._response_cache is not None:
+                self._response_cache.invalidate(request.room.name)
 
         # Done; return the response.
         return response
@@ -332,7 +469,7 @@ class MessagingClient(metaclass=MessagingClientMeta):
             *,
             name: str = None,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> None:
         r"""Deletes a room and all of its blurbs.
@@ -361,32 +498,49 @@ class MessagingClient(metaclass=MessagingClientMeta):
                              'the individual field arguments should be set.')
 
         # If we have keyword arguments corresponding to fields on the
-        # request, apply these.
-        request = messaging.DeleteRoomRequest(request)
+        # request, apply these. Without any, a request of exactly this
+        # type is used as-is rather than copied.
+        # A raw protobuf request is wrapped in its proto-plus type.
+        request = raw_protobuf.wrap(messaging.DeleteRoomRequest, request)
+        if (not isinstance(request, messaging.DeleteRoomRequest) or
+                any(arg is not None for arg in (name,))):
+            request = messaging.DeleteRoomRequest(request)
         if name is not None:
             request.name = name
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.delete_room,
-            default_timeout=None,
-            client_info=_client_info,
-        )
-
-        # Send the request.
-        rpc(
-            request,
-            retry=retry,
-            timeout=timeout,
-            metadata=metadata,
-        )
+        if 'delete_room' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'DeleteRoom')
+            self._inner_api_calls['delete_room'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    governor.wrap(self._transport.delete_room, self._governor,
+                                  _SERVICE, 'DeleteRoom'),
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'DeleteRoom', config.retry)
+        rpc = self._inner_api_calls['delete_room']
+
+        # Send the request. Whatever the outcome, a cached copy of the
+        # room may now be stale.
+        try:
+            rpc(
+                request,
+                retry=retry,
+                timeout=timeout,
+                metadata=metadata,
+            )
+        finally:
+            if self._response_cache is not None:
+                self._response_cache.invalidate(request.name, descendants=True)
 
     def list_rooms(self,
             request: messaging.ListRoomsRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> pagers.ListRoomsPager:
         r"""Lists all chat rooms.
@@ -412,15 +566,33 @@ class MessagingClient(metaclass=MessagingClientMeta):
 
         """
         # Create or coerce a protobuf request object.
-        request = messaging.ListRoomsRequest(request)
+        # A request of exactly this type is used as-is rather than copied.
+        # It then still belongs to the caller, so the pager (which
+        # advances `page_token` in place) works on a copy of it, unless
+        # the caller has handed ownership of its requests to the client.
+        owns_request = self._take_request_ownership
+        # A raw protobuf request is wrapped in its proto-plus type.
+        request = raw_protobuf.wrap(messaging.ListRoomsRequest, request)
+        if not isinstance(request, messaging.ListRoomsRequest):
+            request = messaging.ListRoomsRequest(request)
+            owns_request = True
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.list_rooms,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'list_rooms' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'ListRooms')
+            self._inner_api_calls['list_rooms'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    governor.wrap(
+                        hedging.wrap(self._transport.list_rooms, self._hedging_policy,
+                                     _SERVICE, 'ListRooms'),
+                        self._governor, _SERVICE, 'ListRooms'),
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'ListRooms', config.retry)
+        rpc = self._inner_api_calls['list_rooms']
 
         # Send the request.
         response = rpc(
@@ -436,6 +608,8 @@ class MessagingClient(metaclass=MessagingClientMeta):
             method=rpc,
             request=request,
             response=response,
+            owns_request=owns_request,
+            prefetch_depth=self._page_prefetch_depth,
         )
 
         # Done; return the response.
@@ -449,9 +623,9 @@ class MessagingClient(metaclass=MessagingClientMeta):
             text: str = None,
             image: bytes = None,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
-            ) -> messaging.Blurb:
+            ) -> Union[messaging.Blurb, protobuf_message.Message]:
         r"""Creates a blurb. If the parent is a room, the blurb
         is understood to be a message in that room. If the
         parent is a profile, the blurb is understood to be a
@@ -505,8 +679,13 @@ class MessagingClient(metaclass=MessagingClientMeta):
                              'the individual field arguments should be set.')
 
         # If we have keyword arguments corresponding to fields on the
-        # request, apply these.
-        request = messaging.CreateBlurbRequest(request)
+        # request, apply these. Without any, a request of exactly this
+        # type is used as-is rather than copied.
+        # A raw protobuf request is wrapped in its proto-plus type.
+        request = raw_protobuf.wrap(messaging.CreateBlurbRequest, request)
+        if (not isinstance(request, messaging.CreateBlurbRequest) or
+                any(arg is not None for arg in (parent, user, text, image))):
+            request = messaging.CreateBlurbRequest(request)
         if parent is not None:
             request.parent = parent
         if user is not None:
@@ -518,11 +697,18 @@ class MessagingClient(metaclass=MessagingClientMeta):
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.create_blurb,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'create_blurb' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'CreateBlurb')
+            self._inner_api_calls['create_blurb'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    governor.wrap(self._transport.create_blurb, self._governor,
+                                  _SERVICE, 'CreateBlurb'),
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'CreateBlurb', config.retry)
+        rpc = self._inner_api_calls['create_blurb']
 
         # Send the request.
         response = rpc(
@@ -540,9 +726,9 @@ class MessagingClient(metaclass=MessagingClientMeta):
             *,
             name: str = None,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
-            ) -> messaging.Blurb:
+            ) -> Union[messaging.Blurb, protobuf_message.Message]:
         r"""Retrieves the Blurb with the given resource name.
 
         Args:
@@ -576,18 +762,38 @@ class MessagingClient(metaclass=MessagingClientMeta):
                              'the individual field arguments should be set.')
 
         # If we have keyword arguments corresponding to fields on the
-        # request, apply these.
-        request = messaging.GetBlurbRequest(request)
+        # request, apply these. Without any, a request of exactly this
+        # type is used as-is rather than copied.
+        # A raw protobuf request is wrapped in its proto-plus type.
+        request = raw_protobuf.wrap(messaging.GetBlurbRequest, request)
+        if (not isinstance(request, messaging.GetBlurbRequest) or
+                any(arg is not None for arg in (name,))):
+            request = messaging.GetBlurbRequest(request)
         if name is not None:
             request.name = name
 
+        # Serve the blurb from the response cache, if it is there.
+        if self._response_cache is not None:
+            response, generation = self._response_cache.lookup(request.name)
+            if response is not None:
+                return response
+
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.get_blurb,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'get_blurb' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'GetBlurb')
+            self._inner_api_calls['get_blurb'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    governor.wrap(
+                        hedging.wrap(self._transport.get_blurb, self._hedging_policy,
+                                     _SERVICE, 'GetBlurb'),
+                        self._governor, _SERVICE, 'GetBlurb'),
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'GetBlurb', config.retry)
+        rpc = self._inner_api_calls['get_blurb']
 
         # Certain fields should be provided within the metadata header;
         # add these here.
@@ -605,6 +811,10 @@ class MessagingClient(metaclass=MessagingClientMeta):
             metadata=metadata,
         )
 
+        # Keep the blurb for the next lookup.
+        if self._response_cache is not None:
+            self._response_cache.put(request.name, response, generation)
+
         # Done; return the response.
         return response
 
@@ -612,9 +822,9 @@ class MessagingClient(metaclass=MessagingClientMeta):
             request: messaging.UpdateBlurbRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
-            ) -> messaging.Blurb:
+            ) -> Union[messaging.Blurb, protobuf_message.Message]:
         r"""Updates a blurb.
 
         Args:
@@ -635,23 +845,40 @@ class MessagingClient(metaclass=MessagingClientMeta):
 
         """
         # Create or coerce a protobuf request object.
-        request = messaging.UpdateBlurbRequest(request)
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        # A raw protobuf request is wrapped in its proto-plus type.
+        request = raw_protobuf.wrap(messaging.UpdateBlurbRequest, request)
+        if not isinstance(request, messaging.UpdateBlurbRequest):
+            request = messaging.UpdateBlurbRequest(request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.update_blurb,
-            default_timeout=None,
-            client_info=_client_info,
-        )
-
-        # Send the request.
-        response = rpc(
-            request,
-            retry=retry,
-            timeout=timeout,
-            metadata=metadata,
-        )
+        if 'update_blurb' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'UpdateBlurb')
+            self._inner_api_calls['update_blurb'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    governor.wrap(self._transport.update_blurb, self._governor,
+                                  _SERVICE, 'UpdateBlurb'),
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'UpdateBlurb', config.retry)
+        rpc = self._inner_api_calls['update_blurb']
+
+        # Send the request. Whatever the outcome, a cached copy of the
+        # blurb may now be stale.
+        try:
+            response = rpc(
+                request,
+                retry=retry,
+                timeout=timeout,
+                metadata=metadata,
+            )
+        finally:
+            if self._response_cache is not None:
+                self._response_cache.invalidate(request.blurb.name)
 
         # Done; return the response.
         return response
@@ -661,7 +888,7 @@ class MessagingClient(metaclass=MessagingClientMeta):
             *,
             name: str = None,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> None:
         r"""Deletes a blurb.
@@ -690,33 +917,50 @@ class MessagingClient(metaclass=MessagingClientMeta):
                              'the individual field arguments should be set.')
 
         # If we have keyword arguments corresponding to fields on the
-        # request, apply these.
-        request = messaging.DeleteBlurbRequest(request)
+        # request, apply these. Without any, a request of exactly this
+        # type is used as-is rather than copied.
+        # A raw protobuf request is wrapped in its proto-plus type.
+        request = raw_protobuf.wrap(messaging.DeleteBlurbRequest, request)
+        if (not isinstance(request, messaging.DeleteBlurbRequest) or
+                any(arg is not None for arg in (name,))):
+            request = messaging.DeleteBlurbRequest(request)
         if name is not None:
             request.name = name
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.delete_blurb,
-            default_timeout=None,
-            client_info=_client_info,
-        )
-
-        # Send the request.
-        rpc(
-            request,
-            retry=retry,
-            timeout=timeout,
-            metadata=metadata,
-        )
+        if 'delete_blurb' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'DeleteBlurb')
+            self._inner_api_calls['delete_blurb'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    governor.wrap(self._transport.delete_blurb, self._governor,
+                                  _SERVICE, 'DeleteBlurb'),
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'DeleteBlurb', config.retry)
+        rpc = self._inner_api_calls['delete_blurb']
+
+        # Send the request. Whatever the outcome, a cached copy of the
+        # blurb may now be stale.
+        try:
+            rpc(
+                request,
+                retry=retry,
+                timeout=timeout,
+                metadata=metadata,
+            )
+        finally:
+            if self._response_cache is not None:
+                self._response_cache.invalidate(request.name, descendants=True)
 
     def list_blurbs(self,
             request: messaging.ListBlurbsRequest = None,
             *,
             parent: str = None,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> pagers.ListBlurbsPager:
         r"""Lists blurbs for a specific chat room or user profile
@@ -756,18 +1000,37 @@ class MessagingClient(metaclass=MessagingClientMeta):
                              'the individual field arguments should be set.')
 
         # If we have keyword arguments corresponding to fields on the
-        # request, apply these.
-        request = messaging.ListBlurbsRequest(request)
+        # request, apply these. Without any, a request of exactly this
+        # type is used as-is rather than copied.
+        # A reused request still belongs to the caller, so the pager (which
+        # advances `page_token` in place) works on a copy of it, unless
+        # the caller has handed ownership of its requests to the client.
+        owns_request = self._take_request_ownership
+        # A raw protobuf request is wrapped in its proto-plus type.
+        request = raw_protobuf.wrap(messaging.ListBlurbsRequest, request)
+        if (not isinstance(request, messaging.ListBlurbsRequest) or
+                any(arg is not None for arg in (parent,))):
+            request = messaging.ListBlurbsRequest(request)
+            owns_request = True
         if parent is not None:
             request.parent = parent
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.list_blurbs,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'list_blurbs' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'ListBlurbs')
+            self._inner_api_calls['list_blurbs'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    governor.wrap(
+                        hedging.wrap(self._transport.list_blurbs, self._hedging_policy,
+                                     _SERVICE, 'ListBlurbs'),
+                        self._governor, _SERVICE, 'ListBlurbs'),
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'ListBlurbs', config.retry)
+        rpc = self._inner_api_calls['list_blurbs']
 
         # Certain fields should be provided within the metadata header;
         # add these here.
@@ -791,6 +1054,8 @@ class MessagingClient(metaclass=MessagingClientMeta):
             method=rpc,
             request=request,
             response=response,
+            owns_request=owns_request,
+            prefetch_depth=self._page_prefetch_depth,
         )
 
         # Done; return the response.
@@ -801,9 +1066,9 @@ class MessagingClient(metaclass=MessagingClientMeta):
             *,
             query: str = None,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
-            ) -> operation.Operation:
+            ) -> Union[operation.Operation, PolledOperation]:
         r"""This method searches through all blurbs across all
         rooms and profiles for blurbs containing to words found
         in the query. Only posts that contain an exact match of
@@ -828,7 +1093,7 @@ class MessagingClient(metaclass=MessagingClientMeta):
                 sent along with the request as metadata.
 
         Returns:
-            ~.operation.Operation:
+            Union[~.operation.Operation, ~.PolledOperation]:
                 An object representing a long-running operation.
 
                 The result type for the operation will be
@@ -836,6 +1101,13 @@ class MessagingClient(metaclass=MessagingClientMeta):
                 operation response message for the
                 google.showcase.v1beta1.Messaging\SearchBlurbs method.
 
+                With an ``operation_poller``, it is a
+                :class:`~.PolledOperation` instead: a
+                :class:`concurrent.futures.Future` whose ``result()``
+                takes no ``retry``, and whose ``cancel()`` and
+                ``cancelled()`` stop and report the polling, not the
+                operation on the server.
+
         """
         # Create or coerce a protobuf request object.
         # Sanity check: If we got a request object, we should *not* have
@@ -845,18 +1117,30 @@ class MessagingClient(metaclass=MessagingClientMeta):
                              'the individual field arguments should be set.')
 
         # If we have keyword arguments corresponding to fields on the
-        # request, apply these.
-        request = messaging.SearchBlurbsRequest(request)
+        # request, apply these. Without any, a request of exactly this
+        # type is used as-is rather than copied.
+        # A raw protobuf request is wrapped in its proto-plus type.
+        request = raw_protobuf.wrap(messaging.SearchBlurbsRequest, request)
+        if (not isinstance(request, messaging.SearchBlurbsRequest) or
+                any(arg is not None for arg in (query,))):
+            request = messaging.SearchBlurbsRequest(request)
         if query is not None:
             request.query = query
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.search_blurbs,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'search_blurbs' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'SearchBlurbs')
+            self._inner_api_calls['search_blurbs'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    governor.wrap(self._transport.search_blurbs, self._governor,
+                                  _SERVICE, 'SearchBlurbs'),
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'SearchBlurbs', config.retry)
+        rpc = self._inner_api_calls['search_blurbs']
 
         # Send the request.
         response = rpc(
@@ -866,7 +1150,15 @@ class MessagingClient(metaclass=MessagingClientMeta):
             metadata=metadata,
         )
 
-        # Wrap the response in an operation future.
+        # Wrap the response in an operation future; the shared poller's,
+        # if there is one.
+        if self._operation_poller is not None:
+            return self._operation_poller.track(
+                self._transport.operations_client,
+                response,
+                messaging.SearchBlurbsResponse,
+                metadata_type=messaging.SearchBlurbsMetadata,
+            )
         response = operation.from_gapic(
             response,
             self._transport.operations_client,
@@ -881,9 +1173,9 @@ class MessagingClient(metaclass=MessagingClientMeta):
             request: messaging.StreamBlurbsRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
-            ) -> messaging.StreamBlurbsResponse:
+            ) -> Union[messaging.StreamBlurbsResponse, protobuf_message.Message]:
         r"""This returns a stream that emits the blurbs that are
         created for a particular chat room or user profile.
 
@@ -905,15 +1197,26 @@ class MessagingClient(metaclass=MessagingClientMeta):
 
         """
         # Create or coerce a protobuf request object.
-        request = messaging.StreamBlurbsRequest(request)
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        # A raw protobuf request is wrapped in its proto-plus type.
+        request = raw_protobuf.wrap(messaging.StreamBlurbsRequest, request)
+        if not isinstance(request, messaging.StreamBlurbsRequest):
+            request = messaging.StreamBlurbsRequest(request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.stream_blurbs,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'stream_blurbs' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'StreamBlurbs')
+            self._inner_api_calls['stream_blurbs'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    self._transport.stream_blurbs,
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'StreamBlurbs', config.retry)
+        rpc = self._inner_api_calls['stream_blurbs']
 
         # Send the request.
         response = rpc(
@@ -926,13 +1229,84 @@ class MessagingClient(metaclass=MessagingClientMeta):
         # Done; return the response.
         return response
 
+    def resumable_stream_blurbs(self,
+            request: messaging.StreamBlurbsRequest = None,
+            *,
+            retry: retries.Retry = resumable_stream.DEFAULT_RETRY,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> resumable.ResumableStreamBlurbs:
+        r"""Call :meth:`stream_blurbs`, reopening the stream if it drops.
+
+        When the stream fails with an error accepted by ``retry``, it is
+        opened again after a backoff. The blurbs created or updated while
+        it was down are then listed and delivered as ``CREATE`` or
+        ``UPDATE`` events, and the events seen before are not repeated.
+        Blurbs deleted while it was down are not reported, nor are the
+        changes made before the stream delivered its first event.
+
+        Args:
+            request (:class:`~.messaging.StreamBlurbsRequest`):
+                The request object. The request message for the
+                google.showcase.v1beta1.Messaging\StreamBlurbs method.
+            retry (google.api_core.retry.Retry): Designation of what errors,
+                if any, should reopen the stream, and how long to back off.
+            timeout (float): The timeout for each attempt.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with each attempt, and each listing, as
+                metadata.
+
+        Returns:
+            ~.resumable.ResumableStreamBlurbs:
+                An iterator over the response messages, whose
+                ``trailing_metadata()`` is that of the attempt that
+                finished the stream.
+        """
+        # A raw protobuf request is wrapped in its proto-plus type.
+        request = raw_protobuf.wrap(messaging.StreamBlurbsRequest, request)
+        if not isinstance(request, messaging.StreamBlurbsRequest):
+            request = messaging.StreamBlurbsRequest(request)
+
+        return resumable.ResumableStreamBlurbs(
+            lambda request: self.stream_blurbs(
+                request,
+                # The attempts are retried here, not by the method.
+                retry=None,
+                timeout=timeout,
+                metadata=metadata,
+            ),
+            lambda name: self.list_blurbs(
+                parent=name,
+                metadata=metadata,
+            ),
+            request,
+            retry,
+        )
+
+    def _send_blurbs_rpc(self) -> Callable:
+        # The wrapped SendBlurbs method, shared by send_blurbs() and
+        # bulk_create_blurbs().
+        if 'send_blurbs' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'SendBlurbs')
+            # A stream of requests cannot be sent again, so the call is
+            # never retried by default.
+            self._inner_api_calls['send_blurbs'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    self._transport.send_blurbs,
+                    default_retry=None,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'SendBlurbs', None)
+        return self._inner_api_calls['send_blurbs']
+
     def send_blurbs(self,
             request: messaging.CreateBlurbRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
-            ) -> messaging.SendBlurbsResponse:
+            ) -> Union[messaging.SendBlurbsResponse, protobuf_message.Message]:
         r"""This is a stream to create multiple blurbs. If an
         invalid blurb is requested to be created, the stream
         will close with an error.
@@ -955,15 +1329,16 @@ class MessagingClient(metaclass=MessagingClientMeta):
 
         """
         # Create or coerce a protobuf request object.
-        request = messaging.CreateBlurbRequest(request)
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        # A raw protobuf request is wrapped in its proto-plus type.
+        request = raw_protobuf.wrap(messaging.CreateBlurbRequest, request)
+        if not isinstance(request, messaging.CreateBlurbRequest):
+            request = messaging.CreateBlurbRequest(request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.send_blurbs,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        rpc = self._send_blurbs_rpc()
 
         # Send the request.
         response = rpc(
@@ -976,13 +1351,123 @@ class MessagingClient(metaclass=MessagingClientMeta):
         # Done; return the response.
         return response
 
+    def bulk_create_blurbs(self,
+            parent: str,
+            blurbs: Iterable[messaging.Blurb],
+            *,
+            chunk_size: int = 100,
+            max_concurrent_streams: int = 4,
+            retry: retries.Retry = None,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> bulk.BulkCreateBlurbsResult:
+        r"""Create many blurbs over concurrent ``SendBlurbs`` streams.
+
+        The blurbs are cut into chunks of ``chunk_size``, and each chunk
+        is sent on a ``SendBlurbs`` stream of its own, with up to
+        ``max_concurrent_streams`` streams open at once. A chunk whose
+        stream fails is reported in the result, and the other chunks
+        carry on; the chunks acknowledged before it are kept.
+
+        The server creates each blurb as it reads it, so a failed stream
+        may have created some of its chunk's blurbs. Only if ``retry`` is
+        given is a failed chunk sent again from its start, which may
+        create those blurbs twice.
+
+        Args:
+            parent (str): The resource name of the chat room or user
+                profile that the blurbs will be tied to.
+            blurbs (Iterable[~.messaging.Blurb]): The blurbs to create.
+                They are read lazily.
+            chunk_size (int): The most blurbs to send on one stream.
+            max_concurrent_streams (int): The most streams open at once.
+            retry (Optional[google.api_core.retry.Retry]): Designation
+                of what errors, if any, should make a chunk be sent again;
+                by default, none.
+            timeout (float): The timeout for each stream.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with each stream as metadata.
+
+        Returns:
+            ~.bulk.BulkCreateBlurbsResult:
+                The name created for each blurb, in input order, the
+                errors of the blurbs that failed, and throughput stats.
+        """
+        # Wrap the RPC method; this adds friendly error handling. Retries
+        # are handled per chunk, each with a fresh request stream.
+        rpc = self._send_blurbs_rpc()
+
+        # Send the chunks.
+        return bulk.create_blurbs(
+            lambda requests: rpc(
+                requests,
+                # The attempts are retried here, not by the method.
+                retry=None,
+                timeout=timeout,
+                metadata=metadata,
+            ),
+            parent,
+            blurbs,
+            chunk_size=chunk_size,
+            max_concurrent_streams=max_concurrent_streams,
+            retry=retry,
+        )
+
+    def connect_session(self,
+            parent: str,
+            *,
+            max_queued: int = 100,
+            on_response: Callable[[messaging.StreamBlurbsResponse], None] = None,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> connect.ConnectSession:
+        r"""Open a ``Connect`` stream as a session shared between threads.
+
+        The session sends the ``config`` request first, then the blurbs
+        given to :meth:`~.connect.ConnectSession.send` from any thread.
+        At most ``max_queued`` blurbs wait to be sent, and as many
+        responses wait to be consumed before the stream stops reading.
+
+        Args:
+            parent (str): The room or profile to follow and create
+                blurbs for.
+            max_queued (int): The bound on each direction's queue.
+            on_response (Optional[Callable]): Called with every response
+                as it arrives, instead of queueing it for iteration.
+            timeout (float): The timeout for the stream.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the stream as metadata.
+
+        Returns:
+            ~.connect.ConnectSession:
+                The open session, which iterates over the response
+                messages unless ``on_response`` is set.
+        """
+        # The session uses the bare stub: the wrapped method waits for a
+        # first response before it returns, and none may come until a
+        # blurb is sent. It adds the client's metadata itself, as the
+        # wrapped method would have.
+        if timeout is gapic_v1.method.DEFAULT:
+            timeout = service_config.method_config(_SERVICE, 'Connect').timeout
+        metadata = tuple(metadata) + (_get_client_info().to_grpc_metadata(),)
+        return connect.ConnectSession(
+            lambda requests: self._transport.connect(
+                requests,
+                timeout=timeout,
+                metadata=metadata,
+            ),
+            parent,
+            max_queued=max_queued,
+            on_response=on_response,
+        )
+
     def connect(self,
             request: messaging.ConnectRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
-            ) -> messaging.StreamBlurbsResponse:
+            ) -> Union[messaging.StreamBlurbsResponse, protobuf_message.Message]:
         r"""This method starts a bidirectional stream that
         receives all blurbs that are being created after the
         stream has started and sends requests to create blurbs.
@@ -1007,15 +1492,28 @@ class MessagingClient(metaclass=MessagingClientMeta):
 
         """
         # Create or coerce a protobuf request object.
-        request = messaging.ConnectRequest(request)
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        # A raw protobuf request is wrapped in its proto-plus type.
+        request = raw_protobuf.wrap(messaging.ConnectRequest, request)
+        if not isinstance(request, messaging.ConnectRequest):
+            request = messaging.ConnectRequest(request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.connect,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'connect' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'Connect')
+            # A stream of requests cannot be sent again, so the call is
+            # never retried by default.
+            self._inner_api_calls['connect'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    self._transport.connect,
+                    default_retry=None,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'Connect', None)
+        rpc = self._inner_api_calls['connect']
 
         # Send the request.
         response = rpc(
@@ -1028,18 +1526,68 @@ class MessagingClient(metaclass=MessagingClientMeta):
         # Done; return the response.
         return response
 
+    def fan_out(self,
+            method: str,
+            requests: Iterable,
+            *,
+            max_concurrency: int = 8,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> fan_out.FanOut:
+        r"""Call a ``get_*`` or ``list_*`` method once per request, at once.
 
+        The calls run on a thread pool, at most ``max_concurrency`` at a
+        time, and their outcomes are yielded as they finish; each
+        ``list_*`` call is read to its last page. For example::
 
+            client.fan_out('list_blurbs', [{'parent': n} for n in rooms])
 
+        Args:
+            method (str): The name of the method to call, such as
+                ``'list_blurbs'``.
+            requests (Iterable): The request object, or dict, for each
+                call. They are read lazily.
+            max_concurrency (int): The most calls in flight at once.
+            timeout (float): The timeout for each call.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with each call as metadata.
 
-try:
-    _client_info = gapic_v1.client_info.ClientInfo(
-        gapic_version=pkg_resources.get_distribution(
-            'google-showcase',
-        ).version,
-    )
-except pkg_resources.DistributionNotFound:
-    _client_info = gapic_v1.client_info.ClientInfo()
+        Returns:
+            ~.fan_out.FanOut:
+                An iterator over the outcome of every call, in the order
+                they finish. A call's error is reported in its outcome
+                rather than raised.
+
+        Raises:
+            ValueError: If ``method`` is not a ``get_*`` or ``list_*``
+                method of this client.
+        """
+        return fan_out.fan_out_method(
+            self,
+            method,
+            requests,
+            max_concurrency=max_concurrency,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+
+
+
+
+@functools.lru_cache(maxsize=None)
+def _get_client_info() -> gapic_v1.client_info.ClientInfo:
+    # Looking up the installed version is slow, so it is done when the
+    # first method is wrapped rather than when this module is imported.
+    import pkg_resources
+    try:
+        return gapic_v1.client_info.ClientInfo(
+            gapic_version=pkg_resources.get_distribution(
+                'google-showcase',
+            ).version,
+        )
+    except pkg_resources.DistributionNotFound:
+        return gapic_v1.client_info.ClientInfo()
 
 
 __all__ = (
@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Send and receive blurbs on one ``Connect`` stream.
+
+A :class:`ConnectSession` opens the stream with the ``config`` request the
+server expects first, then sends the blurbs queued with
+:meth:`ConnectSession.send` from any number of threads. Both directions
+are buffered up to a bound: ``send`` refuses a blurb rather than wait
+while the outgoing queue is full, and the stream stops reading while the
+received blurbs are not consumed, which lets gRPC flow control slow the
+server down::
+
+    session = client.connect_session('rooms/lobby')
+    session.send(messaging.Blurb(user='users/me', text='hello'))
+    for response in session:
+        ...
+"""
+
+import collections
+import threading
+import time
+from typing import Callable, Iterator, Optional
+
+import grpc  # type: ignore
+
+from google.api_core import exceptions  # type: ignore
+
+from google.showcase_v1beta1.types import messaging
+
+
+class SessionClosedError(Exception):
+    """The session takes no more blurbs, as it was closed or it failed."""
+
+
+class ConnectSessionStats:
+    """How much went through a :class:`ConnectSession`, and how much waited.
+
+    Attributes:
+        sent (int): The blurbs sent to the server.
+        received (int): The responses received from the server.
+        rejected (int): The blurbs refused because the queue was full.
+        send_queue_depth (int): The blurbs waiting to be sent.
+        max_send_queue_depth (int): The most blurbs that waited to be sent.
+        receive_queue_depth (int): The responses waiting to be consumed.
+        max_receive_queue_depth (int): The most responses that waited to
+            be consumed.
+        elapsed (float): The seconds since the session was opened.
+    """
+    def __init__(self) -> None:
+        self.sent = 0
+        self.received = 0
+        self.rejected = 0
+        self.send_queue_depth = 0
+        self.max_send_queue_depth = 0
+        self.receive_queue_depth = 0
+        self.max_receive_queue_depth = 0
+        self.elapsed = 0.0
+
+    @property
+    def sent_per_second(self) -> float:
+        """The rate at which blurbs were sent."""
+        return self.sent / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def received_per_second(self) -> float:
+        """The rate at which responses were received."""
+        return self.received / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self) -> str:
+        return '{0}<sent={1}, received={2}, rejected={3}, elapsed={4:.3f}s>'.format(
+            self.__class__.__name__, self.sent, self.received,
+            self.rejected, self.elapsed)
+
+
+class ConnectSession:
+    """A ``Connect`` stream shared by any number of sending threads.
+
+    The responses are either iterated over, or handed to ``on_response``
+    on the session's reader thread as they arrive, but not both.
+    """
+    def __init__(self,
+            connect: Callable[[Iterator[messaging.ConnectRequest]],
+                Iterator[messaging.StreamBlurbsResponse]],
+            parent: str,
+            *,
+            max_queued: int = 100,
+            on_response: Callable[[messaging.StreamBlurbsResponse], None] = None,
+            clock: Callable[[], float] = time.monotonic) -> None:
+        """Open the session.
+
+        Args:
+            connect (Callable): Opens a Connect stream, given the iterator
+                of requests to send on it, and returns its responses.
+            parent (str): The room or profile to follow and create blurbs
+                for.
+            max_queued (int): The most blurbs waiting to be sent, and the
+                most responses waiting to be consumed.
+            on_response (Optional[Callable]): Called with every response,
+                instead of queueing it for iteration. The stream waits for
+                it to return.
+            clock (Callable[[], float]): The clock the stats are timed by.
+        """
+        if max_queued < 1:
+            raise ValueError('A session needs room for at least one blurb.')
+        self._max_queued = max_queued
+        self._on_response = on_response
+        self._clock = clock
+        self._started = clock()
+
+        self._lock = threading.Lock()
+        self._sendable = threading.Condition(self._lock)
+        self._receivable = threading.Condition(self._lock)
+        self._outgoing = collections.deque()
+        self._incoming = collections.deque()
+        self._closing = False
+        self._cancelled = False
+        self._done = False
+        self._error = None  # type: Optional[Exception]
+
+        self._sent = 0
+        self._received = 0
+        self._rejected = 0
+        self._max_send_queue_depth = 0
+        self._max_receive_queue_depth = 0
+
+        self._config = messaging.ConnectRequest(
+            config=messaging.ConnectRequest.ConnectConfig(parent=parent),
+        )
+        self._call = connect(self._requests())
+        self._reader = threading.Thread(
+            target=self._read,
+            name='ConnectSession',
+            daemon=True,
+        )
+        self._reader.start()
+
+    def send(self,
+            blurb: messaging.Blurb,
+            *,
+            block: bool = False,
+            timeout: float = None) -> bool:
+        """Queue ``blurb`` to be created.
+
+        Args:
+            blurb (~.messaging.Blurb): The blurb to create.
+            block (bool): Whether to wait for room in the queue. By
+                default, a full queue refuses the blurb at once.
+            timeout (float): The most seconds to wait for room, if
+                ``block`` is set; None waits for as long as it takes.
+
+        Returns:
+            bool: Whether the blurb was queued; False if the queue stayed
+            full.
+
+        Raises:
+            SessionClosedError: If the session was closed, or the stream
+                failed.
+        """
+        # Built outside the lock, on the producer's thread.
+        request = messaging.ConnectRequest(blurb=blurb)
+        with self._lock:
+            if block:
+                self._sendable.wait_for(
+                    lambda: (len(self._outgoing) < self._max_queued
+                             or self._closing or self._done),
+                    timeout,
+                )
+            if self._closing or self._done:
+                raise SessionClosedError(
+                    'The Connect session is closed.') from self._error
+            if len(self._outgoing) >= self._max_queued:
+                self._rejected += 1
+                return False
+            self._outgoing.append(request)
+            self._max_send_queue_depth = max(
+                self._max_send_queue_depth, len(self._outgoing))
+            self._sendable.notify_all()
+        return True
+
+    def _requests(self) -> Iterator[messaging.ConnectRequest]:
+        # The request iterator, consumed by gRPC on a thread of its own.
+        # The server reads the config from the first request.
+        yield self._config
+        while True:
+            with self._lock:
+                self._sendable.wait_for(
+                    lambda: self._outgoing or self._closing or self._done)
+                if not self._outgoing:
+                    # Closed, with everything queued sent: half-close.
+                    return
+                request = self._outgoing.popleft()
+                self._sent += 1
+                self._sendable.notify_all()
+            yield request
+
+    def _read(self) -> None:
+        try:
+            self._receive()
+        except grpc.RpcError as exc:
+            if not self._cancelled:
+                self._error = exceptions.from_grpc_error(exc)
+        except Exception as exc:
+            self._error = exc
+            # An error of on_response's own leaves the stream open.
+            self._call.cancel()
+        finally:
+            with self._lock:
+                self._done = True
+                self._sendable.notify_all()
+                self._receivable.notify_all()
+
+    def _receive(self) -> None:
+        for response in self._call:
+            with self._lock:
+                self._received += 1
+            if self._on_response is not None:
+                self._on_response(response)
+                continue
+            with self._lock:
+                self._receivable.wait_for(
+                    lambda: (len(self._incoming) < self._max_queued
+                             or self._cancelled))
+                if self._cancelled:
+                    return
+                self._incoming.append(response)
+                self._max_receive_queue_depth = max(
+                    self._max_receive_queue_depth, len(self._incoming))
+                self._receivable.notify_all()
+
+    def __iter__(self) -> 'ConnectSession':
+        return self
+
+    def __next__(self) -> messaging.StreamBlurbsResponse:
+        with self._lock:
+            self._receivable.wait_for(lambda: self._incoming or self._done)
+            if self._incoming:
+                response = self._incoming.popleft()
+                self._receivable.notify_all()
+                return response
+        if self._error is not None:
+            raise self._error
+        raise StopIteration
+
+    def close(self) -> None:
+        """Send the blurbs already queued, then end the outgoing stream.
+
+        The responses keep arriving until the server ends the stream.
+        """
+        with self._lock:
+            self._closing = True
+            self._sendable.notify_all()
+
+    def cancel(self) -> None:
+        """End the stream at once, dropping the blurbs not sent yet."""
+        with self._lock:
+            self._closing = True
+            self._cancelled = True
+            self._outgoing.clear()
+            self._sendable.notify_all()
+            self._receivable.notify_all()
+        self._call.cancel()
+
+    def join(self, timeout: float = None) -> None:
+        """Wait for the stream to end."""
+        self._reader.join(timeout)
+
+    def stats(self) -> ConnectSessionStats:
+        """Return the session's counts so far."""
+        stats = ConnectSessionStats()
+        with self._lock:
+            stats.sent = self._sent
+            stats.received = self._received
+            stats.rejected = self._rejected
+            stats.send_queue_depth = len(self._outgoing)
+            stats.max_send_queue_depth = self._max_send_queue_depth
+            stats.receive_queue_depth = len(self._incoming)
+            stats.max_receive_queue_depth = self._max_receive_queue_depth
+        stats.elapsed = self._clock() - self._started
+        return stats
+
+    def __repr__(self) -> str:
+        return '{0}<parent={1!r}, sent={2}, received={3}>'.format(
+            self.__class__.__name__,
+            self._config.config.parent,
+            self._sent,
+            self._received,
+        )
+
+
+__all__ = (
+    'ConnectSession',
+    'ConnectSessionStats',
+    'SessionClosedError',
+)
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Decode blurbs without copying their images out of the response.
+
+Decoding a page of blurbs copies every image into a ``bytes`` object of
+its own, although a caller after ``name``, ``user`` and ``text`` never
+reads one. The parsers here decode each blurb without its ``image``
+field, and keep a ``memoryview`` of the image where it lies in the
+received buffer instead; the image is copied only when
+:attr:`LazyBlurb.image` is read. A transport made with
+``lazy_blurb_images=True`` decodes the ``ListBlurbs`` and
+``StreamBlurbs`` responses this way::
+
+    transport = MessagingGrpcTransport(channel=channel, lazy_blurb_images=True)
+    client = MessagingClient(transport=transport)
+    for blurb in client.list_blurbs(parent='rooms/lobby'):
+        print(blurb.name, blurb.text)  # the images are never copied
+
+The views hold on to the whole buffer they came from, until the last
+view of it is dropped.
+"""
+
+from typing import Any, Iterator, List, Optional, Tuple
+
+from google.protobuf import message  # type: ignore
+
+from google.showcase_v1beta1.types import messaging
+
+
+# The field numbers and wire type the parsers look for.
+_BLURBS = 1  # ListBlurbsResponse.blurbs, SearchBlurbsResponse.blurbs
+_BLURB = 1  # StreamBlurbsResponse.blurb
+_IMAGE = 4  # Blurb.image
+_VARINT = 0
+_FIXED64 = 1
+_LENGTH_DELIMITED = 2
+_FIXED32 = 5
+
+_BlurbPb = messaging.Blurb.pb()
+
+
+class LazyBlurb:
+    """A blurb whose image stays in the response until it is read.
+
+    Every field but ``image`` is read from :attr:`blurb`.
+
+    Attributes:
+        blurb (~.messaging.Blurb): The blurb, without its image; a raw
+            protobuf message if the transport returns those.
+    """
+    __slots__ = ('blurb', '_image')
+
+    def __init__(self, blurb: Any, image: Optional[memoryview]) -> None:
+        self.blurb = blurb
+        self._image = image
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.blurb, name)
+
+    @property
+    def image(self) -> bytes:
+        """The image, copied out of the response."""
+        return bytes(self._image) if self._image is not None else b''
+
+    @property
+    def image_size(self) -> int:
+        """The size of the image, in bytes."""
+        return len(self._image) if self._image is not None else 0
+
+    def image_view(self) -> memoryview:
+        """Return the image where it lies in the response, without a copy."""
+        return self._image if self._image is not None else memoryview(b'')
+
+    def to_blurb(self) -> Any:
+        """Return a complete copy of the blurb, image included."""
+        if isinstance(self.blurb, message.Message):
+            blurb = type(self.blurb)()
+            blurb.CopyFrom(self.blurb)
+        else:
+            blurb = type(self.blurb)(self.blurb)
+        blurb.image = self.image
+        return blurb
+
+    def __repr__(self) -> str:
+        return '{0}<name={1!r}, image_size={2}>'.format(
+            self.__class__.__name__, self.blurb.name, self.image_size)
+
+
+class LazyBlurbsPage:
+    """A ``ListBlurbsResponse`` or ``SearchBlurbsResponse`` of lazy blurbs.
+
+    Attributes:
+        blurbs (List[LazyBlurb]): The blurbs on the page.
+        next_page_token (str): The token of the following page, if any.
+    """
+    __slots__ = ('blurbs', 'next_page_token')
+
+    def __init__(self, blurbs: List[LazyBlurb], next_page_token: str) -> None:
+        self.blurbs = blurbs
+        self.next_page_token = next_page_token
+
+    def __repr__(self) -> str:
+        return '{0}<blurbs={1}, next_page_token={2!r}>'.format(
+            self.__class__.__name__, len(self.blurbs), self.next_page_token)
+
+
+class LazyStreamBlurbsResponse:
+    """A ``StreamBlurbsResponse`` whose blurb is a :class:`LazyBlurb`.
+
+    Attributes:
+        blurb (LazyBlurb): The blurb that was created, updated or deleted.
+        action (~.messaging.StreamBlurbsResponse.Action): What happened to
+            it.
+    """
+    __slots__ = ('blurb', 'action')
+
+    def __init__(self, blurb: LazyBlurb, action: Any) -> None:
+        self.blurb = blurb
+        self.action = action
+
+    def __repr__(self) -> str:
+        return '{0}<action={1!r}, blurb={2!r}>'.format(
+            self.__class__.__name__, self.action, self.blurb)
+
+
+def _varint(view: memoryview, pos: int) -> Tuple[int, int]:
+    result = shift = 0
+    while True:
+        byte = view[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _fields(view: memoryview, pos: int, end: int) -> Iterator[Tuple[int, int, int, int, int]]:
+    # Yield the number, wire type and bounds of each field, and where its
+    # value starts.
+    while pos < end:
+        start = pos
+        key, pos = _varint(view, pos)
+        wire_type = key & 7
+        if wire_type == _VARINT:
+            value_start = pos
+            _, pos = _varint(view, pos)
+        elif wire_type == _LENGTH_DELIMITED:
+            size, value_start = _varint(view, pos)
+            pos = value_start + size
+        elif wire_type in (_FIXED64, _FIXED32):
+            value_start = pos
+            pos += 8 if wire_type == _FIXED64 else 4
+        else:
+            raise message.DecodeError(
+                'Unexpected wire type {}.'.format(wire_type))
+        if pos > end:
+            raise message.DecodeError('Truncated message.')
+        yield key >> 3, wire_type, start, value_start, pos
+
+
+def _lazy_blurb(view: memoryview, parts: List[Tuple[int, int]], raw: bool) -> LazyBlurb:
+    # A blurb sent in several parts is decoded as protobuf does: the parts
+    # are merged, and of the images, the last one counts.
+    kept = []
+    image = None
+    for start, end in parts:
+        for number, wire_type, field_start, value_start, field_end in _fields(view, start, end):
+            if number == _IMAGE and wire_type == _LENGTH_DELIMITED:
+                image = view[value_start:field_end]
+            else:
+                kept.append(view[field_start:field_end])
+    blurb = _BlurbPb.FromString(b''.join(kept))
+    return LazyBlurb(blurb if raw else messaging.Blurb.wrap(blurb), image)
+
+
+def _parse(data: bytes, response_class: Any, blurb_field: int, raw: bool,
+        repeated: bool):
+    # Decode the response without its blurbs, and the blurbs lazily; each
+    # occurrence of a repeated field is a blurb, and all of a singular one
+    # are parts of the same blurb.
+    view = memoryview(data)
+    rest = []
+    parts = []
+    try:
+        for number, wire_type, start, value_start, end in _fields(view, 0, len(view)):
+            if number == blurb_field and wire_type == _LENGTH_DELIMITED:
+                parts.append((value_start, end))
+            else:
+                rest.append(view[start:end])
+        if repeated:
+            blurbs = [_lazy_blurb(view, [part], raw) for part in parts]
+        else:
+            blurbs = [_lazy_blurb(view, parts, raw)] if parts else []
+    except IndexError:
+        raise message.DecodeError('Truncated message.')
+    response = response_class.pb().FromString(b''.join(rest))
+    if not raw:
+        response = response_class.wrap(response)
+    return response, blurbs
+
+
+def parse_blurbs_page(data: bytes, *, raw: bool = False) -> LazyBlurbsPage:
+    """Decode a serialized ``ListBlurbsResponse`` or ``SearchBlurbsResponse``.
+
+    Args:
+        data (bytes): The serialized response.
+        raw (bool): Whether the blurbs are raw protobuf messages rather
+            than proto-plus ones.
+
+    Raises:
+        google.protobuf.message.DecodeError: If ``data`` is not a valid
+            response.
+    """
+    response, blurbs = _parse(data, messaging.ListBlurbsResponse, _BLURBS, raw,
+                              repeated=True)
+    return LazyBlurbsPage(blurbs, response.next_page_token)
+
+
+def parse_stream_blurbs_response(data: bytes, *, raw: bool = False) -> LazyStreamBlurbsResponse:
+    """Decode a serialized ``StreamBlurbsResponse``.
+
+    Args:
+        data (bytes): The serialized response.
+        raw (bool): Whether the blurb is a raw protobuf message rather than
+            a proto-plus one.
+
+    Raises:
+        google.protobuf.message.DecodeError: If ``data`` is not a valid
+            response.
+    """
+    response, blurbs = _parse(data, messaging.StreamBlurbsResponse, _BLURB, raw,
+                              repeated=False)
+    blurb = blurbs[0] if blurbs else LazyBlurb(response.blurb, None)
+    return LazyStreamBlurbsResponse(blurb, response.action)
+
+
+__all__ = (
+    'LazyBlurb',
+    'LazyBlurbsPage',
+    'LazyStreamBlurbsResponse',
+    'parse_blurbs_page',
+    'parse_stream_blurbs_response',
+)
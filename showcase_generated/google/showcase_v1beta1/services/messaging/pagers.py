@@ -15,8 +15,9 @@
 # limitations under the License.
 #
 
-from typing import Any, Callable, Iterable
+from typing import Any, AsyncIterable, Awaitable, Callable, Iterable
 
+from google.showcase_v1beta1 import page_prefetch
 from google.showcase_v1beta1.types import messaging
 
 
@@ -41,7 +42,9 @@ class ListRoomsPager:
             method: Callable[[messaging.ListRoomsRequest],
                 messaging.ListRoomsResponse],
             request: messaging.ListRoomsRequest,
-            response: messaging.ListRoomsResponse):
+            response: messaging.ListRoomsResponse,
+            owns_request: bool = False,
+            prefetch_depth: int = 0):
         """Instantiate the pager.
 
         Args:
@@ -51,22 +54,41 @@ class ListRoomsPager:
                 The initial request object.
             response (:class:`~.messaging.ListRoomsResponse`):
                 The initial response object.
+            owns_request (bool): If True, the pager takes ownership of
+                ``request`` and advances its ``page_token`` in place instead
+                of working on a copy.
+            prefetch_depth (int): If set, the following pages are requested
+                in the background as soon as each page arrives, and up to
+                this many of them are held until they are iterated over.
         """
         self._method = method
-        self._request = messaging.ListRoomsRequest(request)
+        self._request = request if owns_request else messaging.ListRoomsRequest(request)
         self._response = response
+        self._prefetch_depth = prefetch_depth
 
     def __getattr__(self, name: str) -> Any:
         return getattr(self._response, name)
 
     @property
     def pages(self) -> Iterable[messaging.ListRoomsResponse]:
+        if self._prefetch_depth:
+            pages = page_prefetch.prefetch_pages(
+                self._response, self._fetch_page, self._prefetch_depth)
+            for page in pages:
+                self._response = page
+                yield page
+            return
         yield self._response
         while self._response.next_page_token:
             self._request.page_token = self._response.next_page_token
             self._response = self._method(self._request)
             yield self._response
 
+    def _fetch_page(self, response):
+        # Runs on the prefetching thread; only it touches the request.
+        self._request.page_token = response.next_page_token
+        return self._method(self._request)
+
     def __iter__(self) -> Iterable[messaging.Room]:
         for page in self.pages:
             yield from page.rooms
@@ -96,7 +118,9 @@ class ListBlurbsPager:
             method: Callable[[messaging.ListBlurbsRequest],
                 messaging.ListBlurbsResponse],
             request: messaging.ListBlurbsRequest,
-            response: messaging.ListBlurbsResponse):
+            response: messaging.ListBlurbsResponse,
+            owns_request: bool = False,
+            prefetch_depth: int = 0):
         """Instantiate the pager.
 
         Args:
@@ -106,25 +130,204 @@ class ListBlurbsPager:
                 The initial request object.
             response (:class:`~.messaging.ListBlurbsResponse`):
                 The initial response object.
+            owns_request (bool): If True, the pager takes ownership of
+                ``request`` and advances its ``page_token`` in place instead
+                of working on a copy.
+            prefetch_depth (int): If set, the following pages are requested
+                in the background as soon as each page arrives, and up to
+                this many of them are held until they are iterated over.
         """
         self._method = method
-        self._request = messaging.ListBlurbsRequest(request)
+        self._request = request if owns_request else messaging.ListBlurbsRequest(request)
         self._response = response
+        self._prefetch_depth = prefetch_depth
 
     def __getattr__(self, name: str) -> Any:
         return getattr(self._response, name)
 
     @property
     def pages(self) -> Iterable[messaging.ListBlurbsResponse]:
+        if self._prefetch_depth:
+            pages = page_prefetch.prefetch_pages(
+                self._response, self._fetch_page, self._prefetch_depth)
+            for page in pages:
+                self._response = page
+                yield page
+            return
         yield self._response
         while self._response.next_page_token:
             self._request.page_token = self._response.next_page_token
             self._response = self._method(self._request)
             yield self._response
 
+    def _fetch_page(self, response):
+        # Runs on the prefetching thread; only it touches the request.
+        self._request.page_token = response.next_page_token
+        return self._method(self._request)
+
     def __iter__(self) -> Iterable[messaging.Blurb]:
         for page in self.pages:
             yield from page.blurbs
 
     def __repr__(self) -> str:
         return '{0}<{1!r}>'.format(self.__class__.__name__, self._response)
+
+
+class ListRoomsAsyncPager:
+    """A pager for iterating through ``list_rooms`` requests.
+
+    This class thinly wraps an initial
+    :class:`~.messaging.ListRoomsResponse` object, and
+    provides an ``__aiter__`` method to iterate through its
+    ``rooms`` field.
+
+    If there are more pages, the ``__aiter__`` method will make additional
+    ``ListRooms`` requests and continue to iterate
+    through the ``rooms`` field on the
+    corresponding responses.
+
+    All the usual :class:`~.messaging.ListRoomsResponse`
+    attributes are available on the pager. If multiple requests are made, only
+    the most recent response is retained, and thus used for attribute lookup.
+    """
+    def __init__(self,
+            method: Callable[[messaging.ListRoomsRequest],
+                Awaitable[messaging.ListRoomsResponse]],
+            request: messaging.ListRoomsRequest,
+            response: messaging.ListRoomsResponse,
+            owns_request: bool = False,
+            prefetch_depth: int = 0):
+        """Instantiate the pager.
+
+        Args:
+            method (Callable): The method that was originally called, and
+                which instantiated this pager.
+            request (:class:`~.messaging.ListRoomsRequest`):
+                The initial request object.
+            response (:class:`~.messaging.ListRoomsResponse`):
+                The initial response object.
+            owns_request (bool): If True, the pager takes ownership of
+                ``request`` and advances its ``page_token`` in place instead
+                of working on a copy.
+            prefetch_depth (int): If set, the following pages are requested
+                in the background as soon as each page arrives, and up to
+                this many of them are held until they are iterated over.
+        """
+        self._method = method
+        self._request = request if owns_request else messaging.ListRoomsRequest(request)
+        self._response = response
+        self._prefetch_depth = prefetch_depth
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._response, name)
+
+    @property
+    async def pages(self) -> AsyncIterable[messaging.ListRoomsResponse]:
+        if self._prefetch_depth:
+            pages = page_prefetch.prefetch_pages_async(
+                self._response, self._fetch_page, self._prefetch_depth)
+            async for page in pages:
+                self._response = page
+                yield page
+            return
+        yield self._response
+        while self._response.next_page_token:
+            self._request.page_token = self._response.next_page_token
+            self._response = await self._method(self._request)
+            yield self._response
+
+    async def _fetch_page(self, response):
+        # Runs in the prefetching task; only it touches the request.
+        self._request.page_token = response.next_page_token
+        return await self._method(self._request)
+
+    def __aiter__(self) -> AsyncIterable[messaging.Room]:
+        async def async_generator():
+            async for page in self.pages:
+                for response in page.rooms:
+                    yield response
+
+        return async_generator()
+
+    def __repr__(self) -> str:
+        return '{0}<{1!r}>'.format(self.__class__.__name__, self._response)
+
+
+class ListBlurbsAsyncPager:
+    """A pager for iterating through ``list_blurbs`` requests.
+
+    This class thinly wraps an initial
+    :class:`~.messaging.ListBlurbsResponse` object, and
+    provides an ``__aiter__`` method to iterate through its
+    ``blurbs`` field.
+
+    If there are more pages, the ``__aiter__`` method will make additional
+    ``ListBlurbs`` requests and continue to iterate
+    through the ``blurbs`` field on the
+    corresponding responses.
+
+    All the usual :class:`~.messaging.ListBlurbsResponse`
+    attributes are available on the pager. If multiple requests are made, only
+    the most recent response is retained, and thus used for attribute lookup.
+    """
+    def __init__(self,
+            method: Callable[[messaging.ListBlurbsRequest],
+                Awaitable[messaging.ListBlurbsResponse]],
+            request: messaging.ListBlurbsRequest,
+            response: messaging.ListBlurbsResponse,
+            owns_request: bool = False,
+            prefetch_depth: int = 0):
+        """Instantiate the pager.
+
+        Args:
+            method (Callable): The method that was originally called, and
+                which instantiated this pager.
+            request (:class:`~.messaging.ListBlurbsRequest`):
+                The initial request object.
+            response (:class:`~.messaging.ListBlurbsResponse`):
+                The initial response object.
+            owns_request (bool): If True, the pager takes ownership of
+                ``request`` and advances its ``page_token`` in place instead
+                of working on a copy.
+            prefetch_depth (int): If set, the following pages are requested
+                in the background as soon as each page arrives, and up to
+                this many of them are held until they are iterated over.
+        """
+        self._method = method
+        self._request = request if owns_request else messaging.ListBlurbsRequest(request)
+        self._response = response
+        self._prefetch_depth = prefetch_depth
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._response, name)
+
+    @property
+    async def pages(self) -> AsyncIterable[messaging.ListBlurbsResponse]:
+        if self._prefetch_depth:
+            pages = page_prefetch.prefetch_pages_async(
+                self._response, self._fetch_page, self._prefetch_depth)
+            async for page in pages:
+                self._response = page
+                yield page
+            return
+        yield self._response
+        while self._response.next_page_token:
+            self._request.page_token = self._response.next_page_token
+            self._response = await self._method(self._request)
+            yield self._response
+
+    async def _fetch_page(self, response):
+        # Runs in the prefetching task; only it touches the request.
+        self._request.page_token = response.next_page_token
+        return await self._method(self._request)
+
+    def __aiter__(self) -> AsyncIterable[messaging.Blurb]:
+        async def async_generator():
+            async for page in self.pages:
+                for response in page.blurbs:
+                    yield response
+
+        return async_generator()
+
+    def __repr__(self) -> str:
+        return '{0}<{1!r}>'.format(self.__class__.__name__, self._response)
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Resume a ``StreamBlurbs`` subscription after a dropped connection.
+
+``StreamBlurbs`` only reports changes made while it is open, and has no
+cursor to resume from. The stream remembers the time of the latest change
+it delivered, and the blurbs changed at that very time. After opening the
+stream again, it lists the blurbs under the subscribed name and delivers
+the ones created or updated since, as ``CREATE`` or ``UPDATE`` events;
+events on the new stream that are no newer are dropped as duplicates.
+Only the server's timestamps are compared, so the local clock plays no
+part.
+
+Some changes cannot be recovered:
+
+* Before any change was delivered there is no server time to tell the
+  gap from older changes by. The first listing then only sets the time
+  to resume from, and the changes made during that gap are lost.
+* Blurbs deleted while the stream was down cannot be listed, so their
+  ``DELETE`` events are lost.
+
+``ListBlurbs`` cannot filter by time, so each reopening pages through
+every blurb under the subscribed name.
+"""
+
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Set, Tuple
+
+from google.api_core import retry as retries  # type: ignore
+
+from google.showcase_v1beta1.resumable_stream import ResumableStream
+from google.showcase_v1beta1.services.messaging import lazy_images
+from google.showcase_v1beta1.types import messaging
+
+
+_Action = messaging.StreamBlurbsResponse.Action
+
+# The raw protobuf messages, returned by a transport with raw_messages.
+_BlurbPb = messaging.Blurb.pb()
+_StreamBlurbsResponsePb = messaging.StreamBlurbsResponse.pb()
+
+
+def _time(timestamp) -> Tuple[int, int]:
+    return timestamp.seconds, timestamp.nanos
+
+
+def _pb(blurb: messaging.Blurb):
+    if isinstance(blurb, lazy_images.LazyBlurb):
+        blurb = blurb.blurb
+    return blurb if isinstance(blurb, _BlurbPb) else messaging.Blurb.pb(blurb)
+
+
+def _changed(blurb: messaging.Blurb) -> Tuple[int, int]:
+    # The time of the latest change to the blurb.
+    pb = _pb(blurb)
+    return max(_time(pb.create_time), _time(pb.update_time))
+
+
+def _created(blurb: messaging.Blurb) -> Tuple[int, int]:
+    return _time(_pb(blurb).create_time)
+
+
+class ResumableStreamBlurbs(ResumableStream):
+    """A ``StreamBlurbs`` stream that fills the gap when it reopens."""
+    def __init__(self,
+            stream_blurbs: Callable[[messaging.StreamBlurbsRequest],
+                Iterator[messaging.StreamBlurbsResponse]],
+            list_blurbs: Callable[[str], Iterable[messaging.Blurb]],
+            request: messaging.StreamBlurbsRequest,
+            retry: Optional[retries.Retry]) -> None:
+        super().__init__(retry)
+        self._stream_blurbs = stream_blurbs
+        self._list_blurbs = list_blurbs
+        self._request = request
+        self._latest = None  # type: Optional[Tuple[int, int]]
+        self._latest_names = set()  # type: Set[str]
+
+    def _is_new(self, changed: Tuple[int, int], name: str) -> bool:
+        return (self._latest is None
+                or changed > self._latest
+                or (changed == self._latest and name not in self._latest_names))
+
+    def _advance(self, blurb: messaging.Blurb) -> None:
+        changed = _changed(blurb)
+        if self._latest is None or changed > self._latest:
+            self._latest = changed
+            self._latest_names = set()
+        self._latest_names.add(blurb.name)
+
+    def _open(self) -> Iterator[messaging.StreamBlurbsResponse]:
+        return self._stream_blurbs(self._request)
+
+    def _reopened(self) -> List[Any]:
+        # The responses are proto-plus, lazy or raw protobuf messages, as
+        # the stream's own are.
+        listed = self._list_blurbs(self._request.name)
+        if self._latest is None:
+            # Nothing was delivered yet: the latest listed change is where
+            # to resume from, and the gap is lost.
+            for blurb in listed:
+                self._advance(blurb)
+            return []
+        missed = sorted(
+            (blurb for blurb in listed
+             if self._is_new(_changed(blurb), blurb.name)),
+            key=_changed,
+        )
+        responses = []
+        for blurb in missed:
+            created = self._is_new(_created(blurb), blurb.name)
+            # Of the same kind as the responses of the stream.
+            if isinstance(blurb, lazy_images.LazyBlurb):
+                response_class = lazy_images.LazyStreamBlurbsResponse
+            elif isinstance(blurb, _BlurbPb):
+                response_class = _StreamBlurbsResponsePb
+            else:
+                response_class = messaging.StreamBlurbsResponse
+            responses.append(response_class(
+                blurb=blurb,
+                action=_Action.CREATE if created else _Action.UPDATE,
+            ))
+        for blurb in missed:
+            self._advance(blurb)
+        return responses
+
+    def _accept(self, response: messaging.StreamBlurbsResponse) -> bool:
+        if response.action == _Action.DELETE:
+            return True
+        if not self._is_new(_changed(response.blurb), response.blurb.name):
+            return False
+        self._advance(response.blurb)
+        return True
+
+
+__all__ = (
+    'ResumableStreamBlurbs',
+)
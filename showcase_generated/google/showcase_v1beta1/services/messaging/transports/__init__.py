@@ -20,14 +20,17 @@ from typing import Dict, Type
 
 from .base import MessagingTransport
 from .grpc import MessagingGrpcTransport
+from .grpc_asyncio import MessagingGrpcAsyncIOTransport
 
 
 # Compile a registry of transports.
 _transport_registry = OrderedDict()  # type: Dict[str, Type[MessagingTransport]]
 _transport_registry['grpc'] = MessagingGrpcTransport
+_transport_registry['grpc_asyncio'] = MessagingGrpcAsyncIOTransport
 
 
 __all__ = (
     'MessagingTransport',
     'MessagingGrpcTransport',
+    'MessagingGrpcAsyncIOTransport',
 )
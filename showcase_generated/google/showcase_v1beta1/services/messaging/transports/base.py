@@ -18,12 +18,12 @@
 import abc
 import typing
 
-from google import auth
 from google.api_core import operations_v1  # type: ignore
 from google.auth import credentials  # type: ignore
 
 from google.longrunning import operations_pb2 as operations  # type: ignore
 from google.protobuf import empty_pb2 as empty  # type: ignore
+from google.showcase_v1beta1 import credentials_cache
 from google.showcase_v1beta1.types import messaging
 
 
@@ -54,9 +54,9 @@ class MessagingTransport(metaclass=abc.ABCMeta):
         self._host = host
 
         # If no credentials are provided, then determine the appropriate
-        # defaults.
+        # defaults, once per process.
         if credentials is None:
-            credentials, _ = auth.default(scopes=self.AUTH_SCOPES)
+            credentials, _ = credentials_cache.default(scopes=self.AUTH_SCOPES)
 
         # Save the credentials.
         self._credentials = credentials
@@ -15,7 +15,9 @@
 # limitations under the License.
 #
 
-from typing import Callable, Dict
+import functools
+import time
+from typing import Callable, Dict, Optional
 
 from google.api_core import grpc_helpers   # type: ignore
 from google.api_core import operations_v1  # type: ignore
@@ -25,11 +27,22 @@ import grpc  # type: ignore
 
 from google.longrunning import operations_pb2 as operations  # type: ignore
 from google.protobuf import empty_pb2 as empty  # type: ignore
+from google.showcase_v1beta1 import channel_pool
+from google.showcase_v1beta1 import raw_protobuf
+from google.showcase_v1beta1 import service_config
+from google.showcase_v1beta1.services.messaging import lazy_images
 from google.showcase_v1beta1.types import messaging
 
 from .base import MessagingTransport
 
 
+# The responses with blurbs that lazy_blurb_images decodes lazily.
+_LAZY_PARSERS = {
+    messaging.ListBlurbsResponse: lazy_images.parse_blurbs_page,
+    messaging.StreamBlurbsResponse: lazy_images.parse_stream_blurbs_response,
+}
+
+
 class MessagingGrpcTransport(MessagingTransport):
     """gRPC backend transport for Messaging.
 
@@ -45,10 +58,33 @@ class MessagingGrpcTransport(MessagingTransport):
     It sends protocol buffers over the wire using gRPC (which is built on
     top of HTTP/2); the ``grpcio`` package must be installed.
     """
+    # The methods whose stubs are created by warm_up().
+    _METHODS = (
+        'create_room',
+        'get_room',
+        'update_room',
+        'delete_room',
+        'list_rooms',
+        'create_blurb',
+        'get_blurb',
+        'update_blurb',
+        'delete_blurb',
+        'list_blurbs',
+        'search_blurbs',
+        'stream_blurbs',
+        'send_blurbs',
+        'connect',
+    )
+
     def __init__(self, *,
             host: str = 'localhost:7469',
             credentials: credentials.Credentials = None,
-            channel: grpc.Channel = None) -> None:
+            channel: grpc.Channel = None,
+            channel_pool_size: int = None,
+            connect_timeout: float = None,
+            raw_messages: bool = False,
+            lazy_blurb_images: bool = False,
+            grpc_service_config: bool = False) -> None:
         """Instantiate the transport.
 
         Args:
@@ -61,6 +97,28 @@ class MessagingGrpcTransport(MessagingTransport):
                 This argument is ignored if ``channel`` is provided.
             channel (Optional[grpc.Channel]): A ``Channel`` instance through
                 which to make calls.
+            channel_pool_size (Optional[int]): If set, spread calls over a
+                :class:`~.channel_pool.ChannelPool` of this many channels
+                instead of using a single one. The pool is shared with every
+                other transport for the same host, credentials and pool
+                size. This argument is ignored if ``channel`` is provided.
+            connect_timeout (Optional[float]): If set, connect at once
+                rather than on the first call: :meth:`warm_up` waits up to
+                this many seconds for the channel to be ready, and creates
+                the stub of every method.
+            raw_messages (bool): If True, the stubs return the raw protobuf
+                messages under the proto-plus types, and take requests of
+                either kind; see :mod:`~.raw_protobuf`. Long-running
+                operations are unaffected.
+            lazy_blurb_images (bool): If True, the blurbs of ``ListBlurbs``
+                and ``StreamBlurbs`` responses are decoded without copying
+                their images; see :mod:`~.lazy_images`.
+            grpc_service_config (bool): If True, the channel is created
+                with the service config as its ``grpc.service_config``
+                option, so that gRPC itself retries the calls the
+                config allows it to, up to their ``maxAttempts``; see
+                :mod:`~.service_config`. This argument is ignored if
+                ``channel`` is provided.
         """
         # Sanity check: Ensure that channel and credentials are not both
         # provided.
@@ -70,11 +128,20 @@ class MessagingGrpcTransport(MessagingTransport):
         # Run the base constructor.
         super().__init__(host=host, credentials=credentials)
         self._stubs = {}  # type: Dict[str, Callable]
+        self._channel_pool_size = channel_pool_size
+        self._raw_messages = raw_messages
+        self._lazy_blurb_images = lazy_blurb_images
+        self._grpc_service_config = grpc_service_config
 
         # If a channel was explicitly provided, set it.
         if channel:
             self._grpc_channel = channel
 
+        # How long the warm-up took, once there was one.
+        self.warm_up_time = None  # type: Optional[float]
+        if connect_timeout is not None:
+            self.warm_up(connect_timeout)
+
     @property
     def grpc_channel(self) -> grpc.Channel:
         """Create the channel designed to connect to this service.
@@ -85,15 +152,67 @@ class MessagingGrpcTransport(MessagingTransport):
         # Sanity check: Only create a new channel if we do not already
         # have one.
         if not hasattr(self, '_grpc_channel'):
-            self._grpc_channel = grpc_helpers.create_channel(
-                self._host,
-                credentials=self._credentials,
-                scopes=self.AUTH_SCOPES,
-            )
+            options = []
+            if self._grpc_service_config:
+                options.append(
+                    ('grpc.service_config', service_config.SERVICE_CONFIG_JSON))
+            if self._channel_pool_size:
+                self._grpc_channel = channel_pool.shared_pool(
+                    self._host,
+                    size=self._channel_pool_size,
+                    credentials=self._credentials,
+                    scopes=self.AUTH_SCOPES,
+                    options=options,
+                )
+            else:
+                self._grpc_channel = grpc_helpers.create_channel(
+                    self._host,
+                    credentials=self._credentials,
+                    scopes=self.AUTH_SCOPES,
+                    options=options,
+                )
 
         # Return the channel from cache.
         return self._grpc_channel
 
+    def warm_up(self, timeout: float = None) -> float:
+        """Connect the channel, and create the stub of every method.
+
+        This moves the cost of name resolution, the handshakes and the
+        HTTP/2 setup from the first call to here.
+
+        Args:
+            timeout (Optional[float]): The most seconds to wait for the
+                channel to be ready; None waits for as long as it takes.
+
+        Returns:
+            float: The seconds the warm-up took; also saved as
+            ``warm_up_time``.
+
+        Raises:
+            google.api_core.exceptions.DeadlineExceeded: If the channel was
+                not ready in time.
+        """
+        started = time.monotonic()
+        for method in self._METHODS:
+            getattr(self, method)
+        channel_pool.wait_for_ready(self.grpc_channel, timeout)
+        self.warm_up_time = time.monotonic() - started
+        return self.warm_up_time
+
+    def _serializer(self, message_class):
+        if self._raw_messages:
+            return raw_protobuf.serializer(message_class)
+        return message_class.serialize
+
+    def _deserializer(self, message_class):
+        if self._lazy_blurb_images and message_class in _LAZY_PARSERS:
+            return functools.partial(
+                _LAZY_PARSERS[message_class], raw=self._raw_messages)
+        if self._raw_messages:
+            return raw_protobuf.deserializer(message_class)
+        return message_class.deserialize
+
     @property
     def operations_client(self) -> operations_v1.OperationsClient:
         """Create the client designed to process long-running operations.
@@ -131,8 +250,8 @@ class MessagingGrpcTransport(MessagingTransport):
         if 'create_room' not in self._stubs:
             self._stubs['create_room'] = self.grpc_channel.unary_unary(
                 '/google.showcase.v1beta1.Messaging/CreateRoom',
-                request_serializer=messaging.CreateRoomRequest.serialize,
-                response_deserializer=messaging.Room.deserialize,
+                request_serializer=self._serializer(messaging.CreateRoomRequest),
+                response_deserializer=self._deserializer(messaging.Room),
             )
         return self._stubs['create_room']
 
@@ -157,8 +276,8 @@ class MessagingGrpcTransport(MessagingTransport):
         if 'get_room' not in self._stubs:
             self._stubs['get_room'] = self.grpc_channel.unary_unary(
                 '/google.showcase.v1beta1.Messaging/GetRoom',
-                request_serializer=messaging.GetRoomRequest.serialize,
-                response_deserializer=messaging.Room.deserialize,
+                request_serializer=self._serializer(messaging.GetRoomRequest),
+                response_deserializer=self._deserializer(messaging.Room),
             )
         return self._stubs['get_room']
 
@@ -183,8 +302,8 @@ class MessagingGrpcTransport(MessagingTransport):
         if 'update_room' not in self._stubs:
             self._stubs['update_room'] = self.grpc_channel.unary_unary(
                 '/google.showcase.v1beta1.Messaging/UpdateRoom',
-                request_serializer=messaging.UpdateRoomRequest.serialize,
-                response_deserializer=messaging.Room.deserialize,
+                request_serializer=self._serializer(messaging.UpdateRoomRequest),
+                response_deserializer=self._deserializer(messaging.Room),
             )
         return self._stubs['update_room']
 
@@ -209,7 +328,7 @@ class MessagingGrpcTransport(MessagingTransport):
         if 'delete_room' not in self._stubs:
             self._stubs['delete_room'] = self.grpc_channel.unary_unary(
                 '/google.showcase.v1beta1.Messaging/DeleteRoom',
-                request_serializer=messaging.DeleteRoomRequest.serialize,
+                request_serializer=self._serializer(messaging.DeleteRoomRequest),
                 response_deserializer=empty.Empty.FromString,
             )
         return self._stubs['delete_room']
@@ -235,8 +354,8 @@ class MessagingGrpcTransport(MessagingTransport):
         if 'list_rooms' not in self._stubs:
             self._stubs['list_rooms'] = self.grpc_channel.unary_unary(
                 '/google.showcase.v1beta1.Messaging/ListRooms',
-                request_serializer=messaging.ListRoomsRequest.serialize,
-                response_deserializer=messaging.ListRoomsResponse.deserialize,
+                request_serializer=self._serializer(messaging.ListRoomsRequest),
+                response_deserializer=self._deserializer(messaging.ListRoomsResponse),
             )
         return self._stubs['list_rooms']
 
@@ -264,8 +383,8 @@ class MessagingGrpcTransport(MessagingTransport):
         if 'create_blurb' not in self._stubs:
             self._stubs['create_blurb'] = self.grpc_channel.unary_unary(
                 '/google.showcase.v1beta1.Messaging/CreateBlurb',
-                request_serializer=messaging.CreateBlurbRequest.serialize,
-                response_deserializer=messaging.Blurb.deserialize,
+                request_serializer=self._serializer(messaging.CreateBlurbRequest),
+                response_deserializer=self._deserializer(messaging.Blurb),
             )
         return self._stubs['create_blurb']
 
@@ -290,8 +409,8 @@ class MessagingGrpcTransport(MessagingTransport):
         if 'get_blurb' not in self._stubs:
             self._stubs['get_blurb'] = self.grpc_channel.unary_unary(
                 '/google.showcase.v1beta1.Messaging/GetBlurb',
-                request_serializer=messaging.GetBlurbRequest.serialize,
-                response_deserializer=messaging.Blurb.deserialize,
+                request_serializer=self._serializer(messaging.GetBlurbRequest),
+                response_deserializer=self._deserializer(messaging.Blurb),
             )
         return self._stubs['get_blurb']
 
@@ -316,8 +435,8 @@ class MessagingGrpcTransport(MessagingTransport):
         if 'update_blurb' not in self._stubs:
             self._stubs['update_blurb'] = self.grpc_channel.unary_unary(
                 '/google.showcase.v1beta1.Messaging/UpdateBlurb',
-                request_serializer=messaging.UpdateBlurbRequest.serialize,
-                response_deserializer=messaging.Blurb.deserialize,
+                request_serializer=self._serializer(messaging.UpdateBlurbRequest),
+                response_deserializer=self._deserializer(messaging.Blurb),
             )
         return self._stubs['update_blurb']
 
@@ -342,7 +461,7 @@ class MessagingGrpcTransport(MessagingTransport):
         if 'delete_blurb' not in self._stubs:
             self._stubs['delete_blurb'] = self.grpc_channel.unary_unary(
                 '/google.showcase.v1beta1.Messaging/DeleteBlurb',
-                request_serializer=messaging.DeleteBlurbRequest.serialize,
+                request_serializer=self._serializer(messaging.DeleteBlurbRequest),
                 response_deserializer=empty.Empty.FromString,
             )
         return self._stubs['delete_blurb']
@@ -369,8 +488,8 @@ class MessagingGrpcTransport(MessagingTransport):
         if 'list_blurbs' not in self._stubs:
             self._stubs['list_blurbs'] = self.grpc_channel.unary_unary(
                 '/google.showcase.v1beta1.Messaging/ListBlurbs',
-                request_serializer=messaging.ListBlurbsRequest.serialize,
-                response_deserializer=messaging.ListBlurbsResponse.deserialize,
+                request_serializer=self._serializer(messaging.ListBlurbsRequest),
+                response_deserializer=self._deserializer(messaging.ListBlurbsResponse),
             )
         return self._stubs['list_blurbs']
 
@@ -398,7 +517,7 @@ class MessagingGrpcTransport(MessagingTransport):
         if 'search_blurbs' not in self._stubs:
             self._stubs['search_blurbs'] = self.grpc_channel.unary_unary(
                 '/google.showcase.v1beta1.Messaging/SearchBlurbs',
-                request_serializer=messaging.SearchBlurbsRequest.serialize,
+                request_serializer=self._serializer(messaging.SearchBlurbsRequest),
                 response_deserializer=operations.Operation.FromString,
             )
         return self._stubs['search_blurbs']
@@ -425,8 +544,8 @@ class MessagingGrpcTransport(MessagingTransport):
         if 'stream_blurbs' not in self._stubs:
             self._stubs['stream_blurbs'] = self.grpc_channel.unary_stream(
                 '/google.showcase.v1beta1.Messaging/StreamBlurbs',
-                request_serializer=messaging.StreamBlurbsRequest.serialize,
-                response_deserializer=messaging.StreamBlurbsResponse.deserialize,
+                request_serializer=self._serializer(messaging.StreamBlurbsRequest),
+                response_deserializer=self._deserializer(messaging.StreamBlurbsResponse),
             )
         return self._stubs['stream_blurbs']
 
@@ -453,8 +572,8 @@ class MessagingGrpcTransport(MessagingTransport):
         if 'send_blurbs' not in self._stubs:
             self._stubs['send_blurbs'] = self.grpc_channel.stream_unary(
                 '/google.showcase.v1beta1.Messaging/SendBlurbs',
-                request_serializer=messaging.CreateBlurbRequest.serialize,
-                response_deserializer=messaging.SendBlurbsResponse.deserialize,
+                request_serializer=self._serializer(messaging.CreateBlurbRequest),
+                response_deserializer=self._deserializer(messaging.SendBlurbsResponse),
             )
         return self._stubs['send_blurbs']
 
@@ -483,8 +602,8 @@ class MessagingGrpcTransport(MessagingTransport):
         if 'connect' not in self._stubs:
             self._stubs['connect'] = self.grpc_channel.stream_stream(
                 '/google.showcase.v1beta1.Messaging/Connect',
-                request_serializer=messaging.ConnectRequest.serialize,
-                response_deserializer=messaging.StreamBlurbsResponse.deserialize,
+                request_serializer=self._serializer(messaging.ConnectRequest),
+                response_deserializer=self._deserializer(messaging.StreamBlurbsResponse),
             )
         return self._stubs['connect']
 
@@ -0,0 +1,621 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import functools
+from typing import Callable, Dict, Sequence, Tuple, Union
+
+import google.api_core.client_options as ClientOptions # type: ignore
+from google.api_core import exceptions                 # type: ignore
+from google.api_core import gapic_v1                   # type: ignore
+from google.api_core import retry as retries           # type: ignore
+from google.auth import credentials                    # type: ignore
+from google.oauth2 import service_account              # type: ignore
+
+from google.showcase_v1beta1 import retry_budget
+from google.showcase_v1beta1 import service_config
+from google.showcase_v1beta1.retry_budget import RetryBudget
+from google.showcase_v1beta1.services.testing import pagers
+from google.showcase_v1beta1.types import testing
+
+from .client import TestingClient, _SERVICE, _get_client_info
+from .transports.base import TestingTransport
+from .transports.grpc_asyncio import TestingGrpcAsyncIOTransport
+
+
+class TestingAsyncClient:
+    """A service to facilitate running discrete sets of tests
+    against Showcase.
+    """
+
+    DEFAULT_OPTIONS = TestingClient.DEFAULT_OPTIONS
+
+    session_path = staticmethod(TestingClient.session_path)
+
+    get_transport_class = functools.partial(
+        type(TestingClient).get_transport_class,
+        type(TestingClient),
+    )
+
+    @classmethod
+    def from_service_account_file(cls, filename: str, *args, **kwargs):
+        """Creates an instance of this client using the provided credentials
+        file.
+
+        Args:
+            filename (str): The path to the service account private key json
+                file.
+            args: Additional arguments to pass to the constructor.
+            kwargs: Additional arguments to pass to the constructor.
+
+        Returns:
+            {@api.name}: The constructed client.
+        """
+        credentials = service_account.Credentials.from_service_account_file(
+            filename)
+        kwargs['credentials'] = credentials
+        return cls(*args, **kwargs)
+
+    from_service_account_json = from_service_account_file
+
+    def __init__(self, *,
+            credentials: credentials.Credentials = None,
+            transport: Union[str, TestingTransport] = 'grpc_asyncio',
+            client_options: ClientOptions = DEFAULT_OPTIONS,
+            take_request_ownership: bool = False,
+            page_prefetch_depth: int = 0,
+            retry_budget: RetryBudget = None,
+            ) -> None:
+        """Instantiate the testing client.
+
+        Args:
+            credentials (Optional[google.auth.credentials.Credentials]): The
+                authorization credentials to attach to requests. These
+                credentials identify the application to the service; if none
+                are specified, the client will attempt to ascertain the
+                credentials from the environment.
+            transport (Union[str, ~.TestingTransport]): The
+                transport to use. It must be an asyncio transport, such as
+                ~.TestingGrpcAsyncIOTransport; by default one is created.
+            client_options (ClientOptions): Custom options for the client.
+            take_request_ownership (bool): If True, the caller hands over
+                every request message it passes to this client, and must
+                not use it again afterwards. This lets paged methods
+                advance the request's ``page_token`` in place instead of
+                copying the request first.
+            page_prefetch_depth (int): If set, the pagers returned by paged
+                methods request the following pages in the background, and
+                hold up to this many pages ahead of the caller. This hides
+                the round trip at each page boundary on high-latency links.
+            retry_budget (~.RetryBudget): If set, the calls are retried
+                only while their retries are few next to their requests,
+                as the budget allows; past that, a failed call raises its
+                error at once.
+        """
+        # The synchronous client validates the options and creates the
+        # transport; this client only awaits the transport's calls.
+        self._client = TestingClient(
+            credentials=credentials,
+            transport=transport,
+            client_options=client_options,
+            take_request_ownership=take_request_ownership,
+            page_prefetch_depth=page_prefetch_depth,
+            retry_budget=retry_budget,
+        )
+
+        # Save a dictionary of cached API call functions.
+        # These are the actual callables which invoke the proper
+        # transport methods, wrapped with `wrap_method` to add retry,
+        # timeout, and the like.
+        self._inner_api_calls = {}  # type: Dict[str, Callable]
+
+    async def create_session(self,
+            request: testing.CreateSessionRequest = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> testing.Session:
+        r"""Creates a new testing session.
+
+        Args:
+            request (:class:`~.testing.CreateSessionRequest`):
+                The request object. The request for the CreateSession
+                method.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.testing.Session:
+                A session is a suite of tests,
+                generally being made in the context of
+                testing code generation.
+                A session defines tests it may expect,
+                based on which version of the code
+                generation spec is in use.
+
+        """
+        # Create or coerce a protobuf request object.
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        if not isinstance(request, testing.CreateSessionRequest):
+            request = testing.CreateSessionRequest(request)
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'create_session' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'CreateSession')
+            self._inner_api_calls['create_session'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    self._client._transport.create_session,
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'CreateSession', config.async_retry)
+        rpc = self._inner_api_calls['create_session']
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # Done; return the response.
+        return response
+
+    async def get_session(self,
+            request: testing.GetSessionRequest = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> testing.Session:
+        r"""Gets a testing session.
+
+        Args:
+            request (:class:`~.testing.GetSessionRequest`):
+                The request object. The request for the GetSession
+                method.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.testing.Session:
+                A session is a suite of tests,
+                generally being made in the context of
+                testing code generation.
+                A session defines tests it may expect,
+                based on which version of the code
+                generation spec is in use.
+
+        """
+        # Create or coerce a protobuf request object.
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        if not isinstance(request, testing.GetSessionRequest):
+            request = testing.GetSessionRequest(request)
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'get_session' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'GetSession')
+            self._inner_api_calls['get_session'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    self._client._transport.get_session,
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'GetSession', config.async_retry)
+        rpc = self._inner_api_calls['get_session']
+
+        # Certain fields should be provided within the metadata header;
+        # add these here.
+        metadata = tuple(metadata) + (
+            gapic_v1.routing_header.to_grpc_metadata((
+                ('name', request.name),
+            )),
+        )
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # Done; return the response.
+        return response
+
+    async def list_sessions(self,
+            request: testing.ListSessionsRequest = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> pagers.ListSessionsAsyncPager:
+        r"""Lists the current test sessions.
+
+        Args:
+            request (:class:`~.testing.ListSessionsRequest`):
+                The request object. The request for the ListSessions
+                method.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.pagers.ListSessionsAsyncPager:
+                Response for the ListSessions method.
+                Iterating over this object will yield
+                results and resolve additional pages
+                automatically.
+
+        """
+        # Create or coerce a protobuf request object.
+        # A request of exactly this type is used as-is rather than copied.
+        # It then still belongs to the caller, so the pager (which
+        # advances `page_token` in place) works on a copy of it, unless
+        # the caller has handed ownership of its requests to the client.
+        owns_request = self._client._take_request_ownership
+        if not isinstance(request, testing.ListSessionsRequest):
+            request = testing.ListSessionsRequest(request)
+            owns_request = True
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'list_sessions' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'ListSessions')
+            self._inner_api_calls['list_sessions'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    self._client._transport.list_sessions,
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'ListSessions', config.async_retry)
+        rpc = self._inner_api_calls['list_sessions']
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # This method is paged; wrap the response in a pager, which provides
+        # an `__aiter__` convenience method.
+        response = pagers.ListSessionsAsyncPager(
+            method=rpc,
+            request=request,
+            response=response,
+            owns_request=owns_request,
+            prefetch_depth=self._client._page_prefetch_depth,
+        )
+
+        # Done; return the response.
+        return response
+
+    async def delete_session(self,
+            request: testing.DeleteSessionRequest = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> None:
+        r"""Delete a test session.
+
+        Args:
+            request (:class:`~.testing.DeleteSessionRequest`):
+                The request object. Request for the DeleteSession
+                method.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+        """
+        # Create or coerce a protobuf request object.
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        if not isinstance(request, testing.DeleteSessionRequest):
+            request = testing.DeleteSessionRequest(request)
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'delete_session' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'DeleteSession')
+            self._inner_api_calls['delete_session'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    self._client._transport.delete_session,
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'DeleteSession', config.async_retry)
+        rpc = self._inner_api_calls['delete_session']
+
+        # Send the request.
+        await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+    async def report_session(self,
+            request: testing.ReportSessionRequest = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> testing.ReportSessionResponse:
+        r"""Report on the status of a session.
+        This generates a report detailing which tests have been
+        completed, and an overall rollup.
+
+        Args:
+            request (:class:`~.testing.ReportSessionRequest`):
+                The request object. Request message for reporting on a
+                session.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.testing.ReportSessionResponse:
+                Response message for reporting on a
+                session.
+
+        """
+        # Create or coerce a protobuf request object.
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        if not isinstance(request, testing.ReportSessionRequest):
+            request = testing.ReportSessionRequest(request)
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'report_session' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'ReportSession')
+            self._inner_api_calls['report_session'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    self._client._transport.report_session,
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'ReportSession', config.async_retry)
+        rpc = self._inner_api_calls['report_session']
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # Done; return the response.
+        return response
+
+    async def list_tests(self,
+            request: testing.ListTestsRequest = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> pagers.ListTestsAsyncPager:
+        r"""List the tests of a sessesion.
+
+        Args:
+            request (:class:`~.testing.ListTestsRequest`):
+                The request object. The request for the ListTests
+                method.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.pagers.ListTestsAsyncPager:
+                The response for the ListTests
+                method.
+                Iterating over this object will yield
+                results and resolve additional pages
+                automatically.
+
+        """
+        # Create or coerce a protobuf request object.
+        # A request of exactly this type is used as-is rather than copied.
+        # It then still belongs to the caller, so the pager (which
+        # advances `page_token` in place) works on a copy of it, unless
+        # the caller has handed ownership of its requests to the client.
+        owns_request = self._client._take_request_ownership
+        if not isinstance(request, testing.ListTestsRequest):
+            request = testing.ListTestsRequest(request)
+            owns_request = True
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'list_tests' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'ListTests')
+            self._inner_api_calls['list_tests'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    self._client._transport.list_tests,
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'ListTests', config.async_retry)
+        rpc = self._inner_api_calls['list_tests']
+
+        # Certain fields should be provided within the metadata header;
+        # add these here.
+        metadata = tuple(metadata) + (
+            gapic_v1.routing_header.to_grpc_metadata((
+                ('parent', request.parent),
+            )),
+        )
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # This method is paged; wrap the response in a pager, which provides
+        # an `__aiter__` convenience method.
+        response = pagers.ListTestsAsyncPager(
+            method=rpc,
+            request=request,
+            response=response,
+            owns_request=owns_request,
+            prefetch_depth=self._client._page_prefetch_depth,
+        )
+
+        # Done; return the response.
+        return response
+
+    async def delete_test(self,
+            request: testing.DeleteTestRequest = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> None:
+        r"""Explicitly decline to implement a test.
+
+        This removes the test from subsequent ``ListTests`` calls, and
+        attempting to do the test will error.
+
+        This method will error if attempting to delete a required test.
+
+        Args:
+            request (:class:`~.testing.DeleteTestRequest`):
+                The request object. Request message for deleting a test.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+        """
+        # Create or coerce a protobuf request object.
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        if not isinstance(request, testing.DeleteTestRequest):
+            request = testing.DeleteTestRequest(request)
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'delete_test' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'DeleteTest')
+            self._inner_api_calls['delete_test'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    self._client._transport.delete_test,
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'DeleteTest', config.async_retry)
+        rpc = self._inner_api_calls['delete_test']
+
+        # Send the request.
+        await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+    async def verify_test(self,
+            request: testing.VerifyTestRequest = None,
+            *,
+            retry: retries.Retry = gapic_v1.method.DEFAULT,
+            timeout: float = gapic_v1.method.DEFAULT,
+            metadata: Sequence[Tuple[str, str]] = (),
+            ) -> testing.VerifyTestResponse:
+        r"""Register a response to a test.
+        In cases where a test involves registering a final
+        answer at the end of the test, this method provides the
+        means to do so.
+
+        Args:
+            request (:class:`~.testing.VerifyTestRequest`):
+                The request object.
+            retry (google.api_core.retry.Retry): Designation of what errors, if any,
+                should be retried.
+            timeout (float): The timeout for this request.
+            metadata (Sequence[Tuple[str, str]]): Strings which should be
+                sent along with the request as metadata.
+
+        Returns:
+            ~.testing.VerifyTestResponse:
+
+        """
+        # Create or coerce a protobuf request object.
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        if not isinstance(request, testing.VerifyTestRequest):
+            request = testing.VerifyTestRequest(request)
+
+        # Wrap the RPC method; this adds retry and timeout information,
+        # and friendly error handling.
+        if 'verify_test' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'VerifyTest')
+            self._inner_api_calls['verify_test'] = retry_budget.wrap(
+                gapic_v1.method_async.wrap_method(
+                    self._client._transport.verify_test,
+                    default_retry=config.async_retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._client._retry_budget, _SERVICE, 'VerifyTest', config.async_retry)
+        rpc = self._inner_api_calls['verify_test']
+
+        # Send the request.
+        response = await rpc(
+            request,
+            retry=retry,
+            timeout=timeout,
+            metadata=metadata,
+        )
+
+        # Done; return the response.
+        return response
+
+
+__all__ = (
+    'TestingAsyncClient',
+)
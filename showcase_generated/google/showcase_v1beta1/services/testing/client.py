@@ -16,8 +16,8 @@
 #
 
 from collections import OrderedDict
-from typing import Dict, Sequence, Tuple, Type, Union
-import pkg_resources
+import functools
+from typing import Callable, Dict, Sequence, Tuple, Type, Union
 
 import google.api_core.client_options as ClientOptions # type: ignore
 from google.api_core import exceptions                 # type: ignore
@@ -26,11 +26,19 @@ from google.api_core import retry as retries           # type: ignore
 from google.auth import credentials                    # type: ignore
 from google.oauth2 import service_account              # type: ignore
 
+from google.showcase_v1beta1 import retry_budget
+from google.showcase_v1beta1 import service_config
+from google.showcase_v1beta1.retry_budget import RetryBudget
 from google.showcase_v1beta1.services.testing import pagers
 from google.showcase_v1beta1.types import testing
 
 from .transports.base import TestingTransport
 from .transports.grpc import TestingGrpcTransport
+from .transports.grpc_asyncio import TestingGrpcAsyncIOTransport
+
+
+# The service's full name, as the service config knows it.
+_SERVICE = 'google.showcase.v1beta1.Testing'
 
 
 class TestingClientMeta(type):
@@ -42,6 +50,7 @@ class TestingClientMeta(type):
     """
     _transport_registry = OrderedDict()  # type: Dict[str, Type[TestingTransport]]
     _transport_registry['grpc'] = TestingGrpcTransport
+    _transport_registry['grpc_asyncio'] = TestingGrpcAsyncIOTransport
 
     def get_transport_class(cls,
             label: str = None,
@@ -101,6 +110,9 @@ class TestingClient(metaclass=TestingClientMeta):
             credentials: credentials.Credentials = None,
             transport: Union[str, TestingTransport] = None,
             client_options: ClientOptions = DEFAULT_OPTIONS,
+            take_request_ownership: bool = False,
+            page_prefetch_depth: int = 0,
+            retry_budget: RetryBudget = None,
             ) -> None:
         """Instantiate the testing client.
 
@@ -114,6 +126,19 @@ class TestingClient(metaclass=TestingClientMeta):
                 transport to use. If set to None, a transport is chosen
                 automatically.
             client_options (ClientOptions): Custom options for the client.
+            take_request_ownership (bool): If True, the caller hands over
+                every request message it passes to this client, and must
+                not use it again afterwards. This lets paged methods
+                advance the request's ``page_token`` in place instead of
+                copying the request first.
+            page_prefetch_depth (int): If set, the pagers returned by paged
+                methods request the following pages in the background, and
+                hold up to this many pages ahead of the caller. This hides
+                the round trip at each page boundary on high-latency links.
+            retry_budget (~.RetryBudget): If set, the calls are retried
+                only while their retries are few next to their requests,
+                as the budget allows; past that, a failed call raises its
+                error at once.
         """
         if isinstance(client_options, dict):
             client_options = ClientOptions.from_dict(client_options)
@@ -133,11 +158,26 @@ class TestingClient(metaclass=TestingClientMeta):
                 host=client_options.api_endpoint or 'localhost:7469',
             )
 
+        # Save a dictionary of cached API call functions.
+        # These are the actual callables which invoke the proper
+        # transport methods, wrapped with `wrap_method` to add retry,
+        # timeout, and the like.
+        self._inner_api_calls = {}  # type: Dict[str, Callable]
+
+        # Save whether request messages may be modified once they are sent.
+        self._take_request_ownership = take_request_ownership
+
+        # Save how many pages the pagers may fetch ahead of the caller.
+        self._page_prefetch_depth = page_prefetch_depth
+
+        # Save the retry budget of the calls, if any.
+        self._retry_budget = retry_budget
+
     def create_session(self,
             request: testing.CreateSessionRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> testing.Session:
         r"""Creates a new testing session.
@@ -163,15 +203,24 @@ class TestingClient(metaclass=TestingClientMeta):
 
         """
         # Create or coerce a protobuf request object.
-        request = testing.CreateSessionRequest(request)
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        if not isinstance(request, testing.CreateSessionRequest):
+            request = testing.CreateSessionRequest(request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.create_session,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'create_session' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'CreateSession')
+            self._inner_api_calls['create_session'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    self._transport.create_session,
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'CreateSession', config.retry)
+        rpc = self._inner_api_calls['create_session']
 
         # Send the request.
         response = rpc(
@@ -188,7 +237,7 @@ class TestingClient(metaclass=TestingClientMeta):
             request: testing.GetSessionRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> testing.Session:
         r"""Gets a testing session.
@@ -214,15 +263,24 @@ class TestingClient(metaclass=TestingClientMeta):
 
         """
         # Create or coerce a protobuf request object.
-        request = testing.GetSessionRequest(request)
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        if not isinstance(request, testing.GetSessionRequest):
+            request = testing.GetSessionRequest(request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.get_session,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'get_session' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'GetSession')
+            self._inner_api_calls['get_session'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    self._transport.get_session,
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'GetSession', config.retry)
+        rpc = self._inner_api_calls['get_session']
 
         # Certain fields should be provided within the metadata header;
         # add these here.
@@ -247,7 +305,7 @@ class TestingClient(metaclass=TestingClientMeta):
             request: testing.ListSessionsRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> pagers.ListSessionsPager:
         r"""Lists the current test sessions.
@@ -271,15 +329,28 @@ class TestingClient(metaclass=TestingClientMeta):
 
         """
         # Create or coerce a protobuf request object.
-        request = testing.ListSessionsRequest(request)
+        # A request of exactly this type is used as-is rather than copied.
+        # It then still belongs to the caller, so the pager (which
+        # advances `page_token` in place) works on a copy of it, unless
+        # the caller has handed ownership of its requests to the client.
+        owns_request = self._take_request_ownership
+        if not isinstance(request, testing.ListSessionsRequest):
+            request = testing.ListSessionsRequest(request)
+            owns_request = True
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.list_sessions,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'list_sessions' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'ListSessions')
+            self._inner_api_calls['list_sessions'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    self._transport.list_sessions,
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'ListSessions', config.retry)
+        rpc = self._inner_api_calls['list_sessions']
 
         # Send the request.
         response = rpc(
@@ -295,6 +366,8 @@ class TestingClient(metaclass=TestingClientMeta):
             method=rpc,
             request=request,
             response=response,
+            owns_request=owns_request,
+            prefetch_depth=self._page_prefetch_depth,
         )
 
         # Done; return the response.
@@ -304,7 +377,7 @@ class TestingClient(metaclass=TestingClientMeta):
             request: testing.DeleteSessionRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> None:
         r"""Delete a test session.
@@ -320,15 +393,24 @@ class TestingClient(metaclass=TestingClientMeta):
                 sent along with the request as metadata.
         """
         # Create or coerce a protobuf request object.
-        request = testing.DeleteSessionRequest(request)
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        if not isinstance(request, testing.DeleteSessionRequest):
+            request = testing.DeleteSessionRequest(request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.delete_session,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'delete_session' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'DeleteSession')
+            self._inner_api_calls['delete_session'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    self._transport.delete_session,
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'DeleteSession', config.retry)
+        rpc = self._inner_api_calls['delete_session']
 
         # Send the request.
         rpc(
@@ -342,7 +424,7 @@ class TestingClient(metaclass=TestingClientMeta):
             request: testing.ReportSessionRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> testing.ReportSessionResponse:
         r"""Report on the status of a session.
@@ -366,15 +448,24 @@ class TestingClient(metaclass=TestingClientMeta):
 
         """
         # Create or coerce a protobuf request object.
-        request = testing.ReportSessionRequest(request)
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        if not isinstance(request, testing.ReportSessionRequest):
+            request = testing.ReportSessionRequest(request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.report_session,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'report_session' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'ReportSession')
+            self._inner_api_calls['report_session'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    self._transport.report_session,
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'ReportSession', config.retry)
+        rpc = self._inner_api_calls['report_session']
 
         # Send the request.
         response = rpc(
@@ -391,7 +482,7 @@ class TestingClient(metaclass=TestingClientMeta):
             request: testing.ListTestsRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> pagers.ListTestsPager:
         r"""List the tests of a sessesion.
@@ -416,15 +507,28 @@ class TestingClient(metaclass=TestingClientMeta):
 
         """
         # Create or coerce a protobuf request object.
-        request = testing.ListTestsRequest(request)
+        # A request of exactly this type is used as-is rather than copied.
+        # It then still belongs to the caller, so the pager (which
+        # advances `page_token` in place) works on a copy of it, unless
+        # the caller has handed ownership of its requests to the client.
+        owns_request = self._take_request_ownership
+        if not isinstance(request, testing.ListTestsRequest):
+            request = testing.ListTestsRequest(request)
+            owns_request = True
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.list_tests,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'list_tests' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'ListTests')
+            self._inner_api_calls['list_tests'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    self._transport.list_tests,
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'ListTests', config.retry)
+        rpc = self._inner_api_calls['list_tests']
 
         # Certain fields should be provided within the metadata header;
         # add these here.
@@ -448,6 +552,8 @@ class TestingClient(metaclass=TestingClientMeta):
             method=rpc,
             request=request,
             response=response,
+            owns_request=owns_request,
+            prefetch_depth=self._page_prefetch_depth,
         )
 
         # Done; return the response.
@@ -457,7 +563,7 @@ class TestingClient(metaclass=TestingClientMeta):
             request: testing.DeleteTestRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> None:
         r"""Explicitly decline to implement a test.
@@ -477,15 +583,24 @@ class TestingClient(metaclass=TestingClientMeta):
                 sent along with the request as metadata.
         """
         # Create or coerce a protobuf request object.
-        request = testing.DeleteTestRequest(request)
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        if not isinstance(request, testing.DeleteTestRequest):
+            request = testing.DeleteTestRequest(request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.delete_test,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'delete_test' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'DeleteTest')
+            self._inner_api_calls['delete_test'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    self._transport.delete_test,
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'DeleteTest', config.retry)
+        rpc = self._inner_api_calls['delete_test']
 
         # Send the request.
         rpc(
@@ -499,7 +614,7 @@ class TestingClient(metaclass=TestingClientMeta):
             request: testing.VerifyTestRequest = None,
             *,
             retry: retries.Retry = gapic_v1.method.DEFAULT,
-            timeout: float = None,
+            timeout: float = gapic_v1.method.DEFAULT,
             metadata: Sequence[Tuple[str, str]] = (),
             ) -> testing.VerifyTestResponse:
         r"""Register a response to a test.
@@ -521,15 +636,24 @@ class TestingClient(metaclass=TestingClientMeta):
 
         """
         # Create or coerce a protobuf request object.
-        request = testing.VerifyTestRequest(request)
+        # A request of exactly this type is used as-is rather than copied;
+        # the client never modifies it.
+        if not isinstance(request, testing.VerifyTestRequest):
+            request = testing.VerifyTestRequest(request)
 
         # Wrap the RPC method; this adds retry and timeout information,
         # and friendly error handling.
-        rpc = gapic_v1.method.wrap_method(
-            self._transport.verify_test,
-            default_timeout=None,
-            client_info=_client_info,
-        )
+        if 'verify_test' not in self._inner_api_calls:
+            config = service_config.method_config(_SERVICE, 'VerifyTest')
+            self._inner_api_calls['verify_test'] = retry_budget.wrap(
+                gapic_v1.method.wrap_method(
+                    self._transport.verify_test,
+                    default_retry=config.retry,
+                    default_timeout=config.timeout,
+                    client_info=_get_client_info(),
+                ),
+                self._retry_budget, _SERVICE, 'VerifyTest', config.retry)
+        rpc = self._inner_api_calls['verify_test']
 
         # Send the request.
         response = rpc(
@@ -546,14 +670,19 @@ class TestingClient(metaclass=TestingClientMeta):
 
 
 
-try:
-    _client_info = gapic_v1.client_info.ClientInfo(
-        gapic_version=pkg_resources.get_distribution(
-            'google-showcase',
-        ).version,
-    )
-except pkg_resources.DistributionNotFound:
-    _client_info = gapic_v1.client_info.ClientInfo()
+@functools.lru_cache(maxsize=None)
+def _get_client_info() -> gapic_v1.client_info.ClientInfo:
+    # Looking up the installed version is slow, so it is done when the
+    # first method is wrapped rather than when this module is imported.
+    import pkg_resources
+    try:
+        return gapic_v1.client_info.ClientInfo(
+            gapic_version=pkg_resources.get_distribution(
+                'google-showcase',
+            ).version,
+        )
+    except pkg_resources.DistributionNotFound:
+        return gapic_v1.client_info.ClientInfo()
 
 
 __all__ = (
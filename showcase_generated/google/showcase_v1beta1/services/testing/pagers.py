@@ -15,8 +15,9 @@
 # limitations under the License.
 #
 
-from typing import Any, Callable, Iterable
+from typing import Any, AsyncIterable, Awaitable, Callable, Iterable
 
+from google.showcase_v1beta1 import page_prefetch
 from google.showcase_v1beta1.types import testing
 
 
@@ -41,7 +42,9 @@ class ListSessionsPager:
             method: Callable[[testing.ListSessionsRequest],
                 testing.ListSessionsResponse],
             request: testing.ListSessionsRequest,
-            response: testing.ListSessionsResponse):
+            response: testing.ListSessionsResponse,
+            owns_request: bool = False,
+            prefetch_depth: int = 0):
         """Instantiate the pager.
 
         Args:
@@ -51,22 +54,41 @@ class ListSessionsPager:
                 The initial request object.
             response (:class:`~.testing.ListSessionsResponse`):
                 The initial response object.
+            owns_request (bool): If True, the pager takes ownership of
+                ``request`` and advances its ``page_token`` in place instead
+                of working on a copy.
+            prefetch_depth (int): If set, the following pages are requested
+                in the background as soon as each page arrives, and up to
+                this many of them are held until they are iterated over.
         """
         self._method = method
-        self._request = testing.ListSessionsRequest(request)
+        self._request = request if owns_request else testing.ListSessionsRequest(request)
         self._response = response
+        self._prefetch_depth = prefetch_depth
 
     def __getattr__(self, name: str) -> Any:
         return getattr(self._response, name)
 
     @property
     def pages(self) -> Iterable[testing.ListSessionsResponse]:
+        if self._prefetch_depth:
+            pages = page_prefetch.prefetch_pages(
+                self._response, self._fetch_page, self._prefetch_depth)
+            for page in pages:
+                self._response = page
+                yield page
+            return
         yield self._response
         while self._response.next_page_token:
             self._request.page_token = self._response.next_page_token
             self._response = self._method(self._request)
             yield self._response
 
+    def _fetch_page(self, response):
+        # Runs on the prefetching thread; only it touches the request.
+        self._request.page_token = response.next_page_token
+        return self._method(self._request)
+
     def __iter__(self) -> Iterable[testing.Session]:
         for page in self.pages:
             yield from page.sessions
@@ -96,7 +118,9 @@ class ListTestsPager:
             method: Callable[[testing.ListTestsRequest],
                 testing.ListTestsResponse],
             request: testing.ListTestsRequest,
-            response: testing.ListTestsResponse):
+            response: testing.ListTestsResponse,
+            owns_request: bool = False,
+            prefetch_depth: int = 0):
         """Instantiate the pager.
 
         Args:
@@ -106,25 +130,204 @@ class ListTestsPager:
                 The initial request object.
             response (:class:`~.testing.ListTestsResponse`):
                 The initial response object.
+            owns_request (bool): If True, the pager takes ownership of
+                ``request`` and advances its ``page_token`` in place instead
+                of working on a copy.
+            prefetch_depth (int): If set, the following pages are requested
+                in the background as soon as each page arrives, and up to
+                this many of them are held until they are iterated over.
         """
         self._method = method
-        self._request = testing.ListTestsRequest(request)
+        self._request = request if owns_request else testing.ListTestsRequest(request)
         self._response = response
+        self._prefetch_depth = prefetch_depth
 
     def __getattr__(self, name: str) -> Any:
         return getattr(self._response, name)
 
     @property
     def pages(self) -> Iterable[testing.ListTestsResponse]:
+        if self._prefetch_depth:
+            pages = page_prefetch.prefetch_pages(
+                self._response, self._fetch_page, self._prefetch_depth)
+            for page in pages:
+                self._response = page
+                yield page
+            return
         yield self._response
         while self._response.next_page_token:
             self._request.page_token = self._response.next_page_token
             self._response = self._method(self._request)
             yield self._response
 
+    def _fetch_page(self, response):
+        # Runs on the prefetching thread; only it touches the request.
+        self._request.page_token = response.next_page_token
+        return self._method(self._request)
+
     def __iter__(self) -> Iterable[testing.Test]:
         for page in self.pages:
             yield from page.tests
 
     def __repr__(self) -> str:
         return '{0}<{1!r}>'.format(self.__class__.__name__, self._response)
+
+
+class ListSessionsAsyncPager:
+    """A pager for iterating through ``list_sessions`` requests.
+
+    This class thinly wraps an initial
+    :class:`~.testing.ListSessionsResponse` object, and
+    provides an ``__aiter__`` method to iterate through its
+    ``sessions`` field.
+
+    If there are more pages, the ``__aiter__`` method will make additional
+    ``ListSessions`` requests and continue to iterate
+    through the ``sessions`` field on the
+    corresponding responses.
+
+    All the usual :class:`~.testing.ListSessionsResponse`
+    attributes are available on the pager. If multiple requests are made, only
+    the most recent response is retained, and thus used for attribute lookup.
+    """
+    def __init__(self,
+            method: Callable[[testing.ListSessionsRequest],
+                Awaitable[testing.ListSessionsResponse]],
+            request: testing.ListSessionsRequest,
+            response: testing.ListSessionsResponse,
+            owns_request: bool = False,
+            prefetch_depth: int = 0):
+        """Instantiate the pager.
+
+        Args:
+            method (Callable): The method that was originally called, and
+                which instantiated this pager.
+            request (:class:`~.testing.ListSessionsRequest`):
+                The initial request object.
+            response (:class:`~.testing.ListSessionsResponse`):
+                The initial response object.
+            owns_request (bool): If True, the pager takes ownership of
+                ``request`` and advances its ``page_token`` in place instead
+                of working on a copy.
+            prefetch_depth (int): If set, the following pages are requested
+                in the background as soon as each page arrives, and up to
+                this many of them are held until they are iterated over.
+        """
+        self._method = method
+        self._request = request if owns_request else testing.ListSessionsRequest(request)
+        self._response = response
+        self._prefetch_depth = prefetch_depth
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._response, name)
+
+    @property
+    async def pages(self) -> AsyncIterable[testing.ListSessionsResponse]:
+        if self._prefetch_depth:
+            pages = page_prefetch.prefetch_pages_async(
+                self._response, self._fetch_page, self._prefetch_depth)
+            async for page in pages:
+                self._response = page
+                yield page
+            return
+        yield self._response
+        while self._response.next_page_token:
+            self._request.page_token = self._response.next_page_token
+            self._response = await self._method(self._request)
+            yield self._response
+
+    async def _fetch_page(self, response):
+        # Runs in the prefetching task; only it touches the request.
+        self._request.page_token = response.next_page_token
+        return await self._method(self._request)
+
+    def __aiter__(self) -> AsyncIterable[testing.Session]:
+        async def async_generator():
+            async for page in self.pages:
+                for response in page.sessions:
+                    yield response
+
+        return async_generator()
+
+    def __repr__(self) -> str:
+        return '{0}<{1!r}>'.format(self.__class__.__name__, self._response)
+
+
+class ListTestsAsyncPager:
+    """A pager for iterating through ``list_tests`` requests.
+
+    This class thinly wraps an initial
+    :class:`~.testing.ListTestsResponse` object, and
+    provides an ``__aiter__`` method to iterate through its
+    ``tests`` field.
+
+    If there are more pages, the ``__aiter__`` method will make additional
+    ``ListTests`` requests and continue to iterate
+    through the ``tests`` field on the
+    corresponding responses.
+
+    All the usual :class:`~.testing.ListTestsResponse`
+    attributes are available on the pager. If multiple requests are made, only
+    the most recent response is retained, and thus used for attribute lookup.
+    """
+    def __init__(self,
+            method: Callable[[testing.ListTestsRequest],
+                Awaitable[testing.ListTestsResponse]],
+            request: testing.ListTestsRequest,
+            response: testing.ListTestsResponse,
+            owns_request: bool = False,
+            prefetch_depth: int = 0):
+        """Instantiate the pager.
+
+        Args:
+            method (Callable): The method that was originally called, and
+                which instantiated this pager.
+            request (:class:`~.testing.ListTestsRequest`):
+                The initial request object.
+            response (:class:`~.testing.ListTestsResponse`):
+                The initial response object.
+            owns_request (bool): If True, the pager takes ownership of
+                ``request`` and advances its ``page_token`` in place instead
+                of working on a copy.
+            prefetch_depth (int): If set, the following pages are requested
+                in the background as soon as each page arrives, and up to
+                this many of them are held until they are iterated over.
+        """
+        self._method = method
+        self._request = request if owns_request else testing.ListTestsRequest(request)
+        self._response = response
+        self._prefetch_depth = prefetch_depth
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._response, name)
+
+    @property
+    async def pages(self) -> AsyncIterable[testing.ListTestsResponse]:
+        if self._prefetch_depth:
+            pages = page_prefetch.prefetch_pages_async(
+                self._response, self._fetch_page, self._prefetch_depth)
+            async for page in pages:
+                self._response = page
+                yield page
+            return
+        yield self._response
+        while self._response.next_page_token:
+            self._request.page_token = self._response.next_page_token
+            self._response = await self._method(self._request)
+            yield self._response
+
+    async def _fetch_page(self, response):
+        # Runs in the prefetching task; only it touches the request.
+        self._request.page_token = response.next_page_token
+        return await self._method(self._request)
+
+    def __aiter__(self) -> AsyncIterable[testing.Test]:
+        async def async_generator():
+            async for page in self.pages:
+                for response in page.tests:
+                    yield response
+
+        return async_generator()
+
+    def __repr__(self) -> str:
+        return '{0}<{1!r}>'.format(self.__class__.__name__, self._response)
@@ -20,14 +20,17 @@ from typing import Dict, Type
 
 from .base import TestingTransport
 from .grpc import TestingGrpcTransport
+from .grpc_asyncio import TestingGrpcAsyncIOTransport
 
 
 # Compile a registry of transports.
 _transport_registry = OrderedDict()  # type: Dict[str, Type[TestingTransport]]
 _transport_registry['grpc'] = TestingGrpcTransport
+_transport_registry['grpc_asyncio'] = TestingGrpcAsyncIOTransport
 
 
 __all__ = (
     'TestingTransport',
     'TestingGrpcTransport',
+    'TestingGrpcAsyncIOTransport',
 )
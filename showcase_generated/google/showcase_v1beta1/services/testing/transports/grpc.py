@@ -23,6 +23,8 @@ from google.auth import credentials        # type: ignore
 import grpc  # type: ignore
 
 from google.protobuf import empty_pb2 as empty  # type: ignore
+from google.showcase_v1beta1 import channel_pool
+from google.showcase_v1beta1 import service_config
 from google.showcase_v1beta1.types import testing
 
 from .base import TestingTransport
@@ -44,7 +46,9 @@ class TestingGrpcTransport(TestingTransport):
     def __init__(self, *,
             host: str = 'localhost:7469',
             credentials: credentials.Credentials = None,
-            channel: grpc.Channel = None) -> None:
+            channel: grpc.Channel = None,
+            channel_pool_size: int = None,
+            grpc_service_config: bool = False) -> None:
         """Instantiate the transport.
 
         Args:
@@ -57,6 +61,17 @@ class TestingGrpcTransport(TestingTransport):
                 This argument is ignored if ``channel`` is provided.
             channel (Optional[grpc.Channel]): A ``Channel`` instance through
                 which to make calls.
+            channel_pool_size (Optional[int]): If set, spread calls over a
+                :class:`~.channel_pool.ChannelPool` of this many channels
+                instead of using a single one. The pool is shared with every
+                other transport for the same host, credentials and pool
+                size. This argument is ignored if ``channel`` is provided.
+            grpc_service_config (bool): If True, the channel is created
+                with the service config as its ``grpc.service_config``
+                option, so that gRPC itself retries the calls the
+                config allows it to, up to their ``maxAttempts``; see
+                :mod:`~.service_config`. This argument is ignored if
+                ``channel`` is provided.
         """
         # Sanity check: Ensure that channel and credentials are not both
         # provided.
@@ -66,6 +81,8 @@ class TestingGrpcTransport(TestingTransport):
         # Run the base constructor.
         super().__init__(host=host, credentials=credentials)
         self._stubs = {}  # type: Dict[str, Callable]
+        self._channel_pool_size = channel_pool_size
+        self._grpc_service_config = grpc_service_config
 
         # If a channel was explicitly provided, set it.
         if channel:
@@ -81,11 +98,25 @@ class TestingGrpcTransport(TestingTransport):
         # Sanity check: Only create a new channel if we do not already
         # have one.
         if not hasattr(self, '_grpc_channel'):
-            self._grpc_channel = grpc_helpers.create_channel(
-                self._host,
-                credentials=self._credentials,
-                scopes=self.AUTH_SCOPES,
-            )
+            options = []
+            if self._grpc_service_config:
+                options.append(
+                    ('grpc.service_config', service_config.SERVICE_CONFIG_JSON))
+            if self._channel_pool_size:
+                self._grpc_channel = channel_pool.shared_pool(
+                    self._host,
+                    size=self._channel_pool_size,
+                    credentials=self._credentials,
+                    scopes=self.AUTH_SCOPES,
+                    options=options,
+                )
+            else:
+                self._grpc_channel = grpc_helpers.create_channel(
+                    self._host,
+                    credentials=self._credentials,
+                    scopes=self.AUTH_SCOPES,
+                    options=options,
+                )
 
         # Return the channel from cache.
         return self._grpc_channel
@@ -24,7 +24,7 @@ import nox  # type: ignore
 def unit(session):
     """Run the unit test suite."""
 
-    session.install('coverage', 'pytest', 'pytest-cov')
+    session.install('coverage', 'pytest', 'pytest-asyncio', 'pytest-cov')
     session.install('-e', '.')
 
     session.run(
@@ -47,3 +47,14 @@ def mypy(session):
         'mypy',
         'google',
     )
+
+
+@nox.session(python='3.7')
+def benchmark(session):
+    """Benchmark the clients against an in-process server."""
+    session.install('-e', '.')
+    session.run(
+        'python',
+        os.path.join('benchmarks', 'suite.py'),
+        *session.posargs
+    )
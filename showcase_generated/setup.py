@@ -26,9 +26,9 @@ setuptools.setup(
     platforms='Posix; MacOS X; Windows',
     include_package_data=True,
     install_requires=(
-        'google-api-core >= 1.8.0, < 2.0.0dev',
+        'google-api-core >= 1.22.0, < 2.0.0dev',
         'googleapis-common-protos >= 1.5.8',
-        'grpcio >= 1.10.0',
+        'grpcio >= 1.32.0',
         'proto-plus >= 0.4.0',
     ),
     setup_requires=[
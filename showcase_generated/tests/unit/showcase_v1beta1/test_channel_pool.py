@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from concurrent import futures
+from unittest import mock
+
+import grpc
+
+import pytest
+
+from google.api_core import exceptions
+from google.api_core import grpc_helpers
+from google.auth import credentials
+from google.showcase_v1beta1 import channel_pool
+from google.showcase_v1beta1.services.echo import EchoClient
+from google.showcase_v1beta1.services.echo import transports as echo_transports
+from google.showcase_v1beta1.services.identity import transports as identity_transports
+from google.showcase_v1beta1.services.messaging import transports as messaging_transports
+from google.showcase_v1beta1.services.testing import transports as testing_transports
+from google.showcase_v1beta1.types import echo as gs_echo
+
+
+def _fake_channels(count):
+    return [mock.Mock(spec=grpc.Channel) for _ in range(count)]
+
+
+def test_channel_pool_requires_channels():
+    with pytest.raises(ValueError):
+        channel_pool.ChannelPool([])
+
+
+def test_channel_pool_unknown_strategy():
+    with pytest.raises(ValueError):
+        channel_pool.ChannelPool(_fake_channels(1), strategy='random')
+
+
+def test_channel_pool_round_robin():
+    channels = _fake_channels(3)
+    pool = channel_pool.ChannelPool(channels)
+    method = pool.unary_unary('/svc/Method', 'ser', 'deser')
+
+    # One multicallable is built per channel, with the same arguments.
+    for channel in channels:
+        channel.unary_unary.assert_called_once_with(
+            '/svc/Method', 'ser', 'deser')
+
+    for _ in range(7):
+        method('request', timeout=1)
+
+    assert [c.unary_unary.return_value.call_count for c in channels] == [3, 2, 2]
+    channels[0].unary_unary.return_value.assert_called_with('request', timeout=1)
+    assert pool.outstanding == (0, 0, 0)
+
+
+def test_channel_pool_least_outstanding():
+    channels = _fake_channels(3)
+    pool = channel_pool.ChannelPool(
+        channels,
+        strategy=channel_pool.LEAST_OUTSTANDING,
+    )
+    method = pool.unary_stream('/svc/Method')
+
+    # Streams stay outstanding until they are done.
+    calls = [method('request') for _ in range(3)]
+    assert pool.outstanding == (1, 1, 1)
+
+    # Finish the stream on the second channel; it is the idle one now.
+    _, (done_callback,), _ = calls[1].add_done_callback.mock_calls[0]
+    done_callback(calls[1])
+    assert pool.outstanding == (1, 0, 1)
+
+    method('request')
+    assert pool.outstanding == (1, 1, 1)
+    assert channels[1].unary_stream.return_value.call_count == 2
+
+
+def test_channel_pool_blocking_calls_release_on_error():
+    channels = _fake_channels(2)
+    pool = channel_pool.ChannelPool(channels)
+    unary = pool.unary_unary('/svc/Unary')
+    stream = pool.stream_unary('/svc/Stream')
+    channels[0].unary_unary.return_value.with_call.side_effect = RuntimeError
+    channels[0].stream_unary.return_value.side_effect = RuntimeError
+
+    with pytest.raises(RuntimeError):
+        unary.with_call('request')
+    stream.with_call(iter(()))
+    with pytest.raises(RuntimeError):
+        stream(iter(()))
+
+    assert pool.outstanding == (0, 0)
+
+
+def test_channel_pool_async_calls():
+    channels = _fake_channels(1)
+    pool = channel_pool.ChannelPool(channels)
+    methods = (
+        pool.unary_unary('/svc/UnaryUnary').future,
+        pool.stream_unary('/svc/StreamUnary').future,
+        pool.stream_stream('/svc/StreamStream'),
+    )
+
+    calls = [method('request') for method in methods]
+    assert pool.outstanding == (3,)
+    for call in calls:
+        _, (done_callback,), _ = call.add_done_callback.mock_calls[0]
+        done_callback(call)
+    assert pool.outstanding == (0,)
+
+    # A call that fails to start is not outstanding.
+    channels[0].stream_stream.return_value.side_effect = RuntimeError
+    with pytest.raises(RuntimeError):
+        methods[2](iter(()))
+    assert pool.outstanding == (0,)
+
+
+def test_channel_pool_streaming_wrap_errors():
+    # api-core decides how to wrap errors based on the multicallable type.
+    pool = channel_pool.ChannelPool(_fake_channels(1))
+    assert isinstance(pool.unary_unary('/a'), grpc.UnaryUnaryMultiCallable)
+    assert isinstance(pool.unary_stream('/a'), grpc.UnaryStreamMultiCallable)
+    assert isinstance(pool.stream_unary('/a'), grpc.StreamUnaryMultiCallable)
+    assert isinstance(pool.stream_stream('/a'), grpc.StreamStreamMultiCallable)
+
+
+def test_channel_pool_subscribe_and_close():
+    channels = _fake_channels(2)
+    callback = mock.Mock()
+    with channel_pool.ChannelPool(channels) as pool:
+        pool.subscribe(callback, try_to_connect=True)
+        pool.unsubscribe(callback)
+        assert pool.channels == tuple(channels)
+
+    for channel in channels:
+        channel.subscribe.assert_called_once_with(callback, try_to_connect=True)
+        channel.unsubscribe.assert_called_once_with(callback)
+        channel.close.assert_called_once_with()
+
+
+@pytest.mark.parametrize('timeout', [None, 5.0])
+def test_wait_for_ready(timeout):
+    channels = _fake_channels(2)
+    pool = channel_pool.ChannelPool(channels)
+    with mock.patch.object(grpc, 'channel_ready_future') as ready:
+        channel_pool.wait_for_ready(pool, timeout)
+        channel_pool.wait_for_ready(channels[0], timeout)
+
+    # Every channel of the pool is waited for.
+    assert [c[0][0] for c in ready.call_args_list] == channels + channels[:1]
+    assert ready.return_value.result.call_count == 3
+
+
+def test_wait_for_ready_timeout():
+    channel = mock.Mock(spec=grpc.Channel)
+    with mock.patch.object(grpc, 'channel_ready_future') as ready:
+        ready.return_value.result.side_effect = grpc.FutureTimeoutError()
+        with pytest.raises(exceptions.DeadlineExceeded):
+            channel_pool.wait_for_ready(channel, 0.1)
+    ready.return_value.cancel.assert_called_once_with()
+
+
+def test_channel_pool_create():
+    creds = credentials.AnonymousCredentials()
+    with mock.patch.object(grpc_helpers, 'create_channel') as create_channel:
+        pool = channel_pool.ChannelPool.create(
+            'squid.clam.whelk:443',
+            size=3,
+            credentials=creds,
+            scopes=('a',),
+            options=[('grpc.max_send_message_length', 1)],
+        )
+
+    assert len(pool.channels) == 3
+    assert create_channel.call_count == 3
+    create_channel.assert_called_with(
+        'squid.clam.whelk:443',
+        credentials=creds,
+        scopes=('a',),
+        options=[
+            ('grpc.max_send_message_length', 1),
+            ('grpc.use_local_subchannel_pool', 1),
+        ],
+    )
+
+
+def test_shared_pool_across_services():
+    creds = credentials.AnonymousCredentials()
+    transports = [
+        module(
+            host='squid.clam.whelk',
+            credentials=creds,
+            channel_pool_size=2,
+        )
+        for module in (
+            echo_transports.EchoGrpcTransport,
+            identity_transports.IdentityGrpcTransport,
+            messaging_transports.MessagingGrpcTransport,
+            testing_transports.TestingGrpcTransport,
+        )
+    ]
+
+    pool = transports[0].grpc_channel
+    assert isinstance(pool, channel_pool.ChannelPool)
+    assert len(pool.channels) == 2
+    assert all(t.grpc_channel is pool for t in transports)
+
+    # A different pool size (or host, or credentials) gets its own pool.
+    other = echo_transports.EchoGrpcTransport(
+        host='squid.clam.whelk',
+        credentials=creds,
+        channel_pool_size=3,
+    )
+    assert other.grpc_channel is not pool
+
+    # So do channels with other options.
+    configured = messaging_transports.MessagingGrpcTransport(
+        host='squid.clam.whelk',
+        credentials=creds,
+        channel_pool_size=2,
+        grpc_service_config=True,
+    )
+    assert configured.grpc_channel is not pool
+
+    # Closing a shared pool forgets it.
+    pool.close()
+    assert channel_pool.shared_pool(
+        'squid.clam.whelk:443',
+        size=2,
+        credentials=creds,
+    ) is not pool
+
+
+def test_channel_pool_end_to_end():
+    def echo(request, context):
+        return gs_echo.EchoResponse(content=request.content)
+
+    def expand(request, context):
+        for word in request.content.split(' '):
+            yield gs_echo.EchoResponse(content=word)
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    server.add_generic_rpc_handlers((grpc.method_handlers_generic_handler(
+        'google.showcase.v1beta1.Echo', {
+            'Echo': grpc.unary_unary_rpc_method_handler(
+                echo,
+                request_deserializer=gs_echo.EchoRequest.deserialize,
+                response_serializer=gs_echo.EchoResponse.serialize,
+            ),
+            'Expand': grpc.unary_stream_rpc_method_handler(
+                expand,
+                request_deserializer=gs_echo.ExpandRequest.deserialize,
+                response_serializer=gs_echo.EchoResponse.serialize,
+            ),
+        }),))
+    port = server.add_insecure_port('localhost:0')
+    server.start()
+    try:
+        pool = channel_pool.ChannelPool([
+            grpc.insecure_channel('localhost:{}'.format(port))
+            for _ in range(2)
+        ])
+        client = EchoClient(
+            transport=echo_transports.EchoGrpcTransport(channel=pool),
+        )
+
+        for _ in range(3):
+            response = client.echo(gs_echo.EchoRequest(content='hi'))
+            assert response.content == 'hi'
+
+        words = client.expand(gs_echo.ExpandRequest(content='one two'))
+        assert [w.content for w in words] == ['one', 'two']
+        assert pool.outstanding == (0, 0)
+        pool.close()
+    finally:
+        server.stop(None)
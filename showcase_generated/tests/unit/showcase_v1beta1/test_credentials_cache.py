@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import datetime
+import threading
+from unittest import mock
+
+import pytest
+
+from google import auth
+from google.auth import _helpers
+from google.auth import credentials
+from google.auth import exceptions
+from google.auth.transport import requests
+from google.showcase_v1beta1 import credentials_cache
+
+
+class _Credentials(credentials.Credentials):
+    # Credentials whose token lasts ``lifetime`` from ``now``, or never
+    # expires if it is None.
+    def __init__(self, now, lifetime=datetime.timedelta(hours=1), error=None):
+        super().__init__()
+        self.now = now
+        self.lifetime = lifetime
+        self.error = error
+        self.requests = []
+        self.refreshed = threading.Event()
+
+    def refresh(self, request):
+        self.requests.append(request)
+        if self.error is not None:
+            raise self.error
+        self.token = 'token-{}'.format(len(self.requests))
+        self.expiry = None if self.lifetime is None else self.now + self.lifetime
+        self.refreshed.set()
+
+
+@pytest.fixture
+def cache():
+    credentials_cache.clear()
+    yield
+    credentials_cache.clear()
+
+
+def test_default_is_resolved_once(cache):
+    anonymous = credentials.AnonymousCredentials()
+    with mock.patch.object(auth, 'default') as adc:
+        adc.return_value = (anonymous, 'project')
+        assert credentials_cache.default(scopes=['a']) == (anonymous, 'project')
+        assert credentials_cache.default(scopes=('a',)) == (anonymous, 'project')
+        adc.assert_called_once_with(scopes=['a'])
+
+        # Each set of scopes is resolved on its own.
+        credentials_cache.default()
+        assert adc.call_count == 2
+
+        # Until the cache is cleared.
+        credentials_cache.clear()
+        credentials_cache.default(scopes=('a',))
+        assert adc.call_count == 3
+
+
+def test_default_error(cache):
+    with mock.patch.object(auth, 'default') as adc:
+        adc.side_effect = exceptions.DefaultCredentialsError('none')
+        with pytest.raises(exceptions.DefaultCredentialsError):
+            credentials_cache.default()
+        adc.side_effect = None
+        adc.return_value = (credentials.AnonymousCredentials(), None)
+        credentials_cache.default()
+        assert adc.call_count == 2
+
+
+def test_background_refresh(cache):
+    # The tokens are fetched before the first call needs them.
+    creds = _Credentials(_helpers.utcnow())
+    scoped = _Credentials(_helpers.utcnow())
+    with mock.patch.object(auth, 'default') as adc:
+        adc.return_value = (creds, None)
+        assert credentials_cache.default()[0] is creds
+        adc.return_value = (scoped, None)
+        assert credentials_cache.default(scopes=('a',))[0] is scoped
+    assert creds.refreshed.wait(5.0)
+    assert scoped.refreshed.wait(5.0)
+    assert creds.valid
+    assert isinstance(creds.requests[0], requests.Request)
+
+
+def test_refresh_before_expiry():
+    now = _helpers.utcnow()
+    refresher = credentials_cache._Refresher()
+    creds = _Credentials(now)
+    refresher.add(creds)
+    refresher.add(credentials.AnonymousCredentials())
+
+    # A token is fetched at once, and refreshed five minutes before it
+    # expires.
+    assert refresher.refresh_due(now) == 55 * 60
+    assert creds.token == 'token-1'
+    assert refresher.refresh_due(now + datetime.timedelta(minutes=54)) == 60
+    assert len(creds.requests) == 1
+
+    later = now + datetime.timedelta(minutes=56)
+    creds.now = later
+    assert refresher.refresh_due(later) == 55 * 60
+    assert creds.token == 'token-2'
+
+    # Every refresh shares the same transport.
+    assert creds.requests[0] is creds.requests[1]
+
+
+def test_refresh_short_lived_tokens():
+    now = _helpers.utcnow()
+    refresher = credentials_cache._Refresher()
+    short = _Credentials(now, lifetime=datetime.timedelta(minutes=1))
+    endless = _Credentials(now, lifetime=None)
+    refresher.add(short)
+    refresher.add(endless)
+
+    # A token that is already within the margin is refreshed again only
+    # after a while; one that never expires, never.
+    assert refresher.refresh_due(now) == 30
+    assert refresher.refresh_due(now + datetime.timedelta(seconds=10)) == 20
+    assert (len(short.requests), len(endless.requests)) == (1, 1)
+
+
+@pytest.mark.parametrize('error', [
+    exceptions.RefreshError('no network'),
+    ValueError('malformed response'),
+])
+def test_refresh_error(error):
+    now = _helpers.utcnow()
+    refresher = credentials_cache._Refresher()
+    creds = _Credentials(now, error=error)
+    refresher.add(creds)
+
+    # A failed refresh is tried again after a while.
+    assert refresher.refresh_due(now) == 30
+    assert refresher.refresh_due(now + datetime.timedelta(seconds=10)) == 20
+    assert len(creds.requests) == 1
+    assert refresher.refresh_due(now + datetime.timedelta(seconds=30)) == 30
+    assert len(creds.requests) == 2
+
+    # Cleared credentials are no longer refreshed.
+    refresher.clear()
+    assert refresher.refresh_due(now + datetime.timedelta(minutes=1)) is None
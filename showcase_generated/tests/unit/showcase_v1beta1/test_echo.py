@@ -15,27 +15,55 @@
 # limitations under the License.
 #
 
+import asyncio
+from concurrent import futures
+import threading
 from unittest import mock
 
 import grpc
+from grpc import aio
 
 import pytest
 
 from google import auth
 from google.api_core import client_options
+from google.api_core import exceptions
+from google.api_core import gapic_v1
+from google.api_core import grpc_helpers
+from google.api_core import grpc_helpers_async
+from google.api_core import operation
+from google.api_core import operation_async
 from google.api_core import future
 from google.api_core import operations_v1
+from google.api_core import retry as retries
 from google.auth import credentials
 from google.longrunning import operations_pb2
 from google.oauth2 import service_account
 from google.rpc import status_pb2 as status  # type: ignore
+from google.showcase_v1beta1 import channel_pool
+from google.showcase_v1beta1 import credentials_cache
+from google.showcase_v1beta1 import operation_poller
+from google.showcase_v1beta1 import service_config
+from google.showcase_v1beta1.governor import Governor
+from google.showcase_v1beta1.hedging import HedgingPolicy
+from google.showcase_v1beta1.operation_poller import OperationPoller
+from google.showcase_v1beta1.services.echo import EchoAsyncClient
 from google.showcase_v1beta1.services.echo import EchoClient
+from google.showcase_v1beta1.services.echo import multiplex
 from google.showcase_v1beta1.services.echo import pagers
 from google.showcase_v1beta1.services.echo import transports
 from google.showcase_v1beta1.types import echo
 from google.showcase_v1beta1.types import echo as gs_echo
 
 
+def _fake_stream_call(call_type, responses):
+    # A streaming call that yields the given responses when iterated.
+    call = mock.MagicMock(spec=call_type)
+    call.wait_for_connection = mock.AsyncMock()
+    call.__aiter__.return_value = responses
+    return call
+
+
 def test_echo_client_from_service_account_file():
     creds = credentials.AnonymousCredentials()
     with mock.patch.object(service_account.Credentials, 'from_service_account_file') as factory:
@@ -72,6 +100,23 @@ def test_echo_client_client_options_from_dict():
         transport.assert_called_once_with(credentials=None, host="squid.clam.whelk")
 
 
+def test_echo_async_client_from_service_account_file():
+    creds = credentials.AnonymousCredentials()
+    with mock.patch.object(service_account.Credentials, 'from_service_account_file') as factory:
+        factory.return_value = creds
+        client = EchoAsyncClient.from_service_account_file("dummy/file/path.json")
+        assert isinstance(client, EchoAsyncClient)
+        assert client._client._transport._credentials == creds
+
+        client = EchoAsyncClient.from_service_account_json("dummy/file/path.json")
+        assert client._client._transport._credentials == creds
+
+
+def test_echo_async_client_get_transport_class():
+    assert EchoAsyncClient.get_transport_class() is transports.EchoGrpcTransport
+    assert EchoAsyncClient.get_transport_class('grpc_asyncio') is transports.EchoGrpcAsyncIOTransport
+
+
 def test_echo(transport: str = 'grpc'):
     client = EchoClient(
         credentials=credentials.AnonymousCredentials(),
@@ -102,6 +147,324 @@ def test_echo(transport: str = 'grpc'):
     assert response.content == 'content_value'
 
 
+@pytest.mark.asyncio
+async def test_echo_async():
+    client = EchoAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = gs_echo.EchoRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.echo),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = gs_echo.EchoResponse(
+            content='content_value',
+        )
+        response = await client.echo(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, gs_echo.EchoResponse)
+    assert response.content == 'content_value'
+
+
+@pytest.mark.asyncio
+async def test_echo_async_hedged():
+    policy = HedgingPolicy(delay=0.01, budget=1.0)
+    client = EchoAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+        hedging_policy=policy,
+    )
+    answers = [asyncio.Event(), None]
+
+    async def echo(request, **kwargs):
+        # The first call never answers; the hedge does at once.
+        answer = answers.pop(0)
+        if answer is not None:
+            await answer.wait()
+        return gs_echo.EchoResponse(content=request.content)
+
+    with mock.patch.object(
+            type(client._client._transport.echo),
+            '__call__',
+            side_effect=echo) as call:
+        response = await client.echo(gs_echo.EchoRequest(content='hedged'))
+
+    assert response.content == 'hedged'
+    assert call.call_count == 2
+    stats = policy.snapshot()['/google.showcase.v1beta1.Echo/Echo']
+    assert (stats.calls, stats.hedges, stats.wins) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_echo_async_governed():
+    gov = Governor(max_in_flight=1)
+    client = EchoAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+        governor=gov,
+    )
+
+    async def echo(request, **kwargs):
+        # The call is let through, and holds the method's one slot.
+        assert gov.snapshot()['/google.showcase.v1beta1.Echo/Echo'].in_flight == 1
+        return gs_echo.EchoResponse(content=request.content)
+
+    with mock.patch.object(
+            type(client._client._transport.echo),
+            '__call__',
+            side_effect=echo):
+        response = await client.echo(gs_echo.EchoRequest(content='governed'))
+
+    assert response.content == 'governed'
+    stats = gov.snapshot()['/google.showcase.v1beta1.Echo/Echo']
+    assert (stats.acquired, stats.in_flight) == (1, 0)
+
+
+def _echo_chat(requests, **kwargs):
+    # A Chat stream that echoes every request.
+    for request in requests:
+        yield gs_echo.EchoResponse(content=request.content)
+
+
+def test_echo_multiplexed():
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials(),
+        multiplex_echo_streams=2,
+    )
+
+    # Mock the actual calls within the gRPC stubs.
+    with mock.patch.object(
+            type(client._transport.chat),
+            '__call__') as chat, \
+            mock.patch.object(
+            type(client._transport.echo),
+            '__call__') as call:
+        chat.side_effect = _echo_chat
+        call.return_value = gs_echo.EchoResponse(content='unary')
+
+        # Concurrent callers share the streams, and get their own answers.
+        with futures.ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(
+                lambda i: client.echo(gs_echo.EchoRequest(content=str(i))),
+                range(50),
+            ))
+        assert [r.content for r in responses] == [str(i) for i in range(50)]
+        assert 1 <= chat.call_count <= 2
+        assert call.call_count == 0
+
+        # The streams carry the client's metadata.
+        _, _, kw = chat.mock_calls[0]
+        assert any(key == 'x-goog-api-client' for key, _ in kw['metadata'])
+
+        # A timeout of the caller's own replaces the service config's.
+        assert client.echo(gs_echo.EchoRequest(content='t'), timeout=30).content == 't'
+
+        # A request for an error, or with its own metadata or retry, goes
+        # unary.
+        client.echo(gs_echo.EchoRequest(error=status.Status(code=5)))
+        client.echo(gs_echo.EchoRequest(content='x'), metadata=[('a', 'b')])
+        client.echo(gs_echo.EchoRequest(content='x'), retry=None)
+        assert call.call_count == 3
+
+        client.close()
+
+
+def test_echo_multiplexed_governed():
+    gov = Governor(max_in_flight=1)
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials(),
+        multiplex_echo_streams=1,
+        governor=gov,
+    )
+
+    # Mock the actual call within the gRPC stub.
+    with mock.patch.object(
+            type(client._transport.chat),
+            '__call__') as chat:
+        chat.side_effect = _echo_chat
+        assert client.echo(gs_echo.EchoRequest(content='x')).content == 'x'
+
+    # The call on the stream was let through by the governor.
+    stats = gov.snapshot()['/google.showcase.v1beta1.Echo/Echo']
+    assert (stats.acquired, stats.in_flight) == (1, 0)
+    client.close()
+
+
+def test_echo_client_close():
+    # A client without shared streams has nothing to close.
+    with EchoClient(credentials=credentials.AnonymousCredentials()):
+        pass
+
+    with EchoClient(
+            credentials=credentials.AnonymousCredentials(),
+            multiplex_echo_streams=1) as client:
+        with mock.patch.object(
+                type(client._transport.chat),
+                '__call__') as chat:
+            chat.side_effect = _echo_chat
+            assert client.echo(gs_echo.EchoRequest(content='x')).content == 'x'
+            stream = client._echo_multiplexer._streams[0]
+
+    # Leaving the block finished the stream and joined its reader.
+    assert stream.broken
+    assert not stream._reader.is_alive()
+
+
+def test_echo_multiplexed_falls_back_to_unary():
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials(),
+        multiplex_echo_streams=1,
+    )
+
+    def broken_chat(requests, **kwargs):
+        next(requests)
+        raise RuntimeError('stream reset')
+        yield
+
+    # Mock the actual calls within the gRPC stubs.
+    with mock.patch.object(
+            type(client._transport.chat),
+            '__call__') as chat, \
+            mock.patch.object(
+            type(client._transport.echo),
+            '__call__') as call:
+        chat.side_effect = broken_chat
+        call.return_value = gs_echo.EchoResponse(content='unary')
+
+        # Each request is sent again on its own, and the broken stream is
+        # replaced for the next caller.
+        for _ in range(2):
+            response = client.echo(gs_echo.EchoRequest(content='x'))
+            assert response.content == 'unary'
+        assert chat.call_count == 2
+        assert call.call_count == 2
+
+
+def test_chat_multiplexer_requires_streams():
+    with pytest.raises(ValueError):
+        multiplex.ChatMultiplexer(_echo_chat, 0)
+
+
+def test_chat_multiplexer_timeout():
+    def silent_chat(requests):
+        # Read every request, and answer none.
+        for _ in requests:
+            pass
+        yield from ()
+
+    multiplexer = multiplex.ChatMultiplexer(silent_chat, 2)
+    # Closing before any stream was opened is fine.
+    multiplexer.close()
+
+    with pytest.raises(exceptions.DeadlineExceeded):
+        multiplexer.echo(gs_echo.EchoRequest(content='x'), timeout=0.01)
+    multiplexer.close()
+
+
+def test_chat_multiplexer_opens_streams_lazily():
+    opened = []
+    answer = threading.Event()
+
+    def gated_chat(requests):
+        # Echo every request once answers are let through.
+        opened.append(requests)
+        for request in requests:
+            answer.wait()
+            yield gs_echo.EchoResponse(content=request.content)
+
+    multiplexer = multiplex.ChatMultiplexer(gated_chat, 2)
+
+    # Callers one after another share the first stream.
+    answer.set()
+    for i in range(3):
+        assert multiplexer.echo(gs_echo.EchoRequest(content=str(i))).content == str(i)
+    assert len(opened) == 1
+
+    # Another stream is opened only while the first one is busy, and no
+    # more than the limit.
+    answer.clear()
+    sent = [multiplexer._send(gs_echo.EchoRequest(content=str(i)))
+        for i in range(3)]
+    assert len(opened) == 2
+    assert sent[0][0] is not sent[1][0]
+    answer.set()
+    assert [f.result().content for _, f in sent] == ['0', '1', '2']
+    multiplexer.close()
+
+
+class _SilentCall:
+    # A Chat stream that reads every request and answers none, until it
+    # is cancelled.
+    def __init__(self, requests):
+        self.requests = requests
+        self.cancelled = False
+
+    def __iter__(self):
+        for _ in self.requests:
+            pass
+        return iter(())
+
+    def cancel(self):
+        self.cancelled = True
+
+
+@pytest.mark.parametrize('timeout', [None, 1.0])
+def test_chat_multiplexer_stalled(timeout):
+    calls = []
+
+    def silent_chat(requests):
+        calls.append(_SilentCall(requests))
+        return calls[-1]
+
+    multiplexer = multiplex.ChatMultiplexer(silent_chat, 1, stall_timeout=0.01)
+
+    # A caller left unanswered longer than the bound gives up on the
+    # stream, which is cancelled, and the next caller gets a new one.
+    with pytest.raises(multiplex.StreamError):
+        multiplexer.echo(gs_echo.EchoRequest(content='x'), timeout=timeout)
+    assert calls[0].cancelled
+    assert multiplexer._streams[0].broken
+    with pytest.raises(multiplex.StreamError):
+        multiplexer.echo(gs_echo.EchoRequest(content='x'), timeout=timeout)
+    assert len(calls) == 2
+    multiplexer.close()
+
+
+def test_chat_stream_abandoned():
+    def silent_chat(requests):
+        for _ in requests:
+            pass
+        yield from ()
+
+    stream = multiplex._ChatStream(silent_chat)
+    future = stream.send(gs_echo.EchoRequest(content='x'))
+    stream.abandon(1.0)
+    with pytest.raises(multiplex.StreamError):
+        future.result()
+
+    # Abandoning it again changes nothing.
+    stream.abandon(1.0)
+    stream.close()
+
+
+def test_chat_stream_closed():
+    stream = multiplex._ChatStream(_echo_chat)
+    assert stream.send(gs_echo.EchoRequest(content='x')).result().content == 'x'
+    stream.close()
+    with pytest.raises(multiplex.StreamError):
+        stream.send(gs_echo.EchoRequest(content='x'))
+
+
 def test_expand(transport: str = 'grpc'):
     client = EchoClient(
         credentials=credentials.AnonymousCredentials(),
@@ -130,6 +493,37 @@ def test_expand(transport: str = 'grpc'):
         assert isinstance(message, gs_echo.EchoResponse)
 
 
+@pytest.mark.asyncio
+async def test_expand_async():
+    client = EchoAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = gs_echo.ExpandRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.expand),
+            '__call__') as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = _fake_stream_call(
+            aio.UnaryStreamCall,
+            [gs_echo.EchoResponse()],
+        )
+        response = await client.expand(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert call.call_count == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    async for message in response:
+        assert isinstance(message, gs_echo.EchoResponse)
+
+
 def test_expand_flattened():
     client = EchoClient(
         credentials=credentials.AnonymousCredentials(),
@@ -157,6 +551,37 @@ def test_expand_flattened():
         assert args[0].error == status.Status(code=411)
 
 
+@pytest.mark.asyncio
+async def test_expand_flattened_async():
+    client = EchoAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.expand),
+            '__call__') as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = _fake_stream_call(
+            aio.UnaryStreamCall,
+            [gs_echo.EchoResponse()],
+        )
+
+        # Call the method with a truthy value for each flattened field,
+        # using the keyword arguments to the method.
+        response = await client.expand(
+            content='content_value',
+            error=status.Status(code=411),
+        )
+
+        # Establish that the underlying call was made with the expected
+        # request object values.
+        assert call.call_count == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0].content == 'content_value'
+        assert args[0].error == status.Status(code=411)
+
+
 def test_expand_flattened_error():
     client = EchoClient(
         credentials=credentials.AnonymousCredentials(),
@@ -172,6 +597,172 @@ def test_expand_flattened_error():
         )
 
 
+@pytest.mark.asyncio
+async def test_expand_flattened_error_async():
+    client = EchoAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Attempting to call a method with both a request object and flattened
+    # fields is an error.
+    with pytest.raises(ValueError):
+        await client.expand(
+            gs_echo.ExpandRequest(),
+            content='content_value',
+            error=status.Status(code=411),
+        )
+
+
+class _StreamCall:
+    """A server stream that breaks with `error` after its responses."""
+    def __init__(self, responses, error=None, trailing_metadata=()):
+        self._responses = iter(responses)
+        self._error = error
+        self._trailing_metadata = trailing_metadata
+        self.cancelled = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        for response in self._responses:
+            return response
+        if self._error:
+            raise self._error
+        raise StopIteration
+
+    def trailing_metadata(self):
+        return self._trailing_metadata
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def test_resumable_expand():
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    attempts = [
+        _StreamCall(
+            [gs_echo.EchoResponse(content='The'), gs_echo.EchoResponse(content='rain')],
+            exceptions.ServiceUnavailable('connection dropped'),
+        ),
+        exceptions.ServiceUnavailable('still down'),
+        _StreamCall(
+            [gs_echo.EchoResponse(content='in'), gs_echo.EchoResponse(content='Spain')],
+            trailing_metadata=(('done', 'yes'),),
+        ),
+    ]
+
+    with mock.patch.object(
+            type(client._transport.expand),
+            '__call__') as call:
+        call.side_effect = attempts
+        stream = client.resumable_expand(
+            content='The rain  in Spain',
+            error=status.Status(message='after the words'),
+            retry=retries.Retry(initial=0, maximum=0),
+        )
+        assert stream.trailing_metadata() is None
+        words = [response.content for response in stream]
+
+        # Every word came once, in order; each attempt asked for the rest.
+        assert words == ['The', 'rain', 'in', 'Spain']
+        requests = [args[0] for _, args, _ in call.mock_calls]
+        assert [r.content for r in requests] == [
+            'The rain  in Spain', 'in Spain', 'in Spain']
+        assert {r.error.message for r in requests} == {'after the words'}
+
+        # Each attempt has the timeout of the service config.
+        assert {kwargs['timeout'] for _, _, kwargs in call.mock_calls} == {10.0}
+
+    assert stream.attempts == 3
+    assert stream.position == 4
+    assert stream.trailing_metadata() == (('done', 'yes'),)
+    assert repr(stream) == 'ResumableExpand<attempts=3>'
+
+
+def test_resumable_expand_ends_with_error():
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    with mock.patch.object(
+            type(client._transport.expand),
+            '__call__') as call:
+        call.side_effect = [
+            _StreamCall(
+                [gs_echo.EchoResponse(content='a')],
+                exceptions.ServiceUnavailable('connection dropped'),
+            ),
+            _StreamCall(
+                [gs_echo.EchoResponse(content='b')],
+                exceptions.ServiceUnavailable('the requested error'),
+            ),
+        ]
+        stream = client.resumable_expand(
+            content='a b',
+            error=status.Status(code=14, message='the requested error'),
+            retry=retries.Retry(initial=0, maximum=0, deadline=1),
+        )
+        assert [next(stream).content, next(stream).content] == ['a', 'b']
+
+        # The error after the last word is the server's own, and is
+        # raised without reopening the stream.
+        with pytest.raises(exceptions.ServiceUnavailable, match='the requested error'):
+            next(stream)
+
+    assert call.call_count == 2
+    assert stream.attempts == 2
+
+
+def test_resumable_expand_without_retry():
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    request = gs_echo.ExpandRequest(content='a b')
+    with mock.patch.object(
+            type(client._transport.expand),
+            '__call__') as call:
+        call.return_value = _StreamCall(
+            [gs_echo.EchoResponse(content='a')],
+            exceptions.ServiceUnavailable('connection dropped'),
+        )
+        stream = client.resumable_expand(request, retry=None)
+        assert next(stream).content == 'a'
+        with pytest.raises(exceptions.ServiceUnavailable):
+            next(stream)
+
+    # The request was sent as it was given.
+    call.assert_called_once()
+    assert call.call_args[0][0] is request
+    stream.cancel()
+
+
+def test_resumable_expand_cancel():
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    with mock.patch.object(
+            type(client._transport.expand),
+            '__call__') as call:
+        call.return_value = _StreamCall([gs_echo.EchoResponse(content='a')])
+        stream = client.resumable_expand(
+            gs_echo.ExpandRequest(content='a'),
+            retry=None,
+        )
+        next(stream)
+        stream.cancel()
+    assert call.return_value.cancelled
+
+
+def test_resumable_expand_flattened_error():
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    with pytest.raises(ValueError):
+        client.resumable_expand(gs_echo.ExpandRequest(), content='content_value')
+
+
 def test_collect(transport: str = 'grpc'):
     client = EchoClient(
         credentials=credentials.AnonymousCredentials(),
@@ -202,6 +793,38 @@ def test_collect(transport: str = 'grpc'):
     assert response.content == 'content_value'
 
 
+@pytest.mark.asyncio
+async def test_collect_async():
+    client = EchoAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    requests = iter([gs_echo.EchoRequest()])
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.collect),
+            '__call__') as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = grpc_helpers_async.FakeStreamUnaryCall(
+            gs_echo.EchoResponse(
+                content='content_value',
+            ),
+        )
+        response = await client.collect(requests)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] is requests
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, gs_echo.EchoResponse)
+    assert response.content == 'content_value'
+
+
 def test_chat(transport: str = 'grpc'):
     client = EchoClient(
         credentials=credentials.AnonymousCredentials(),
@@ -230,46 +853,286 @@ def test_chat(transport: str = 'grpc'):
         assert isinstance(message, gs_echo.EchoResponse)
 
 
-def test_paged_expand(transport: str = 'grpc'):
-    client = EchoClient(
-        credentials=credentials.AnonymousCredentials(),
-        transport=transport,
+@pytest.mark.asyncio
+async def test_chat_async():
+    client = EchoAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    requests = iter([gs_echo.EchoRequest()])
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.chat),
+            '__call__') as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = _fake_stream_call(
+            aio.StreamStreamCall,
+            [gs_echo.EchoResponse()],
+        )
+        response = await client.chat(requests)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert call.call_count == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] is requests
+
+    # Establish that the response is the type that we expect.
+    async for message in response:
+        assert isinstance(message, gs_echo.EchoResponse)
+
+
+def test_paged_expand(transport: str = 'grpc'):
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials(),
+        transport=transport,
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = gs_echo.PagedExpandRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.paged_expand),
+            '__call__') as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = gs_echo.PagedExpandResponse(
+            next_page_token='next_page_token_value',
+        )
+        response = client.paged_expand(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, pagers.PagedExpandPager)
+    assert response.next_page_token == 'next_page_token_value'
+
+
+@pytest.mark.asyncio
+async def test_paged_expand_async():
+    client = EchoAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = gs_echo.PagedExpandRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.paged_expand),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = gs_echo.PagedExpandResponse(
+            next_page_token='next_page_token_value',
+        )
+        response = await client.paged_expand(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, pagers.PagedExpandAsyncPager)
+    assert response.next_page_token == 'next_page_token_value'
+
+
+def test_paged_expand_pager():
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.paged_expand),
+            '__call__') as call:
+        # Set the response to a series of pages.
+        call.side_effect = (
+            gs_echo.PagedExpandResponse(
+                responses=[
+                    gs_echo.EchoResponse(),
+                    gs_echo.EchoResponse(),
+                    gs_echo.EchoResponse(),
+                ],
+                next_page_token='abc',
+            ),
+            gs_echo.PagedExpandResponse(
+                responses=[],
+                next_page_token='def',
+            ),
+            gs_echo.PagedExpandResponse(
+                responses=[
+                    gs_echo.EchoResponse(),
+                ],
+                next_page_token='ghi',
+            ),
+            gs_echo.PagedExpandResponse(
+                responses=[
+                    gs_echo.EchoResponse(),
+                    gs_echo.EchoResponse(),
+                ],
+            ),
+            RuntimeError,
+        )
+        results = [i for i in client.paged_expand(
+            request={},
+        )]
+        assert len(results) == 6
+        assert all([isinstance(i, gs_echo.EchoResponse)
+                    for i in results])
+
+
+@pytest.mark.asyncio
+async def test_paged_expand_pager_async():
+    client = EchoAsyncClient(
+        credentials=credentials.AnonymousCredentials,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.paged_expand),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Set the response to a series of pages.
+        call.side_effect = (
+            gs_echo.PagedExpandResponse(
+                responses=[
+                    gs_echo.EchoResponse(),
+                    gs_echo.EchoResponse(),
+                    gs_echo.EchoResponse(),
+                ],
+                next_page_token='abc',
+            ),
+            gs_echo.PagedExpandResponse(
+                responses=[],
+                next_page_token='def',
+            ),
+            gs_echo.PagedExpandResponse(
+                responses=[
+                    gs_echo.EchoResponse(),
+                ],
+                next_page_token='ghi',
+            ),
+            gs_echo.PagedExpandResponse(
+                responses=[
+                    gs_echo.EchoResponse(),
+                    gs_echo.EchoResponse(),
+                ],
+            ),
+            RuntimeError,
+        )
+        pager = await client.paged_expand(request={})
+        results = [i async for i in pager]
+        assert len(results) == 6
+        assert all([isinstance(i, gs_echo.EchoResponse)
+                    for i in results])
+
+def test_paged_expand_pages():
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.paged_expand),
+            '__call__') as call:
+        # Set the response to a series of pages.
+        call.side_effect = (
+            gs_echo.PagedExpandResponse(
+                responses=[
+                    gs_echo.EchoResponse(),
+                    gs_echo.EchoResponse(),
+                    gs_echo.EchoResponse(),
+                ],
+                next_page_token='abc',
+            ),
+            gs_echo.PagedExpandResponse(
+                responses=[],
+                next_page_token='def',
+            ),
+            gs_echo.PagedExpandResponse(
+                responses=[
+                    gs_echo.EchoResponse(),
+                ],
+                next_page_token='ghi',
+            ),
+            gs_echo.PagedExpandResponse(
+                responses=[
+                    gs_echo.EchoResponse(),
+                    gs_echo.EchoResponse(),
+                ],
+            ),
+            RuntimeError,
+        )
+        pages = list(client.paged_expand(request={}).pages)
+        for page, token in zip(pages, ['abc','def','ghi', '']):
+            assert page.raw_page.next_page_token == token
+
+
+@pytest.mark.asyncio
+async def test_paged_expand_pages_async():
+    client = EchoAsyncClient(
+        credentials=credentials.AnonymousCredentials,
     )
 
-    # Everything is optional in proto3 as far as the runtime is concerned,
-    # and we are mocking out the actual API, so just send an empty request.
-    request = gs_echo.PagedExpandRequest()
-
     # Mock the actual call within the gRPC stub, and fake the request.
     with mock.patch.object(
-            type(client._transport.paged_expand),
-            '__call__') as call:
-        # Designate an appropriate return value for the call.
-        call.return_value = gs_echo.PagedExpandResponse(
-            next_page_token='next_page_token_value',
+            type(client._client._transport.paged_expand),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Set the response to a series of pages.
+        call.side_effect = (
+            gs_echo.PagedExpandResponse(
+                responses=[
+                    gs_echo.EchoResponse(),
+                    gs_echo.EchoResponse(),
+                    gs_echo.EchoResponse(),
+                ],
+                next_page_token='abc',
+            ),
+            gs_echo.PagedExpandResponse(
+                responses=[],
+                next_page_token='def',
+            ),
+            gs_echo.PagedExpandResponse(
+                responses=[
+                    gs_echo.EchoResponse(),
+                ],
+                next_page_token='ghi',
+            ),
+            gs_echo.PagedExpandResponse(
+                responses=[
+                    gs_echo.EchoResponse(),
+                    gs_echo.EchoResponse(),
+                ],
+            ),
+            RuntimeError,
         )
-        response = client.paged_expand(request)
-
-        # Establish that the underlying gRPC stub method was called.
-        assert len(call.mock_calls) == 1
-        _, args, _ = call.mock_calls[0]
-        assert args[0] == request
-
-    # Establish that the response is the type that we expect.
-    assert isinstance(response, pagers.PagedExpandPager)
-    assert response.next_page_token == 'next_page_token_value'
+        pager = await client.paged_expand(request={})
+        pages = [page async for page in pager.pages]
+        for page, token in zip(pages, ['abc','def','ghi', '']):
+            assert page.raw_page.next_page_token == token
 
 
-def test_paged_expand_pager():
+def test_paged_expand_pager_prefetch():
     client = EchoClient(
         credentials=credentials.AnonymousCredentials,
+        page_prefetch_depth=2,
     )
 
     # Mock the actual call within the gRPC stub, and fake the request.
     with mock.patch.object(
             type(client._transport.paged_expand),
             '__call__') as call:
-        # Set the response to a series of pages.
+        # Set the response to a series of pages; they are fetched ahead.
         call.side_effect = (
             gs_echo.PagedExpandResponse(
                 responses=[
@@ -297,23 +1160,27 @@ def test_paged_expand_pager():
             ),
             RuntimeError,
         )
-        results = [i for i in client.paged_expand(
-            request={},
-        )]
+        pager = client.paged_expand(request={})
+        results = [i for i in pager]
+        assert pager.next_page_token == ''
         assert len(results) == 6
         assert all([isinstance(i, gs_echo.EchoResponse)
                     for i in results])
 
-def test_paged_expand_pages():
-    client = EchoClient(
+
+@pytest.mark.asyncio
+async def test_paged_expand_pager_prefetch_async():
+    client = EchoAsyncClient(
         credentials=credentials.AnonymousCredentials,
+        page_prefetch_depth=2,
     )
 
     # Mock the actual call within the gRPC stub, and fake the request.
     with mock.patch.object(
-            type(client._transport.paged_expand),
-            '__call__') as call:
-        # Set the response to a series of pages.
+            type(client._client._transport.paged_expand),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Set the response to a series of pages; they are fetched ahead.
         call.side_effect = (
             gs_echo.PagedExpandResponse(
                 responses=[
@@ -341,9 +1208,12 @@ def test_paged_expand_pages():
             ),
             RuntimeError,
         )
-        pages = list(client.paged_expand(request={}).pages)
-        for page, token in zip(pages, ['abc','def','ghi', '']):
-            assert page.raw_page.next_page_token == token
+        pager = await client.paged_expand(request={})
+        results = [i async for i in pager]
+        assert pager.next_page_token == ''
+        assert len(results) == 6
+        assert all([isinstance(i, gs_echo.EchoResponse)
+                    for i in results])
 
 
 def test_wait(transport: str = 'grpc'):
@@ -373,6 +1243,55 @@ def test_wait(transport: str = 'grpc'):
     assert isinstance(response, future.Future)
 
 
+def test_wait_operation_poller():
+    poller = OperationPoller()
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials(),
+        operation_poller=poller,
+    )
+    response = operations_pb2.Operation(name='operations/spam', done=True)
+    response.response.Pack(gs_echo.WaitResponse.pb(gs_echo.WaitResponse(content='done')))
+
+    with mock.patch.object(
+            type(client._transport.wait),
+            '__call__') as call:
+        call.return_value = response
+        polled = client.wait({'ttl': {'seconds': 1}})
+
+    # The operation is tracked by the shared poller.
+    assert isinstance(polled, operation_poller.PolledOperation)
+    assert polled.result() == gs_echo.WaitResponse(content='done')
+    poller.close()
+
+
+@pytest.mark.asyncio
+async def test_wait_async():
+    client = EchoAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = gs_echo.WaitRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.wait),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = operations_pb2.Operation(name='operations/spam')
+        response = await client.wait(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, operation_async.AsyncOperation)
+
+
 def test_block(transport: str = 'grpc'):
     client = EchoClient(
         credentials=credentials.AnonymousCredentials(),
@@ -403,6 +1322,186 @@ def test_block(transport: str = 'grpc'):
     assert response.content == 'content_value'
 
 
+@pytest.mark.asyncio
+async def test_block_async():
+    client = EchoAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = gs_echo.BlockRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.block),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = gs_echo.BlockResponse(
+            content='content_value',
+        )
+        response = await client.block(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, gs_echo.BlockResponse)
+    assert response.content == 'content_value'
+
+
+@pytest.mark.parametrize('take_request_ownership', [False, True])
+def test_paged_expand_pager_request_ownership(take_request_ownership):
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials(),
+        take_request_ownership=take_request_ownership,
+    )
+    request = gs_echo.PagedExpandRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.paged_expand),
+            '__call__') as call:
+        call.side_effect = (
+            gs_echo.PagedExpandResponse(next_page_token='abc'),
+            gs_echo.PagedExpandResponse(),
+        )
+        pager = client.paged_expand(request)
+        pages = list(pager.pages)
+
+    # The pager only advances the caller's own request once the caller has
+    # handed it over; otherwise it works on a copy.
+    assert len(pages) == 2
+    assert (pager._request is request) == take_request_ownership
+    assert request.page_token == ('abc' if take_request_ownership else '')
+
+
+_METHODS = (
+    ('echo', gs_echo.EchoRequest),
+    ('expand', gs_echo.ExpandRequest),
+    ('collect', gs_echo.EchoRequest),
+    ('chat', gs_echo.EchoRequest),
+    ('paged_expand', gs_echo.PagedExpandRequest),
+    ('wait', gs_echo.WaitRequest),
+    ('block', gs_echo.BlockRequest),
+)
+
+_REQUEST_STREAMING_METHODS = ('collect', 'chat')
+
+
+def test_echo_wrapped_methods_are_cached():
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # The operations client and the operation future do their own wrapping;
+    # build the former up front and stub out the latter.
+    client._transport.operations_client
+
+    # Mock out the wrapping itself, so that we can count how often it happens.
+    with mock.patch.object(gapic_v1.method, 'wrap_method') as wrap, \
+            mock.patch.object(operation, 'from_gapic'):
+        wrap.return_value.return_value = operations_pb2.Operation(
+            name='operations/spam',
+        )
+
+        # Call every method twice; only the first call should wrap.
+        for _ in range(2):
+            for name, request_type in _METHODS:
+                getattr(client, name)(request_type())
+
+        assert wrap.call_count == len(_METHODS)
+        assert sorted(client._inner_api_calls) == sorted(
+            name for name, _ in _METHODS)
+
+
+def test_echo_requests_are_not_copied():
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # The operation future is not under test; stub it out.
+    with mock.patch.object(gapic_v1.method, 'wrap_method') as wrap, \
+            mock.patch.object(operation, 'from_gapic'):
+        rpc = wrap.return_value
+        rpc.return_value = operations_pb2.Operation(name='operations/spam')
+
+        for name, request_type in _METHODS:
+            # A request of exactly the right type is sent as-is...
+            request = request_type()
+            getattr(client, name)(request)
+            _, args, _ = rpc.mock_calls[-1]
+            assert args[0] is request
+
+            # ...while anything else is coerced into a new request.
+            getattr(client, name)({})
+            _, args, _ = rpc.mock_calls[-1]
+            assert isinstance(args[0], request_type)
+
+
+@pytest.mark.asyncio
+async def test_echo_async_wrapped_methods_are_cached():
+    client = EchoAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # The operations client does its own wrapping; build it up front,
+    # and stub out the operation future.
+    client._client._transport.operations_client
+
+    # Mock out the wrapping itself, so that we can count how often it happens.
+    with mock.patch.object(gapic_v1.method_async, 'wrap_method') as wrap, \
+            mock.patch.object(operation_async, 'from_gapic'):
+        wrap.return_value = mock.AsyncMock(
+            return_value=grpc_helpers_async.FakeUnaryUnaryCall(
+                operations_pb2.Operation(name='operations/spam'),
+            ),
+        )
+
+        # Call every method twice; only the first call should wrap.
+        for _ in range(2):
+            for name, request_type in _METHODS:
+                await getattr(client, name)(request_type())
+
+        assert wrap.call_count == len(_METHODS)
+        assert sorted(client._inner_api_calls) == sorted(
+            name for name, _ in _METHODS)
+
+
+@pytest.mark.asyncio
+async def test_echo_async_requests_are_not_copied():
+    client = EchoAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # The operation future is not under test; stub it out.
+    with mock.patch.object(gapic_v1.method_async, 'wrap_method') as wrap, \
+            mock.patch.object(operation_async, 'from_gapic'):
+        rpc = wrap.return_value = mock.AsyncMock(
+            return_value=grpc_helpers_async.FakeUnaryUnaryCall(
+                operations_pb2.Operation(name='operations/spam'),
+            ),
+        )
+
+        for name, request_type in _METHODS:
+            # A request of exactly the right type is sent as-is...
+            request = request_type()
+            await getattr(client, name)(request)
+            _, args, _ = rpc.mock_calls[-1]
+            assert args[0] is request
+
+            # ...while anything else is coerced into a new request. Streams
+            # of requests are passed through untouched.
+            if name in _REQUEST_STREAMING_METHODS:
+                continue
+            await getattr(client, name)({})
+            _, args, _ = rpc.mock_calls[-1]
+            assert isinstance(args[0], request_type)
+
+
 def test_credentials_transport_error():
     # It is an error to provide credentials and a transport instance.
     transport = transports.EchoGrpcTransport(
@@ -435,6 +1534,17 @@ def test_transport_grpc_default():
     )
 
 
+def test_transport_grpc_asyncio_default():
+    # An async client should use the gRPC AsyncIO transport by default.
+    client = EchoAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    assert isinstance(
+        client._client._transport,
+        transports.EchoGrpcAsyncIOTransport,
+    )
+
+
 def test_echo_base_transport():
     # Instantiate the base transport.
     transport = transports.EchoTransport(
@@ -463,12 +1573,16 @@ def test_echo_base_transport():
 
 
 def test_echo_auth_adc():
-    # If no credentials are provided, we should use ADC credentials.
+    # If no credentials are provided, we should use ADC credentials,
+    # resolved once for every client.
+    credentials_cache.clear()
     with mock.patch.object(auth, 'default') as adc:
         adc.return_value = (credentials.AnonymousCredentials(), None)
         client = EchoClient()
+        assert EchoClient()._transport._credentials is client._transport._credentials
         adc.assert_called_once_with(scopes=(
         ))
+    credentials_cache.clear()
 
 
 def test_echo_host_no_port():
@@ -497,6 +1611,127 @@ def test_echo_grpc_transport_channel():
     assert transport.grpc_channel is channel
 
 
+def test_echo_grpc_transport_raw_messages():
+    channel = mock.Mock(spec=grpc.Channel)
+    transport = transports.EchoGrpcTransport(
+        channel=channel,
+        raw_messages=True,
+    )
+    transport.expand
+    kwargs = channel.unary_stream.call_args[1]
+    response = kwargs['response_deserializer'](
+        gs_echo.EchoResponse.serialize(gs_echo.EchoResponse(content='word')))
+    assert isinstance(response, gs_echo.EchoResponse.pb())
+    assert response.content == 'word'
+
+    # Requests of either kind are sent.
+    request = gs_echo.ExpandRequest(content='a b')
+    serialized = gs_echo.ExpandRequest.serialize(request)
+    assert kwargs['request_serializer'](request) == serialized
+    assert kwargs['request_serializer'](gs_echo.ExpandRequest.pb(request)) == serialized
+
+
+def test_echo_raw_request_is_wrapped():
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    request = gs_echo.EchoRequest.pb()(content='word')
+    with mock.patch.object(
+            type(client._transport.echo),
+            '__call__') as call:
+        call.return_value = gs_echo.EchoResponse()
+        client.echo(request)
+
+    # The raw request was wrapped, not copied.
+    sent = call.call_args[0][0]
+    assert isinstance(sent, gs_echo.EchoRequest)
+    assert gs_echo.EchoRequest.pb(sent) is request
+
+
+def test_echo_grpc_transport_connect_timeout():
+    channel = mock.Mock(spec=grpc.Channel)
+    with mock.patch.object(channel_pool, 'wait_for_ready') as wait_for_ready:
+        transport = transports.EchoGrpcTransport(
+            channel=channel,
+            connect_timeout=5.0,
+        )
+        wait_for_ready.assert_called_once_with(channel, 5.0)
+
+    # Every stub was created up front, and the warm-up was timed.
+    assert sorted(transport._stubs) == sorted(transport._METHODS)
+    assert transport.warm_up_time >= 0
+    assert transports.EchoGrpcTransport(channel=channel).warm_up_time is None
+
+
+def test_echo_grpc_transport_service_config():
+    with mock.patch.object(grpc_helpers, 'create_channel') as create_channel:
+        transport = transports.EchoGrpcTransport(
+            credentials=credentials.AnonymousCredentials(),
+            grpc_service_config=True,
+        )
+        assert transport.grpc_channel is create_channel.return_value
+        create_channel.assert_called_once_with(
+            'localhost:7469',
+            credentials=mock.ANY,
+            scopes=(),
+            options=[('grpc.service_config', service_config.SERVICE_CONFIG_JSON)],
+        )
+
+
+def test_echo_service_config_retry():
+    client = EchoClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Mock the actual call within the gRPC stub.
+    with mock.patch.object(
+            type(client._transport.echo),
+            '__call__') as call, \
+            mock.patch('time.sleep'):
+        call.side_effect = [
+            exceptions.ServiceUnavailable('connection dropped'),
+            gs_echo.EchoResponse(content='x'),
+        ]
+        response = client.echo(gs_echo.EchoRequest(content='x'))
+
+    # The UNAVAILABLE error was retried, and each attempt had a timeout.
+    assert response.content == 'x'
+    assert call.call_count == 2
+    _, _, kwargs = call.mock_calls[0]
+    assert 0 < kwargs['timeout'] <= 10.0
+
+
+@pytest.mark.asyncio
+async def test_echo_grpc_asyncio_transport_channel():
+    channel = aio.insecure_channel('http://localhost/')
+    transport = transports.EchoGrpcAsyncIOTransport(
+        channel=channel,
+    )
+    assert transport.grpc_channel is channel
+
+
+@pytest.mark.parametrize('grpc_service_config,options', [
+    (False, []),
+    (True, [('grpc.service_config', service_config.SERVICE_CONFIG_JSON)]),
+])
+def test_echo_grpc_asyncio_transport_create_channel(grpc_service_config, options):
+    creds = credentials.AnonymousCredentials()
+    with mock.patch.object(grpc_helpers_async, 'create_channel') as create_channel:
+        transport = transports.EchoGrpcAsyncIOTransport(
+            host='squid.clam.whelk',
+            credentials=creds,
+            grpc_service_config=grpc_service_config,
+        )
+        assert transport.grpc_channel is create_channel.return_value
+        assert transport.grpc_channel is create_channel.return_value
+        create_channel.assert_called_once_with(
+            'squid.clam.whelk:443',
+            credentials=creds,
+            scopes=transport.AUTH_SCOPES,
+            options=options,
+        )
+
+
 def test_echo_grpc_lro_client():
     client = EchoClient(
         credentials=credentials.AnonymousCredentials(),
@@ -512,3 +1747,21 @@ def test_echo_grpc_lro_client():
 
     # Ensure that subsequent calls to the property send the exact same object.
     assert transport.operations_client is transport.operations_client
+
+
+@pytest.mark.asyncio
+async def test_echo_grpc_asyncio_lro_client():
+    client = EchoAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+        transport='grpc_asyncio',
+    )
+    transport = client._client._transport
+
+    # Ensure that we have a api-core operations client.
+    assert isinstance(
+        transport.operations_client,
+        operations_v1.OperationsAsyncClient,
+    )
+
+    # Ensure that subsequent calls to the property send the exact same object.
+    assert transport.operations_client is transport.operations_client
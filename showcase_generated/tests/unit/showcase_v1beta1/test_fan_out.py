@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import threading
+
+import pytest
+
+from google.showcase_v1beta1.fan_out import FanOut
+from google.showcase_v1beta1.fan_out import FanOutResult
+from google.showcase_v1beta1.fan_out import fan_out_method
+
+
+def test_fan_out_bounds_concurrency():
+    lock = threading.Lock()
+    in_flight = [0, 0]  # Now, and the most seen.
+
+    def call(request):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+        threading.Event().wait(0.005)
+        with lock:
+            in_flight[0] -= 1
+        return request * 2
+
+    outcomes = list(FanOut(call, range(20), max_concurrency=4))
+    assert sorted(o.index for o in outcomes) == list(range(20))
+    assert all(o.response == o.request * 2 for o in outcomes)
+    assert all(o.error is None for o in outcomes)
+    assert 1 <= in_flight[1] <= 4
+
+
+def test_fan_out_yields_as_calls_finish():
+    release = threading.Event()
+
+    def call(request):
+        if request == 'slow':
+            release.wait()
+        return request
+
+    outcomes = iter(FanOut(call, ['slow', 'fast'], max_concurrency=2))
+    assert next(outcomes).request == 'fast'
+    release.set()
+    assert next(outcomes).request == 'slow'
+    assert list(outcomes) == []
+
+
+def test_fan_out_reports_errors():
+    def call(request):
+        if request % 2:
+            raise RuntimeError(request)
+        return request
+
+    outcomes = sorted(FanOut(call, range(4)), key=lambda o: o.index)
+    assert [o.response for o in outcomes] == [0, None, 2, None]
+    assert [type(o.error) for o in outcomes] == [
+        type(None), RuntimeError, type(None), RuntimeError]
+    assert repr(outcomes[1]) == 'FanOutResult<index=1, failed>'
+    assert repr(outcomes[2]) == 'FanOutResult<index=2, ok>'
+
+
+def test_fan_out_cancel():
+    requests_read = []
+
+    def requests():
+        for i in range(100):
+            requests_read.append(i)
+            yield i
+
+    fan_out = FanOut(lambda request: request, requests(), max_concurrency=2)
+    outcomes = iter(fan_out)
+    next(outcomes)
+    fan_out.cancel()
+    assert repr(fan_out).endswith('cancelled=True>')
+
+    # The calls in flight still finish; no more are sent.
+    assert len(list(outcomes)) <= 2
+    assert len(requests_read) <= 4
+
+
+def test_fan_out_starts_when_iterated():
+    calls = []
+    fan_out = FanOut(calls.append, range(4), max_concurrency=2)
+    outcomes = iter(fan_out)
+
+    # Nothing runs until the first outcome is wanted.
+    assert calls == [] and fan_out._executor is None
+    assert next(outcomes).error is None
+    assert len(list(outcomes)) == 3
+    assert sorted(calls) == [0, 1, 2, 3]
+
+    # Iterating again does not start over.
+    assert list(fan_out) == []
+
+    # A fan-out cancelled before it is iterated sends nothing.
+    fan_out = FanOut(calls.append, range(4))
+    fan_out.cancel()
+    assert list(fan_out) == []
+    assert len(calls) == 4
+
+
+def test_fan_out_requires_concurrency():
+    with pytest.raises(ValueError):
+        FanOut(lambda request: request, [], max_concurrency=0)
+
+
+def test_fan_out_empty():
+    assert list(FanOut(lambda request: request, [])) == []
+
+
+class _Client:
+    def get_thing(self, request, timeout, metadata):
+        return (request, timeout, metadata)
+
+    def list_things(self, request, timeout, metadata):
+        return iter([request, request])
+
+    def delete_thing(self, request, timeout, metadata):
+        raise AssertionError('not a get or list method')
+
+    get_attribute = 'not callable'
+
+
+def test_fan_out_method():
+    outcomes = fan_out_method(
+        _Client(), 'get_thing', ['a'],
+        max_concurrency=2, timeout=5, metadata=[('k', 'v')],
+    )
+    assert [o.response for o in outcomes] == [('a', 5, [('k', 'v')])]
+
+    # Every page of a list is read.
+    outcomes = fan_out_method(
+        _Client(), 'list_things', ['a'],
+        max_concurrency=2, timeout=None, metadata=(),
+    )
+    assert [o.response for o in outcomes] == [['a', 'a']]
+
+
+@pytest.mark.parametrize('method', [
+    'delete_thing', 'get_missing', 'get_attribute',
+])
+def test_fan_out_method_error(method):
+    with pytest.raises(ValueError):
+        fan_out_method(
+            _Client(), method, [], max_concurrency=1, timeout=None, metadata=())
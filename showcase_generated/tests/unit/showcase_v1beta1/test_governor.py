@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import asyncio
+import threading
+import time
+
+from grpc import aio
+import pytest
+
+from google.api_core import exceptions
+from google.showcase_v1beta1 import governor
+from google.showcase_v1beta1.governor import Governor
+
+
+_METHOD = '/google.showcase.v1beta1.Messaging/CreateBlurb'
+_OTHER = '/google.showcase.v1beta1.Messaging/GetBlurb'
+
+
+class _Clock:
+    # A clock that only moves when told to.
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_rate():
+    clock = _Clock()
+    gov = Governor(rate=2.0, burst=2, clock=clock)
+
+    # The burst goes through, and then the bucket is empty.
+    assert gov.try_acquire(_METHOD)
+    assert gov.try_acquire(_METHOD)
+    assert not gov.try_acquire(_METHOD)
+
+    # A token comes back every half second.
+    clock.now = 0.5
+    assert gov.try_acquire(_METHOD)
+    assert not gov.try_acquire(_METHOD)
+    for _ in range(3):
+        gov.release(_METHOD)
+
+    stats = gov.snapshot()[_METHOD]
+    assert (stats.acquired, stats.rejected, stats.in_flight) == (3, 2, 0)
+    assert stats.queue_delay.count == 3
+    assert repr(stats) == 'GovernorStats<acquired=3, rejected=2, in_flight=0>'
+
+
+def test_acquire_waits_for_a_token():
+    gov = Governor(rate=50.0, burst=1)
+    assert gov.acquire(_METHOD) == pytest.approx(0.0, abs=0.01)
+    assert gov.acquire(_METHOD) >= 0.015
+    stats = gov.snapshot()[_METHOD]
+    assert stats.acquired == 2
+    assert stats.queue_delay.max >= 0.015
+
+
+def test_max_in_flight():
+    gov = Governor(max_in_flight=1)
+    assert gov.acquire(_METHOD, timeout=1.0) == pytest.approx(0.0, abs=0.01)
+    assert not gov.try_acquire(_METHOD)
+
+    # A call from another thread waits until the first one is over.
+    acquired = threading.Event()
+
+    def other():
+        gov.acquire(_METHOD)
+        acquired.set()
+
+    thread = threading.Thread(target=other)
+    thread.start()
+    assert not acquired.wait(0.05)
+    assert gov.snapshot()[_METHOD].in_flight == 1
+    gov.release(_METHOD)
+    thread.join(1.0)
+    assert acquired.is_set()
+    assert gov.snapshot()[_METHOD].in_flight == 1
+
+    # The budgets are per method.
+    assert gov.try_acquire(_OTHER)
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'max_in_flight': 1},
+    {'rate': 0.1, 'burst': 1},
+])
+def test_acquire_timeout(kwargs):
+    gov = Governor(**kwargs)
+    gov.acquire(_METHOD)
+    start = time.monotonic()
+    with pytest.raises(exceptions.DeadlineExceeded):
+        gov.acquire(_METHOD, timeout=0.02)
+    assert time.monotonic() - start < 1.0
+    assert gov.snapshot()[_METHOD].rejected == 1
+
+
+def test_mapping_limits():
+    gov = Governor(rate={_METHOD: 1.0}, max_in_flight={_METHOD: 5})
+    assert gov.try_acquire(_METHOD)
+    assert not gov.try_acquire(_METHOD)
+
+    # Methods the mappings leave out are not limited.
+    for _ in range(10):
+        assert gov.try_acquire(_OTHER)
+    assert repr(gov) == 'Governor<methods=2>'
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'rate': 0.0}, {'rate': {_METHOD: -1.0}}, {'burst': 0.5},
+    {'max_in_flight': 0},
+])
+def test_governor_error(kwargs):
+    with pytest.raises(ValueError):
+        Governor(**kwargs)
+
+
+class _Stub:
+    def __init__(self, gov):
+        self._governor = gov
+        self.calls = []
+
+    def __call__(self, request, timeout=None, metadata=()):
+        self.calls.append((request, timeout, metadata))
+        assert self._governor.snapshot()[_METHOD].in_flight == 1
+        if request == 'fail':
+            raise exceptions.ServiceUnavailable('down')
+        return 'response'
+
+
+def test_govern():
+    clock = iter([0.0, 1.5, 1.5, 1.5, 1.5]).__next__
+    gov = Governor(max_in_flight=1, clock=clock)
+    stub = _Stub(gov)
+    governed = governor.wrap(
+        stub, gov, 'google.showcase.v1beta1.Messaging', 'CreateBlurb')
+
+    # The stub has what is left of the timeout after the wait.
+    assert governed('request', timeout=5.0, metadata=[('k', 'v')]) == 'response'
+    assert stub.calls == [('request', 3.5, [('k', 'v')])]
+
+    # A failed call is over as well.
+    with pytest.raises(exceptions.ServiceUnavailable):
+        governed('fail')
+    assert stub.calls[-1] == ('fail', None, ())
+    assert gov.snapshot()[_METHOD].in_flight == 0
+
+
+def test_wrap_without_governor():
+    stub = _Stub(None)
+    assert governor.wrap(stub, None, 'google.showcase.v1beta1.Messaging', 'CreateBlurb') is stub
+
+
+@pytest.mark.asyncio
+async def test_acquire_async_waits_for_a_token():
+    gov = Governor(rate=50.0, burst=1)
+    assert await gov.acquire_async(_METHOD) == pytest.approx(0.0, abs=0.01)
+    assert await gov.acquire_async(_METHOD) >= 0.015
+    stats = gov.snapshot()[_METHOD]
+    assert stats.acquired == 2
+    assert stats.queue_delay.max >= 0.015
+
+
+@pytest.mark.asyncio
+async def test_acquire_async_max_in_flight():
+    gov = Governor(max_in_flight=1)
+    await gov.acquire_async(_METHOD)
+
+    # Another call backs off on the event loop until the first is over.
+    other = asyncio.ensure_future(gov.acquire_async(_METHOD, timeout=1.0))
+    await asyncio.sleep(0.02)
+    assert not other.done()
+    gov.release(_METHOD)
+    assert await other < 1.0
+    assert gov.snapshot()[_METHOD].in_flight == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('kwargs', [
+    {'max_in_flight': 1},
+    {'rate': 0.1, 'burst': 1},
+])
+async def test_acquire_async_timeout(kwargs):
+    gov = Governor(**kwargs)
+    await gov.acquire_async(_METHOD)
+    start = time.monotonic()
+    with pytest.raises(exceptions.DeadlineExceeded):
+        await gov.acquire_async(_METHOD, timeout=0.02)
+    assert time.monotonic() - start < 1.0
+    assert gov.snapshot()[_METHOD].rejected == 1
+
+
+class _AsyncStub(_Stub):
+    async def _answer(self, request, timeout, metadata):
+        return super().__call__(request, timeout, metadata)
+
+    def __call__(self, request, timeout=None, metadata=()):
+        return self._answer(request, timeout, metadata)
+
+
+@pytest.mark.asyncio
+async def test_wrap_async():
+    clock = iter([0.0, 1.5, 1.5, 1.5, 1.5]).__next__
+    gov = Governor(max_in_flight=1, clock=clock)
+    stub = _AsyncStub(gov)
+    assert governor.wrap_async(
+        stub, None, 'google.showcase.v1beta1.Messaging', 'CreateBlurb') is stub
+    governed = governor.wrap_async(
+        stub, gov, 'google.showcase.v1beta1.Messaging', 'CreateBlurb')
+
+    # api-core wraps the calls of a unary multicallable as unary ones.
+    assert isinstance(governed, aio.UnaryUnaryMultiCallable)
+
+    # The stub has what is left of the timeout after the wait.
+    assert await governed('request', timeout=5.0, metadata=[('k', 'v')]) == 'response'
+    assert stub.calls == [('request', 3.5, [('k', 'v')])]
+
+    # A failed call is over as well.
+    with pytest.raises(exceptions.ServiceUnavailable):
+        await governed('fail')
+    assert stub.calls[-1] == ('fail', None, ())
+    assert gov.snapshot()[_METHOD].in_flight == 0
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import collections
+import itertools
+import logging
+import threading
+from unittest import mock
+
+import grpc
+
+import pytest
+
+from google.showcase_v1beta1.header_interceptor import HeaderInterceptor
+
+
+_Details = collections.namedtuple('_Details', (
+    'method', 'timeout', 'metadata', 'credentials', 'wait_for_ready', 'compression'))
+
+# The details an interceptor written for older gRPC versions passes on.
+_OldDetails = collections.namedtuple('_OldDetails', (
+    'method', 'timeout', 'metadata', 'credentials'))
+
+
+def _intercept(interceptor, details, shape='unary_unary'):
+    continuation = mock.Mock(return_value='call')
+    assert getattr(interceptor, 'intercept_' + shape)(
+        continuation, details, 'request') == 'call'
+    new_details, request = continuation.call_args[0]
+    assert request == 'request'
+    return new_details
+
+
+@pytest.mark.parametrize('shape', [
+    'unary_unary',
+    'unary_stream',
+    'stream_unary',
+    'stream_stream',
+])
+def test_header_interceptor_shapes(shape):
+    interceptor = HeaderInterceptor([('x-team', 'showcase')])
+    details = _intercept(
+        interceptor,
+        _Details('/svc/Method', 5, None, None, True, grpc.Compression.Gzip),
+        shape,
+    )
+    assert details == ('/svc/Method', 5, (('x-team', 'showcase'),), None,
+                       True, grpc.Compression.Gzip)
+    assert isinstance(details, grpc.ClientCallDetails)
+
+
+def test_header_interceptor_merges_metadata():
+    interceptor = HeaderInterceptor([('x-team', 'showcase')])
+
+    # Without metadata of its own, a call gets the precomputed tuple.
+    details = _intercept(interceptor, _Details('/svc/Method', None, (), None, None, None))
+    assert details.metadata is interceptor.metadata
+
+    details = _intercept(interceptor, _Details(
+        '/svc/Method', None, (('a', '1'),), None, None, None))
+    assert details.metadata == (('a', '1'), ('x-team', 'showcase'))
+
+    details = _intercept(interceptor, _OldDetails(
+        '/svc/Method', None, [('a', '1')], None))
+    assert details.metadata == (('a', '1'), ('x-team', 'showcase'))
+    assert (details.wait_for_ready, details.compression) == (None, None)
+
+
+def test_header_interceptor_call_credentials():
+    ours = mock.Mock(spec=grpc.CallCredentials)
+    theirs = mock.Mock(spec=grpc.CallCredentials)
+    interceptor = HeaderInterceptor(call_credentials=ours)
+
+    assert _intercept(interceptor, _OldDetails('/m', None, None, None)).credentials is ours
+    assert _intercept(interceptor, _OldDetails('/m', None, None, theirs)).credentials is theirs
+
+
+def test_header_interceptor_refresh():
+    passwords = itertools.count()
+    interceptor = HeaderInterceptor(
+        [('x-team', 'showcase')],
+        rotating_headers={'one-time-password': lambda: str(next(passwords))},
+        refresh_interval=3600,
+    )
+    try:
+        assert interceptor.metadata == (
+            ('x-team', 'showcase'), ('one-time-password', '0'))
+        interceptor.refresh()
+        details = _intercept(interceptor, _OldDetails('/m', None, None, None))
+        assert details.metadata == (
+            ('x-team', 'showcase'), ('one-time-password', '1'))
+        assert repr(interceptor) == (
+            "HeaderInterceptor<headers=['x-team'], rotating=['one-time-password']>")
+    finally:
+        interceptor.close()
+
+
+def test_header_interceptor_refreshes_in_background(caplog):
+    fetched = []
+    failed = threading.Event()
+
+    def fetch():
+        fetched.append(None)
+        if len(fetched) == 3:
+            failed.set()
+            raise RuntimeError('The password service is down.')
+        return str(len(fetched))
+
+    interceptor = HeaderInterceptor(
+        rotating_headers={'one-time-password': fetch},
+        refresh_interval=0.01,
+    )
+    with caplog.at_level(logging.WARNING):
+        assert failed.wait(5)
+        interceptor.close()
+
+    # The failed fetch kept the value fetched before it.
+    assert interceptor.metadata == (('one-time-password', '2'),)
+    assert 'Could not refresh the rotating headers' in caplog.text
+
+
+def test_header_interceptor_options_error():
+    with pytest.raises(ValueError):
+        HeaderInterceptor(refresh_interval=0)
+
+    # Nothing to stop without rotating headers.
+    HeaderInterceptor().close()
@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import asyncio
+from concurrent import futures
+import threading
+from unittest import mock
+
+from grpc import aio
+import pytest
+
+from google.showcase_v1beta1 import hedging
+from google.showcase_v1beta1.hedging import HedgingPolicy
+from google.showcase_v1beta1.metrics import LatencyHistogram
+
+
+_METHOD = '/google.showcase.v1beta1.Messaging/GetBlurb'
+
+
+class _Failed(Exception):
+    pass
+
+
+def _answer(value, after=0.0):
+    # A call that answers ``value`` (or fails with it) after a while; or
+    # never, unless cancelled, if ``after`` is None.
+    future = futures.Future()
+
+    def answer():
+        if not future.set_running_or_notify_cancel():
+            return
+        if isinstance(value, Exception):
+            future.set_exception(value)
+        else:
+            future.set_result(value)
+
+    if after == 0.0:
+        answer()
+    elif after is not None:
+        threading.Timer(after, answer).start()
+    return future
+
+
+class _Stub:
+    # Each call answers with the next of ``answers``, given as the
+    # arguments of _answer().
+    def __init__(self, *answers):
+        self._answers = list(answers)
+        self.requests = []
+        self.sent = []
+
+    def future(self, request, timeout=None, metadata=()):
+        self.requests.append((request, timeout, metadata))
+        call = _answer(*self._answers.pop(0))
+        self.sent.append(call)
+        return call
+
+
+class _AsyncStub:
+    # The asyncio counterpart of _Stub; a call that never answers waits
+    # until it is cancelled.
+    def __init__(self, *answers):
+        self._answers = list(answers)
+        self.requests = []
+        self.cancelled = []
+
+    def __call__(self, request, timeout=None, metadata=()):
+        self.requests.append((request, timeout, metadata))
+        return self._answer(*self._answers.pop(0))
+
+    async def _answer(self, value, after=0.0):
+        try:
+            await asyncio.sleep(3600 if after is None else after)
+        except asyncio.CancelledError:
+            self.cancelled.append(value)
+            raise
+        if isinstance(value, BaseException):
+            raise value
+        return value
+
+
+def test_fast_answer_is_not_hedged():
+    policy = HedgingPolicy(delay=1.0, budget=1.0)
+    stub = _Stub(('first',))
+    assert policy.hedge(stub, _METHOD)('request', timeout=5, metadata=[('k', 'v')]) == 'first'
+    assert stub.requests == [('request', 5, [('k', 'v')])]
+
+    stats = policy.snapshot()[_METHOD]
+    assert (stats.calls, stats.hedges, stats.wins, stats.throttled) == (1, 0, 0, 0)
+    assert stats.latency.count == 1
+    assert repr(stats) == 'HedgingStats<calls=1, hedges=0, wins=0, throttled=0>'
+
+
+def test_hedge_wins():
+    clock = iter([0.0, 2.0, 3.0]).__next__
+    policy = HedgingPolicy(delay=0.01, budget=1.0, clock=clock)
+    stub = _Stub(('slow', None), ('fast',))
+    assert policy.hedge(stub, _METHOD)('request', timeout=5) == 'fast'
+
+    # The hedge had what was left of the timeout, and the slow call was
+    # cancelled.
+    assert [timeout for _, timeout, _ in stub.requests] == [5, 3.0]
+    assert stub.sent[0].cancelled()
+    stats = policy.snapshot()[_METHOD]
+    assert (stats.calls, stats.hedges, stats.wins) == (1, 1, 1)
+    assert stats.latency.max == 3.0
+
+
+def test_first_call_wins_after_hedging():
+    policy = HedgingPolicy(delay=0.01, budget=1.0)
+    stub = _Stub(('first', 0.05), ('hedge', None))
+    assert policy.hedge(stub, _METHOD)('request') == 'first'
+    assert [timeout for _, timeout, _ in stub.requests] == [None, None]
+    assert stub.sent[1].cancelled()
+    stats = policy.snapshot()[_METHOD]
+    assert (stats.hedges, stats.wins) == (1, 0)
+
+
+@pytest.mark.parametrize('first,second,expected', [
+    (_Failed('down'), 'hedge', 'hedge'),
+    ('first', _Failed('down'), 'first'),
+])
+def test_failed_call_loses(first, second, expected):
+    policy = HedgingPolicy(delay=0.01, budget=1.0)
+    stub = _Stub(
+        (first, 0.05 if first == 'first' else 0.02),
+        (second,),
+    )
+    assert policy.hedge(stub, _METHOD)('request') == expected
+
+
+@pytest.mark.parametrize('first_after,second_after', [(0.05, 0.0), (0.02, 0.05)])
+def test_both_calls_fail(first_after, second_after):
+    # Whichever fails first, the first call's error is raised.
+    policy = HedgingPolicy(delay=0.01, budget=1.0)
+    stub = _Stub(
+        (_Failed('first'), first_after),
+        (_Failed('second'), second_after),
+    )
+    with pytest.raises(_Failed, match='first'):
+        policy.hedge(stub, _METHOD)('request')
+    stats = policy.snapshot()[_METHOD]
+    assert (stats.calls, stats.hedges, stats.wins) == (1, 1, 0)
+    assert stats.latency.count == 0
+
+
+def test_budget():
+    # One hedge in every two calls.
+    policy = HedgingPolicy(delay=0.0, budget={_METHOD: 0.5})
+    stub = _Stub(*[('slow', 0.02) for _ in range(4)])
+    hedged = policy.hedge(stub, _METHOD)
+    for _ in range(3):
+        assert hedged('request') == 'slow'
+    stats = policy.snapshot()[_METHOD]
+    assert (stats.calls, stats.hedges, stats.throttled) == (3, 1, 2)
+
+    # Methods the budget leaves out are never hedged.
+    other = HedgingPolicy(delay=0.0, budget={}).hedge(_Stub(('x', 0.02)), _METHOD)
+    assert other('request') == 'x'
+
+
+def test_observed_percentile():
+    policy = HedgingPolicy(percentile=0.5, min_samples=3, budget=1.0)
+    stub = _Stub(
+        *[('ok',) for _ in range(3)],
+        ('slow', None), ('hedge',),
+    )
+    hedged = policy.hedge(stub, _METHOD)
+
+    # No hedging until the method's latency is known.
+    for _ in range(3):
+        assert hedged('request') == 'ok'
+    assert policy.snapshot()[_METHOD].hedges == 0
+
+    assert hedged('request') == 'hedge'
+    assert policy.snapshot()[_METHOD].wins == 1
+    assert repr(policy) == 'HedgingPolicy<delay=None, percentile=0.5, methods=1>'
+
+
+def test_observed_percentile_is_cached(monkeypatch):
+    monkeypatch.setattr(hedging, '_REFRESH', 2)
+    now = [0.0]
+    policy = HedgingPolicy(percentile=0.9, min_samples=2, clock=lambda: now[0])
+
+    def answer(seconds):
+        policy._finish(_METHOD, now[0] - seconds, False)
+
+    with mock.patch.object(LatencyHistogram, 'percentile', autospec=True,
+                           side_effect=LatencyHistogram.percentile) as percentile:
+        assert policy._start(_METHOD) is None
+        answer(1.0)
+        answer(1.0)
+
+        # The delay is worked out once, and kept...
+        assert policy._start(_METHOD) == pytest.approx(1.0, rel=0.01)
+        answer(3.0)
+        assert policy._start(_METHOD) == pytest.approx(1.0, rel=0.01)
+        assert percentile.call_count == 1
+
+        # ...until enough more calls have answered.
+        answer(3.0)
+        assert policy._start(_METHOD) == pytest.approx(3.0, rel=0.01)
+        assert percentile.call_count == 2
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'delay': -1.0}, {'percentile': 0.0}, {'percentile': 1.0},
+])
+def test_policy_error(kwargs):
+    with pytest.raises(ValueError):
+        HedgingPolicy(**kwargs)
+
+
+def test_wrap():
+    stub = _Stub()
+    policy = HedgingPolicy()
+    assert hedging.wrap(stub, None, 'google.showcase.v1beta1.Messaging', 'GetBlurb') is stub
+
+    # Only methods the service config allows to retry are hedged.
+    assert hedging.wrap(stub, policy, 'google.showcase.v1beta1.Messaging', 'CreateBlurb') is stub
+    hedged = hedging.wrap(stub, policy, 'google.showcase.v1beta1.Messaging', 'GetBlurb')
+    assert hedged._method == _METHOD
+
+
+@pytest.mark.asyncio
+async def test_async_hedge_wins():
+    clock = iter([0.0, 2.0, 3.0]).__next__
+    policy = HedgingPolicy(delay=0.01, budget=1.0, clock=clock)
+    stub = _AsyncStub(('slow', None), ('fast',))
+    hedged = hedging.wrap_async(
+        stub, policy, 'google.showcase.v1beta1.Messaging', 'GetBlurb')
+    assert await hedged('request', timeout=5) == 'fast'
+
+    # The hedge had what was left of the timeout, and the slow call was
+    # cancelled.
+    assert [timeout for _, timeout, _ in stub.requests] == [5, 3.0]
+    await asyncio.sleep(0)
+    assert stub.cancelled == ['slow']
+    stats = policy.snapshot()[_METHOD]
+    assert (stats.calls, stats.hedges, stats.wins) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_async_fast_answer_is_not_hedged():
+    policy = HedgingPolicy(delay=1.0, budget=1.0)
+    stub = _AsyncStub(('first',))
+    hedged = hedging.wrap_async(
+        stub, policy, 'google.showcase.v1beta1.Messaging', 'GetBlurb')
+    assert await hedged('request', timeout=5, metadata=[('k', 'v')]) == 'first'
+    assert stub.requests == [('request', 5, [('k', 'v')])]
+
+    # Without a delay, or a hedge left in the budget, the call is only
+    # waited for.
+    for policy in (HedgingPolicy(percentile=0.5), HedgingPolicy(delay=0.0, budget=0.0)):
+        hedged = hedging.wrap_async(
+            _AsyncStub(('first', 0.02)), policy,
+            'google.showcase.v1beta1.Messaging', 'GetBlurb')
+        assert await hedged('request') == 'first'
+        assert policy.snapshot()[_METHOD].hedges == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('first,second,expected', [
+    (('first', 0.05), ('hedge', None), 'first'),
+    ((_Failed('down'), 0.02), ('hedge', 0.05), 'hedge'),
+    (('first', 0.05), (_Failed('down'),), 'first'),
+])
+async def test_async_race(first, second, expected):
+    policy = HedgingPolicy(delay=0.01, budget=1.0)
+    stub = _AsyncStub(first, second)
+    hedged = hedging.wrap_async(
+        stub, policy, 'google.showcase.v1beta1.Messaging', 'GetBlurb')
+    assert await hedged('request') == expected
+    assert [timeout for _, timeout, _ in stub.requests] == [None, None]
+    stats = policy.snapshot()[_METHOD]
+    assert (stats.hedges, stats.wins) == (1, int(expected == 'hedge'))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('first_after,second_after', [(0.05, 0.0), (0.02, 0.05)])
+async def test_async_both_calls_fail(first_after, second_after):
+    # Whichever fails first, the first call's error is raised.
+    policy = HedgingPolicy(delay=0.01, budget=1.0)
+    stub = _AsyncStub(
+        (_Failed('first'), first_after),
+        (_Failed('second'), second_after),
+    )
+    hedged = hedging.wrap_async(
+        stub, policy, 'google.showcase.v1beta1.Messaging', 'GetBlurb')
+    with pytest.raises(_Failed, match='first'):
+        await hedged('request')
+    assert policy.snapshot()[_METHOD].latency.count == 0
+
+
+@pytest.mark.asyncio
+async def test_async_call_cancelled():
+    # A call cancelled under the hedge, as gRPC cancels one, is not
+    # asked for its error.
+    policy = HedgingPolicy(delay=1.0, budget=1.0)
+    hedged = hedging.wrap_async(
+        _AsyncStub((asyncio.CancelledError(),)), policy,
+        'google.showcase.v1beta1.Messaging', 'GetBlurb')
+    with pytest.raises(asyncio.CancelledError):
+        await hedged('request')
+
+
+def test_wrap_async():
+    stub = _AsyncStub()
+    policy = HedgingPolicy()
+    assert hedging.wrap_async(stub, None, 'google.showcase.v1beta1.Messaging', 'GetBlurb') is stub
+    assert hedging.wrap_async(stub, policy, 'google.showcase.v1beta1.Messaging', 'CreateBlurb') is stub
+
+    # api-core wraps the calls of a unary multicallable as unary ones.
+    hedged = hedging.wrap_async(stub, policy, 'google.showcase.v1beta1.Messaging', 'GetBlurb')
+    assert isinstance(hedged, aio.UnaryUnaryMultiCallable)
@@ -15,16 +15,31 @@
 # limitations under the License.
 #
 
+from concurrent import futures
 from unittest import mock
 
 import grpc
+from grpc import aio
 
 import pytest
 
 from google import auth
 from google.api_core import client_options
+from google.api_core import exceptions
+from google.api_core import gapic_v1
+from google.api_core import grpc_helpers
+from google.api_core import grpc_helpers_async
 from google.auth import credentials
+from google.longrunning import operations_pb2
 from google.oauth2 import service_account
+from google.showcase_v1beta1 import channel_pool
+from google.showcase_v1beta1 import credentials_cache
+from google.showcase_v1beta1 import service_config
+from google.showcase_v1beta1.governor import Governor
+from google.showcase_v1beta1.hedging import HedgingPolicy
+from google.showcase_v1beta1.response_cache import ResponseCache
+from google.showcase_v1beta1.retry_budget import RetryBudget
+from google.showcase_v1beta1.services.identity import IdentityAsyncClient
 from google.showcase_v1beta1.services.identity import IdentityClient
 from google.showcase_v1beta1.services.identity import pagers
 from google.showcase_v1beta1.services.identity import transports
@@ -67,6 +82,23 @@ def test_identity_client_client_options_from_dict():
         transport.assert_called_once_with(credentials=None, host="squid.clam.whelk")
 
 
+def test_identity_async_client_from_service_account_file():
+    creds = credentials.AnonymousCredentials()
+    with mock.patch.object(service_account.Credentials, 'from_service_account_file') as factory:
+        factory.return_value = creds
+        client = IdentityAsyncClient.from_service_account_file("dummy/file/path.json")
+        assert isinstance(client, IdentityAsyncClient)
+        assert client._client._transport._credentials == creds
+
+        client = IdentityAsyncClient.from_service_account_json("dummy/file/path.json")
+        assert client._client._transport._credentials == creds
+
+
+def test_identity_async_client_get_transport_class():
+    assert IdentityAsyncClient.get_transport_class() is transports.IdentityGrpcTransport
+    assert IdentityAsyncClient.get_transport_class('grpc_asyncio') is transports.IdentityGrpcAsyncIOTransport
+
+
 def test_create_user(transport: str = 'grpc'):
     client = IdentityClient(
         credentials=credentials.AnonymousCredentials(),
@@ -101,6 +133,41 @@ def test_create_user(transport: str = 'grpc'):
     assert response.email == 'email_value'
 
 
+@pytest.mark.asyncio
+async def test_create_user_async():
+    client = IdentityAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = identity.CreateUserRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.create_user),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = identity.User(
+            name='name_value',
+            display_name='display_name_value',
+            email='email_value',
+        )
+        response = await client.create_user(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, identity.User)
+    assert response.name == 'name_value'
+    assert response.display_name == 'display_name_value'
+    assert response.email == 'email_value'
+
+
 def test_create_user_flattened():
     client = IdentityClient(
         credentials=credentials.AnonymousCredentials(),
@@ -128,6 +195,35 @@ def test_create_user_flattened():
         assert args[0].user.email == 'email_value'
 
 
+@pytest.mark.asyncio
+async def test_create_user_flattened_async():
+    client = IdentityAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.create_user),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = identity.User()
+
+        # Call the method with a truthy value for each flattened field,
+        # using the keyword arguments to the method.
+        response = await client.create_user(
+            display_name='display_name_value',
+            email='email_value',
+        )
+
+        # Establish that the underlying call was made with the expected
+        # request object values.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0].user.display_name == 'display_name_value'
+        assert args[0].user.email == 'email_value'
+
+
 def test_create_user_flattened_error():
     client = IdentityClient(
         credentials=credentials.AnonymousCredentials(),
@@ -143,6 +239,47 @@ def test_create_user_flattened_error():
         )
 
 
+@pytest.mark.asyncio
+async def test_create_user_flattened_error_async():
+    client = IdentityAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Attempting to call a method with both a request object and flattened
+    # fields is an error.
+    with pytest.raises(ValueError):
+        await client.create_user(
+            identity.CreateUserRequest(),
+            display_name='display_name_value',
+            email='email_value',
+        )
+
+
+def test_create_user_governor():
+    governor = Governor(max_in_flight=1)
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials(),
+        governor=governor,
+    )
+
+    # Mock the actual call within the gRPC stub; the call is in flight
+    # while the stub runs, and over afterwards.
+    def call(request, timeout=None, metadata=()):
+        stats = governor.snapshot()['/google.showcase.v1beta1.Identity/CreateUser']
+        assert stats.in_flight == 1
+        return identity.User(name='users/u')
+
+    with mock.patch.object(
+            type(client._transport.create_user),
+            '__call__') as stub:
+        stub.side_effect = call
+        for _ in range(2):
+            assert client.create_user(display_name='u').name == 'users/u'
+
+    stats = governor.snapshot()['/google.showcase.v1beta1.Identity/CreateUser']
+    assert (stats.acquired, stats.in_flight) == (2, 0)
+
+
 def test_get_user(transport: str = 'grpc'):
     client = IdentityClient(
         credentials=credentials.AnonymousCredentials(),
@@ -177,6 +314,41 @@ def test_get_user(transport: str = 'grpc'):
     assert response.email == 'email_value'
 
 
+@pytest.mark.asyncio
+async def test_get_user_async():
+    client = IdentityAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = identity.GetUserRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.get_user),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = identity.User(
+            name='name_value',
+            display_name='display_name_value',
+            email='email_value',
+        )
+        response = await client.get_user(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, identity.User)
+    assert response.name == 'name_value'
+    assert response.display_name == 'display_name_value'
+    assert response.email == 'email_value'
+
+
 def test_get_user_field_headers():
     client = IdentityClient(
         credentials=credentials.AnonymousCredentials(),
@@ -233,6 +405,33 @@ def test_get_user_flattened():
         assert args[0].name == 'name_value'
 
 
+@pytest.mark.asyncio
+async def test_get_user_flattened_async():
+    client = IdentityAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.get_user),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = identity.User()
+
+        # Call the method with a truthy value for each flattened field,
+        # using the keyword arguments to the method.
+        response = await client.get_user(
+            name='name_value',
+        )
+
+        # Establish that the underlying call was made with the expected
+        # request object values.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0].name == 'name_value'
+
+
 def test_get_user_flattened_error():
     client = IdentityClient(
         credentials=credentials.AnonymousCredentials(),
@@ -247,6 +446,69 @@ def test_get_user_flattened_error():
         )
 
 
+@pytest.mark.asyncio
+async def test_get_user_flattened_error_async():
+    client = IdentityAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Attempting to call a method with both a request object and flattened
+    # fields is an error.
+    with pytest.raises(ValueError):
+        await client.get_user(
+            identity.GetUserRequest(),
+            name='name_value',
+        )
+
+
+def test_get_user_hedging_policy():
+    policy = HedgingPolicy(delay=0.0, budget=1.0)
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials(),
+        hedging_policy=policy,
+    )
+    slow = futures.Future()
+    fast = futures.Future()
+    fast.set_result(identity.User(name='users/1'))
+
+    # Mock the calls within the gRPC stub; the first one never answers.
+    with mock.patch.object(
+            type(client._transport.get_user),
+            'future') as future:
+        future.side_effect = [slow, fast]
+        response = client.get_user(name='users/1')
+
+    # The hedge answered, and the first call was cancelled.
+    assert response.name == 'users/1'
+    assert future.call_count == 2
+    assert slow.cancelled()
+    stats = policy.snapshot()['/google.showcase.v1beta1.Identity/GetUser']
+    assert (stats.calls, stats.hedges, stats.wins) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_get_user_retry_budget_async():
+    budget = RetryBudget(ratio=0.0, min_retries=1)
+    client = IdentityAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+        retry_budget=budget,
+    )
+
+    # Mock the actual call within the gRPC stub; the backend is down, and
+    # the budget allows one retry.
+    with mock.patch.object(
+            type(client._client._transport.get_user),
+            '__call__',
+            new_callable=mock.AsyncMock) as call, mock.patch('asyncio.sleep'):
+        call.side_effect = exceptions.ServiceUnavailable('overloaded')
+        with pytest.raises(exceptions.ServiceUnavailable):
+            await client.get_user(name='users/u')
+        assert call.call_count == 2
+
+    stats = budget.snapshot()['/google.showcase.v1beta1.Identity/GetUser']
+    assert (stats.requests, stats.retries, stats.suppressed) == (1, 1, 1)
+
+
 def test_update_user(transport: str = 'grpc'):
     client = IdentityClient(
         credentials=credentials.AnonymousCredentials(),
@@ -281,6 +543,41 @@ def test_update_user(transport: str = 'grpc'):
     assert response.email == 'email_value'
 
 
+@pytest.mark.asyncio
+async def test_update_user_async():
+    client = IdentityAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = identity.UpdateUserRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.update_user),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = identity.User(
+            name='name_value',
+            display_name='display_name_value',
+            email='email_value',
+        )
+        response = await client.update_user(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, identity.User)
+    assert response.name == 'name_value'
+    assert response.display_name == 'display_name_value'
+    assert response.email == 'email_value'
+
+
 def test_delete_user(transport: str = 'grpc'):
     client = IdentityClient(
         credentials=credentials.AnonymousCredentials(),
@@ -308,6 +605,34 @@ def test_delete_user(transport: str = 'grpc'):
     assert response is None
 
 
+@pytest.mark.asyncio
+async def test_delete_user_async():
+    client = IdentityAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = identity.DeleteUserRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.delete_user),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = None
+        response = await client.delete_user(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert response is None
+
+
 def test_delete_user_flattened():
     client = IdentityClient(
         credentials=credentials.AnonymousCredentials(),
@@ -333,6 +658,33 @@ def test_delete_user_flattened():
         assert args[0].name == 'name_value'
 
 
+@pytest.mark.asyncio
+async def test_delete_user_flattened_async():
+    client = IdentityAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.delete_user),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = None
+
+        # Call the method with a truthy value for each flattened field,
+        # using the keyword arguments to the method.
+        response = await client.delete_user(
+            name='name_value',
+        )
+
+        # Establish that the underlying call was made with the expected
+        # request object values.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0].name == 'name_value'
+
+
 def test_delete_user_flattened_error():
     client = IdentityClient(
         credentials=credentials.AnonymousCredentials(),
@@ -347,37 +699,203 @@ def test_delete_user_flattened_error():
         )
 
 
-def test_list_users(transport: str = 'grpc'):
+@pytest.mark.asyncio
+async def test_delete_user_flattened_error_async():
+    client = IdentityAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Attempting to call a method with both a request object and flattened
+    # fields is an error.
+    with pytest.raises(ValueError):
+        await client.delete_user(
+            identity.DeleteUserRequest(),
+            name='name_value',
+        )
+
+
+def test_get_user_response_cache():
+    cache = ResponseCache()
     client = IdentityClient(
         credentials=credentials.AnonymousCredentials(),
-        transport=transport,
+        response_cache=cache,
     )
 
-    # Everything is optional in proto3 as far as the runtime is concerned,
-    # and we are mocking out the actual API, so just send an empty request.
-    request = identity.ListUsersRequest()
+    def respond(request, **kwargs):
+        if isinstance(request, identity.DeleteUserRequest):
+            raise exceptions.DeadlineExceeded('too slow')
+        return identity.User(name='users/1', display_name='Ada')
 
-    # Mock the actual call within the gRPC stub, and fake the request.
+    # Mock the actual calls within the gRPC stubs; they share one type.
     with mock.patch.object(
-            type(client._transport.list_users),
+            type(client._transport.get_user),
             '__call__') as call:
-        # Designate an appropriate return value for the call.
-        call.return_value = identity.ListUsersResponse(
-            next_page_token='next_page_token_value',
-        )
-        response = client.list_users(request)
+        call.side_effect = respond
 
-        # Establish that the underlying gRPC stub method was called.
-        assert len(call.mock_calls) == 1
-        _, args, _ = call.mock_calls[0]
-        assert args[0] == request
+        def lookups():
+            return sum(isinstance(args[0], identity.GetUserRequest)
+                       for _, args, _ in call.mock_calls)
 
-    # Establish that the response is the type that we expect.
-    assert isinstance(response, pagers.ListUsersPager)
-    assert response.next_page_token == 'next_page_token_value'
+        # Only the first lookup reaches the server.
+        assert client.get_user(name='users/1').display_name == 'Ada'
+        assert client.get_user(name='users/1').display_name == 'Ada'
+        assert lookups() == 1
+        assert (cache.hits, cache.misses) == (1, 1)
 
+        # Updating the user drops it from the cache.
+        client.update_user(identity.UpdateUserRequest(
+            user=identity.User(name='users/1'),
+        ))
+        client.get_user(name='users/1')
+        assert lookups() == 2
 
-def test_list_users_pager():
+        # So does deleting it, even when the call fails.
+        with pytest.raises(exceptions.DeadlineExceeded):
+            client.delete_user(name='users/1')
+        client.get_user(name='users/1')
+        assert lookups() == 3
+
+
+def test_get_user_response_cache_update_in_flight():
+    cache = ResponseCache()
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials(),
+        response_cache=cache,
+    )
+    users = [identity.User(name='users/1', display_name='Ada')]
+
+    def respond(request, **kwargs):
+        if isinstance(request, identity.UpdateUserRequest):
+            users.append(request.user)
+            return request.user
+        user = users[-1]
+        if len(users) == 1:
+            # The user is updated while the old one is on its way back.
+            client.update_user(identity.UpdateUserRequest(
+                user=identity.User(name='users/1', display_name='Grace'),
+            ))
+        return user
+
+    # Mock the actual calls within the gRPC stubs; they share one type.
+    with mock.patch.object(
+            type(client._transport.get_user),
+            '__call__') as call:
+        call.side_effect = respond
+
+        # The old user is returned, but not cached over the update.
+        assert client.get_user(name='users/1').display_name == 'Ada'
+        assert len(cache) == 0
+        assert client.get_user(name='users/1').display_name == 'Grace'
+        assert client.get_user(name='users/1').display_name == 'Grace'
+        assert cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_get_user_response_cache_async():
+    cache = ResponseCache()
+    client = IdentityAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+        response_cache=cache,
+    )
+
+    def respond(request, **kwargs):
+        if isinstance(request, identity.DeleteUserRequest):
+            raise exceptions.DeadlineExceeded('too slow')
+        return identity.User(name='users/1', display_name='Ada')
+
+    # Mock the actual calls within the gRPC stubs; they share one type.
+    with mock.patch.object(
+            type(client._client._transport.get_user),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        call.side_effect = respond
+
+        def lookups():
+            return sum(isinstance(args[0], identity.GetUserRequest)
+                       for _, args, _ in call.mock_calls)
+
+        # Only the first lookup reaches the server.
+        assert (await client.get_user(name='users/1')).display_name == 'Ada'
+        assert (await client.get_user(name='users/1')).display_name == 'Ada'
+        assert lookups() == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        # Updating the user drops it from the cache.
+        await client.update_user(identity.UpdateUserRequest(
+            user=identity.User(name='users/1'),
+        ))
+        await client.get_user(name='users/1')
+        assert lookups() == 2
+
+        # So does deleting it, even when the call fails.
+        with pytest.raises(exceptions.DeadlineExceeded):
+            await client.delete_user(name='users/1')
+        await client.get_user(name='users/1')
+        assert lookups() == 3
+
+
+def test_list_users(transport: str = 'grpc'):
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials(),
+        transport=transport,
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = identity.ListUsersRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.list_users),
+            '__call__') as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = identity.ListUsersResponse(
+            next_page_token='next_page_token_value',
+        )
+        response = client.list_users(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, pagers.ListUsersPager)
+    assert response.next_page_token == 'next_page_token_value'
+
+
+@pytest.mark.asyncio
+async def test_list_users_async():
+    client = IdentityAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = identity.ListUsersRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.list_users),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = identity.ListUsersResponse(
+            next_page_token='next_page_token_value',
+        )
+        response = await client.list_users(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, pagers.ListUsersAsyncPager)
+    assert response.next_page_token == 'next_page_token_value'
+
+
+def test_list_users_pager():
     client = IdentityClient(
         credentials=credentials.AnonymousCredentials,
     )
@@ -421,6 +939,52 @@ def test_list_users_pager():
         assert all([isinstance(i, identity.User)
                     for i in results])
 
+
+@pytest.mark.asyncio
+async def test_list_users_pager_async():
+    client = IdentityAsyncClient(
+        credentials=credentials.AnonymousCredentials,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.list_users),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Set the response to a series of pages.
+        call.side_effect = (
+            identity.ListUsersResponse(
+                users=[
+                    identity.User(),
+                    identity.User(),
+                    identity.User(),
+                ],
+                next_page_token='abc',
+            ),
+            identity.ListUsersResponse(
+                users=[],
+                next_page_token='def',
+            ),
+            identity.ListUsersResponse(
+                users=[
+                    identity.User(),
+                ],
+                next_page_token='ghi',
+            ),
+            identity.ListUsersResponse(
+                users=[
+                    identity.User(),
+                    identity.User(),
+                ],
+            ),
+            RuntimeError,
+        )
+        pager = await client.list_users(request={})
+        results = [i async for i in pager]
+        assert len(results) == 6
+        assert all([isinstance(i, identity.User)
+                    for i in results])
+
 def test_list_users_pages():
     client = IdentityClient(
         credentials=credentials.AnonymousCredentials,
@@ -463,6 +1027,311 @@ def test_list_users_pages():
             assert page.raw_page.next_page_token == token
 
 
+@pytest.mark.asyncio
+async def test_list_users_pages_async():
+    client = IdentityAsyncClient(
+        credentials=credentials.AnonymousCredentials,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.list_users),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Set the response to a series of pages.
+        call.side_effect = (
+            identity.ListUsersResponse(
+                users=[
+                    identity.User(),
+                    identity.User(),
+                    identity.User(),
+                ],
+                next_page_token='abc',
+            ),
+            identity.ListUsersResponse(
+                users=[],
+                next_page_token='def',
+            ),
+            identity.ListUsersResponse(
+                users=[
+                    identity.User(),
+                ],
+                next_page_token='ghi',
+            ),
+            identity.ListUsersResponse(
+                users=[
+                    identity.User(),
+                    identity.User(),
+                ],
+            ),
+            RuntimeError,
+        )
+        pager = await client.list_users(request={})
+        pages = [page async for page in pager.pages]
+        for page, token in zip(pages, ['abc','def','ghi', '']):
+            assert page.raw_page.next_page_token == token
+
+
+def test_list_users_pager_prefetch():
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials,
+        page_prefetch_depth=2,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.list_users),
+            '__call__') as call:
+        # Set the response to a series of pages; they are fetched ahead.
+        call.side_effect = (
+            identity.ListUsersResponse(
+                users=[
+                    identity.User(),
+                    identity.User(),
+                    identity.User(),
+                ],
+                next_page_token='abc',
+            ),
+            identity.ListUsersResponse(
+                users=[],
+                next_page_token='def',
+            ),
+            identity.ListUsersResponse(
+                users=[
+                    identity.User(),
+                ],
+                next_page_token='ghi',
+            ),
+            identity.ListUsersResponse(
+                users=[
+                    identity.User(),
+                    identity.User(),
+                ],
+            ),
+            RuntimeError,
+        )
+        pager = client.list_users(request={})
+        results = [i for i in pager]
+        assert pager.next_page_token == ''
+        assert len(results) == 6
+        assert all([isinstance(i, identity.User)
+                    for i in results])
+
+
+@pytest.mark.asyncio
+async def test_list_users_pager_prefetch_async():
+    client = IdentityAsyncClient(
+        credentials=credentials.AnonymousCredentials,
+        page_prefetch_depth=2,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.list_users),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Set the response to a series of pages; they are fetched ahead.
+        call.side_effect = (
+            identity.ListUsersResponse(
+                users=[
+                    identity.User(),
+                    identity.User(),
+                    identity.User(),
+                ],
+                next_page_token='abc',
+            ),
+            identity.ListUsersResponse(
+                users=[],
+                next_page_token='def',
+            ),
+            identity.ListUsersResponse(
+                users=[
+                    identity.User(),
+                ],
+                next_page_token='ghi',
+            ),
+            identity.ListUsersResponse(
+                users=[
+                    identity.User(),
+                    identity.User(),
+                ],
+            ),
+            RuntimeError,
+        )
+        pager = await client.list_users(request={})
+        results = [i async for i in pager]
+        assert pager.next_page_token == ''
+        assert len(results) == 6
+        assert all([isinstance(i, identity.User)
+                    for i in results])
+
+
+@pytest.mark.parametrize('take_request_ownership', [False, True])
+def test_list_users_pager_request_ownership(take_request_ownership):
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials(),
+        take_request_ownership=take_request_ownership,
+    )
+    request = identity.ListUsersRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.list_users),
+            '__call__') as call:
+        call.side_effect = (
+            identity.ListUsersResponse(next_page_token='abc'),
+            identity.ListUsersResponse(),
+        )
+        pager = client.list_users(request)
+        pages = list(pager.pages)
+
+    # The pager only advances the caller's own request once the caller has
+    # handed it over; otherwise it works on a copy.
+    assert len(pages) == 2
+    assert (pager._request is request) == take_request_ownership
+    assert request.page_token == ('abc' if take_request_ownership else '')
+
+
+_METHODS = (
+    ('create_user', identity.CreateUserRequest),
+    ('get_user', identity.GetUserRequest),
+    ('update_user', identity.UpdateUserRequest),
+    ('delete_user', identity.DeleteUserRequest),
+    ('list_users', identity.ListUsersRequest),
+)
+
+
+def test_fan_out():
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Mock the actual call within the gRPC stub.
+    with mock.patch.object(
+            type(client._transport.get_user),
+            '__call__') as call:
+        def get_user(request, **kwargs):
+            if request.name == 'users/missing':
+                raise exceptions.NotFound('missing')
+            return identity.User(name=request.name)
+        call.side_effect = get_user
+
+        names = ['users/{}'.format(i) for i in range(10)] + ['users/missing']
+        outcomes = list(client.fan_out(
+            'get_user', [{'name': name} for name in names],
+            max_concurrency=3, metadata=[('a', 'b')],
+        ))
+
+        # Establish that the underlying gRPC stub method was called.
+        assert call.call_count == 11
+        _, args, kwargs = call.mock_calls[0]
+        assert ('a', 'b') in kwargs['metadata']
+
+        # Each call has the timeout of the service config.
+        assert kwargs['timeout'] == 5.0
+
+    responses = {o.request['name']: o for o in outcomes}
+    assert responses['users/3'].response.name == 'users/3'
+    assert isinstance(responses['users/missing'].error, exceptions.NotFound)
+
+    with pytest.raises(ValueError):
+        client.fan_out('delete_user', [])
+
+
+
+def test_identity_wrapped_methods_are_cached():
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Mock out the wrapping itself, so that we can count how often it happens.
+    with mock.patch.object(gapic_v1.method, 'wrap_method') as wrap:
+        wrap.return_value.return_value = operations_pb2.Operation(
+            name='operations/spam',
+        )
+
+        # Call every method twice; only the first call should wrap.
+        for _ in range(2):
+            for name, request_type in _METHODS:
+                getattr(client, name)(request_type())
+
+        assert wrap.call_count == len(_METHODS)
+        assert sorted(client._inner_api_calls) == sorted(
+            name for name, _ in _METHODS)
+
+
+def test_identity_requests_are_not_copied():
+    client = IdentityClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    with mock.patch.object(gapic_v1.method, 'wrap_method') as wrap:
+        rpc = wrap.return_value
+        rpc.return_value = operations_pb2.Operation(name='operations/spam')
+
+        for name, request_type in _METHODS:
+            # A request of exactly the right type is sent as-is...
+            request = request_type()
+            getattr(client, name)(request)
+            _, args, _ = rpc.mock_calls[-1]
+            assert args[0] is request
+
+            # ...while anything else is coerced into a new request.
+            getattr(client, name)({})
+            _, args, _ = rpc.mock_calls[-1]
+            assert isinstance(args[0], request_type)
+
+
+@pytest.mark.asyncio
+async def test_identity_async_wrapped_methods_are_cached():
+    client = IdentityAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Mock out the wrapping itself, so that we can count how often it happens.
+    with mock.patch.object(gapic_v1.method_async, 'wrap_method') as wrap:
+        wrap.return_value = mock.AsyncMock(
+            return_value=grpc_helpers_async.FakeUnaryUnaryCall(
+                operations_pb2.Operation(name='operations/spam'),
+            ),
+        )
+
+        # Call every method twice; only the first call should wrap.
+        for _ in range(2):
+            for name, request_type in _METHODS:
+                await getattr(client, name)(request_type())
+
+        assert wrap.call_count == len(_METHODS)
+        assert sorted(client._inner_api_calls) == sorted(
+            name for name, _ in _METHODS)
+
+
+@pytest.mark.asyncio
+async def test_identity_async_requests_are_not_copied():
+    client = IdentityAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    with mock.patch.object(gapic_v1.method_async, 'wrap_method') as wrap:
+        rpc = wrap.return_value = mock.AsyncMock(
+            return_value=grpc_helpers_async.FakeUnaryUnaryCall(
+                operations_pb2.Operation(name='operations/spam'),
+            ),
+        )
+
+        for name, request_type in _METHODS:
+            # A request of exactly the right type is sent as-is...
+            request = request_type()
+            await getattr(client, name)(request)
+            _, args, _ = rpc.mock_calls[-1]
+            assert args[0] is request
+
+            # ...while anything else is coerced into a new request.
+            await getattr(client, name)({})
+            _, args, _ = rpc.mock_calls[-1]
+            assert isinstance(args[0], request_type)
+
+
 def test_credentials_transport_error():
     # It is an error to provide credentials and a transport instance.
     transport = transports.IdentityGrpcTransport(
@@ -495,6 +1364,17 @@ def test_transport_grpc_default():
     )
 
 
+def test_transport_grpc_asyncio_default():
+    # An async client should use the gRPC AsyncIO transport by default.
+    client = IdentityAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    assert isinstance(
+        client._client._transport,
+        transports.IdentityGrpcAsyncIOTransport,
+    )
+
+
 def test_identity_base_transport():
     # Instantiate the base transport.
     transport = transports.IdentityTransport(
@@ -516,12 +1396,16 @@ def test_identity_base_transport():
 
 
 def test_identity_auth_adc():
-    # If no credentials are provided, we should use ADC credentials.
+    # If no credentials are provided, we should use ADC credentials,
+    # resolved once for every client.
+    credentials_cache.clear()
     with mock.patch.object(auth, 'default') as adc:
         adc.return_value = (credentials.AnonymousCredentials(), None)
         client = IdentityClient()
+        assert IdentityClient()._transport._credentials is client._transport._credentials
         adc.assert_called_once_with(scopes=(
         ))
+    credentials_cache.clear()
 
 
 def test_identity_host_no_port():
@@ -542,6 +1426,32 @@ def test_identity_host_with_port():
     assert client._transport._host == 'localhost:8000'
 
 
+def test_identity_grpc_transport_service_config():
+    with mock.patch.object(grpc_helpers, 'create_channel') as create_channel:
+        transport = transports.IdentityGrpcTransport(
+            credentials=credentials.AnonymousCredentials(),
+            grpc_service_config=True,
+        )
+        assert transport.grpc_channel is create_channel.return_value
+        create_channel.assert_called_once_with(
+            'localhost:7469',
+            credentials=mock.ANY,
+            scopes=(),
+            options=[('grpc.service_config', service_config.SERVICE_CONFIG_JSON)],
+        )
+
+    # The pool is created with the same option.
+    with mock.patch.object(channel_pool, 'shared_pool') as shared_pool:
+        transport = transports.IdentityGrpcTransport(
+            credentials=credentials.AnonymousCredentials(),
+            channel_pool_size=2,
+            grpc_service_config=True,
+        )
+        assert transport.grpc_channel is shared_pool.return_value
+        assert shared_pool.call_args[1]['options'] == [
+            ('grpc.service_config', service_config.SERVICE_CONFIG_JSON)]
+
+
 def test_identity_grpc_transport_channel():
     channel = grpc.insecure_channel('http://localhost/')
     transport = transports.IdentityGrpcTransport(
@@ -550,6 +1460,37 @@ def test_identity_grpc_transport_channel():
     assert transport.grpc_channel is channel
 
 
+@pytest.mark.asyncio
+async def test_identity_grpc_asyncio_transport_channel():
+    channel = aio.insecure_channel('http://localhost/')
+    transport = transports.IdentityGrpcAsyncIOTransport(
+        channel=channel,
+    )
+    assert transport.grpc_channel is channel
+
+
+@pytest.mark.parametrize('grpc_service_config,options', [
+    (False, []),
+    (True, [('grpc.service_config', service_config.SERVICE_CONFIG_JSON)]),
+])
+def test_identity_grpc_asyncio_transport_create_channel(grpc_service_config, options):
+    creds = credentials.AnonymousCredentials()
+    with mock.patch.object(grpc_helpers_async, 'create_channel') as create_channel:
+        transport = transports.IdentityGrpcAsyncIOTransport(
+            host='squid.clam.whelk',
+            credentials=creds,
+            grpc_service_config=grpc_service_config,
+        )
+        assert transport.grpc_channel is create_channel.return_value
+        assert transport.grpc_channel is create_channel.return_value
+        create_channel.assert_called_once_with(
+            'squid.clam.whelk:443',
+            credentials=creds,
+            scopes=transport.AUTH_SCOPES,
+            options=options,
+        )
+
+
 def test_user_path():
   user_id = "squid"
 
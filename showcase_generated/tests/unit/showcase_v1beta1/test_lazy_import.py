@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import os
+import subprocess
+import sys
+import types
+
+import pytest
+
+import google.showcase_v1beta1
+from google.showcase_v1beta1 import lazy_import
+from google.showcase_v1beta1.services import echo
+from google.showcase_v1beta1.services.echo.client import EchoClient
+from google.showcase_v1beta1.types.echo import EchoRequest
+
+
+def _run(code):
+    # Import in a fresh interpreter, so that nothing is loaded already.
+    return subprocess.run(
+        [sys.executable, '-c', code],
+        stdout=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+    ).stdout
+
+
+def test_attach():
+    package = types.ModuleType('lazy_test_package')
+    sys.modules['lazy_test_package'] = package
+    try:
+        getattr_, dir_ = lazy_import.attach('lazy_test_package', {
+            'os.path': ('join', 'split'),
+            'sys': ('maxsize',),
+        })
+        assert getattr_('join') is os.path.join
+        assert getattr_('maxsize') == sys.maxsize
+
+        # A name is saved on the package once it is looked up.
+        assert package.join is os.path.join
+        assert 'split' not in vars(package)
+
+        assert dir_() == sorted(set(vars(package)) | {'join', 'split', 'maxsize'})
+        with pytest.raises(AttributeError):
+            getattr_('spam')
+    finally:
+        del sys.modules['lazy_test_package']
+
+
+def test_package_exports():
+    assert google.showcase_v1beta1.EchoClient is EchoClient
+    assert google.showcase_v1beta1.EchoRequest is EchoRequest
+    assert echo.EchoClient is EchoClient
+    for name in google.showcase_v1beta1.__all__:
+        assert name in dir(google.showcase_v1beta1)
+        assert getattr(google.showcase_v1beta1, name)
+    with pytest.raises(AttributeError):
+        google.showcase_v1beta1.SpamClient
+
+
+def test_import_loads_nothing_up_front():
+    loaded = _run(
+        'import sys\n'
+        'import google.showcase\n'
+        'print(sorted(m for m in sys.modules if m.startswith("google.showcase")))\n'
+    )
+    assert 'services' not in loaded
+    assert 'types' not in loaded
+
+
+def test_import_loads_only_what_is_used():
+    loaded = _run(
+        'import sys\n'
+        'from google.showcase import EchoClient\n'
+        'print(sorted(m for m in sys.modules if m.startswith("google.showcase")))\n'
+    )
+    assert 'google.showcase_v1beta1.services.echo.client' in loaded
+    assert 'google.showcase_v1beta1.services.echo.async_client' not in loaded
+    assert 'google.showcase_v1beta1.services.messaging' not in loaded
+
+
+def test_star_import():
+    assert _run(
+        'from google.showcase import *\n'
+        'print(EchoClient.__name__, Blurb.__name__)\n'
+    ) == 'EchoClient Blurb\n'
@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import time
+
+import grpc
+import pytest
+
+from google.api_core import exceptions
+from google.protobuf import duration_pb2
+from google.protobuf import field_mask_pb2
+from google.protobuf import timestamp_pb2
+from google.showcase_v1beta1.local_server import LocalServer
+from google.showcase_v1beta1.services.echo import EchoClient
+from google.showcase_v1beta1.services.echo import transports as echo_transports
+from google.showcase_v1beta1.services.identity import IdentityClient
+from google.showcase_v1beta1.services.identity import transports as identity_transports
+from google.showcase_v1beta1.services.messaging import MessagingClient
+from google.showcase_v1beta1.services.messaging import transports as messaging_transports
+from google.showcase_v1beta1.services.testing import client as testing_client
+from google.showcase_v1beta1.services.testing import transports as testing_transports
+from google.showcase_v1beta1.types import echo as gs_echo
+from google.showcase_v1beta1.types import messaging
+
+
+@pytest.fixture
+def server():
+    with LocalServer(page_size=2) as server:
+        yield server
+
+
+def _echo(server):
+    return EchoClient(transport=echo_transports.EchoGrpcTransport(
+        channel=server.channel()))
+
+
+def _identity(server):
+    return IdentityClient(transport=identity_transports.IdentityGrpcTransport(
+        channel=server.channel()))
+
+
+def _messaging(server):
+    return MessagingClient(transport=messaging_transports.MessagingGrpcTransport(
+        channel=server.channel()))
+
+
+def _testing(server):
+    return testing_client.TestingClient(transport=testing_transports.TestingGrpcTransport(
+        channel=server.channel()))
+
+
+def _in(seconds):
+    return timestamp_pb2.Timestamp(seconds=int(time.time() + seconds))
+
+
+def _bare(call):
+    # Raise the api-core error of a call on a bare stub.
+    try:
+        return call()
+    except grpc.RpcError as exc:
+        raise exceptions.from_grpc_error(exc) from exc
+
+
+def test_echo(server):
+    client = _echo(server)
+    assert client.echo({'content': 'hello'}).content == 'hello'
+    with pytest.raises(exceptions.NotFound, match='nope'):
+        client.echo({'error': {'code': 5, 'message': 'nope'}})
+    with pytest.raises(exceptions.Unknown):
+        client.echo({'error': {'code': 99}}, retry=None)
+    # An OK status gets an empty response.
+    assert client.echo({'error': {'code': 0}}).content == ''
+
+
+def test_expand(server):
+    client = _echo(server)
+    responses = client.expand({'content': 'one two three'})
+    assert [r.content for r in responses] == ['one', 'two', 'three']
+
+    responses = client.expand({'content': 'one two', 'error': {'code': 14}})
+    assert next(responses).content == 'one'
+    assert next(responses).content == 'two'
+    with pytest.raises(exceptions.ServiceUnavailable):
+        next(responses)
+
+
+def test_collect_and_chat(server):
+    # The generated client methods cannot take a request iterator yet, so
+    # the stubs are called directly.
+    transport = _echo(server)._transport
+    requests = [gs_echo.EchoRequest(content=word) for word in ('a', 'b')]
+    assert transport.collect(iter(requests)).content == 'a b'
+    assert [r.content for r in transport.chat(iter(requests))] == ['a', 'b']
+
+    error = gs_echo.EchoRequest(error={'code': 3})
+    with pytest.raises(exceptions.InvalidArgument):
+        _bare(lambda: transport.collect(iter(requests + [error])))
+    responses = transport.chat(iter(requests + [error]))
+    assert next(responses).content == 'a'
+    assert next(responses).content == 'b'
+    with pytest.raises(exceptions.InvalidArgument):
+        _bare(lambda: next(responses))
+
+
+def test_paged_expand(server):
+    client = _echo(server)
+    pager = client.paged_expand({'content': 'a b c d e'})
+    assert [r.content for r in pager] == ['a', 'b', 'c', 'd', 'e']
+    page = client.paged_expand({'content': 'a b c', 'page_size': 5})
+    assert page.next_page_token == ''
+    with pytest.raises(exceptions.InvalidArgument):
+        client.paged_expand({'content': 'a b c', 'page_token': 'abc'})
+    with pytest.raises(exceptions.InvalidArgument):
+        client.paged_expand({'content': 'a b c', 'page_token': '4'})
+
+
+def test_wait(server):
+    client = _echo(server)
+    operation = client.wait({
+        'ttl': duration_pb2.Duration(nanos=50 * 1000 * 1000),
+        'success': {'content': 'done'},
+    })
+    assert not operation.done()
+    assert operation.result(timeout=10).content == 'done'
+    assert operation.metadata.end_time
+
+    operation = client.wait({
+        'end_time': _in(-1),
+        'error': {'code': 9, 'message': 'late'},
+    })
+    with pytest.raises(exceptions.FailedPrecondition):
+        operation.result(timeout=10)
+
+    with pytest.raises(exceptions.NotFound):
+        client._transport.operations_client.get_operation('operations/missing')
+
+
+def test_block(server):
+    client = _echo(server)
+    began = time.monotonic()
+    response = client.block({
+        'response_delay': duration_pb2.Duration(nanos=20 * 1000 * 1000),
+        'success': {'content': 'late'},
+    })
+    assert response.content == 'late'
+    assert time.monotonic() - began >= 0.02
+    with pytest.raises(exceptions.Aborted):
+        client.block({'error': {'code': 10}})
+
+
+def test_identity(server):
+    client = _identity(server)
+    user = client.create_user({'user': {'display_name': 'Ann', 'email': 'a@x'}})
+    other = client.create_user({'user': {'display_name': 'Bo', 'email': 'b@x'}})
+    assert user.create_time == user.update_time
+    assert client.get_user({'name': user.name}) == user
+
+    updated = client.update_user({
+        'user': {'name': user.name, 'display_name': 'Anne'},
+        'update_mask': field_mask_pb2.FieldMask(paths=['display_name']),
+    })
+    assert updated.display_name == 'Anne'
+    assert updated.email == 'a@x'
+    assert updated.create_time == user.create_time
+    with pytest.raises(exceptions.InvalidArgument):
+        client.update_user({
+            'user': {'name': user.name},
+            'update_mask': field_mask_pb2.FieldMask(paths=['bogus']),
+        })
+
+    assert [u.name for u in client.list_users()] == [user.name, other.name]
+    client.delete_user({'name': user.name})
+    with pytest.raises(exceptions.NotFound):
+        client.get_user({'name': user.name})
+    with pytest.raises(exceptions.NotFound):
+        client.delete_user({'name': user.name})
+
+
+def test_rooms(server):
+    client = _messaging(server)
+    rooms = [client.create_room({'room': {'display_name': str(i)}}) for i in range(3)]
+    pages = list(client.list_rooms({'page_size': 2}).pages)
+    assert [len(page.rooms) for page in pages] == [2, 1]
+
+    # Without a mask, the whole room is replaced.
+    updated = client.update_room({
+        'room': {'name': rooms[0].name, 'display_name': 'new'},
+    })
+    assert updated.display_name == 'new'
+    assert updated.create_time == rooms[0].create_time
+    assert client.get_room({'name': rooms[0].name}).display_name == 'new'
+
+    client.delete_room({'name': rooms[0].name})
+    with pytest.raises(exceptions.NotFound):
+        client.get_room({'name': rooms[0].name})
+
+
+def test_blurbs(server):
+    client = _messaging(server)
+    room = client.create_room({'room': {'display_name': 'room'}})
+    user = _identity(server).create_user(
+        {'user': {'display_name': 'u', 'email': 'u@x'}})
+
+    blurbs = [
+        client.create_blurb(
+            {'parent': room.name, 'blurb': {'user': user.name, 'text': text}})
+        for text in ('hello world', 'goodbye', 'hello again')
+    ]
+    profile = client.create_blurb({
+        'parent': user.name + '/profile',
+        'blurb': {'user': user.name, 'text': 'hello'},
+    })
+    assert profile.name.startswith(user.name + '/profile/blurbs/')
+    for parent in ('users/missing/profile', 'bogus'):
+        with pytest.raises(exceptions.NotFound):
+            client.create_blurb({'parent': parent, 'blurb': {'text': 'x'}})
+
+    assert client.get_blurb({'name': blurbs[0].name}) == blurbs[0]
+    assert [b.name for b in client.list_blurbs({'parent': room.name})] == [
+        b.name for b in blurbs]
+    updated = client.update_blurb({'blurb': {'name': blurbs[1].name, 'text': 'hi'}})
+    assert updated.text == 'hi'
+    client.delete_blurb({'name': blurbs[1].name})
+    with pytest.raises(exceptions.NotFound):
+        client.get_blurb({'name': blurbs[1].name})
+
+    # A search matches any word, in one room or all of them.
+    found = client.search_blurbs({'query': 'hello', 'parent': room.name})
+    assert [b.text for b in found.result(timeout=10).blurbs] == [
+        'hello world', 'hello again']
+    found = client.search_blurbs({'query': 'hello nothing', 'page_size': 5})
+    assert len(found.result(timeout=10).blurbs) == 3
+
+    # Deleting the room deletes its blurbs.
+    client.delete_room({'name': room.name})
+    with pytest.raises(exceptions.NotFound):
+        client.list_blurbs({'parent': room.name})
+
+
+def test_stream_blurbs(server):
+    client = _messaging(server)
+    room = client.create_room({'room': {'display_name': 'room'}})
+    stream = client._transport.stream_blurbs(messaging.StreamBlurbsRequest(
+        name=room.name, expire_time=_in(30)))
+    # The headers come once the stream follows the room.
+    stream.initial_metadata()
+
+    blurb = client.create_blurb({'parent': room.name, 'blurb': {'text': 'a'}})
+    client.update_blurb({'blurb': {'name': blurb.name, 'text': 'b'}})
+    client.delete_blurb({'name': blurb.name})
+    Action = messaging.StreamBlurbsResponse.Action
+    events = [next(stream) for _ in range(3)]
+    assert [e.action for e in events] == [Action.CREATE, Action.UPDATE, Action.DELETE]
+    assert [e.blurb.text for e in events] == ['a', 'b', 'b']
+    stream.cancel()
+
+    # A stream ends at its expire time.
+    stream = client._transport.stream_blurbs(messaging.StreamBlurbsRequest(
+        name=room.name, expire_time=_in(-1)))
+    assert list(stream) == []
+
+    with pytest.raises(exceptions.NotFound):
+        next(client.stream_blurbs({'name': 'rooms/missing'}))
+
+
+def test_send_blurbs(server):
+    client = _messaging(server)
+    room = client.create_room({'room': {'display_name': 'room'}})
+    result = client.bulk_create_blurbs(
+        room.name, [messaging.Blurb(text=str(i)) for i in range(5)],
+        chunk_size=2)
+    assert not result.errors
+    assert len(set(result.names)) == 5
+    assert len(list(client.list_blurbs({'parent': room.name}))) == 5
+
+
+def test_connect(server):
+    client = _messaging(server)
+    room = client.create_room({'room': {'display_name': 'room'}})
+    session = client.connect_session(room.name)
+    for text in ('a', 'b'):
+        session.send(messaging.Blurb(text=text), block=True)
+    session.close()
+    assert [r.blurb.text for r in session] == ['a', 'b']
+
+    # A blurb the server cannot create ends the stream.
+    session = client.connect_session(room.name)
+    next_response = iter(session)
+    session.send(messaging.Blurb(text='a'))
+    assert next(next_response).blurb.text == 'a'
+    client.delete_room({'name': room.name})
+    session.send(messaging.Blurb(text='b'))
+    with pytest.raises(exceptions.NotFound):
+        next(next_response)
+
+    transport = client._transport
+    for requests in ([], [messaging.ConnectRequest(blurb={'text': 'a'})]):
+        with pytest.raises(exceptions.InvalidArgument):
+            _bare(lambda: next(transport.connect(iter(requests))))
+
+
+def test_testing(server):
+    client = _testing(server)
+    session = client.create_session({'session': {'version': 'V1_LATEST'}})
+    assert client.get_session({'name': session.name}) == session
+    assert [s.name for s in client.list_sessions()] == [session.name]
+    assert client.report_session({'name': session.name}).result == \
+        client.report_session({'name': session.name}).Result.PASSED
+    assert list(client.list_tests({'parent': session.name})) == []
+    with pytest.raises(exceptions.NotFound):
+        client.delete_test({'name': session.name + '/tests/t'})
+    with pytest.raises(exceptions.NotFound):
+        client.verify_test({'name': session.name + '/tests/t'})
+    client.delete_session({'name': session.name})
+    with pytest.raises(exceptions.NotFound):
+        client.list_tests({'parent': session.name})
+
+
+def test_latency_and_pace():
+    with LocalServer(latency={'Echo': 0.02}, stream_interval=0.01) as server:
+        client = _echo(server)
+        began = time.monotonic()
+        client.echo({'content': 'x'})
+        assert time.monotonic() - began >= 0.02
+
+        began = time.monotonic()
+        list(client.expand({'content': 'a b c'}))
+        assert time.monotonic() - began >= 0.03
+
+    with LocalServer(latency=0.01) as server:
+        began = time.monotonic()
+        _echo(server).echo({'content': 'x'})
+        assert time.monotonic() - began >= 0.01
+
+
+def test_injected_failures():
+    with LocalServer(error_rate=0.5, seed=1) as server:
+        client = _echo(server)
+        failures = 0
+        for _ in range(20):
+            try:
+                client.echo({'content': 'x'}, retry=None)
+            except exceptions.ServiceUnavailable:
+                failures += 1
+        assert 0 < failures < 20
+
+    # The service config's retry policy rides out the failures.
+    with LocalServer(error_rate=0.2, seed=1) as server:
+        client = _echo(server)
+        for _ in range(20):
+            assert client.echo({'content': 'x'}).content == 'x'
+
+    with LocalServer(error_rate=1.0, error_code=grpc.StatusCode.ABORTED) as server:
+        with pytest.raises(exceptions.Aborted):
+            next(_echo(server).expand({'content': 'a'}))
+
+
+def test_unix_socket(tmp_path):
+    address = 'unix:' + str(tmp_path / 'showcase.sock')
+    server = LocalServer(address).start()
+    try:
+        assert server.address == address
+        assert _echo(server).echo({'content': 'x'}).content == 'x'
+    finally:
+        server.stop(grace=1)
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'error_rate': 1.5}, {'error_rate': -0.1}, {'page_size': 0},
+])
+def test_options_error(kwargs):
+    with pytest.raises(ValueError):
+        LocalServer(**kwargs)
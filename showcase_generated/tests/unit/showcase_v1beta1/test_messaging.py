@@ -15,25 +15,58 @@
 # limitations under the License.
 #
 
+from concurrent import futures
+import datetime
+import threading
+import time
 from unittest import mock
 
 import grpc
+from grpc import aio
 
 import pytest
 
 from google import auth
 from google.api_core import client_options
+from google.api_core import exceptions
+from google.api_core import gapic_v1
+from google.api_core import grpc_helpers_async
+from google.api_core import operation
+from google.api_core import operation_async
 from google.api_core import future
 from google.api_core import operations_v1
+from google.api_core import retry as retries
 from google.auth import credentials
 from google.longrunning import operations_pb2
 from google.oauth2 import service_account
+from google.protobuf import message
+from google.protobuf import timestamp_pb2 as timestamp  # type: ignore
+from google.showcase_v1beta1 import channel_pool
+from google.showcase_v1beta1 import credentials_cache
+from google.showcase_v1beta1 import service_config
+from google.showcase_v1beta1.governor import Governor
+from google.showcase_v1beta1.operation_poller import OperationPoller
+from google.showcase_v1beta1.hedging import HedgingPolicy
+from google.showcase_v1beta1.response_cache import ResponseCache
+from google.showcase_v1beta1.retry_budget import RetryBudget
+from google.showcase_v1beta1.services.messaging import MessagingAsyncClient
 from google.showcase_v1beta1.services.messaging import MessagingClient
+from google.showcase_v1beta1.services.messaging import bulk
+from google.showcase_v1beta1.services.messaging import connect
+from google.showcase_v1beta1.services.messaging import lazy_images
 from google.showcase_v1beta1.services.messaging import pagers
 from google.showcase_v1beta1.services.messaging import transports
 from google.showcase_v1beta1.types import messaging
 
 
+def _fake_stream_call(call_type, responses):
+    # A streaming call that yields the given responses when iterated.
+    call = mock.MagicMock(spec=call_type)
+    call.wait_for_connection = mock.AsyncMock()
+    call.__aiter__.return_value = responses
+    return call
+
+
 def test_messaging_client_from_service_account_file():
     creds = credentials.AnonymousCredentials()
     with mock.patch.object(service_account.Credentials, 'from_service_account_file') as factory:
@@ -70,6 +103,23 @@ def test_messaging_client_client_options_from_dict():
         transport.assert_called_once_with(credentials=None, host="squid.clam.whelk")
 
 
+def test_messaging_async_client_from_service_account_file():
+    creds = credentials.AnonymousCredentials()
+    with mock.patch.object(service_account.Credentials, 'from_service_account_file') as factory:
+        factory.return_value = creds
+        client = MessagingAsyncClient.from_service_account_file("dummy/file/path.json")
+        assert isinstance(client, MessagingAsyncClient)
+        assert client._client._transport._credentials == creds
+
+        client = MessagingAsyncClient.from_service_account_json("dummy/file/path.json")
+        assert client._client._transport._credentials == creds
+
+
+def test_messaging_async_client_get_transport_class():
+    assert MessagingAsyncClient.get_transport_class() is transports.MessagingGrpcTransport
+    assert MessagingAsyncClient.get_transport_class('grpc_asyncio') is transports.MessagingGrpcAsyncIOTransport
+
+
 def test_create_room(transport: str = 'grpc'):
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
@@ -104,6 +154,41 @@ def test_create_room(transport: str = 'grpc'):
     assert response.description == 'description_value'
 
 
+@pytest.mark.asyncio
+async def test_create_room_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = messaging.CreateRoomRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.create_room),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = messaging.Room(
+            name='name_value',
+            display_name='display_name_value',
+            description='description_value',
+        )
+        response = await client.create_room(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, messaging.Room)
+    assert response.name == 'name_value'
+    assert response.display_name == 'display_name_value'
+    assert response.description == 'description_value'
+
+
 def test_create_room_flattened():
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
@@ -131,6 +216,35 @@ def test_create_room_flattened():
         assert args[0].room.description == 'description_value'
 
 
+@pytest.mark.asyncio
+async def test_create_room_flattened_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.create_room),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = messaging.Room()
+
+        # Call the method with a truthy value for each flattened field,
+        # using the keyword arguments to the method.
+        response = await client.create_room(
+            display_name='display_name_value',
+            description='description_value',
+        )
+
+        # Establish that the underlying call was made with the expected
+        # request object values.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0].room.display_name == 'display_name_value'
+        assert args[0].room.description == 'description_value'
+
+
 def test_create_room_flattened_error():
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
@@ -146,6 +260,22 @@ def test_create_room_flattened_error():
         )
 
 
+@pytest.mark.asyncio
+async def test_create_room_flattened_error_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Attempting to call a method with both a request object and flattened
+    # fields is an error.
+    with pytest.raises(ValueError):
+        await client.create_room(
+            messaging.CreateRoomRequest(),
+            display_name='display_name_value',
+            description='description_value',
+        )
+
+
 def test_get_room(transport: str = 'grpc'):
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
@@ -180,6 +310,41 @@ def test_get_room(transport: str = 'grpc'):
     assert response.description == 'description_value'
 
 
+@pytest.mark.asyncio
+async def test_get_room_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = messaging.GetRoomRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.get_room),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = messaging.Room(
+            name='name_value',
+            display_name='display_name_value',
+            description='description_value',
+        )
+        response = await client.get_room(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, messaging.Room)
+    assert response.name == 'name_value'
+    assert response.display_name == 'display_name_value'
+    assert response.description == 'description_value'
+
+
 def test_get_room_field_headers():
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
@@ -236,6 +401,33 @@ def test_get_room_flattened():
         assert args[0].name == 'name_value'
 
 
+@pytest.mark.asyncio
+async def test_get_room_flattened_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.get_room),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = messaging.Room()
+
+        # Call the method with a truthy value for each flattened field,
+        # using the keyword arguments to the method.
+        response = await client.get_room(
+            name='name_value',
+        )
+
+        # Establish that the underlying call was made with the expected
+        # request object values.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0].name == 'name_value'
+
+
 def test_get_room_flattened_error():
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
@@ -250,6 +442,21 @@ def test_get_room_flattened_error():
         )
 
 
+@pytest.mark.asyncio
+async def test_get_room_flattened_error_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Attempting to call a method with both a request object and flattened
+    # fields is an error.
+    with pytest.raises(ValueError):
+        await client.get_room(
+            messaging.GetRoomRequest(),
+            name='name_value',
+        )
+
+
 def test_update_room(transport: str = 'grpc'):
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
@@ -284,6 +491,41 @@ def test_update_room(transport: str = 'grpc'):
     assert response.description == 'description_value'
 
 
+@pytest.mark.asyncio
+async def test_update_room_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = messaging.UpdateRoomRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.update_room),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = messaging.Room(
+            name='name_value',
+            display_name='display_name_value',
+            description='description_value',
+        )
+        response = await client.update_room(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, messaging.Room)
+    assert response.name == 'name_value'
+    assert response.display_name == 'display_name_value'
+    assert response.description == 'description_value'
+
+
 def test_delete_room(transport: str = 'grpc'):
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
@@ -311,6 +553,34 @@ def test_delete_room(transport: str = 'grpc'):
     assert response is None
 
 
+@pytest.mark.asyncio
+async def test_delete_room_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = messaging.DeleteRoomRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.delete_room),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = None
+        response = await client.delete_room(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert response is None
+
+
 def test_delete_room_flattened():
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
@@ -336,6 +606,33 @@ def test_delete_room_flattened():
         assert args[0].name == 'name_value'
 
 
+@pytest.mark.asyncio
+async def test_delete_room_flattened_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.delete_room),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = None
+
+        # Call the method with a truthy value for each flattened field,
+        # using the keyword arguments to the method.
+        response = await client.delete_room(
+            name='name_value',
+        )
+
+        # Establish that the underlying call was made with the expected
+        # request object values.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0].name == 'name_value'
+
+
 def test_delete_room_flattened_error():
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
@@ -350,6 +647,21 @@ def test_delete_room_flattened_error():
         )
 
 
+@pytest.mark.asyncio
+async def test_delete_room_flattened_error_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Attempting to call a method with both a request object and flattened
+    # fields is an error.
+    with pytest.raises(ValueError):
+        await client.delete_room(
+            messaging.DeleteRoomRequest(),
+            name='name_value',
+        )
+
+
 def test_list_rooms(transport: str = 'grpc'):
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
@@ -380,6 +692,37 @@ def test_list_rooms(transport: str = 'grpc'):
     assert response.next_page_token == 'next_page_token_value'
 
 
+@pytest.mark.asyncio
+async def test_list_rooms_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = messaging.ListRoomsRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.list_rooms),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = messaging.ListRoomsResponse(
+            next_page_token='next_page_token_value',
+        )
+        response = await client.list_rooms(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, pagers.ListRoomsAsyncPager)
+    assert response.next_page_token == 'next_page_token_value'
+
+
 def test_list_rooms_pager():
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials,
@@ -424,15 +767,18 @@ def test_list_rooms_pager():
         assert all([isinstance(i, messaging.Room)
                     for i in results])
 
-def test_list_rooms_pages():
-    client = MessagingClient(
+
+@pytest.mark.asyncio
+async def test_list_rooms_pager_async():
+    client = MessagingAsyncClient(
         credentials=credentials.AnonymousCredentials,
     )
 
     # Mock the actual call within the gRPC stub, and fake the request.
     with mock.patch.object(
-            type(client._transport.list_rooms),
-            '__call__') as call:
+            type(client._client._transport.list_rooms),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
         # Set the response to a series of pages.
         call.side_effect = (
             messaging.ListRoomsResponse(
@@ -461,24 +807,206 @@ def test_list_rooms_pages():
             ),
             RuntimeError,
         )
-        pages = list(client.list_rooms(request={}).pages)
-        for page, token in zip(pages, ['abc','def','ghi', '']):
-            assert page.raw_page.next_page_token == token
-
+        pager = await client.list_rooms(request={})
+        results = [i async for i in pager]
+        assert len(results) == 6
+        assert all([isinstance(i, messaging.Room)
+                    for i in results])
 
-def test_create_blurb(transport: str = 'grpc'):
+def test_list_rooms_pages():
     client = MessagingClient(
-        credentials=credentials.AnonymousCredentials(),
-        transport=transport,
+        credentials=credentials.AnonymousCredentials,
     )
 
-    # Everything is optional in proto3 as far as the runtime is concerned,
-    # and we are mocking out the actual API, so just send an empty request.
-    request = messaging.CreateBlurbRequest()
-
     # Mock the actual call within the gRPC stub, and fake the request.
     with mock.patch.object(
-            type(client._transport.create_blurb),
+            type(client._transport.list_rooms),
+            '__call__') as call:
+        # Set the response to a series of pages.
+        call.side_effect = (
+            messaging.ListRoomsResponse(
+                rooms=[
+                    messaging.Room(),
+                    messaging.Room(),
+                    messaging.Room(),
+                ],
+                next_page_token='abc',
+            ),
+            messaging.ListRoomsResponse(
+                rooms=[],
+                next_page_token='def',
+            ),
+            messaging.ListRoomsResponse(
+                rooms=[
+                    messaging.Room(),
+                ],
+                next_page_token='ghi',
+            ),
+            messaging.ListRoomsResponse(
+                rooms=[
+                    messaging.Room(),
+                    messaging.Room(),
+                ],
+            ),
+            RuntimeError,
+        )
+        pages = list(client.list_rooms(request={}).pages)
+        for page, token in zip(pages, ['abc','def','ghi', '']):
+            assert page.raw_page.next_page_token == token
+
+
+@pytest.mark.asyncio
+async def test_list_rooms_pages_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.list_rooms),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Set the response to a series of pages.
+        call.side_effect = (
+            messaging.ListRoomsResponse(
+                rooms=[
+                    messaging.Room(),
+                    messaging.Room(),
+                    messaging.Room(),
+                ],
+                next_page_token='abc',
+            ),
+            messaging.ListRoomsResponse(
+                rooms=[],
+                next_page_token='def',
+            ),
+            messaging.ListRoomsResponse(
+                rooms=[
+                    messaging.Room(),
+                ],
+                next_page_token='ghi',
+            ),
+            messaging.ListRoomsResponse(
+                rooms=[
+                    messaging.Room(),
+                    messaging.Room(),
+                ],
+            ),
+            RuntimeError,
+        )
+        pager = await client.list_rooms(request={})
+        pages = [page async for page in pager.pages]
+        for page, token in zip(pages, ['abc','def','ghi', '']):
+            assert page.raw_page.next_page_token == token
+
+
+def test_list_rooms_pager_prefetch():
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials,
+        page_prefetch_depth=2,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.list_rooms),
+            '__call__') as call:
+        # Set the response to a series of pages; they are fetched ahead.
+        call.side_effect = (
+            messaging.ListRoomsResponse(
+                rooms=[
+                    messaging.Room(),
+                    messaging.Room(),
+                    messaging.Room(),
+                ],
+                next_page_token='abc',
+            ),
+            messaging.ListRoomsResponse(
+                rooms=[],
+                next_page_token='def',
+            ),
+            messaging.ListRoomsResponse(
+                rooms=[
+                    messaging.Room(),
+                ],
+                next_page_token='ghi',
+            ),
+            messaging.ListRoomsResponse(
+                rooms=[
+                    messaging.Room(),
+                    messaging.Room(),
+                ],
+            ),
+            RuntimeError,
+        )
+        pager = client.list_rooms(request={})
+        results = [i for i in pager]
+        assert pager.next_page_token == ''
+        assert len(results) == 6
+        assert all([isinstance(i, messaging.Room)
+                    for i in results])
+
+
+@pytest.mark.asyncio
+async def test_list_rooms_pager_prefetch_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials,
+        page_prefetch_depth=2,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.list_rooms),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Set the response to a series of pages; they are fetched ahead.
+        call.side_effect = (
+            messaging.ListRoomsResponse(
+                rooms=[
+                    messaging.Room(),
+                    messaging.Room(),
+                    messaging.Room(),
+                ],
+                next_page_token='abc',
+            ),
+            messaging.ListRoomsResponse(
+                rooms=[],
+                next_page_token='def',
+            ),
+            messaging.ListRoomsResponse(
+                rooms=[
+                    messaging.Room(),
+                ],
+                next_page_token='ghi',
+            ),
+            messaging.ListRoomsResponse(
+                rooms=[
+                    messaging.Room(),
+                    messaging.Room(),
+                ],
+            ),
+            RuntimeError,
+        )
+        pager = await client.list_rooms(request={})
+        results = [i async for i in pager]
+        assert pager.next_page_token == ''
+        assert len(results) == 6
+        assert all([isinstance(i, messaging.Room)
+                    for i in results])
+
+
+def test_create_blurb(transport: str = 'grpc'):
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+        transport=transport,
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = messaging.CreateBlurbRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.create_blurb),
             '__call__') as call:
         # Designate an appropriate return value for the call.
         call.return_value = messaging.Blurb(
@@ -502,6 +1030,43 @@ def test_create_blurb(transport: str = 'grpc'):
     assert response.image == b'image_blob'
 
 
+@pytest.mark.asyncio
+async def test_create_blurb_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = messaging.CreateBlurbRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.create_blurb),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = messaging.Blurb(
+            name='name_value',
+            user='user_value',
+            text='text_value',
+            image=b'image_blob',
+        )
+        response = await client.create_blurb(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, messaging.Blurb)
+    assert response.name == 'name_value'
+    assert response.user == 'user_value'
+    assert response.text == 'text_value'
+    assert response.image == b'image_blob'
+
+
 def test_create_blurb_flattened():
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
@@ -533,6 +1098,39 @@ def test_create_blurb_flattened():
         assert args[0].blurb.image == b'image_blob'
 
 
+@pytest.mark.asyncio
+async def test_create_blurb_flattened_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.create_blurb),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = messaging.Blurb()
+
+        # Call the method with a truthy value for each flattened field,
+        # using the keyword arguments to the method.
+        response = await client.create_blurb(
+            parent='parent_value',
+            user='user_value',
+            text='text_value',
+            image=b'image_blob',
+        )
+
+        # Establish that the underlying call was made with the expected
+        # request object values.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0].parent == 'parent_value'
+        assert args[0].blurb.user == 'user_value'
+        assert args[0].blurb.text == 'text_value'
+        assert args[0].blurb.image == b'image_blob'
+
+
 def test_create_blurb_flattened_error():
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
@@ -550,6 +1148,49 @@ def test_create_blurb_flattened_error():
         )
 
 
+@pytest.mark.asyncio
+async def test_create_blurb_flattened_error_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Attempting to call a method with both a request object and flattened
+    # fields is an error.
+    with pytest.raises(ValueError):
+        await client.create_blurb(
+            messaging.CreateBlurbRequest(),
+            parent='parent_value',
+            user='user_value',
+            text='text_value',
+            image=b'image_blob',
+        )
+
+
+def test_create_blurb_governor():
+    governor = Governor(rate=1.0, burst=1)
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+        governor=governor,
+    )
+
+    # Mock the actual call within the gRPC stub.
+    with mock.patch.object(
+            type(client._transport.create_blurb),
+            '__call__') as call:
+        call.return_value = messaging.Blurb(name='rooms/r/blurbs/b')
+        client.create_blurb(parent='rooms/r', text='hi')
+
+        # The bucket is empty, and the next call is not let through
+        # within its timeout.
+        with pytest.raises(exceptions.DeadlineExceeded):
+            client.create_blurb(parent='rooms/r', text='hi',
+                                timeout=0.01)
+        assert call.call_count == 1
+
+    stats = governor.snapshot()['/google.showcase.v1beta1.Messaging/CreateBlurb']
+    assert (stats.acquired, stats.rejected, stats.in_flight) == (1, 1, 0)
+
+
 def test_get_blurb(transport: str = 'grpc'):
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
@@ -586,20 +1227,57 @@ def test_get_blurb(transport: str = 'grpc'):
     assert response.image == b'image_blob'
 
 
-def test_get_blurb_field_headers():
-    client = MessagingClient(
+@pytest.mark.asyncio
+async def test_get_blurb_async():
+    client = MessagingAsyncClient(
         credentials=credentials.AnonymousCredentials(),
-  )
-
-    # Any value that is part of the HTTP/1.1 URI should be sent as
-    # a field header. Set these to a non-empty value.
-    request = messaging.GetBlurbRequest(
-        name='name/value',
     )
 
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = messaging.GetBlurbRequest()
+
     # Mock the actual call within the gRPC stub, and fake the request.
     with mock.patch.object(
-            type(client._transport.get_blurb),
+            type(client._client._transport.get_blurb),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = messaging.Blurb(
+            name='name_value',
+            user='user_value',
+            text='text_value',
+            image=b'image_blob',
+        )
+        response = await client.get_blurb(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, messaging.Blurb)
+    assert response.name == 'name_value'
+    assert response.user == 'user_value'
+    assert response.text == 'text_value'
+    assert response.image == b'image_blob'
+
+
+def test_get_blurb_field_headers():
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+  )
+
+    # Any value that is part of the HTTP/1.1 URI should be sent as
+    # a field header. Set these to a non-empty value.
+    request = messaging.GetBlurbRequest(
+        name='name/value',
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.get_blurb),
             '__call__') as call:
         call.return_value = messaging.Blurb()
         response = client.get_blurb(request)
@@ -642,6 +1320,33 @@ def test_get_blurb_flattened():
         assert args[0].name == 'name_value'
 
 
+@pytest.mark.asyncio
+async def test_get_blurb_flattened_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.get_blurb),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = messaging.Blurb()
+
+        # Call the method with a truthy value for each flattened field,
+        # using the keyword arguments to the method.
+        response = await client.get_blurb(
+            name='name_value',
+        )
+
+        # Establish that the underlying call was made with the expected
+        # request object values.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0].name == 'name_value'
+
+
 def test_get_blurb_flattened_error():
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
@@ -656,7 +1361,992 @@ def test_get_blurb_flattened_error():
         )
 
 
-def test_update_blurb(transport: str = 'grpc'):
+@pytest.mark.asyncio
+async def test_get_blurb_flattened_error_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Attempting to call a method with both a request object and flattened
+    # fields is an error.
+    with pytest.raises(ValueError):
+        await client.get_blurb(
+            messaging.GetBlurbRequest(),
+            name='name_value',
+        )
+
+
+def test_get_blurb_hedging_policy():
+    policy = HedgingPolicy(delay=0.0, budget=1.0)
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+        hedging_policy=policy,
+    )
+    slow = futures.Future()
+    fast = futures.Future()
+    fast.set_result(messaging.Blurb(name='rooms/r/blurbs/b'))
+
+    # Mock the calls within the gRPC stub; the first one never answers.
+    with mock.patch.object(
+            type(client._transport.get_blurb),
+            'future') as future:
+        future.side_effect = [slow, fast]
+        response = client.get_blurb(name='rooms/r/blurbs/b')
+
+    # The hedge answered, and the first call was cancelled.
+    assert response.name == 'rooms/r/blurbs/b'
+    assert future.call_count == 2
+    assert slow.cancelled()
+    stats = policy.snapshot()['/google.showcase.v1beta1.Messaging/GetBlurb']
+    assert (stats.calls, stats.hedges, stats.wins) == (1, 1, 1)
+
+
+def test_get_blurb_retry_budget():
+    budget = RetryBudget(ratio=0.0, min_retries=1)
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+        retry_budget=budget,
+    )
+
+    # Mock the actual call within the gRPC stub; the backend is down.
+    with mock.patch.object(
+            type(client._transport.get_blurb),
+            '__call__') as call, mock.patch('time.sleep'):
+        call.side_effect = exceptions.ServiceUnavailable('overloaded')
+
+        # The budget allows one retry, and then the call fails fast.
+        with pytest.raises(exceptions.ServiceUnavailable):
+            client.get_blurb(name='rooms/r/blurbs/b')
+        assert call.call_count == 2
+        with pytest.raises(exceptions.ServiceUnavailable):
+            client.get_blurb(name='rooms/r/blurbs/b')
+        assert call.call_count == 3
+
+    stats = budget.snapshot()['/google.showcase.v1beta1.Messaging/GetBlurb']
+    assert (stats.requests, stats.retries, stats.suppressed) == (2, 1, 2)
+
+
+def test_update_blurb(transport: str = 'grpc'):
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+        transport=transport,
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = messaging.UpdateBlurbRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.update_blurb),
+            '__call__') as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = messaging.Blurb(
+            name='name_value',
+            user='user_value',
+            text='text_value',
+            image=b'image_blob',
+        )
+        response = client.update_blurb(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, messaging.Blurb)
+    assert response.name == 'name_value'
+    assert response.user == 'user_value'
+    assert response.text == 'text_value'
+    assert response.image == b'image_blob'
+
+
+@pytest.mark.asyncio
+async def test_update_blurb_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = messaging.UpdateBlurbRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.update_blurb),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = messaging.Blurb(
+            name='name_value',
+            user='user_value',
+            text='text_value',
+            image=b'image_blob',
+        )
+        response = await client.update_blurb(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, messaging.Blurb)
+    assert response.name == 'name_value'
+    assert response.user == 'user_value'
+    assert response.text == 'text_value'
+    assert response.image == b'image_blob'
+
+
+def test_delete_blurb(transport: str = 'grpc'):
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+        transport=transport,
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = messaging.DeleteBlurbRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.delete_blurb),
+            '__call__') as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = None
+        response = client.delete_blurb(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert response is None
+
+
+@pytest.mark.asyncio
+async def test_delete_blurb_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = messaging.DeleteBlurbRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.delete_blurb),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = None
+        response = await client.delete_blurb(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert response is None
+
+
+def test_delete_blurb_flattened():
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.delete_blurb),
+            '__call__') as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = None
+
+        # Call the method with a truthy value for each flattened field,
+        # using the keyword arguments to the method.
+        response = client.delete_blurb(
+            name='name_value',
+        )
+
+        # Establish that the underlying call was made with the expected
+        # request object values.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0].name == 'name_value'
+
+
+@pytest.mark.asyncio
+async def test_delete_blurb_flattened_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.delete_blurb),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = None
+
+        # Call the method with a truthy value for each flattened field,
+        # using the keyword arguments to the method.
+        response = await client.delete_blurb(
+            name='name_value',
+        )
+
+        # Establish that the underlying call was made with the expected
+        # request object values.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0].name == 'name_value'
+
+
+def test_delete_blurb_flattened_error():
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Attempting to call a method with both a request object and flattened
+    # fields is an error.
+    with pytest.raises(ValueError):
+        client.delete_blurb(
+            messaging.DeleteBlurbRequest(),
+            name='name_value',
+        )
+
+
+@pytest.mark.asyncio
+async def test_delete_blurb_flattened_error_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Attempting to call a method with both a request object and flattened
+    # fields is an error.
+    with pytest.raises(ValueError):
+        await client.delete_blurb(
+            messaging.DeleteBlurbRequest(),
+            name='name_value',
+        )
+
+
+def _respond_with_resources(room, blurb):
+    # Answer any room or blurb request with the named resource.
+    def respond(request, **kwargs):
+        if isinstance(request, (messaging.DeleteRoomRequest,
+                                messaging.DeleteBlurbRequest)):
+            return None
+        if isinstance(request, (messaging.GetRoomRequest,
+                                messaging.UpdateRoomRequest)):
+            return messaging.Room(name=room)
+        return messaging.Blurb(name=blurb, text='hi')
+    return respond
+
+
+def _lookups(call):
+    # Count the GetRoom and GetBlurb calls that reached the stub.
+    return (
+        sum(isinstance(args[0], messaging.GetRoomRequest)
+            for _, args, _ in call.mock_calls),
+        sum(isinstance(args[0], messaging.GetBlurbRequest)
+            for _, args, _ in call.mock_calls),
+    )
+
+
+def test_get_room_and_blurb_response_cache():
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+        response_cache=ResponseCache(),
+    )
+    room = client.room_path('r')
+    blurb = client.blurb_path('r', 'b')
+
+    # Mock the actual calls within the gRPC stubs; they share one type.
+    with mock.patch.object(
+            type(client._transport.get_room),
+            '__call__') as call:
+        call.side_effect = _respond_with_resources(room, blurb)
+
+        def get_both():
+            client.get_room(name=room)
+            client.get_blurb(name=blurb)
+            return _lookups(call)
+
+        # Only the first lookups reach the server.
+        get_both()
+        assert get_both() == (1, 1)
+
+        # Updates and deletes drop just the resource they touch...
+        client.update_blurb(messaging.UpdateBlurbRequest(
+            blurb=messaging.Blurb(name=blurb),
+        ))
+        assert get_both() == (1, 2)
+        client.update_room(messaging.UpdateRoomRequest(
+            room=messaging.Room(name=room),
+        ))
+        assert get_both() == (2, 2)
+        client.delete_blurb(name=blurb)
+        assert get_both() == (2, 3)
+
+        # ...and the resources beneath it.
+        client.delete_room(name=room)
+        assert get_both() == (3, 4)
+
+
+@pytest.mark.asyncio
+async def test_get_room_and_blurb_response_cache_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+        response_cache=ResponseCache(),
+    )
+    room = client.room_path('r')
+    blurb = client.blurb_path('r', 'b')
+
+    # Mock the actual calls within the gRPC stubs; they share one type.
+    with mock.patch.object(
+            type(client._client._transport.get_room),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        call.side_effect = _respond_with_resources(room, blurb)
+
+        async def get_both():
+            await client.get_room(name=room)
+            await client.get_blurb(name=blurb)
+            return _lookups(call)
+
+        # Only the first lookups reach the server.
+        await get_both()
+        assert await get_both() == (1, 1)
+
+        # Updates and deletes drop just the resource they touch...
+        await client.update_blurb(messaging.UpdateBlurbRequest(
+            blurb=messaging.Blurb(name=blurb),
+        ))
+        assert await get_both() == (1, 2)
+        await client.update_room(messaging.UpdateRoomRequest(
+            room=messaging.Room(name=room),
+        ))
+        assert await get_both() == (2, 2)
+        await client.delete_blurb(name=blurb)
+        assert await get_both() == (2, 3)
+
+        # ...and the resources beneath it.
+        await client.delete_room(name=room)
+        assert await get_both() == (3, 4)
+
+
+def test_list_blurbs(transport: str = 'grpc'):
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+        transport=transport,
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = messaging.ListBlurbsRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.list_blurbs),
+            '__call__') as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = messaging.ListBlurbsResponse(
+            next_page_token='next_page_token_value',
+        )
+        response = client.list_blurbs(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, pagers.ListBlurbsPager)
+    assert response.next_page_token == 'next_page_token_value'
+
+
+@pytest.mark.asyncio
+async def test_list_blurbs_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = messaging.ListBlurbsRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.list_blurbs),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = messaging.ListBlurbsResponse(
+            next_page_token='next_page_token_value',
+        )
+        response = await client.list_blurbs(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, pagers.ListBlurbsAsyncPager)
+    assert response.next_page_token == 'next_page_token_value'
+
+
+def test_list_blurbs_field_headers():
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+  )
+
+    # Any value that is part of the HTTP/1.1 URI should be sent as
+    # a field header. Set these to a non-empty value.
+    request = messaging.ListBlurbsRequest(
+        parent='parent/value',
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.list_blurbs),
+            '__call__') as call:
+        call.return_value = messaging.ListBlurbsResponse()
+        response = client.list_blurbs(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the field header was sent.
+    _, _, kw = call.mock_calls[0]
+    assert (
+        'x-goog-request-params',
+        'parent=parent/value',
+    ) in kw['metadata']
+
+
+def test_list_blurbs_flattened():
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.list_blurbs),
+            '__call__') as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = messaging.ListBlurbsResponse()
+
+        # Call the method with a truthy value for each flattened field,
+        # using the keyword arguments to the method.
+        response = client.list_blurbs(
+            parent='parent_value',
+        )
+
+        # Establish that the underlying call was made with the expected
+        # request object values.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0].parent == 'parent_value'
+
+
+@pytest.mark.asyncio
+async def test_list_blurbs_flattened_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.list_blurbs),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = messaging.ListBlurbsResponse()
+
+        # Call the method with a truthy value for each flattened field,
+        # using the keyword arguments to the method.
+        response = await client.list_blurbs(
+            parent='parent_value',
+        )
+
+        # Establish that the underlying call was made with the expected
+        # request object values.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0].parent == 'parent_value'
+
+
+def test_list_blurbs_flattened_error():
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Attempting to call a method with both a request object and flattened
+    # fields is an error.
+    with pytest.raises(ValueError):
+        client.list_blurbs(
+            messaging.ListBlurbsRequest(),
+            parent='parent_value',
+        )
+
+
+@pytest.mark.asyncio
+async def test_list_blurbs_flattened_error_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Attempting to call a method with both a request object and flattened
+    # fields is an error.
+    with pytest.raises(ValueError):
+        await client.list_blurbs(
+            messaging.ListBlurbsRequest(),
+            parent='parent_value',
+        )
+
+
+def test_list_blurbs_pager():
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.list_blurbs),
+            '__call__') as call:
+        # Set the response to a series of pages.
+        call.side_effect = (
+            messaging.ListBlurbsResponse(
+                blurbs=[
+                    messaging.Blurb(),
+                    messaging.Blurb(),
+                    messaging.Blurb(),
+                ],
+                next_page_token='abc',
+            ),
+            messaging.ListBlurbsResponse(
+                blurbs=[],
+                next_page_token='def',
+            ),
+            messaging.ListBlurbsResponse(
+                blurbs=[
+                    messaging.Blurb(),
+                ],
+                next_page_token='ghi',
+            ),
+            messaging.ListBlurbsResponse(
+                blurbs=[
+                    messaging.Blurb(),
+                    messaging.Blurb(),
+                ],
+            ),
+            RuntimeError,
+        )
+        results = [i for i in client.list_blurbs(
+            request={},
+        )]
+        assert len(results) == 6
+        assert all([isinstance(i, messaging.Blurb)
+                    for i in results])
+
+
+@pytest.mark.asyncio
+async def test_list_blurbs_pager_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.list_blurbs),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Set the response to a series of pages.
+        call.side_effect = (
+            messaging.ListBlurbsResponse(
+                blurbs=[
+                    messaging.Blurb(),
+                    messaging.Blurb(),
+                    messaging.Blurb(),
+                ],
+                next_page_token='abc',
+            ),
+            messaging.ListBlurbsResponse(
+                blurbs=[],
+                next_page_token='def',
+            ),
+            messaging.ListBlurbsResponse(
+                blurbs=[
+                    messaging.Blurb(),
+                ],
+                next_page_token='ghi',
+            ),
+            messaging.ListBlurbsResponse(
+                blurbs=[
+                    messaging.Blurb(),
+                    messaging.Blurb(),
+                ],
+            ),
+            RuntimeError,
+        )
+        pager = await client.list_blurbs(request={})
+        results = [i async for i in pager]
+        assert len(results) == 6
+        assert all([isinstance(i, messaging.Blurb)
+                    for i in results])
+
+def test_list_blurbs_pages():
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.list_blurbs),
+            '__call__') as call:
+        # Set the response to a series of pages.
+        call.side_effect = (
+            messaging.ListBlurbsResponse(
+                blurbs=[
+                    messaging.Blurb(),
+                    messaging.Blurb(),
+                    messaging.Blurb(),
+                ],
+                next_page_token='abc',
+            ),
+            messaging.ListBlurbsResponse(
+                blurbs=[],
+                next_page_token='def',
+            ),
+            messaging.ListBlurbsResponse(
+                blurbs=[
+                    messaging.Blurb(),
+                ],
+                next_page_token='ghi',
+            ),
+            messaging.ListBlurbsResponse(
+                blurbs=[
+                    messaging.Blurb(),
+                    messaging.Blurb(),
+                ],
+            ),
+            RuntimeError,
+        )
+        pages = list(client.list_blurbs(request={}).pages)
+        for page, token in zip(pages, ['abc','def','ghi', '']):
+            assert page.raw_page.next_page_token == token
+
+
+@pytest.mark.asyncio
+async def test_list_blurbs_pages_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.list_blurbs),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Set the response to a series of pages.
+        call.side_effect = (
+            messaging.ListBlurbsResponse(
+                blurbs=[
+                    messaging.Blurb(),
+                    messaging.Blurb(),
+                    messaging.Blurb(),
+                ],
+                next_page_token='abc',
+            ),
+            messaging.ListBlurbsResponse(
+                blurbs=[],
+                next_page_token='def',
+            ),
+            messaging.ListBlurbsResponse(
+                blurbs=[
+                    messaging.Blurb(),
+                ],
+                next_page_token='ghi',
+            ),
+            messaging.ListBlurbsResponse(
+                blurbs=[
+                    messaging.Blurb(),
+                    messaging.Blurb(),
+                ],
+            ),
+            RuntimeError,
+        )
+        pager = await client.list_blurbs(request={})
+        pages = [page async for page in pager.pages]
+        for page, token in zip(pages, ['abc','def','ghi', '']):
+            assert page.raw_page.next_page_token == token
+
+
+def test_list_blurbs_pager_prefetch():
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials,
+        page_prefetch_depth=2,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.list_blurbs),
+            '__call__') as call:
+        # Set the response to a series of pages; they are fetched ahead.
+        call.side_effect = (
+            messaging.ListBlurbsResponse(
+                blurbs=[
+                    messaging.Blurb(),
+                    messaging.Blurb(),
+                    messaging.Blurb(),
+                ],
+                next_page_token='abc',
+            ),
+            messaging.ListBlurbsResponse(
+                blurbs=[],
+                next_page_token='def',
+            ),
+            messaging.ListBlurbsResponse(
+                blurbs=[
+                    messaging.Blurb(),
+                ],
+                next_page_token='ghi',
+            ),
+            messaging.ListBlurbsResponse(
+                blurbs=[
+                    messaging.Blurb(),
+                    messaging.Blurb(),
+                ],
+            ),
+            RuntimeError,
+        )
+        pager = client.list_blurbs(request={})
+        results = [i for i in pager]
+        assert pager.next_page_token == ''
+        assert len(results) == 6
+        assert all([isinstance(i, messaging.Blurb)
+                    for i in results])
+
+
+@pytest.mark.asyncio
+async def test_list_blurbs_pager_prefetch_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials,
+        page_prefetch_depth=2,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.list_blurbs),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Set the response to a series of pages; they are fetched ahead.
+        call.side_effect = (
+            messaging.ListBlurbsResponse(
+                blurbs=[
+                    messaging.Blurb(),
+                    messaging.Blurb(),
+                    messaging.Blurb(),
+                ],
+                next_page_token='abc',
+            ),
+            messaging.ListBlurbsResponse(
+                blurbs=[],
+                next_page_token='def',
+            ),
+            messaging.ListBlurbsResponse(
+                blurbs=[
+                    messaging.Blurb(),
+                ],
+                next_page_token='ghi',
+            ),
+            messaging.ListBlurbsResponse(
+                blurbs=[
+                    messaging.Blurb(),
+                    messaging.Blurb(),
+                ],
+            ),
+            RuntimeError,
+        )
+        pager = await client.list_blurbs(request={})
+        results = [i async for i in pager]
+        assert pager.next_page_token == ''
+        assert len(results) == 6
+        assert all([isinstance(i, messaging.Blurb)
+                    for i in results])
+
+
+def test_search_blurbs(transport: str = 'grpc'):
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+        transport=transport,
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = messaging.SearchBlurbsRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.search_blurbs),
+            '__call__') as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = operations_pb2.Operation(name='operations/spam')
+        response = client.search_blurbs(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, future.Future)
+
+
+def test_search_blurbs_operation_poller():
+    poller = OperationPoller()
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+        operation_poller=poller,
+    )
+    response = operations_pb2.Operation(name='operations/spam', done=True)
+    response.response.Pack(messaging.SearchBlurbsResponse.pb(
+        messaging.SearchBlurbsResponse(next_page_token='next')))
+
+    with mock.patch.object(
+            type(client._transport.search_blurbs),
+            '__call__') as call:
+        call.return_value = response
+        polled = client.search_blurbs({'query': 'hello'})
+
+    # The operation is tracked by the shared poller.
+    assert polled.result().next_page_token == 'next'
+    poller.close()
+
+
+@pytest.mark.asyncio
+async def test_search_blurbs_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = messaging.SearchBlurbsRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.search_blurbs),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = operations_pb2.Operation(name='operations/spam')
+        response = await client.search_blurbs(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, operation_async.AsyncOperation)
+
+
+def test_search_blurbs_flattened():
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.search_blurbs),
+            '__call__') as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = operations_pb2.Operation(name='operations/op')
+
+        # Call the method with a truthy value for each flattened field,
+        # using the keyword arguments to the method.
+        response = client.search_blurbs(
+            query='query_value',
+        )
+
+        # Establish that the underlying call was made with the expected
+        # request object values.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0].query == 'query_value'
+
+
+@pytest.mark.asyncio
+async def test_search_blurbs_flattened_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.search_blurbs),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = operations_pb2.Operation(name='operations/op')
+
+        # Call the method with a truthy value for each flattened field,
+        # using the keyword arguments to the method.
+        response = await client.search_blurbs(
+            query='query_value',
+        )
+
+        # Establish that the underlying call was made with the expected
+        # request object values.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0].query == 'query_value'
+
+
+def test_search_blurbs_flattened_error():
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Attempting to call a method with both a request object and flattened
+    # fields is an error.
+    with pytest.raises(ValueError):
+        client.search_blurbs(
+            messaging.SearchBlurbsRequest(),
+            query='query_value',
+        )
+
+
+@pytest.mark.asyncio
+async def test_search_blurbs_flattened_error_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Attempting to call a method with both a request object and flattened
+    # fields is an error.
+    with pytest.raises(ValueError):
+        await client.search_blurbs(
+            messaging.SearchBlurbsRequest(),
+            query='query_value',
+        )
+
+
+def test_search_blurbs_raw_page_lro():
+    response = messaging.SearchBlurbsResponse()
+    assert response.raw_page is response
+
+
+def test_stream_blurbs(transport: str = 'grpc'):
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
         transport=transport,
@@ -664,20 +2354,15 @@ def test_update_blurb(transport: str = 'grpc'):
 
     # Everything is optional in proto3 as far as the runtime is concerned,
     # and we are mocking out the actual API, so just send an empty request.
-    request = messaging.UpdateBlurbRequest()
+    request = messaging.StreamBlurbsRequest()
 
     # Mock the actual call within the gRPC stub, and fake the request.
     with mock.patch.object(
-            type(client._transport.update_blurb),
+            type(client._transport.stream_blurbs),
             '__call__') as call:
         # Designate an appropriate return value for the call.
-        call.return_value = messaging.Blurb(
-            name='name_value',
-            user='user_value',
-            text='text_value',
-            image=b'image_blob',
-        )
-        response = client.update_blurb(request)
+        call.return_value = iter([messaging.StreamBlurbsResponse()])
+        response = client.stream_blurbs(request)
 
         # Establish that the underlying gRPC stub method was called.
         assert len(call.mock_calls) == 1
@@ -685,80 +2370,247 @@ def test_update_blurb(transport: str = 'grpc'):
         assert args[0] == request
 
     # Establish that the response is the type that we expect.
-    assert isinstance(response, messaging.Blurb)
-    assert response.name == 'name_value'
-    assert response.user == 'user_value'
-    assert response.text == 'text_value'
-    assert response.image == b'image_blob'
+    for message in response:
+        assert isinstance(message, messaging.StreamBlurbsResponse)
 
 
-def test_delete_blurb(transport: str = 'grpc'):
-    client = MessagingClient(
+@pytest.mark.asyncio
+async def test_stream_blurbs_async():
+    client = MessagingAsyncClient(
         credentials=credentials.AnonymousCredentials(),
-        transport=transport,
     )
 
     # Everything is optional in proto3 as far as the runtime is concerned,
     # and we are mocking out the actual API, so just send an empty request.
-    request = messaging.DeleteBlurbRequest()
+    request = messaging.StreamBlurbsRequest()
 
     # Mock the actual call within the gRPC stub, and fake the request.
     with mock.patch.object(
-            type(client._transport.delete_blurb),
+            type(client._client._transport.stream_blurbs),
             '__call__') as call:
         # Designate an appropriate return value for the call.
-        call.return_value = None
-        response = client.delete_blurb(request)
+        call.return_value = _fake_stream_call(
+            aio.UnaryStreamCall,
+            [messaging.StreamBlurbsResponse()],
+        )
+        response = await client.stream_blurbs(request)
 
         # Establish that the underlying gRPC stub method was called.
-        assert len(call.mock_calls) == 1
+        assert call.call_count == 1
         _, args, _ = call.mock_calls[0]
         assert args[0] == request
 
     # Establish that the response is the type that we expect.
-    assert response is None
+    async for message in response:
+        assert isinstance(message, messaging.StreamBlurbsResponse)
 
 
-def test_delete_blurb_flattened():
+class _StreamCall:
+    """A server stream that breaks with `error` after its responses."""
+    def __init__(self, responses, error=None, trailing_metadata=()):
+        self._responses = iter(responses)
+        self._error = error
+        self._trailing_metadata = trailing_metadata
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        for response in self._responses:
+            return response
+        if self._error:
+            raise self._error
+        raise StopIteration
+
+    def trailing_metadata(self):
+        return self._trailing_metadata
+
+
+def _blurb(name, created, updated=None):
+    return messaging.Blurb(
+        name='rooms/r/blurbs/' + name,
+        create_time=timestamp.Timestamp(seconds=created),
+        update_time=timestamp.Timestamp(seconds=updated or created),
+    )
+
+
+def _event(action, *args):
+    return messaging.StreamBlurbsResponse(
+        blurb=_blurb(*args),
+        action=getattr(messaging.StreamBlurbsResponse.Action, action),
+    )
+
+
+def test_resumable_stream_blurbs():
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
     )
+    request = messaging.StreamBlurbsRequest(name='rooms/r')
+    streams = [
+        _StreamCall(
+            [_event('CREATE', 'a', 101), _event('UPDATE', 'b', 50, 102)],
+            exceptions.ServiceUnavailable('connection dropped'),
+        ),
+        _StreamCall(
+            [_event('CREATE', 'c', 103), _event('DELETE', 'a', 101), _event('CREATE', 'f', 105)],
+            trailing_metadata=(('done', 'yes'),),
+        ),
+    ]
+    listed = messaging.ListBlurbsResponse(blurbs=[
+        _blurb('a', 101),
+        _blurb('b', 50, 102),
+        # Changed while the stream was down.
+        _blurb('d', 99, 104),
+        _blurb('c', 103),
+        # Changed before the stream was opened.
+        _blurb('e', 90),
+    ])
 
-    # Mock the actual call within the gRPC stub, and fake the request.
     with mock.patch.object(
-            type(client._transport.delete_blurb),
+            type(client._transport.stream_blurbs),
+            '__call__') as stream_call, mock.patch.object(
+            type(client._transport.list_blurbs),
+            '__call__') as list_call:
+        stream_call.side_effect = streams
+        list_call.return_value = listed
+        stream = client.resumable_stream_blurbs(
+            request,
+            retry=retries.Retry(initial=0, maximum=0),
+        )
+        events = [(r.action.name, r.blurb.name[len('rooms/r/blurbs/'):]) for r in stream]
+
+        # The gap was listed once, under the subscribed room.
+        list_call.assert_called_once()
+        assert list_call.call_args[0][0].parent == 'rooms/r'
+        assert [args[0] for _, args, _ in stream_call.mock_calls] == [request, request]
+
+        # Each attempt has the timeout of the service config.
+        assert {kwargs['timeout'] for _, _, kwargs in stream_call.mock_calls} == {5.0}
+
+    # Nothing was missed or repeated.
+    assert events == [
+        ('CREATE', 'a'),
+        ('UPDATE', 'b'),
+        ('CREATE', 'c'),
+        ('UPDATE', 'd'),
+        ('DELETE', 'a'),
+        ('CREATE', 'f'),
+    ]
+    assert stream.attempts == 2
+    assert stream.trailing_metadata() == (('done', 'yes'),)
+
+
+def test_resumable_stream_blurbs_raw_messages():
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    raw_event = messaging.StreamBlurbsResponse.pb()
+    streams = [
+        _StreamCall([raw_event.FromString(
+                        messaging.StreamBlurbsResponse.serialize(_event('CREATE', 'a', 101)))],
+                    exceptions.ServiceUnavailable('connection dropped')),
+        _StreamCall([]),
+    ]
+    with mock.patch.object(
+            type(client._transport.stream_blurbs),
+            '__call__') as stream_call, mock.patch.object(
+            type(client._transport.list_blurbs),
+            '__call__') as list_call:
+        stream_call.side_effect = streams
+        list_call.return_value = messaging.ListBlurbsResponse.pb(
+            messaging.ListBlurbsResponse(blurbs=[_blurb('a', 101), _blurb('b', 102)]))
+        stream = client.resumable_stream_blurbs(
+            {'name': 'rooms/r'},
+            retry=retries.Retry(initial=0, maximum=0),
+        )
+        responses = list(stream)
+
+    # The missed blurb is reported as the stream reports the others.
+    assert [r.blurb.name for r in responses] == ['rooms/r/blurbs/a', 'rooms/r/blurbs/b']
+    assert all(isinstance(r, raw_event) for r in responses)
+
+
+def test_list_blurbs_raw_request_is_wrapped():
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    request = messaging.ListBlurbsRequest.pb()(parent='rooms/r')
+    with mock.patch.object(
+            type(client._transport.list_blurbs),
             '__call__') as call:
-        # Designate an appropriate return value for the call.
-        call.return_value = None
+        call.return_value = messaging.ListBlurbsResponse()
+        list(client.list_blurbs(request))
 
-        # Call the method with a truthy value for each flattened field,
-        # using the keyword arguments to the method.
-        response = client.delete_blurb(
-            name='name_value',
+    # The raw request was wrapped, not copied, and left as it was.
+    sent = call.call_args[0][0]
+    assert messaging.ListBlurbsRequest.pb(sent) is request
+    assert request == messaging.ListBlurbsRequest.pb()(parent='rooms/r')
+
+
+def test_resumable_stream_blurbs_ties():
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    streams = [
+        _StreamCall([_event('CREATE', 'a', 101)],
+                    exceptions.ServiceUnavailable('connection dropped')),
+        _StreamCall([_event('CREATE', 'a', 101), _event('CREATE', 'b', 101)]),
+    ]
+    with mock.patch.object(
+            type(client._transport.stream_blurbs),
+            '__call__') as stream_call, mock.patch.object(
+            type(client._transport.list_blurbs),
+            '__call__') as list_call:
+        stream_call.side_effect = streams
+        list_call.return_value = messaging.ListBlurbsResponse()
+        stream = client.resumable_stream_blurbs(
+            {'name': 'rooms/r'},
+            retry=retries.Retry(initial=0, maximum=0),
         )
+        names = [r.blurb.name for r in stream]
 
-        # Establish that the underlying call was made with the expected
-        # request object values.
-        assert len(call.mock_calls) == 1
-        _, args, _ = call.mock_calls[0]
-        assert args[0].name == 'name_value'
+    # Of two blurbs changed in the same second, only the one seen is dropped.
+    assert names == ['rooms/r/blurbs/a', 'rooms/r/blurbs/b']
 
 
-def test_delete_blurb_flattened_error():
+def test_resumable_stream_blurbs_before_any_event():
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
     )
-
-    # Attempting to call a method with both a request object and flattened
-    # fields is an error.
-    with pytest.raises(ValueError):
-        client.delete_blurb(
-            messaging.DeleteBlurbRequest(),
-            name='name_value',
+    streams = [
+        exceptions.ServiceUnavailable('not connected'),
+        _StreamCall([_event('CREATE', 'x', 99)],
+                    exceptions.ServiceUnavailable('connection dropped')),
+        _StreamCall([_event('CREATE', 'b', 102)]),
+    ]
+    with mock.patch.object(
+            type(client._transport.stream_blurbs),
+            '__call__') as stream_call, mock.patch.object(
+            type(client._transport.list_blurbs),
+            '__call__') as list_call:
+        stream_call.side_effect = streams
+        list_call.side_effect = [
+            messaging.ListBlurbsResponse(blurbs=[_blurb('y', 20), _blurb('z', 10)]),
+            messaging.ListBlurbsResponse(blurbs=[
+                _blurb('z', 10), _blurb('y', 20), _blurb('x', 99), _blurb('a', 98, 101)]),
+        ]
+        stream = client.resumable_stream_blurbs(
+            {'name': 'rooms/r'},
+            retry=retries.Retry(initial=0, maximum=0),
         )
+        events = [(r.action.name, r.blurb.name) for r in stream]
 
+    # Until something was delivered, the stream is not filtered, and the
+    # gap is not replayed: its listing only sets the time to resume from.
+    assert events == [
+        ('CREATE', 'rooms/r/blurbs/x'),
+        ('UPDATE', 'rooms/r/blurbs/a'),
+        ('CREATE', 'rooms/r/blurbs/b'),
+    ]
+    assert stream.attempts == 3
 
-def test_list_blurbs(transport: str = 'grpc'):
+
+def test_send_blurbs(transport: str = 'grpc'):
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
         transport=transport,
@@ -766,17 +2618,17 @@ def test_list_blurbs(transport: str = 'grpc'):
 
     # Everything is optional in proto3 as far as the runtime is concerned,
     # and we are mocking out the actual API, so just send an empty request.
-    request = messaging.ListBlurbsRequest()
+    request = messaging.CreateBlurbRequest()
 
     # Mock the actual call within the gRPC stub, and fake the request.
     with mock.patch.object(
-            type(client._transport.list_blurbs),
+            type(client._transport.send_blurbs),
             '__call__') as call:
         # Designate an appropriate return value for the call.
-        call.return_value = messaging.ListBlurbsResponse(
-            next_page_token='next_page_token_value',
+        call.return_value = messaging.SendBlurbsResponse(
+            names=['names_value'],
         )
-        response = client.list_blurbs(request)
+        response = client.send_blurbs(request)
 
         # Establish that the underlying gRPC stub method was called.
         assert len(call.mock_calls) == 1
@@ -784,238 +2636,465 @@ def test_list_blurbs(transport: str = 'grpc'):
         assert args[0] == request
 
     # Establish that the response is the type that we expect.
-    assert isinstance(response, pagers.ListBlurbsPager)
-    assert response.next_page_token == 'next_page_token_value'
+    assert isinstance(response, messaging.SendBlurbsResponse)
+    assert response.names == ['names_value']
 
 
-def test_list_blurbs_field_headers():
-    client = MessagingClient(
+@pytest.mark.asyncio
+async def test_send_blurbs_async():
+    client = MessagingAsyncClient(
         credentials=credentials.AnonymousCredentials(),
-  )
-
-    # Any value that is part of the HTTP/1.1 URI should be sent as
-    # a field header. Set these to a non-empty value.
-    request = messaging.ListBlurbsRequest(
-        parent='parent/value',
     )
 
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    requests = iter([messaging.CreateBlurbRequest()])
+
     # Mock the actual call within the gRPC stub, and fake the request.
     with mock.patch.object(
-            type(client._transport.list_blurbs),
+            type(client._client._transport.send_blurbs),
             '__call__') as call:
-        call.return_value = messaging.ListBlurbsResponse()
-        response = client.list_blurbs(request)
+        # Designate an appropriate return value for the call.
+        call.return_value = grpc_helpers_async.FakeStreamUnaryCall(
+            messaging.SendBlurbsResponse(
+                names=['names_value'],
+            ),
+        )
+        response = await client.send_blurbs(requests)
 
         # Establish that the underlying gRPC stub method was called.
         assert len(call.mock_calls) == 1
         _, args, _ = call.mock_calls[0]
-        assert args[0] == request
+        assert args[0] is requests
 
-    # Establish that the field header was sent.
-    _, _, kw = call.mock_calls[0]
-    assert (
-        'x-goog-request-params',
-        'parent=parent/value',
-    ) in kw['metadata']
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, messaging.SendBlurbsResponse)
+    assert response.names == ['names_value']
 
 
-def test_list_blurbs_flattened():
+def _fake_send_blurbs(fail=None):
+    # Create every blurb of a stream, named after its text, unless `fail`
+    # raises for it first.
+    def send_blurbs(requests, **kwargs):
+        requests = list(requests)
+        for request in requests:
+            if fail:
+                fail(request)
+        return messaging.SendBlurbsResponse(
+            names=['rooms/r/blurbs/' + r.blurb.text for r in requests],
+        )
+    return send_blurbs
+
+
+def test_bulk_create_blurbs():
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
     )
+    blurbs = (messaging.Blurb(text=str(i)) for i in range(10))
 
-    # Mock the actual call within the gRPC stub, and fake the request.
+    # Mock the actual call within the gRPC stub, and fake the streams.
     with mock.patch.object(
-            type(client._transport.list_blurbs),
+            type(client._transport.send_blurbs),
             '__call__') as call:
-        # Designate an appropriate return value for the call.
-        call.return_value = messaging.ListBlurbsResponse()
-
-        # Call the method with a truthy value for each flattened field,
-        # using the keyword arguments to the method.
-        response = client.list_blurbs(
-            parent='parent_value',
+        call.side_effect = _fake_send_blurbs()
+        result = client.bulk_create_blurbs('rooms/r', blurbs,
+            chunk_size=3,
+            max_concurrent_streams=2,
         )
 
-        # Establish that the underlying call was made with the expected
-        # request object values.
-        assert len(call.mock_calls) == 1
-        _, args, _ = call.mock_calls[0]
-        assert args[0].parent == 'parent_value'
+        # The input was sent as four streams of requests.
+        assert call.call_count == 4
+        for _, args, kwargs in call.mock_calls:
+            assert not isinstance(args[0], messaging.CreateBlurbRequest)
 
+            # Each stream has the timeout of the service config.
+            assert kwargs['timeout'] == 5.0
 
-def test_list_blurbs_flattened_error():
-    client = MessagingClient(
-        credentials=credentials.AnonymousCredentials(),
-    )
+        # The wrapped method is shared with `send_blurbs`, and cached.
+        rpc = client._inner_api_calls['send_blurbs']
+        assert client.bulk_create_blurbs('rooms/r', []).names == []
+        assert client._inner_api_calls['send_blurbs'] is rpc
 
-    # Attempting to call a method with both a request object and flattened
-    # fields is an error.
-    with pytest.raises(ValueError):
-        client.list_blurbs(
-            messaging.ListBlurbsRequest(),
-            parent='parent_value',
-        )
+    # The names are mapped back to the input, in order.
+    assert result.names == ['rooms/r/blurbs/{}'.format(i) for i in range(10)]
+    assert result.errors == {}
+    assert result.created == 10
+    assert result.streams == 4
+    assert result.retries == 0
+    assert result.blurbs_per_second > 0
 
 
-def test_list_blurbs_pager():
+def test_bulk_create_blurbs_resumes_failed_chunk():
     client = MessagingClient(
-        credentials=credentials.AnonymousCredentials,
+        credentials=credentials.AnonymousCredentials(),
     )
+    blurbs = [messaging.Blurb(text=str(i)) for i in range(6)]
+    failures = [exceptions.ServiceUnavailable('try again')]
+
+    def fail(request):
+        assert request.parent == 'rooms/r'
+        if request.blurb.text == '4' and failures:
+            raise failures.pop()
 
-    # Mock the actual call within the gRPC stub, and fake the request.
     with mock.patch.object(
-            type(client._transport.list_blurbs),
+            type(client._transport.send_blurbs),
             '__call__') as call:
-        # Set the response to a series of pages.
-        call.side_effect = (
-            messaging.ListBlurbsResponse(
-                blurbs=[
-                    messaging.Blurb(),
-                    messaging.Blurb(),
-                    messaging.Blurb(),
-                ],
-                next_page_token='abc',
-            ),
-            messaging.ListBlurbsResponse(
-                blurbs=[],
-                next_page_token='def',
-            ),
-            messaging.ListBlurbsResponse(
-                blurbs=[
-                    messaging.Blurb(),
-                ],
-                next_page_token='ghi',
-            ),
-            messaging.ListBlurbsResponse(
-                blurbs=[
-                    messaging.Blurb(),
-                    messaging.Blurb(),
-                ],
-            ),
-            RuntimeError,
+        call.side_effect = _fake_send_blurbs(fail)
+        result = client.bulk_create_blurbs('rooms/r', blurbs,
+            chunk_size=3,
+            max_concurrent_streams=1,
+            retry=retries.Retry(initial=0, maximum=0),
         )
-        results = [i for i in client.list_blurbs(
-            request={},
-        )]
-        assert len(results) == 6
-        assert all([isinstance(i, messaging.Blurb)
-                    for i in results])
 
-def test_list_blurbs_pages():
+    # Only the failed chunk was sent again.
+    assert call.call_count == 3
+    assert result.names == ['rooms/r/blurbs/{}'.format(i) for i in range(6)]
+    assert result.errors == {}
+    assert result.streams == 3
+    assert result.retries == 1
+
+
+def test_bulk_create_blurbs_reports_failed_chunk():
     client = MessagingClient(
-        credentials=credentials.AnonymousCredentials,
+        credentials=credentials.AnonymousCredentials(),
     )
+    blurbs = [messaging.Blurb(text=str(i)) for i in range(6)]
+    error = exceptions.ServiceUnavailable('try again')
+
+    def fail(request):
+        if request.blurb.text == '1':
+            raise error
 
-    # Mock the actual call within the gRPC stub, and fake the request.
     with mock.patch.object(
-            type(client._transport.list_blurbs),
+            type(client._transport.send_blurbs),
             '__call__') as call:
-        # Set the response to a series of pages.
-        call.side_effect = (
-            messaging.ListBlurbsResponse(
-                blurbs=[
-                    messaging.Blurb(),
-                    messaging.Blurb(),
-                    messaging.Blurb(),
-                ],
-                next_page_token='abc',
-            ),
-            messaging.ListBlurbsResponse(
-                blurbs=[],
-                next_page_token='def',
-            ),
-            messaging.ListBlurbsResponse(
-                blurbs=[
-                    messaging.Blurb(),
-                ],
-                next_page_token='ghi',
-            ),
-            messaging.ListBlurbsResponse(
-                blurbs=[
-                    messaging.Blurb(),
-                    messaging.Blurb(),
-                ],
-            ),
-            RuntimeError,
-        )
-        pages = list(client.list_blurbs(request={}).pages)
-        for page, token in zip(pages, ['abc','def','ghi', '']):
-            assert page.raw_page.next_page_token == token
+        call.side_effect = _fake_send_blurbs(fail)
+        result = client.bulk_create_blurbs('rooms/r', blurbs,
+            chunk_size=3,
+        )
 
+    # The failed chunk was not sent again, as its first blurb may have
+    # been created; the other chunk still went through.
+    assert result.names == [None] * 3 + [
+        'rooms/r/blurbs/{}'.format(i) for i in range(3, 6)]
+    assert result.errors == {0: error, 1: error, 2: error}
+    assert result.created == 3
+    assert result.streams == 2
+    assert result.retries == 0
 
-def test_search_blurbs(transport: str = 'grpc'):
+
+def test_bulk_create_blurbs_retries_exhausted():
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
-        transport=transport,
     )
+    blurbs = [messaging.Blurb(text=str(i)) for i in range(3)]
+    clock = iter(range(0, 100, 10))
 
-    # Everything is optional in proto3 as far as the runtime is concerned,
-    # and we are mocking out the actual API, so just send an empty request.
-    request = messaging.SearchBlurbsRequest()
+    def fail(request):
+        raise exceptions.ServiceUnavailable('try again')
 
-    # Mock the actual call within the gRPC stub, and fake the request.
     with mock.patch.object(
-            type(client._transport.search_blurbs),
-            '__call__') as call:
-        # Designate an appropriate return value for the call.
-        call.return_value = operations_pb2.Operation(name='operations/spam')
-        response = client.search_blurbs(request)
+            type(client._transport.send_blurbs),
+            '__call__') as call, \
+            mock.patch('google.api_core.datetime_helpers.utcnow',
+                       side_effect=lambda: datetime.datetime(2020, 1, 1, 0, 0, next(clock))):
+        call.side_effect = _fake_send_blurbs(fail)
+        result = client.bulk_create_blurbs('rooms/r', blurbs,
+            chunk_size=3,
+            retry=retries.Retry(initial=0, maximum=0, deadline=15),
+        )
 
-        # Establish that the underlying gRPC stub method was called.
-        assert len(call.mock_calls) == 1
-        _, args, _ = call.mock_calls[0]
-        assert args[0] == request
+    # The chunk was sent twice before the deadline ran out: that is one
+    # retry, although the last stream failed too.
+    assert isinstance(result.errors[0], exceptions.RetryError)
+    assert call.call_count == 2
+    assert (result.streams, result.retries) == (2, 1)
 
-    # Establish that the response is the type that we expect.
-    assert isinstance(response, future.Future)
+
+@pytest.mark.parametrize('options', [
+    {'chunk_size': 0},
+    {'max_concurrent_streams': 0},
+])
+def test_bulk_create_blurbs_options_error(options):
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    with pytest.raises(ValueError):
+        client.bulk_create_blurbs('rooms/r', [], **options)
 
 
-def test_search_blurbs_flattened():
+def test_bulk_create_blurbs_result():
+    result = bulk.BulkCreateBlurbsResult()
+    assert result.created == 0
+    assert result.blurbs_per_second == 0.0
+
+    result.names = ['rooms/r/blurbs/1', None]
+    result.elapsed = 0.5
+    assert result.created == 1
+    assert result.blurbs_per_second == 2.0
+
+
+class _ConnectCall:
+    """A Connect stream that answers every blurb with a CREATE event."""
+    def __init__(self, requests, release=None, error=None):
+        self.config = None
+        self.cancelled = False
+        self._responses = self._respond(requests, release, error)
+
+    def _respond(self, requests, release, error):
+        self.config = next(requests).config
+        if release is not None:
+            release.wait()
+        for request in requests:
+            yield messaging.StreamBlurbsResponse(
+                blurb=request.blurb,
+                action=messaging.StreamBlurbsResponse.Action.CREATE,
+            )
+        if error:
+            raise error
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._responses)
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class _RpcError(grpc.RpcError):
+    def code(self):
+        return grpc.StatusCode.UNAVAILABLE
+
+    def details(self):
+        return 'stream reset'
+
+    def trailing_metadata(self):
+        return None
+
+
+def test_connect_session():
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
     )
 
-    # Mock the actual call within the gRPC stub, and fake the request.
+    # Mock the actual call within the gRPC stub.
     with mock.patch.object(
-            type(client._transport.search_blurbs),
+            type(client._transport.connect),
             '__call__') as call:
-        # Designate an appropriate return value for the call.
-        call.return_value = operations_pb2.Operation(name='operations/op')
+        call.side_effect = lambda requests, **kwargs: _ConnectCall(requests)
+        session = client.connect_session(
+            'rooms/r', timeout=5, metadata=[('a', 'b')])
+
+        # Many producers share the session.
+        threads = [
+            threading.Thread(
+                target=session.send,
+                args=(messaging.Blurb(text=str(i)),),
+                kwargs={'block': True},
+            )
+            for i in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        session.close()
+        responses = list(session)
 
-        # Call the method with a truthy value for each flattened field,
-        # using the keyword arguments to the method.
-        response = client.search_blurbs(
-            query='query_value',
-        )
+        # Establish that the underlying gRPC stub method was called.
+        _, args, kwargs = call.mock_calls[0]
+        assert kwargs['timeout'] == 5
+        assert kwargs['metadata'][0] == ('a', 'b')
 
-        # Establish that the underlying call was made with the expected
-        # request object values.
-        assert len(call.mock_calls) == 1
-        _, args, _ = call.mock_calls[0]
-        assert args[0].query == 'query_value'
+        # The stream carries the client's metadata too.
+        assert any(key == 'x-goog-api-client' for key, _ in kwargs['metadata'])
 
+    assert sorted(int(r.blurb.text) for r in responses) == list(range(20))
+    stats = session.stats()
+    assert stats.sent == stats.received == 20
+    assert stats.rejected == 0
+    assert stats.send_queue_depth == stats.receive_queue_depth == 0
+    assert 1 <= stats.max_send_queue_depth <= 20
+    assert repr(session) == "ConnectSession<parent='rooms/r', sent=20, received=20>"
 
-def test_search_blurbs_flattened_error():
+    # A closed session takes no more blurbs.
+    with pytest.raises(connect.SessionClosedError):
+        session.send(messaging.Blurb(text='late'))
+
+
+def test_connect_session_default_timeout():
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
     )
 
-    # Attempting to call a method with both a request object and flattened
-    # fields is an error.
+    # Mock the actual call within the gRPC stub.
+    with mock.patch.object(
+            type(client._transport.connect),
+            '__call__') as call:
+        call.side_effect = lambda requests, **kwargs: _ConnectCall(requests)
+        session = client.connect_session('rooms/r')
+        session.close()
+        assert list(session) == []
+
+        # The stream has the timeout of the service config.
+        _, args, kwargs = call.mock_calls[0]
+        assert kwargs['timeout'] == 10.0
+
+
+def test_connect_session_sends_config_first():
+    calls = []
+
+    def connect_call(requests):
+        calls.append(_ConnectCall(requests))
+        return calls[-1]
+
+    session = connect.ConnectSession(connect_call, 'users/u')
+    session.close()
+    assert list(session) == []
+    assert calls[0].config.parent == 'users/u'
+    assert not calls[0].cancelled
+
+
+def test_connect_session_requires_queue():
     with pytest.raises(ValueError):
-        client.search_blurbs(
-            messaging.SearchBlurbsRequest(),
-            query='query_value',
-        )
+        connect.ConnectSession(_ConnectCall, 'rooms/r', max_queued=0)
 
 
-def test_search_blurbs_raw_page_lro():
-    response = messaging.SearchBlurbsResponse()
-    assert response.raw_page is response
+def test_connect_session_backpressure():
+    release = threading.Event()
+    session = connect.ConnectSession(
+        lambda requests: _ConnectCall(requests, release=release),
+        'rooms/r',
+        max_queued=1,
+    )
+
+    # The stream reads nothing yet, so the queue is full with one blurb.
+    assert session.send(messaging.Blurb(text='1'))
+    assert not session.send(messaging.Blurb(text='2'))
+    assert not session.send(
+        messaging.Blurb(text='2'), block=True, timeout=0.01)
+    stats = session.stats()
+    assert stats.rejected == 2
+    assert stats.send_queue_depth == 1
+
+    release.set()
+    assert session.send(messaging.Blurb(text='2'), block=True)
+    assert session.send(messaging.Blurb(text='3'), block=True)
+    session.close()
+    assert [r.blurb.text for r in session] == ['1', '2', '3']
+    assert session.stats().max_receive_queue_depth == 1
+
+
+def test_connect_session_on_response():
+    received = []
+    session = connect.ConnectSession(
+        _ConnectCall,
+        'rooms/r',
+        on_response=received.append,
+    )
+    session.send(messaging.Blurb(text='x'), block=True)
+    session.close()
+    session.join()
+    assert [r.blurb.text for r in received] == ['x']
+    assert session.stats().receive_queue_depth == 0
 
 
-def test_stream_blurbs(transport: str = 'grpc'):
+def test_connect_session_on_response_error():
+    calls = []
+
+    def connect_call(requests):
+        calls.append(_ConnectCall(requests))
+        return calls[-1]
+
+    def on_response(response):
+        raise RuntimeError('bad handler')
+
+    session = connect.ConnectSession(
+        connect_call,
+        'rooms/r',
+        on_response=on_response,
+    )
+    session.send(messaging.Blurb(text='x'), block=True)
+    session.join()
+
+    # The stream is cancelled, and the error ends the session.
+    assert calls[0].cancelled
+    with pytest.raises(connect.SessionClosedError) as exc_info:
+        session.send(messaging.Blurb(text='y'))
+    assert isinstance(exc_info.value.__cause__, RuntimeError)
+    with pytest.raises(RuntimeError):
+        next(session)
+
+
+def test_connect_session_stream_error():
+    session = connect.ConnectSession(
+        lambda requests: _ConnectCall(requests, error=_RpcError()),
+        'rooms/r',
+    )
+    session.send(messaging.Blurb(text='x'))
+    session.close()
+    assert next(session).blurb.text == 'x'
+    with pytest.raises(exceptions.ServiceUnavailable):
+        next(session)
+
+
+def test_connect_session_cancel():
+    calls = []
+
+    def connect_call(requests):
+        calls.append(_ConnectCall(requests, error=_RpcError()))
+        return calls[-1]
+
+    session = connect.ConnectSession(connect_call, 'rooms/r', max_queued=1)
+    for text in '12':
+        session.send(messaging.Blurb(text=text), block=True)
+    while session.stats().received < 2:
+        time.sleep(0.001)
+
+    # One response waits to be consumed, and the reader waits for room.
+    assert session.stats().receive_queue_depth == 1
+    session.cancel()
+    session.join()
+    assert calls[0].cancelled
+    # The buffered response is still delivered; the stream's error, which
+    # the cancellation caused, is not raised.
+    assert [r.blurb.text for r in session] == ['1']
+
+
+def test_connect_session_cancelled_stream_error():
+    class Call:
+        def __init__(self, requests):
+            self.cancelled = threading.Event()
+
+        def __iter__(self):
+            return self
+
+        def __next__(self):
+            self.cancelled.wait()
+            raise _RpcError()
+
+        def cancel(self):
+            self.cancelled.set()
+
+    session = connect.ConnectSession(Call, 'rooms/r')
+    session.cancel()
+    assert list(session) == []
+
+
+def test_connect_session_stats():
+    stats = connect.ConnectSessionStats()
+    assert stats.sent_per_second == stats.received_per_second == 0.0
+
+    stats.sent, stats.received, stats.elapsed = 4, 2, 0.5
+    assert stats.sent_per_second == 8.0
+    assert stats.received_per_second == 4.0
+    assert repr(stats) == 'ConnectSessionStats<sent=4, received=2, rejected=0, elapsed=0.500s>'
+
+
+
+def test_connect(transport: str = 'grpc'):
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
         transport=transport,
@@ -1023,15 +3102,15 @@ def test_stream_blurbs(transport: str = 'grpc'):
 
     # Everything is optional in proto3 as far as the runtime is concerned,
     # and we are mocking out the actual API, so just send an empty request.
-    request = messaging.StreamBlurbsRequest()
+    request = messaging.ConnectRequest()
 
     # Mock the actual call within the gRPC stub, and fake the request.
     with mock.patch.object(
-            type(client._transport.stream_blurbs),
+            type(client._transport.connect),
             '__call__') as call:
         # Designate an appropriate return value for the call.
         call.return_value = iter([messaging.StreamBlurbsResponse()])
-        response = client.stream_blurbs(request)
+        response = client.connect(request)
 
         # Establish that the underlying gRPC stub method was called.
         assert len(call.mock_calls) == 1
@@ -1043,62 +3122,397 @@ def test_stream_blurbs(transport: str = 'grpc'):
         assert isinstance(message, messaging.StreamBlurbsResponse)
 
 
-def test_send_blurbs(transport: str = 'grpc'):
-    client = MessagingClient(
+@pytest.mark.asyncio
+async def test_connect_async():
+    client = MessagingAsyncClient(
         credentials=credentials.AnonymousCredentials(),
-        transport=transport,
     )
 
     # Everything is optional in proto3 as far as the runtime is concerned,
     # and we are mocking out the actual API, so just send an empty request.
-    request = messaging.CreateBlurbRequest()
+    requests = iter([messaging.ConnectRequest()])
 
     # Mock the actual call within the gRPC stub, and fake the request.
     with mock.patch.object(
-            type(client._transport.send_blurbs),
+            type(client._client._transport.connect),
             '__call__') as call:
         # Designate an appropriate return value for the call.
-        call.return_value = messaging.SendBlurbsResponse(
-            names=['names_value'],
+        call.return_value = _fake_stream_call(
+            aio.StreamStreamCall,
+            [messaging.StreamBlurbsResponse()],
         )
-        response = client.send_blurbs(request)
+        response = await client.connect(requests)
 
         # Establish that the underlying gRPC stub method was called.
-        assert len(call.mock_calls) == 1
+        assert call.call_count == 1
         _, args, _ = call.mock_calls[0]
-        assert args[0] == request
+        assert args[0] is requests
 
     # Establish that the response is the type that we expect.
-    assert isinstance(response, messaging.SendBlurbsResponse)
-    assert response.names == ['names_value']
+    async for message in response:
+        assert isinstance(message, messaging.StreamBlurbsResponse)
 
 
-def test_connect(transport: str = 'grpc'):
+def test_connect_is_not_retried():
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
-        transport=transport,
     )
 
-    # Everything is optional in proto3 as far as the runtime is concerned,
-    # and we are mocking out the actual API, so just send an empty request.
-    request = messaging.ConnectRequest()
+    # Mock the actual call within the gRPC stub; the backend is down.
+    # The requests already taken from the stream cannot be sent again,
+    # so the call fails at once although the config retries Connect.
+    with mock.patch.object(
+            type(client._transport.connect),
+            '__call__') as call:
+        call.side_effect = exceptions.ServiceUnavailable('down')
+        with pytest.raises(exceptions.ServiceUnavailable):
+            client.connect(messaging.ConnectRequest())
+        assert call.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_connect_is_not_retried_async():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Mock the actual call within the gRPC stub; the backend is down.
+    with mock.patch.object(
+            type(client._client._transport.connect),
+            '__call__') as call:
+        call.side_effect = exceptions.ServiceUnavailable('down')
+        with pytest.raises(exceptions.ServiceUnavailable):
+            await client.connect(iter([messaging.ConnectRequest()]))
+        assert call.call_count == 1
+
+
+def _image_blurb(name, image=b''):
+    return messaging.Blurb(name=name, user='users/u', text='hi', image=image,
+                           create_time=timestamp.Timestamp(seconds=100))
+
+
+@pytest.mark.parametrize('raw', [False, True])
+def test_lazy_images_parse_blurbs_page(raw):
+    data = messaging.ListBlurbsResponse.serialize(messaging.ListBlurbsResponse(
+        blurbs=[_image_blurb('rooms/r/blurbs/a', b'picture'), _image_blurb('rooms/r/blurbs/b')],
+        next_page_token='next',
+    ))
+    page = lazy_images.parse_blurbs_page(data, raw=raw)
+
+    assert page.next_page_token == 'next'
+    assert repr(page) == "LazyBlurbsPage<blurbs=2, next_page_token='next'>"
+    first, second = page.blurbs
+    assert (first.name, first.user, first.text) == ('rooms/r/blurbs/a', 'users/u', 'hi')
+    # The image is left out of the decoded blurb, and read from the buffer.
+    assert first.blurb.image == b''
+    assert first.image_size == 7
+    assert first.image_view().obj is data
+    assert first.image == b'picture'
+    assert repr(first) == "LazyBlurb<name='rooms/r/blurbs/a', image_size=7>"
+    assert (second.image, second.image_size, bytes(second.image_view())) == (b'', 0, b'')
+
+    blurb = first.to_blurb()
+    assert isinstance(blurb, messaging.Blurb.pb() if raw else messaging.Blurb)
+    assert blurb.image == b'picture'
+    assert first.blurb.image == b''
+
+
+@pytest.mark.parametrize('raw', [False, True])
+def test_lazy_images_parse_stream_blurbs_response(raw):
+    data = messaging.StreamBlurbsResponse.serialize(messaging.StreamBlurbsResponse(
+        blurb=_image_blurb('rooms/r/blurbs/a', b'picture'),
+        action=messaging.StreamBlurbsResponse.Action.UPDATE,
+    ))
+    response = lazy_images.parse_stream_blurbs_response(data, raw=raw)
+    assert response.action == messaging.StreamBlurbsResponse.Action.UPDATE
+    assert response.blurb.name == 'rooms/r/blurbs/a'
+    assert response.blurb.image == b'picture'
+    assert repr(response).startswith('LazyStreamBlurbsResponse<')
+
+    empty = lazy_images.parse_stream_blurbs_response(b'')
+    assert (empty.blurb.name, empty.blurb.image) == ('', b'')
+
+
+def test_lazy_images_merge_stream_blurb_parts():
+    # A blurb sent twice is merged, as protobuf decodes it.
+    data = b''.join(
+        messaging.StreamBlurbsResponse.serialize(messaging.StreamBlurbsResponse(blurb=blurb))
+        for blurb in (
+            _image_blurb('rooms/r/blurbs/a', b'first'),
+            messaging.Blurb(text='edited', image=b'second'),
+            messaging.Blurb(text='again'),
+        )
+    )
+    expected = messaging.StreamBlurbsResponse.deserialize(data).blurb
+    blurb = lazy_images.parse_stream_blurbs_response(data).blurb
+    assert blurb.to_blurb() == expected
+    assert (blurb.name, blurb.text, blurb.image) == ('rooms/r/blurbs/a', 'again', b'second')
+
+
+def test_lazy_images_keep_unknown_fields():
+    blurb = messaging.Blurb.serialize(_image_blurb('rooms/r/blurbs/a', b'picture'))
+    # Unknown fixed64 (15) and fixed32 (14) fields.
+    blurb += b'\x79' + b'\x00' * 8 + b'\x75' + b'\x00' * 4
+    data = b'\x0a' + bytes([len(blurb)]) + blurb
+    blurb, = lazy_images.parse_blurbs_page(data).blurbs
+    assert (blurb.name, blurb.image) == ('rooms/r/blurbs/a', b'picture')
+
+
+@pytest.mark.parametrize('data', [
+    b'\x4b',  # A group.
+    b'\x0a\x05ab',  # Shorter than its length.
+    b'\x10',  # A varint cut short.
+    b'\x0a\x02\x22\x80',  # An image length cut short.
+])
+def test_lazy_images_decode_error(data):
+    with pytest.raises(message.DecodeError):
+        lazy_images.parse_blurbs_page(data)
+
+
+def test_messaging_grpc_transport_lazy_blurb_images():
+    channel = mock.Mock(spec=grpc.Channel)
+    transport = transports.MessagingGrpcTransport(
+        channel=channel,
+        lazy_blurb_images=True,
+    )
+    transport.list_blurbs
+    deserialize = channel.unary_unary.call_args[1]['response_deserializer']
+    page = deserialize(messaging.ListBlurbsResponse.serialize(
+        messaging.ListBlurbsResponse(blurbs=[_image_blurb('rooms/r/blurbs/a', b'picture')])))
+    assert isinstance(page, lazy_images.LazyBlurbsPage)
+    assert isinstance(page.blurbs[0].blurb, messaging.Blurb)
+
+    # Only the responses with blurbs are decoded lazily.
+    transport.get_blurb
+    deserialize = channel.unary_unary.call_args[1]['response_deserializer']
+    assert deserialize(messaging.Blurb.serialize(_image_blurb('rooms/r/blurbs/a', b'picture'))).image == b'picture'
+
+
+def test_resumable_stream_blurbs_lazy_images():
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    def lazy_event(*args):
+        return lazy_images.parse_stream_blurbs_response(
+            messaging.StreamBlurbsResponse.serialize(_event('CREATE', *args)))
+
+    streams = [
+        _StreamCall([lazy_event('a', 101)],
+                    exceptions.ServiceUnavailable('connection dropped')),
+        _StreamCall([lazy_event('c', 103)]),
+    ]
+    listed = lazy_images.parse_blurbs_page(messaging.ListBlurbsResponse.serialize(
+        messaging.ListBlurbsResponse(blurbs=[_blurb('a', 101), _blurb('b', 102)])))
+    with mock.patch.object(
+            type(client._transport.stream_blurbs),
+            '__call__') as stream_call, mock.patch.object(
+            type(client._transport.list_blurbs),
+            '__call__') as list_call:
+        stream_call.side_effect = streams
+        list_call.return_value = listed
+        stream = client.resumable_stream_blurbs(
+            {'name': 'rooms/r'},
+            retry=retries.Retry(initial=0, maximum=0),
+        )
+        responses = list(stream)
+
+    assert [r.blurb.name[len('rooms/r/blurbs/'):] for r in responses] == ['a', 'b', 'c']
+    assert all(isinstance(r, lazy_images.LazyStreamBlurbsResponse) for r in responses)
+
+
+def test_fan_out():
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Mock the actual call within the gRPC stub.
+    with mock.patch.object(
+            type(client._transport.list_blurbs),
+            '__call__') as call:
+        def list_blurbs(request, **kwargs):
+            # Two pages per room.
+            if not request.page_token:
+                return messaging.ListBlurbsResponse(
+                    blurbs=[messaging.Blurb(name=request.parent + '/blurbs/1')],
+                    next_page_token='next',
+                )
+            return messaging.ListBlurbsResponse(
+                blurbs=[messaging.Blurb(name=request.parent + '/blurbs/2')],
+            )
+        call.side_effect = list_blurbs
+
+        rooms = ['rooms/{}'.format(i) for i in range(5)]
+        outcomes = list(client.fan_out(
+            'list_blurbs', [{'parent': room} for room in rooms]))
+
+    assert call.call_count == 10
+    assert sorted(o.request['parent'] for o in outcomes) == rooms
+
+    # Each call has the timeout of the service config.
+    assert {kwargs['timeout'] for _, _, kwargs in call.mock_calls} == {10.0}
+    for outcome in outcomes:
+        assert [b.name for b in outcome.response] == [
+            outcome.request['parent'] + '/blurbs/1',
+            outcome.request['parent'] + '/blurbs/2',
+        ]
+
+
+
+@pytest.mark.parametrize('take_request_ownership', [False, True])
+def test_list_blurbs_pager_request_ownership(take_request_ownership):
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+        take_request_ownership=take_request_ownership,
+    )
+    request = messaging.ListBlurbsRequest()
 
     # Mock the actual call within the gRPC stub, and fake the request.
     with mock.patch.object(
-            type(client._transport.connect),
+            type(client._transport.list_blurbs),
             '__call__') as call:
-        # Designate an appropriate return value for the call.
-        call.return_value = iter([messaging.StreamBlurbsResponse()])
-        response = client.connect(request)
+        call.side_effect = (
+            messaging.ListBlurbsResponse(next_page_token='abc'),
+            messaging.ListBlurbsResponse(),
+        )
+        pager = client.list_blurbs(request)
+        pages = list(pager.pages)
+
+    # The pager only advances the caller's own request once the caller has
+    # handed it over; otherwise it works on a copy.
+    assert len(pages) == 2
+    assert (pager._request is request) == take_request_ownership
+    assert request.page_token == ('abc' if take_request_ownership else '')
+
+
+_METHODS = (
+    ('create_room', messaging.CreateRoomRequest),
+    ('get_room', messaging.GetRoomRequest),
+    ('update_room', messaging.UpdateRoomRequest),
+    ('delete_room', messaging.DeleteRoomRequest),
+    ('list_rooms', messaging.ListRoomsRequest),
+    ('create_blurb', messaging.CreateBlurbRequest),
+    ('get_blurb', messaging.GetBlurbRequest),
+    ('update_blurb', messaging.UpdateBlurbRequest),
+    ('delete_blurb', messaging.DeleteBlurbRequest),
+    ('list_blurbs', messaging.ListBlurbsRequest),
+    ('search_blurbs', messaging.SearchBlurbsRequest),
+    ('stream_blurbs', messaging.StreamBlurbsRequest),
+    ('send_blurbs', messaging.CreateBlurbRequest),
+    ('connect', messaging.ConnectRequest),
+)
+
+_REQUEST_STREAMING_METHODS = ('send_blurbs', 'connect')
+
+
+def test_messaging_wrapped_methods_are_cached():
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
 
-        # Establish that the underlying gRPC stub method was called.
-        assert len(call.mock_calls) == 1
-        _, args, _ = call.mock_calls[0]
-        assert args[0] == request
+    # The operations client and the operation future do their own wrapping;
+    # build the former up front and stub out the latter.
+    client._transport.operations_client
+
+    # Mock out the wrapping itself, so that we can count how often it happens.
+    with mock.patch.object(gapic_v1.method, 'wrap_method') as wrap, \
+            mock.patch.object(operation, 'from_gapic'):
+        wrap.return_value.return_value = operations_pb2.Operation(
+            name='operations/spam',
+        )
+
+        # Call every method twice; only the first call should wrap.
+        for _ in range(2):
+            for name, request_type in _METHODS:
+                getattr(client, name)(request_type())
+
+        assert wrap.call_count == len(_METHODS)
+        assert sorted(client._inner_api_calls) == sorted(
+            name for name, _ in _METHODS)
+
+
+def test_messaging_requests_are_not_copied():
+    client = MessagingClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # The operation future is not under test; stub it out.
+    with mock.patch.object(gapic_v1.method, 'wrap_method') as wrap, \
+            mock.patch.object(operation, 'from_gapic'):
+        rpc = wrap.return_value
+        rpc.return_value = operations_pb2.Operation(name='operations/spam')
+
+        for name, request_type in _METHODS:
+            # A request of exactly the right type is sent as-is...
+            request = request_type()
+            getattr(client, name)(request)
+            _, args, _ = rpc.mock_calls[-1]
+            assert args[0] is request
+
+            # ...while anything else is coerced into a new request.
+            getattr(client, name)({})
+            _, args, _ = rpc.mock_calls[-1]
+            assert isinstance(args[0], request_type)
+
+
+@pytest.mark.asyncio
+async def test_messaging_async_wrapped_methods_are_cached():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # The operations client does its own wrapping; build it up front,
+    # and stub out the operation future.
+    client._client._transport.operations_client
+
+    # Mock out the wrapping itself, so that we can count how often it happens.
+    with mock.patch.object(gapic_v1.method_async, 'wrap_method') as wrap, \
+            mock.patch.object(operation_async, 'from_gapic'):
+        wrap.return_value = mock.AsyncMock(
+            return_value=grpc_helpers_async.FakeUnaryUnaryCall(
+                operations_pb2.Operation(name='operations/spam'),
+            ),
+        )
+
+        # Call every method twice; only the first call should wrap.
+        for _ in range(2):
+            for name, request_type in _METHODS:
+                await getattr(client, name)(request_type())
+
+        assert wrap.call_count == len(_METHODS)
+        assert sorted(client._inner_api_calls) == sorted(
+            name for name, _ in _METHODS)
 
-    # Establish that the response is the type that we expect.
-    for message in response:
-        assert isinstance(message, messaging.StreamBlurbsResponse)
+
+@pytest.mark.asyncio
+async def test_messaging_async_requests_are_not_copied():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # The operation future is not under test; stub it out.
+    with mock.patch.object(gapic_v1.method_async, 'wrap_method') as wrap, \
+            mock.patch.object(operation_async, 'from_gapic'):
+        rpc = wrap.return_value = mock.AsyncMock(
+            return_value=grpc_helpers_async.FakeUnaryUnaryCall(
+                operations_pb2.Operation(name='operations/spam'),
+            ),
+        )
+
+        for name, request_type in _METHODS:
+            # A request of exactly the right type is sent as-is...
+            request = request_type()
+            await getattr(client, name)(request)
+            _, args, _ = rpc.mock_calls[-1]
+            assert args[0] is request
+
+            # ...while anything else is coerced into a new request. Streams
+            # of requests are passed through untouched.
+            if name in _REQUEST_STREAMING_METHODS:
+                continue
+            await getattr(client, name)({})
+            _, args, _ = rpc.mock_calls[-1]
+            assert isinstance(args[0], request_type)
 
 
 def test_credentials_transport_error():
@@ -1133,6 +3547,17 @@ def test_transport_grpc_default():
     )
 
 
+def test_transport_grpc_asyncio_default():
+    # An async client should use the gRPC AsyncIO transport by default.
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    assert isinstance(
+        client._client._transport,
+        transports.MessagingGrpcAsyncIOTransport,
+    )
+
+
 def test_messaging_base_transport():
     # Instantiate the base transport.
     transport = transports.MessagingTransport(
@@ -1168,12 +3593,16 @@ def test_messaging_base_transport():
 
 
 def test_messaging_auth_adc():
-    # If no credentials are provided, we should use ADC credentials.
+    # If no credentials are provided, we should use ADC credentials,
+    # resolved once for every client.
+    credentials_cache.clear()
     with mock.patch.object(auth, 'default') as adc:
         adc.return_value = (credentials.AnonymousCredentials(), None)
         client = MessagingClient()
+        assert MessagingClient()._transport._credentials is client._transport._credentials
         adc.assert_called_once_with(scopes=(
         ))
+    credentials_cache.clear()
 
 
 def test_messaging_host_no_port():
@@ -1202,6 +3631,84 @@ def test_messaging_grpc_transport_channel():
     assert transport.grpc_channel is channel
 
 
+def test_messaging_grpc_transport_raw_messages():
+    channel = mock.Mock(spec=grpc.Channel)
+    transport = transports.MessagingGrpcTransport(
+        channel=channel,
+        raw_messages=True,
+    )
+    transport.stream_blurbs
+    kwargs = channel.unary_stream.call_args[1]
+    response = kwargs['response_deserializer'](
+        messaging.StreamBlurbsResponse.serialize(_event('CREATE', 'a', 101)))
+    assert isinstance(response, messaging.StreamBlurbsResponse.pb())
+    assert response.blurb.name == 'rooms/r/blurbs/a'
+
+
+def test_messaging_grpc_transport_connect_timeout():
+    channel = mock.Mock(spec=grpc.Channel)
+    with mock.patch.object(channel_pool, 'wait_for_ready') as wait_for_ready:
+        transport = transports.MessagingGrpcTransport(
+            channel=channel,
+            connect_timeout=5.0,
+        )
+        wait_for_ready.assert_called_once_with(channel, 5.0)
+
+    # Every stub was created up front, and the warm-up was timed.
+    assert sorted(transport._stubs) == sorted(transport._METHODS)
+    assert transport.warm_up_time >= 0
+    assert transports.MessagingGrpcTransport(channel=channel).warm_up_time is None
+
+
+def test_messaging_grpc_transport_service_config():
+    creds = credentials.AnonymousCredentials()
+    with mock.patch.object(channel_pool, 'shared_pool') as shared_pool:
+        transport = transports.MessagingGrpcTransport(
+            credentials=creds,
+            channel_pool_size=2,
+            grpc_service_config=True,
+        )
+        assert transport.grpc_channel is shared_pool.return_value
+        shared_pool.assert_called_once_with(
+            'localhost:7469',
+            size=2,
+            credentials=creds,
+            scopes=(),
+            options=[('grpc.service_config', service_config.SERVICE_CONFIG_JSON)],
+        )
+
+
+@pytest.mark.asyncio
+async def test_messaging_grpc_asyncio_transport_channel():
+    channel = aio.insecure_channel('http://localhost/')
+    transport = transports.MessagingGrpcAsyncIOTransport(
+        channel=channel,
+    )
+    assert transport.grpc_channel is channel
+
+
+@pytest.mark.parametrize('grpc_service_config,options', [
+    (False, []),
+    (True, [('grpc.service_config', service_config.SERVICE_CONFIG_JSON)]),
+])
+def test_messaging_grpc_asyncio_transport_create_channel(grpc_service_config, options):
+    creds = credentials.AnonymousCredentials()
+    with mock.patch.object(grpc_helpers_async, 'create_channel') as create_channel:
+        transport = transports.MessagingGrpcAsyncIOTransport(
+            host='squid.clam.whelk',
+            credentials=creds,
+            grpc_service_config=grpc_service_config,
+        )
+        assert transport.grpc_channel is create_channel.return_value
+        assert transport.grpc_channel is create_channel.return_value
+        create_channel.assert_called_once_with(
+            'squid.clam.whelk:443',
+            credentials=creds,
+            scopes=transport.AUTH_SCOPES,
+            options=options,
+        )
+
+
 def test_messaging_grpc_lro_client():
     client = MessagingClient(
         credentials=credentials.AnonymousCredentials(),
@@ -1232,3 +3739,21 @@ def test_blurb_path():
   expected = "rooms/{room_id}/blurbs/{blurb_id}".format(room_id=room_id, blurb_id=blurb_id, )
   actual = MessagingClient.blurb_path(room_id, blurb_id)
   assert expected == actual
+
+
+@pytest.mark.asyncio
+async def test_messaging_grpc_asyncio_lro_client():
+    client = MessagingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+        transport='grpc_asyncio',
+    )
+    transport = client._client._transport
+
+    # Ensure that we have a api-core operations client.
+    assert isinstance(
+        transport.operations_client,
+        operations_v1.OperationsAsyncClient,
+    )
+
+    # Ensure that subsequent calls to the property send the exact same object.
+    assert transport.operations_client is transport.operations_client
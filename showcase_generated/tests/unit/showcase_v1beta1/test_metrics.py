@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import collections
+
+import grpc
+
+import pytest
+
+from google.showcase_v1beta1 import metrics
+from google.showcase_v1beta1.types import echo as gs_echo
+
+
+_Details = collections.namedtuple('_Details', ('method', 'timeout', 'metadata', 'credentials'))
+
+
+class _Clock:
+    def __init__(self, *times):
+        self._times = iter(times)
+
+    def __call__(self):
+        return next(self._times)
+
+
+class _Error(grpc.RpcError, grpc.Call):
+    def __init__(self, code):
+        self._code = code
+
+    def code(self):
+        return self._code
+
+
+class _Outcome:
+    """A finished unary call, as grpc's interceptor chain returns it."""
+    def __init__(self, response=None, error=None):
+        self._response = response
+        self._error = error
+
+    def add_done_callback(self, fn):
+        fn(self)
+
+    def cancelled(self):
+        return False
+
+    def exception(self):
+        return self._error
+
+    def code(self):
+        return grpc.StatusCode.INTERNAL if self._error else grpc.StatusCode.OK
+
+    def result(self):
+        return self._response
+
+
+class _Stream:
+    """A streaming call whose end the test decides."""
+    def __init__(self, responses, code=grpc.StatusCode.OK, cancelled=False):
+        self._responses = iter(responses)
+        self._code = code
+        self._cancelled = cancelled
+        self._callbacks = []
+
+    def __next__(self):
+        return next(self._responses)
+
+    def add_done_callback(self, fn):
+        self._callbacks.append(fn)
+
+    def finish(self):
+        for fn in self._callbacks:
+            fn(self)
+
+    def cancelled(self):
+        return self._cancelled
+
+    def exception(self):
+        if self._cancelled:
+            raise AssertionError('A cancelled call has no exception.')
+        return None if self._code == grpc.StatusCode.OK else self
+
+    def code(self):
+        return self._code
+
+    def trailing_metadata(self):
+        return (('key', 'value'),)
+
+
+def _details(method):
+    return _Details('/google.showcase.v1beta1.Echo/' + method, None, None, None)
+
+
+def test_bucket_bounds():
+    for value in list(range(2000)) + [10 ** 6, 3600 * 10 ** 6]:
+        low, high = metrics._bucket_bounds(metrics._bucket(value))
+        assert low <= value < high
+        assert high - low <= max(1, low / 16)
+
+
+def test_latency_histogram():
+    histogram = metrics.LatencyHistogram()
+    assert histogram.percentile(0.5) == 0.0
+
+    for micros in [100] * 90 + [1000] * 9 + [50000]:
+        histogram.record(micros)
+    assert histogram.count == 100
+    assert histogram.sum == pytest.approx(0.068)
+    assert (histogram.min, histogram.max) == (0.0001, 0.05)
+    assert histogram.percentile(0.5) == pytest.approx(0.0001, rel=1 / 16)
+    assert histogram.percentile(0.99) == pytest.approx(0.001, rel=1 / 16)
+    assert histogram.percentile(1.0) == 0.05
+    assert histogram.cumulative_counts([0.00005, 0.0005, 0.01, 1]) == [0, 90, 99, 100]
+
+    copy = histogram.copy()
+    histogram.record(1)
+    assert (copy.count, copy.min) == (100, 0.0001)
+    assert 'count=100' in repr(copy)
+
+
+def test_unary_unary():
+    interceptor = metrics.MetricsInterceptor(clock=_Clock(1.0, 1.25, 2.0, 2.5))
+    request = gs_echo.EchoRequest(content='hi')
+    response = gs_echo.EchoResponse(content='hello')
+
+    call = interceptor.intercept_unary_unary(
+        lambda details, req: _Outcome(response), _details('Echo'), request)
+    assert call.result() == response
+    interceptor.intercept_unary_unary(
+        lambda details, req: _Outcome(error=_Error(grpc.StatusCode.UNAVAILABLE)),
+        _details('Echo'),
+        gs_echo.EchoRequest.pb(request),
+    )
+
+    echo = interceptor.snapshot()['/google.showcase.v1beta1.Echo/Echo']
+    assert echo.calls == 2
+    assert echo.status_codes == {
+        grpc.StatusCode.OK: 1,
+        grpc.StatusCode.UNAVAILABLE: 1,
+    }
+    assert (echo.requests, echo.request_bytes) == (2, 8)
+    # Only the response that arrived is counted.
+    assert (echo.responses, echo.response_bytes) == (1, 7)
+    assert (echo.latency.min, echo.latency.max) == (0.25, 0.5)
+
+
+def test_unary_unary_failed_in_chain():
+    interceptor = metrics.MetricsInterceptor()
+    interceptor.intercept_unary_unary(
+        lambda details, req: _Outcome(error=ValueError()),
+        _details('Echo'),
+        gs_echo.EchoRequest(),
+    )
+    assert interceptor.snapshot()['/google.showcase.v1beta1.Echo/Echo'].status_codes == {
+        grpc.StatusCode.INTERNAL: 1,
+    }
+
+
+def test_unary_stream():
+    interceptor = metrics.MetricsInterceptor(clock=_Clock(0.0, 3.0))
+    stream = _Stream([gs_echo.EchoResponse(content='a'), gs_echo.EchoResponse(content='bc')])
+
+    call = interceptor.intercept_unary_stream(
+        lambda details, req: stream,
+        _details('Expand'),
+        gs_echo.ExpandRequest(content='a bc'),
+    )
+    assert [r.content for r in call] == ['a', 'bc']
+    # The wrapper stands in for the call.
+    assert call.trailing_metadata() == (('key', 'value'),)
+
+    expand = interceptor.snapshot()['/google.showcase.v1beta1.Echo/Expand']
+    assert (expand.responses, expand.response_bytes) == (2, 7)
+    assert expand.calls == 0
+
+    stream.finish()
+    expand = interceptor.snapshot()['/google.showcase.v1beta1.Echo/Expand']
+    assert expand.calls == 1
+    assert expand.latency.max == 3.0
+    assert (expand.requests, expand.request_bytes) == (1, 6)
+
+
+def test_stream_unary():
+    interceptor = metrics.MetricsInterceptor()
+    sent = []
+
+    def continuation(details, requests):
+        sent.extend(requests)
+        return _Outcome(gs_echo.EchoResponse(content='a b'))
+
+    interceptor.intercept_stream_unary(
+        continuation,
+        _details('Collect'),
+        iter([gs_echo.EchoRequest(content='a'), gs_echo.EchoRequest(content='b')]),
+    )
+    assert [r.content for r in sent] == ['a', 'b']
+
+    collect = interceptor.snapshot()['/google.showcase.v1beta1.Echo/Collect']
+    assert (collect.requests, collect.request_bytes) == (2, 6)
+    assert (collect.responses, collect.response_bytes) == (1, 5)
+    assert collect.status_codes == {grpc.StatusCode.OK: 1}
+
+
+@pytest.mark.parametrize('code,cancelled', [
+    (grpc.StatusCode.ABORTED, False),
+    (grpc.StatusCode.CANCELLED, True),
+])
+def test_stream_stream(code, cancelled):
+    interceptor = metrics.MetricsInterceptor()
+    stream = _Stream([gs_echo.EchoResponse(content='a')], code, cancelled)
+
+    def continuation(details, requests):
+        assert next(requests).content == 'a'
+        return stream
+
+    call = interceptor.intercept_stream_stream(
+        continuation,
+        _details('Chat'),
+        iter([gs_echo.EchoRequest(content='a')]),
+    )
+    assert next(call).content == 'a'
+    stream.finish()
+
+    chat = interceptor.snapshot()['/google.showcase.v1beta1.Echo/Chat']
+    assert (chat.requests, chat.responses) == (1, 1)
+    assert chat.status_codes == {code: 1}
+
+
+def test_snapshot_and_reset():
+    interceptor = metrics.MetricsInterceptor()
+    interceptor.intercept_unary_unary(
+        lambda details, req: _Outcome(gs_echo.EchoResponse()),
+        _details('Echo'),
+        gs_echo.EchoRequest(),
+    )
+    snapshot = interceptor.snapshot()
+    assert 'calls=1' in repr(snapshot['/google.showcase.v1beta1.Echo/Echo'])
+    assert repr(interceptor) == 'MetricsInterceptor<methods=1>'
+
+    # A snapshot does not change as more is recorded.
+    interceptor.intercept_unary_unary(
+        lambda details, req: _Outcome(gs_echo.EchoResponse()),
+        _details('Echo'),
+        gs_echo.EchoRequest(),
+    )
+    assert snapshot['/google.showcase.v1beta1.Echo/Echo'].calls == 1
+
+    interceptor.reset()
+    assert interceptor.snapshot() == {}
+
+
+def test_prometheus_text():
+    echo = metrics.MethodMetrics()
+    for micros in (400, 2000, 3000):
+        echo.latency.record(micros)
+    echo.status_codes = {
+        grpc.StatusCode.UNAVAILABLE: 1,
+        grpc.StatusCode.OK: 2,
+    }
+    echo.requests, echo.request_bytes = 3, 12
+    echo.responses, echo.response_bytes = 2, 14
+
+    text = metrics.prometheus_text(
+        {'/google.showcase.v1beta1.Echo/Echo': echo},
+        prefix='test',
+        buckets=(0.001, 0.0025),
+    )
+    assert text == '\n'.join([
+        '# HELP test_rpc_duration_seconds The latency of finished RPCs.',
+        '# TYPE test_rpc_duration_seconds histogram',
+        'test_rpc_duration_seconds_bucket{method="/google.showcase.v1beta1.Echo/Echo",le="0.001"} 1',
+        'test_rpc_duration_seconds_bucket{method="/google.showcase.v1beta1.Echo/Echo",le="0.0025"} 2',
+        'test_rpc_duration_seconds_bucket{method="/google.showcase.v1beta1.Echo/Echo",le="+Inf"} 3',
+        'test_rpc_duration_seconds_sum{method="/google.showcase.v1beta1.Echo/Echo"} 0.0054',
+        'test_rpc_duration_seconds_count{method="/google.showcase.v1beta1.Echo/Echo"} 3',
+        '# HELP test_rpcs_total Finished RPCs, by status code.',
+        '# TYPE test_rpcs_total counter',
+        'test_rpcs_total{method="/google.showcase.v1beta1.Echo/Echo",code="OK"} 2',
+        'test_rpcs_total{method="/google.showcase.v1beta1.Echo/Echo",code="UNAVAILABLE"} 1',
+        '# HELP test_request_messages_total Request messages sent.',
+        '# TYPE test_request_messages_total counter',
+        'test_request_messages_total{method="/google.showcase.v1beta1.Echo/Echo"} 3',
+        '# HELP test_response_messages_total Response messages received.',
+        '# TYPE test_response_messages_total counter',
+        'test_response_messages_total{method="/google.showcase.v1beta1.Echo/Echo"} 2',
+        '# HELP test_request_bytes_total Serialized bytes of requests sent.',
+        '# TYPE test_request_bytes_total counter',
+        'test_request_bytes_total{method="/google.showcase.v1beta1.Echo/Echo"} 12',
+        '# HELP test_response_bytes_total Serialized bytes of responses received.',
+        '# TYPE test_response_bytes_total counter',
+        'test_response_bytes_total{method="/google.showcase.v1beta1.Echo/Echo"} 14',
+    ]) + '\n'
+
+
+def test_prometheus_label_escaping():
+    text = metrics.prometheus_text({'a"b\\c\nd': metrics.MethodMetrics()})
+    assert 'method="a\\"b\\\\c\\nd"' in text
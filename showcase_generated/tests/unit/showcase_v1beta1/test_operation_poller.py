@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from concurrent import futures
+import threading
+
+import grpc
+
+import pytest
+
+from google.api_core import exceptions
+from google.api_core import operation
+from google.longrunning import operations_pb2
+from google.protobuf import any_pb2
+from google.rpc import status_pb2
+from google.showcase_v1beta1.operation_poller import OperationPoller
+from google.showcase_v1beta1.types import echo
+from google.showcase_v1beta1.types import messaging
+
+
+class _RpcError(grpc.RpcError):
+    def __init__(self, code):
+        self._code = code
+
+    def code(self):
+        return self._code
+
+    def details(self):
+        return 'polling failed'
+
+    def trailing_metadata(self):
+        return None
+
+
+class _SendError(Exception):
+    """Raised when the GetOperation call is sent, rather than answered."""
+
+
+class _Call:
+    def __init__(self, outcome):
+        self._outcome = outcome
+
+    def result(self):
+        if callable(self._outcome):
+            return self._outcome()
+        if isinstance(self._outcome, Exception):
+            raise self._outcome
+        return self._outcome
+
+
+class _GetOperation:
+    """GetOperation, answering each operation's polls in turn."""
+    def __init__(self, outcomes):
+        self._outcomes = {name: list(answers) for name, answers in outcomes.items()}
+        self.requests = []
+
+    def future(self, request, timeout=None):
+        self.requests.append(request.name)
+        outcome = self._outcomes[request.name].pop(0)
+        if isinstance(outcome, _SendError):
+            raise outcome
+        return _Call(outcome)
+
+
+class _OperationsClient:
+    def __init__(self, outcomes):
+        self.operations_stub = self
+        self.GetOperation = _GetOperation(outcomes)
+
+
+def _any(message):
+    packed = any_pb2.Any()
+    packed.Pack(type(message).pb(message))
+    return packed
+
+
+def _running(name, metadata=None):
+    op = operations_pb2.Operation(name=name)
+    if metadata is not None:
+        op.metadata.CopyFrom(_any(metadata))
+    return op
+
+
+def _done(name, content):
+    return operations_pb2.Operation(
+        name=name, done=True,
+        response=_any(echo.WaitResponse(content=content)))
+
+
+@pytest.mark.parametrize('options', [
+    {'initial': 0},
+    {'initial': 2, 'maximum': 1},
+    {'multiplier': 0.5},
+    {'max_batch': 0},
+])
+def test_operation_poller_options_error(options):
+    with pytest.raises(ValueError):
+        OperationPoller(**options)
+
+
+def test_operation_poller_done_at_once():
+    client = _OperationsClient({})
+    poller = OperationPoller()
+    future = poller.track(client, _done('operations/a', 'hi'), echo.WaitResponse)
+    assert future.result() == echo.WaitResponse(content='hi')
+    assert future.metadata is None
+    assert repr(future) == "PolledOperation<name='operations/a', polls=0, done=True>"
+
+    # Nothing was polled, so no thread was started.
+    assert poller.polls == 0
+    poller.close()
+
+
+def test_operation_poller_polls_until_done():
+    client = _OperationsClient({
+        'operations/a': [_running('operations/a'), _done('operations/a', 'a')],
+        'operations/b': [_done('operations/b', 'b')],
+    })
+    with OperationPoller(initial=0.001, maximum=0.002) as poller:
+        first = poller.track(
+            client, _running('operations/a'), echo.WaitResponse,
+            metadata_type=echo.WaitMetadata)
+        second = poller.track(client, _running('operations/b'), echo.WaitResponse)
+        assert first.result(timeout=5).content == 'a'
+        assert second.result(timeout=5).content == 'b'
+        assert (first.polls, second.polls, poller.polls) == (2, 1, 3)
+        assert repr(poller) == 'OperationPoller<tracking=0, polls=3>'
+
+
+def test_operation_poller_batches():
+    names = ['operations/{}'.format(i) for i in range(5)]
+    client = _OperationsClient({name: [_done(name, name)] for name in names})
+    with OperationPoller(initial=0.05, max_batch=2) as poller:
+        polled = [
+            poller.track(client, _running(name), echo.WaitResponse)
+            for name in names
+        ]
+        assert [f.result(timeout=5).content for f in polled] == names
+    # Every operation came due at once, and was sent at most two at a time.
+    assert poller.batches >= 3
+
+
+def test_operation_poller_retry_info_hint():
+    # The server asks for the next poll at once; the poller's own first
+    # interval is far longer.
+    hint = messaging.SearchBlurbsMetadata(retry_info={'retry_delay': {'nanos': 1000}})
+    client = _OperationsClient({
+        'operations/a': [
+            _running('operations/a', hint),
+            operations_pb2.Operation(
+                name='operations/a', done=True,
+                response=_any(messaging.SearchBlurbsResponse(next_page_token='t'))),
+        ],
+    })
+    with OperationPoller(initial=60, maximum=60) as poller:
+        future = poller.track(
+            client, _running('operations/a', hint), messaging.SearchBlurbsResponse,
+            metadata_type=messaging.SearchBlurbsMetadata)
+        assert future.metadata.retry_info.retry_delay.nanos == 1000
+        assert future.result(timeout=5).next_page_token == 't'
+
+
+def test_operation_poller_operation_errors():
+    failed = operations_pb2.Operation(
+        name='operations/a', done=True,
+        error=status_pb2.Status(code=5, message='not found'))
+    empty = operations_pb2.Operation(name='operations/b', done=True)
+    client = _OperationsClient({})
+    with OperationPoller() as poller:
+        with pytest.raises(exceptions.NotFound):
+            poller.track(client, failed, echo.WaitResponse).result()
+        with pytest.raises(exceptions.GoogleAPICallError):
+            poller.track(client, empty, echo.WaitResponse).result()
+
+
+def test_operation_poller_polling_errors():
+    client = _OperationsClient({
+        'operations/a': [
+            _RpcError(grpc.StatusCode.UNAVAILABLE),
+            _done('operations/a', 'a'),
+        ],
+        'operations/b': [_RpcError(grpc.StatusCode.PERMISSION_DENIED)],
+    })
+    with OperationPoller(initial=0.001) as poller:
+        first = poller.track(client, _running('operations/a'), echo.WaitResponse)
+        second = poller.track(client, _running('operations/b'), echo.WaitResponse)
+        # An unavailable server is tried again; other errors fail the future.
+        assert first.result(timeout=5).content == 'a'
+        with pytest.raises(exceptions.PermissionDenied):
+            second.result(timeout=5)
+
+
+def test_operation_poller_unexpected_errors():
+    def broken():
+        raise ValueError('bad answer')
+
+    client = _OperationsClient({
+        'operations/a': [_SendError('channel closed')],
+        'operations/b': [broken],
+        'operations/c': [_done('operations/c', 'c')],
+        'operations/d': [_done('operations/d', 'd')],
+    })
+    with OperationPoller(initial=0.001, max_batch=10) as poller:
+        polled = [
+            poller.track(client, _running(name), echo.WaitResponse)
+            for name in ('operations/a', 'operations/b', 'operations/c')
+        ]
+        # The response is not of the type the caller expects.
+        polled.append(poller.track(
+            client, _running('operations/d'), messaging.Blurb))
+
+        # Each error fails its own future; the other futures, and the
+        # polling thread, carry on.
+        with pytest.raises(_SendError):
+            polled[0].result(timeout=5)
+        with pytest.raises(ValueError):
+            polled[1].result(timeout=5)
+        assert polled[2].result(timeout=5).content == 'c'
+        with pytest.raises(TypeError):
+            polled[3].result(timeout=5)
+
+
+def test_operation_poller_api_core_operation():
+    client = _OperationsClient({'operations/a': [_done('operations/a', 'a')]})
+    started = operation.Operation(
+        _running('operations/a'), refresh=None, cancel=None,
+        result_type=echo.WaitResponse)
+    with OperationPoller(initial=0.001) as poller:
+        assert poller.track(client, started, echo.WaitResponse).result(timeout=5).content == 'a'
+
+
+def test_operation_poller_cancel():
+    polled = threading.Event()
+    future = None
+
+    def cancel_then_answer():
+        future.cancel()
+        polled.set()
+        return _running('operations/a')
+
+    client = _OperationsClient({
+        'operations/a': [cancel_then_answer],
+        'operations/b': [],
+    })
+    with OperationPoller(initial=0.001) as poller:
+        future = poller.track(client, _running('operations/a'), echo.WaitResponse)
+        assert polled.wait(5)
+        # Cancelled before its first poll, b is never polled.
+        other = poller.track(client, _running('operations/b'), echo.WaitResponse)
+        assert other.cancel()
+        while poller.batches < 2:
+            threading.Event().wait(0.001)
+    assert future.cancelled()
+    assert client.GetOperation.requests == ['operations/a']
+
+
+@pytest.mark.parametrize('outcome', [
+    _done('operations/a', 'a'),
+    _RpcError(grpc.StatusCode.PERMISSION_DENIED),
+])
+def test_operation_poller_cancel_while_polling(outcome):
+    future = None
+
+    def cancel_then_answer():
+        future.cancel()
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    client = _OperationsClient({'operations/a': [cancel_then_answer]})
+    with OperationPoller(initial=0.001) as poller:
+        future = poller.track(client, _running('operations/a'), echo.WaitResponse)
+        while poller.batches < 1:
+            threading.Event().wait(0.001)
+    # What the poll found is dropped.
+    assert future.cancelled()
+
+
+def test_operation_poller_close():
+    poller = OperationPoller(initial=0.001)
+
+    def close_while_polling():
+        threading.Thread(target=poller.close).start()
+        # Give close() the lock before the poll is answered.
+        while not poller._closed:
+            threading.Event().wait(0.001)
+        return _running('operations/a')
+
+    client = _OperationsClient({'operations/a': [close_while_polling]})
+    polled = poller.track(client, _running('operations/a'), echo.WaitResponse)
+    waiting = OperationPoller(initial=60)
+    pending = waiting.track(client, _running('operations/b'), echo.WaitResponse)
+    waiting.close()
+
+    # Closing cancels the operations still tracked, or being polled.
+    assert pending.cancelled()
+    with pytest.raises(futures.CancelledError):
+        polled.result(timeout=5)
+    with pytest.raises(ValueError):
+        waiting.track(client, _running('operations/c'), echo.WaitResponse)
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from google.showcase_v1beta1 import page_prefetch
+from google.showcase_v1beta1.types import echo as gs_echo
+
+
+def _pages(count):
+    # A chain of pages, each pointing at the next by its index.
+    return [
+        gs_echo.PagedExpandResponse(
+            responses=[gs_echo.EchoResponse(content=str(i))],
+            next_page_token=str(i + 1) if i + 1 < count else '',
+        )
+        for i in range(count)
+    ]
+
+
+class _Fetcher:
+    """Serves the page named by ``next_page_token``, counting requests."""
+    def __init__(self, pages, delay=0.0, fail_at=None):
+        self.pages = pages
+        self.delay = delay
+        self.fail_at = fail_at
+        self.calls = 0
+
+    def __call__(self, response):
+        self.calls += 1
+        time.sleep(self.delay)
+        index = int(response.next_page_token)
+        if index == self.fail_at:
+            raise RuntimeError('page {} is gone'.format(index))
+        return self.pages[index]
+
+    async def fetch_async(self, response):
+        await asyncio.sleep(self.delay)
+        return self(response)
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.001)
+    return predicate()
+
+
+def test_prefetch_pages_requires_depth():
+    pages = page_prefetch.prefetch_pages(_pages(2)[0], _Fetcher(_pages(2)), 0)
+    with pytest.raises(ValueError):
+        list(pages)
+
+
+def test_prefetch_pages_single_page():
+    page, = _pages(1)
+    fetch = _Fetcher([page])
+    assert list(page_prefetch.prefetch_pages(page, fetch, 2)) == [page]
+    assert fetch.calls == 0
+
+
+def test_prefetch_pages_in_order():
+    pages = _pages(5)
+    fetch = _Fetcher(pages, delay=0.005)
+    assert list(page_prefetch.prefetch_pages(pages[0], fetch, 2)) == pages
+    assert fetch.calls == 4
+
+
+def test_prefetch_pages_is_bounded():
+    pages = _pages(6)
+    fetch = _Fetcher(pages)
+    prefetched = page_prefetch.prefetch_pages(pages[0], fetch, 1)
+    assert next(prefetched) is pages[0]
+    assert next(prefetched) is pages[1]
+
+    # One page waits in the buffer while the next is held back until there
+    # is room for it; nothing further is requested.
+    assert _wait_for(lambda: fetch.calls == 3)
+    time.sleep(0.05)
+    assert fetch.calls == 3
+
+    # Closing the iterator lets the background thread go.
+    prefetched.close()
+    assert _wait_for(lambda: not any(
+        thread.name == 'PagePrefetcher' for thread in threading.enumerate()))
+    assert fetch.calls == 3
+
+
+def test_prefetch_pages_error():
+    pages = _pages(5)
+    fetch = _Fetcher(pages, fail_at=3)
+    prefetched = page_prefetch.prefetch_pages(pages[0], fetch, 4)
+    assert [next(prefetched) for _ in range(3)] == pages[:3]
+    with pytest.raises(RuntimeError):
+        next(prefetched)
+
+
+@pytest.mark.asyncio
+async def test_prefetch_pages_async_requires_depth():
+    pages = _pages(2)
+    prefetched = page_prefetch.prefetch_pages_async(
+        pages[0], _Fetcher(pages).fetch_async, 0)
+    with pytest.raises(ValueError):
+        await prefetched.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_prefetch_pages_async_single_page():
+    page, = _pages(1)
+    fetch = _Fetcher([page])
+    prefetched = page_prefetch.prefetch_pages_async(page, fetch.fetch_async, 2)
+    assert [p async for p in prefetched] == [page]
+    assert fetch.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_prefetch_pages_async_in_order():
+    pages = _pages(5)
+    fetch = _Fetcher(pages)
+    prefetched = page_prefetch.prefetch_pages_async(
+        pages[0], fetch.fetch_async, 2)
+    assert [p async for p in prefetched] == pages
+    assert fetch.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_prefetch_pages_async_is_bounded():
+    pages = _pages(6)
+    fetch = _Fetcher(pages)
+    prefetched = page_prefetch.prefetch_pages_async(
+        pages[0], fetch.fetch_async, 1)
+    assert await prefetched.__anext__() is pages[0]
+    assert await prefetched.__anext__() is pages[1]
+
+    # Let the background task run as far as the queue allows.
+    for _ in range(20):
+        await asyncio.sleep(0)
+    assert fetch.calls == 3
+
+    # Closing the iterator cancels the background task.
+    await prefetched.aclose()
+    for _ in range(20):
+        await asyncio.sleep(0)
+    assert fetch.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_prefetch_pages_async_error():
+    pages = _pages(5)
+    fetch = _Fetcher(pages, fail_at=3)
+    prefetched = page_prefetch.prefetch_pages_async(
+        pages[0], fetch.fetch_async, 4)
+    assert [await prefetched.__anext__() for _ in range(3)] == pages[:3]
+    with pytest.raises(RuntimeError):
+        await prefetched.__anext__()
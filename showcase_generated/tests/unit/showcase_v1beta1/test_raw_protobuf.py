@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from google.showcase_v1beta1 import raw_protobuf
+from google.showcase_v1beta1.types import echo
+
+
+def test_serializer_takes_either_kind():
+    serialize = raw_protobuf.serializer(echo.EchoRequest)
+    request = echo.EchoRequest(content='hello')
+    expected = echo.EchoRequest.serialize(request)
+    assert serialize(request) == expected
+    assert serialize(echo.EchoRequest.pb(request)) == expected
+
+
+def test_deserializer_returns_raw_messages():
+    deserialize = raw_protobuf.deserializer(echo.EchoResponse)
+    response = deserialize(
+        echo.EchoResponse.serialize(echo.EchoResponse(content='hello')))
+    assert isinstance(response, echo.EchoResponse.pb())
+    assert response.content == 'hello'
+
+
+def test_wrap_does_not_copy():
+    raw = echo.EchoRequest.pb()(content='hello')
+    wrapped = raw_protobuf.wrap(echo.EchoRequest, raw)
+    assert isinstance(wrapped, echo.EchoRequest)
+    assert echo.EchoRequest.pb(wrapped) is raw
+
+    # Anything else is returned as it is.
+    request = echo.EchoRequest(content='hello')
+    assert raw_protobuf.wrap(echo.EchoRequest, request) is request
+    assert raw_protobuf.wrap(echo.EchoRequest, None) is None
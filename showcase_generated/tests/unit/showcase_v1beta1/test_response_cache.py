@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import pytest
+
+from google.showcase_v1beta1.response_cache import ResponseCache
+from google.showcase_v1beta1.types import messaging
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _room(name, display_name=''):
+    return messaging.Room(name=name, display_name=display_name)
+
+
+@pytest.mark.parametrize('options', [
+    {'max_size': 0},
+    {'ttl': 0},
+])
+def test_response_cache_options_error(options):
+    with pytest.raises(ValueError):
+        ResponseCache(**options)
+
+
+def test_response_cache_hit_and_miss():
+    cache = ResponseCache()
+    assert cache.get('rooms/1') is None
+
+    cache.put('rooms/1', _room('rooms/1', 'Lobby'))
+    assert cache.get('rooms/1') == _room('rooms/1', 'Lobby')
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert len(cache) == 1
+
+
+def test_response_cache_copies():
+    cache = ResponseCache()
+    room = _room('rooms/1', 'Lobby')
+    cache.put('rooms/1', room)
+
+    # Neither the original nor a returned copy can change the cached room.
+    room.display_name = 'Attic'
+    cache.get('rooms/1').display_name = 'Cellar'
+    assert cache.get('rooms/1').display_name == 'Lobby'
+
+
+def test_response_cache_copies_raw_messages():
+    cache = ResponseCache()
+    room = messaging.Room.pb(_room('rooms/1', 'Lobby'))
+    cache.put('rooms/1', room)
+
+    room.display_name = 'Attic'
+    cached = cache.get('rooms/1')
+    assert isinstance(cached, messaging.Room.pb())
+    assert cached.display_name == 'Lobby'
+    assert cached is not cache.get('rooms/1')
+
+
+def test_response_cache_expiry():
+    clock = _Clock()
+    cache = ResponseCache(ttl=10, clock=clock)
+    cache.put('rooms/1', _room('rooms/1'))
+
+    clock.now = 9.9
+    assert cache.get('rooms/1') is not None
+    clock.now = 10
+    assert cache.get('rooms/1') is None
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_response_cache_evicts_least_recently_used():
+    cache = ResponseCache(max_size=2)
+    cache.put('rooms/1', _room('rooms/1'))
+    cache.put('rooms/2', _room('rooms/2'))
+
+    # Using rooms/1 makes rooms/2 the one to go.
+    cache.get('rooms/1')
+    cache.put('rooms/3', _room('rooms/3'))
+    assert cache.get('rooms/2') is None
+    assert cache.get('rooms/1') is not None
+    assert cache.get('rooms/3') is not None
+    assert cache.evictions == 1
+
+
+def test_response_cache_invalidate():
+    cache = ResponseCache()
+    for name in ('rooms/1', 'rooms/1/blurbs/a', 'rooms/10', 'users/1'):
+        cache.put(name, _room(name))
+
+    # Only the name itself is dropped...
+    cache.invalidate('rooms/1')
+    assert cache.get('rooms/1') is None
+    assert cache.get('rooms/1/blurbs/a') is not None
+
+    # ...unless the resources beneath it should go too.
+    cache.put('rooms/1', _room('rooms/1'))
+    cache.invalidate('rooms/1', descendants=True)
+    assert cache.get('rooms/1') is None
+    assert cache.get('rooms/1/blurbs/a') is None
+    assert cache.get('rooms/10') is not None
+    assert cache.get('users/1') is not None
+
+    # Dropping a name that is not cached is fine.
+    cache.invalidate('rooms/2')
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.hits == 3
+
+
+def test_response_cache_put_after_invalidate():
+    cache = ResponseCache()
+
+    # A lookup misses, and the resource is dropped while it is fetched;
+    # what was fetched may be out of date, and is not cached.
+    response, generation = cache.lookup('rooms/1')
+    assert response is None
+    cache.invalidate('rooms/1')
+    cache.put('rooms/1', _room('rooms/1'), generation)
+    assert cache.get('rooms/1') is None
+
+    # Fetched after the drop, it is.
+    _, generation = cache.lookup('rooms/1')
+    cache.put('rooms/1', _room('rooms/1'), generation)
+    assert cache.get('rooms/1') is not None
+
+    # Other names, and puts without a generation, are not affected.
+    _, generation = cache.lookup('rooms/2')
+    cache.invalidate('rooms/1')
+    cache.put('rooms/2', _room('rooms/2'), generation)
+    cache.put('rooms/1', _room('rooms/1'))
+    assert cache.get('rooms/2') is not None
+    assert cache.get('rooms/1') is not None
+
+
+def test_response_cache_put_after_invalidate_descendants():
+    cache = ResponseCache()
+    _, generation = cache.lookup('rooms/1/blurbs/a')
+    cache.invalidate('rooms/1', descendants=True)
+    cache.put('rooms/1/blurbs/a', _room('rooms/1/blurbs/a'), generation)
+    cache.put('rooms/10/blurbs/a', _room('rooms/10/blurbs/a'), generation)
+    assert cache.get('rooms/1/blurbs/a') is None
+    assert cache.get('rooms/10/blurbs/a') is not None
+
+
+def test_response_cache_put_after_forgotten_invalidate():
+    cache = ResponseCache(max_size=2)
+    _, generation = cache.lookup('rooms/1')
+    for name in ('rooms/1', 'rooms/2', 'rooms/3'):
+        cache.invalidate(name)
+
+    # The drop of rooms/1 is forgotten, so nothing fetched before it is
+    # cached; what is fetched afterwards is.
+    cache.put('rooms/1', _room('rooms/1'), generation)
+    cache.put('rooms/4', _room('rooms/4'), generation)
+    assert len(cache) == 0
+    _, generation = cache.lookup('rooms/1')
+    cache.put('rooms/1', _room('rooms/1'), generation)
+    assert cache.get('rooms/1') is not None
+
+    # Nor is anything fetched before the cache was cleared.
+    _, generation = cache.lookup('rooms/5')
+    cache.clear()
+    cache.put('rooms/5', _room('rooms/5'), generation)
+    assert len(cache) == 0
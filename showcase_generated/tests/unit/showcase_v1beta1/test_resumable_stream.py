@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import pytest
+
+from google.showcase_v1beta1.resumable_stream import ResumableStream
+
+
+def test_resumable_stream_is_abstract():
+    stream = ResumableStream(None)
+    with pytest.raises(NotImplementedError):
+        next(stream)
+    with pytest.raises(NotImplementedError):
+        stream._accept(None)
+    assert list(stream._reopened()) == []
+
+
+def test_resumable_stream_not_open():
+    stream = ResumableStream(None)
+    assert iter(stream) is stream
+    assert stream.trailing_metadata() is None
+    # Nothing to cancel yet.
+    stream.cancel()
+    assert repr(stream) == 'ResumableStream<attempts=0>'
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import pytest
+
+from google.api_core import exceptions
+from google.api_core import gapic_v1
+from google.api_core import retry as retries
+from google.showcase_v1beta1 import retry_budget
+from google.showcase_v1beta1.retry_budget import RetryBudget
+
+
+_METHOD = '/google.showcase.v1beta1.Messaging/GetBlurb'
+_OTHER = '/google.showcase.v1beta1.Messaging/ListBlurbs'
+
+_PREDICATE = retries.if_exception_type(exceptions.ServiceUnavailable)
+_RETRY = retries.Retry(_PREDICATE, initial=0.0, maximum=0.0, deadline=None)
+
+
+class _Clock:
+    # A clock that only moves when told to.
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ratio():
+    clock = _Clock()
+    budget = RetryBudget(ratio=0.5, min_retries=0, clock=clock)
+    retry = budget.budget(_RETRY, _METHOD, _PREDICATE)
+    unavailable = exceptions.ServiceUnavailable('down')
+
+    # One retry for every two requests.
+    budget._request(_METHOD)
+    assert retry._predicate(unavailable)
+    assert not retry._predicate(unavailable)
+    budget._request(_METHOD)
+    assert not retry._predicate(unavailable)
+    budget._request(_METHOD)
+    assert retry._predicate(unavailable)
+
+    # Errors that are not retried do not spend the budget.
+    assert not retry._predicate(exceptions.NotFound('gone'))
+
+    stats = budget.snapshot()[_METHOD]
+    assert (stats.requests, stats.retries, stats.suppressed) == (3, 2, 2)
+    assert (stats.window_requests, stats.window_retries) == (3, 2)
+    assert repr(stats) == 'RetryBudgetStats<requests=3, retries=2, suppressed=2>'
+
+
+def test_window_slides():
+    clock = _Clock()
+    budget = RetryBudget(ratio=1.0, window=10.0, min_retries=0, clock=clock)
+    retry = budget.budget(_RETRY, _METHOD, _PREDICATE)
+    unavailable = exceptions.ServiceUnavailable('down')
+    budget._request(_METHOD)
+    assert retry._predicate(unavailable)
+    assert not retry._predicate(unavailable)
+
+    # The request and the retry leave the window, and the budget with them.
+    clock.now = 10.0
+    stats = budget.snapshot()[_METHOD]
+    assert (stats.window_requests, stats.window_retries) == (0, 0)
+    assert not retry._predicate(unavailable)
+    budget._request(_METHOD)
+    assert retry._predicate(unavailable)
+    assert budget.snapshot()[_METHOD].retries == 2
+
+
+def test_window_slides_by_buckets():
+    clock = _Clock()
+    budget = RetryBudget(window=10.0, clock=clock)
+
+    # The window is counted a tenth at a time, in as many buckets however
+    # many calls there are.
+    for now in (0.0, 0.5, 5.0, 9.9):
+        clock.now = now
+        for _ in range(100):
+            budget._request(_METHOD)
+    assert budget.snapshot()[_METHOD].window_requests == 400
+    assert len(budget._windows[_METHOD].requests) == 10
+
+    clock.now = 10.0
+    assert budget.snapshot()[_METHOD].window_requests == 200
+    clock.now = 15.0
+    assert budget.snapshot()[_METHOD].window_requests == 100
+
+    # A bucket counts its new span of time from nothing.
+    budget._request(_METHOD)
+    assert budget.snapshot()[_METHOD].window_requests == 101
+    clock.now = 25.0
+    budget._request(_METHOD)
+    assert budget.snapshot()[_METHOD].window_requests == 1
+
+
+def test_min_retries():
+    budget = RetryBudget(ratio={_METHOD: 0.0}, min_retries=2)
+    retry = budget.budget(_RETRY, _METHOD, _PREDICATE)
+    unavailable = exceptions.ServiceUnavailable('down')
+    assert retry._predicate(unavailable)
+    assert retry._predicate(unavailable)
+    assert not retry._predicate(unavailable)
+
+    # Methods the ratio leaves out are not limited.
+    other = budget.budget(_RETRY, _OTHER, _PREDICATE)
+    assert all(other._predicate(unavailable) for _ in range(10))
+    assert repr(budget) == "RetryBudget<ratio={'%s': 0.0}, window=10.0, methods=2>" % _METHOD
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'window': 0.0}, {'min_retries': -1},
+])
+def test_budget_error(kwargs):
+    with pytest.raises(ValueError):
+        RetryBudget(**kwargs)
+
+
+class _Method:
+    # A method wrapped by wrap_method, which applies the retry it is given.
+    def __init__(self, *errors):
+        self._errors = list(errors)
+        self.retries = []
+
+    def __call__(self, request, retry=gapic_v1.method.DEFAULT, timeout=None):
+        self.retries.append(retry)
+
+        def attempt():
+            if self._errors:
+                raise self._errors.pop(0)
+            return 'response'
+
+        return attempt() if retry in (None, gapic_v1.method.DEFAULT) else retry(attempt)()
+
+
+def test_wrap():
+    budget = RetryBudget(ratio=0.0, min_retries=1)
+    method = _Method(*[exceptions.ServiceUnavailable('down')] * 2)
+    rpc = retry_budget.wrap(
+        method, budget, 'google.showcase.v1beta1.Messaging', 'GetBlurb', _RETRY)
+
+    # The default retry is used, and allowed one retry.
+    with pytest.raises(exceptions.ServiceUnavailable):
+        rpc('request')
+    assert method.retries[0] is not _RETRY
+    assert method.retries[0]._deadline is None
+
+    # A call not to be retried is counted, and not retried.
+    rpc('request', retry=None)
+    assert method.retries[1] is None
+    stats = budget.snapshot()[_METHOD]
+    assert (stats.requests, stats.retries, stats.suppressed) == (2, 1, 1)
+
+    # A call's own retry is budgeted as well, with its own predicate.
+    method = _Method(exceptions.ServiceUnavailable('down'))
+    rpc = retry_budget.wrap(
+        method, budget, 'google.showcase.v1beta1.Messaging', 'GetBlurb', _RETRY)
+    retry = retries.Retry(
+        retries.if_exception_type(exceptions.ServiceUnavailable), deadline=None)
+    with pytest.raises(exceptions.ServiceUnavailable):
+        rpc('request', retry=retry)
+    assert method.retries[0] is not retry
+    assert method.retries[0]._deadline is None
+    stats = budget.snapshot()[_METHOD]
+    assert (stats.requests, stats.retries, stats.suppressed) == (3, 1, 2)
+
+    # A method with no default retry has nothing to budget.
+    rpc = retry_budget.wrap(
+        _Method(), budget, 'google.showcase.v1beta1.Messaging', 'SendBlurbs', None)
+    assert rpc('request') == 'response'
+
+
+def test_wrap_without_configured_predicate():
+    budget = RetryBudget(ratio=0.0, min_retries=0)
+    method = _Method(exceptions.ServiceUnavailable('down'))
+
+    # A method the service config has no retry for falls back to the
+    # predicate of the retry it is given.
+    rpc = retry_budget.wrap(
+        method, budget, 'google.showcase.v1beta1.Unknown', 'Method', _RETRY)
+    with pytest.raises(exceptions.ServiceUnavailable):
+        rpc('request')
+    stats = budget.snapshot()['/google.showcase.v1beta1.Unknown/Method']
+    assert (stats.requests, stats.retries, stats.suppressed) == (1, 0, 1)
+
+
+def test_wrap_without_budget():
+    method = _Method()
+    assert retry_budget.wrap(
+        method, None, 'google.showcase.v1beta1.Messaging', 'GetBlurb', _RETRY) is method
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2019  Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import json
+from unittest import mock
+
+import pytest
+
+from google.api_core import exceptions
+from google.showcase_v1beta1 import service_config
+
+
+def test_method_config():
+    echo = service_config.method_config('google.showcase.v1beta1.Echo', 'Echo')
+    assert echo.timeout == 10.0
+    assert echo.max_attempts == 3
+    assert echo.retry._initial == 0.1
+    assert echo.retry._maximum == 3.0
+    assert echo.retry._multiplier == 2.0
+    assert echo.retry._deadline == 10.0
+    assert echo.async_retry._deadline == 10.0
+    assert repr(echo) == 'MethodConfig<timeout=10.0, max_attempts=3>'
+
+    # The policy is built once, and shared by every client.
+    assert service_config.method_config(
+        'google.showcase.v1beta1.Messaging', 'GetRoom') is echo
+
+    get_user = service_config.method_config('google.showcase.v1beta1.Identity', 'GetUser')
+    assert (get_user.timeout, get_user.max_attempts) == (5.0, 5)
+    assert get_user.retry._initial == 0.2
+
+
+def test_method_config_defaults():
+    # A method without a policy of its own gets its service's.
+    block = service_config.method_config('google.showcase.v1beta1.Echo', 'Block')
+    assert block.timeout == 5.0
+    assert block.retry is None
+    assert block.async_retry is None
+
+    # A service without a policy gets none.
+    for service, method in [
+            ('google.showcase.v1beta1.Identity', 'CreateUser'),
+            ('google.showcase.v1beta1.Testing', 'CreateSession')]:
+        config = service_config.method_config(service, method)
+        assert config.timeout is None
+        assert config.retry is None
+
+
+@pytest.mark.parametrize('error,retried', [
+    (exceptions.ServiceUnavailable('down'), True),
+    (exceptions.Unknown('?'), True),
+    (exceptions.DeadlineExceeded('slow'), False),
+    (exceptions.NotFound('gone'), False),
+])
+def test_retryable_codes(error, retried):
+    config = service_config.method_config('google.showcase.v1beta1.Echo', 'Expand')
+    assert config.predicate(error) is retried
+    assert config.retry._predicate is config.predicate
+    assert config.async_retry._predicate is config.predicate
+
+
+def test_service_config_json():
+    parsed = json.loads(service_config.SERVICE_CONFIG_JSON)
+    names = [
+        (name['service'], name.get('method'))
+        for entry in parsed['methodConfig']
+        for name in entry['name']
+    ]
+    assert ('google.showcase.v1beta1.Messaging', 'Connect') in names
+
+
+def test_bad_duration():
+    with pytest.raises(ValueError, match='Not a duration'):
+        service_config._parse(json.dumps({'methodConfig': [{
+            'name': [{'service': 'google.showcase.v1beta1.Echo'}],
+            'timeout': '5 seconds',
+        }]}))
+
+
+def test_packaged_config_missing():
+    with pytest.raises(ImportError, match='missing'):
+        service_config._read('no_such_service_config.json')
+
+    # A loader that cannot read files.
+    with mock.patch('pkgutil.get_data', return_value=None):
+        with pytest.raises(ImportError, match='missing'):
+            service_config._read('showcase_grpc_service_config.json')
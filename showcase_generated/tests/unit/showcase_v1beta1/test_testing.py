@@ -18,13 +18,22 @@
 from unittest import mock
 
 import grpc
+from grpc import aio
 
 import pytest
 
 from google import auth
 from google.api_core import client_options
+from google.api_core import gapic_v1
+from google.api_core import grpc_helpers
+from google.api_core import grpc_helpers_async
 from google.auth import credentials
+from google.longrunning import operations_pb2
 from google.oauth2 import service_account
+from google.showcase_v1beta1 import channel_pool
+from google.showcase_v1beta1 import credentials_cache
+from google.showcase_v1beta1 import service_config
+from google.showcase_v1beta1.services.testing import TestingAsyncClient
 from google.showcase_v1beta1.services.testing import TestingClient
 from google.showcase_v1beta1.services.testing import pagers
 from google.showcase_v1beta1.services.testing import transports
@@ -67,6 +76,23 @@ def test_testing_client_client_options_from_dict():
         transport.assert_called_once_with(credentials=None, host="squid.clam.whelk")
 
 
+def test_testing_async_client_from_service_account_file():
+    creds = credentials.AnonymousCredentials()
+    with mock.patch.object(service_account.Credentials, 'from_service_account_file') as factory:
+        factory.return_value = creds
+        client = TestingAsyncClient.from_service_account_file("dummy/file/path.json")
+        assert isinstance(client, TestingAsyncClient)
+        assert client._client._transport._credentials == creds
+
+        client = TestingAsyncClient.from_service_account_json("dummy/file/path.json")
+        assert client._client._transport._credentials == creds
+
+
+def test_testing_async_client_get_transport_class():
+    assert TestingAsyncClient.get_transport_class() is transports.TestingGrpcTransport
+    assert TestingAsyncClient.get_transport_class('grpc_asyncio') is transports.TestingGrpcAsyncIOTransport
+
+
 def test_create_session(transport: str = 'grpc'):
     client = TestingClient(
         credentials=credentials.AnonymousCredentials(),
@@ -99,6 +125,39 @@ def test_create_session(transport: str = 'grpc'):
     assert response.version == testing.Session.Version.V1_LATEST
 
 
+@pytest.mark.asyncio
+async def test_create_session_async():
+    client = TestingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = testing.CreateSessionRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.create_session),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = testing.Session(
+            name='name_value',
+            version=testing.Session.Version.V1_LATEST,
+        )
+        response = await client.create_session(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, testing.Session)
+    assert response.name == 'name_value'
+    assert response.version == testing.Session.Version.V1_LATEST
+
+
 def test_get_session(transport: str = 'grpc'):
     client = TestingClient(
         credentials=credentials.AnonymousCredentials(),
@@ -131,6 +190,39 @@ def test_get_session(transport: str = 'grpc'):
     assert response.version == testing.Session.Version.V1_LATEST
 
 
+@pytest.mark.asyncio
+async def test_get_session_async():
+    client = TestingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = testing.GetSessionRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.get_session),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = testing.Session(
+            name='name_value',
+            version=testing.Session.Version.V1_LATEST,
+        )
+        response = await client.get_session(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, testing.Session)
+    assert response.name == 'name_value'
+    assert response.version == testing.Session.Version.V1_LATEST
+
+
 def test_get_session_field_headers():
     client = TestingClient(
         credentials=credentials.AnonymousCredentials(),
@@ -192,6 +284,37 @@ def test_list_sessions(transport: str = 'grpc'):
     assert response.next_page_token == 'next_page_token_value'
 
 
+@pytest.mark.asyncio
+async def test_list_sessions_async():
+    client = TestingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = testing.ListSessionsRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.list_sessions),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = testing.ListSessionsResponse(
+            next_page_token='next_page_token_value',
+        )
+        response = await client.list_sessions(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, pagers.ListSessionsAsyncPager)
+    assert response.next_page_token == 'next_page_token_value'
+
+
 def test_list_sessions_pager():
     client = TestingClient(
         credentials=credentials.AnonymousCredentials,
@@ -236,6 +359,52 @@ def test_list_sessions_pager():
         assert all([isinstance(i, testing.Session)
                     for i in results])
 
+
+@pytest.mark.asyncio
+async def test_list_sessions_pager_async():
+    client = TestingAsyncClient(
+        credentials=credentials.AnonymousCredentials,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.list_sessions),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Set the response to a series of pages.
+        call.side_effect = (
+            testing.ListSessionsResponse(
+                sessions=[
+                    testing.Session(),
+                    testing.Session(),
+                    testing.Session(),
+                ],
+                next_page_token='abc',
+            ),
+            testing.ListSessionsResponse(
+                sessions=[],
+                next_page_token='def',
+            ),
+            testing.ListSessionsResponse(
+                sessions=[
+                    testing.Session(),
+                ],
+                next_page_token='ghi',
+            ),
+            testing.ListSessionsResponse(
+                sessions=[
+                    testing.Session(),
+                    testing.Session(),
+                ],
+            ),
+            RuntimeError,
+        )
+        pager = await client.list_sessions(request={})
+        results = [i async for i in pager]
+        assert len(results) == 6
+        assert all([isinstance(i, testing.Session)
+                    for i in results])
+
 def test_list_sessions_pages():
     client = TestingClient(
         credentials=credentials.AnonymousCredentials,
@@ -278,6 +447,145 @@ def test_list_sessions_pages():
             assert page.raw_page.next_page_token == token
 
 
+@pytest.mark.asyncio
+async def test_list_sessions_pages_async():
+    client = TestingAsyncClient(
+        credentials=credentials.AnonymousCredentials,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.list_sessions),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Set the response to a series of pages.
+        call.side_effect = (
+            testing.ListSessionsResponse(
+                sessions=[
+                    testing.Session(),
+                    testing.Session(),
+                    testing.Session(),
+                ],
+                next_page_token='abc',
+            ),
+            testing.ListSessionsResponse(
+                sessions=[],
+                next_page_token='def',
+            ),
+            testing.ListSessionsResponse(
+                sessions=[
+                    testing.Session(),
+                ],
+                next_page_token='ghi',
+            ),
+            testing.ListSessionsResponse(
+                sessions=[
+                    testing.Session(),
+                    testing.Session(),
+                ],
+            ),
+            RuntimeError,
+        )
+        pager = await client.list_sessions(request={})
+        pages = [page async for page in pager.pages]
+        for page, token in zip(pages, ['abc','def','ghi', '']):
+            assert page.raw_page.next_page_token == token
+
+
+def test_list_sessions_pager_prefetch():
+    client = TestingClient(
+        credentials=credentials.AnonymousCredentials,
+        page_prefetch_depth=2,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.list_sessions),
+            '__call__') as call:
+        # Set the response to a series of pages; they are fetched ahead.
+        call.side_effect = (
+            testing.ListSessionsResponse(
+                sessions=[
+                    testing.Session(),
+                    testing.Session(),
+                    testing.Session(),
+                ],
+                next_page_token='abc',
+            ),
+            testing.ListSessionsResponse(
+                sessions=[],
+                next_page_token='def',
+            ),
+            testing.ListSessionsResponse(
+                sessions=[
+                    testing.Session(),
+                ],
+                next_page_token='ghi',
+            ),
+            testing.ListSessionsResponse(
+                sessions=[
+                    testing.Session(),
+                    testing.Session(),
+                ],
+            ),
+            RuntimeError,
+        )
+        pager = client.list_sessions(request={})
+        results = [i for i in pager]
+        assert pager.next_page_token == ''
+        assert len(results) == 6
+        assert all([isinstance(i, testing.Session)
+                    for i in results])
+
+
+@pytest.mark.asyncio
+async def test_list_sessions_pager_prefetch_async():
+    client = TestingAsyncClient(
+        credentials=credentials.AnonymousCredentials,
+        page_prefetch_depth=2,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.list_sessions),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Set the response to a series of pages; they are fetched ahead.
+        call.side_effect = (
+            testing.ListSessionsResponse(
+                sessions=[
+                    testing.Session(),
+                    testing.Session(),
+                    testing.Session(),
+                ],
+                next_page_token='abc',
+            ),
+            testing.ListSessionsResponse(
+                sessions=[],
+                next_page_token='def',
+            ),
+            testing.ListSessionsResponse(
+                sessions=[
+                    testing.Session(),
+                ],
+                next_page_token='ghi',
+            ),
+            testing.ListSessionsResponse(
+                sessions=[
+                    testing.Session(),
+                    testing.Session(),
+                ],
+            ),
+            RuntimeError,
+        )
+        pager = await client.list_sessions(request={})
+        results = [i async for i in pager]
+        assert pager.next_page_token == ''
+        assert len(results) == 6
+        assert all([isinstance(i, testing.Session)
+                    for i in results])
+
+
 def test_delete_session(transport: str = 'grpc'):
     client = TestingClient(
         credentials=credentials.AnonymousCredentials(),
@@ -305,25 +613,24 @@ def test_delete_session(transport: str = 'grpc'):
     assert response is None
 
 
-def test_report_session(transport: str = 'grpc'):
-    client = TestingClient(
+@pytest.mark.asyncio
+async def test_delete_session_async():
+    client = TestingAsyncClient(
         credentials=credentials.AnonymousCredentials(),
-        transport=transport,
     )
 
     # Everything is optional in proto3 as far as the runtime is concerned,
     # and we are mocking out the actual API, so just send an empty request.
-    request = testing.ReportSessionRequest()
+    request = testing.DeleteSessionRequest()
 
     # Mock the actual call within the gRPC stub, and fake the request.
     with mock.patch.object(
-            type(client._transport.report_session),
-            '__call__') as call:
+            type(client._client._transport.delete_session),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
         # Designate an appropriate return value for the call.
-        call.return_value = testing.ReportSessionResponse(
-            result=testing.ReportSessionResponse.Result.PASSED,
-        )
-        response = client.report_session(request)
+        call.return_value = None
+        response = await client.delete_session(request)
 
         # Establish that the underlying gRPC stub method was called.
         assert len(call.mock_calls) == 1
@@ -331,11 +638,10 @@ def test_report_session(transport: str = 'grpc'):
         assert args[0] == request
 
     # Establish that the response is the type that we expect.
-    assert isinstance(response, testing.ReportSessionResponse)
-    assert response.result == testing.ReportSessionResponse.Result.PASSED
+    assert response is None
 
 
-def test_list_tests(transport: str = 'grpc'):
+def test_report_session(transport: str = 'grpc'):
     client = TestingClient(
         credentials=credentials.AnonymousCredentials(),
         transport=transport,
@@ -343,11 +649,72 @@ def test_list_tests(transport: str = 'grpc'):
 
     # Everything is optional in proto3 as far as the runtime is concerned,
     # and we are mocking out the actual API, so just send an empty request.
-    request = testing.ListTestsRequest()
+    request = testing.ReportSessionRequest()
 
     # Mock the actual call within the gRPC stub, and fake the request.
     with mock.patch.object(
-            type(client._transport.list_tests),
+            type(client._transport.report_session),
+            '__call__') as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = testing.ReportSessionResponse(
+            result=testing.ReportSessionResponse.Result.PASSED,
+        )
+        response = client.report_session(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, testing.ReportSessionResponse)
+    assert response.result == testing.ReportSessionResponse.Result.PASSED
+
+
+@pytest.mark.asyncio
+async def test_report_session_async():
+    client = TestingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = testing.ReportSessionRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.report_session),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = testing.ReportSessionResponse(
+            result=testing.ReportSessionResponse.Result.PASSED,
+        )
+        response = await client.report_session(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, testing.ReportSessionResponse)
+    assert response.result == testing.ReportSessionResponse.Result.PASSED
+
+
+def test_list_tests(transport: str = 'grpc'):
+    client = TestingClient(
+        credentials=credentials.AnonymousCredentials(),
+        transport=transport,
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = testing.ListTestsRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.list_tests),
             '__call__') as call:
         # Designate an appropriate return value for the call.
         call.return_value = testing.ListTestsResponse(
@@ -365,6 +732,37 @@ def test_list_tests(transport: str = 'grpc'):
     assert response.next_page_token == 'next_page_token_value'
 
 
+@pytest.mark.asyncio
+async def test_list_tests_async():
+    client = TestingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = testing.ListTestsRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.list_tests),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = testing.ListTestsResponse(
+            next_page_token='next_page_token_value',
+        )
+        response = await client.list_tests(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, pagers.ListTestsAsyncPager)
+    assert response.next_page_token == 'next_page_token_value'
+
+
 def test_list_tests_field_headers():
     client = TestingClient(
         credentials=credentials.AnonymousCredentials(),
@@ -440,6 +838,52 @@ def test_list_tests_pager():
         assert all([isinstance(i, testing.Test)
                     for i in results])
 
+
+@pytest.mark.asyncio
+async def test_list_tests_pager_async():
+    client = TestingAsyncClient(
+        credentials=credentials.AnonymousCredentials,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.list_tests),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Set the response to a series of pages.
+        call.side_effect = (
+            testing.ListTestsResponse(
+                tests=[
+                    testing.Test(),
+                    testing.Test(),
+                    testing.Test(),
+                ],
+                next_page_token='abc',
+            ),
+            testing.ListTestsResponse(
+                tests=[],
+                next_page_token='def',
+            ),
+            testing.ListTestsResponse(
+                tests=[
+                    testing.Test(),
+                ],
+                next_page_token='ghi',
+            ),
+            testing.ListTestsResponse(
+                tests=[
+                    testing.Test(),
+                    testing.Test(),
+                ],
+            ),
+            RuntimeError,
+        )
+        pager = await client.list_tests(request={})
+        results = [i async for i in pager]
+        assert len(results) == 6
+        assert all([isinstance(i, testing.Test)
+                    for i in results])
+
 def test_list_tests_pages():
     client = TestingClient(
         credentials=credentials.AnonymousCredentials,
@@ -482,6 +926,145 @@ def test_list_tests_pages():
             assert page.raw_page.next_page_token == token
 
 
+@pytest.mark.asyncio
+async def test_list_tests_pages_async():
+    client = TestingAsyncClient(
+        credentials=credentials.AnonymousCredentials,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.list_tests),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Set the response to a series of pages.
+        call.side_effect = (
+            testing.ListTestsResponse(
+                tests=[
+                    testing.Test(),
+                    testing.Test(),
+                    testing.Test(),
+                ],
+                next_page_token='abc',
+            ),
+            testing.ListTestsResponse(
+                tests=[],
+                next_page_token='def',
+            ),
+            testing.ListTestsResponse(
+                tests=[
+                    testing.Test(),
+                ],
+                next_page_token='ghi',
+            ),
+            testing.ListTestsResponse(
+                tests=[
+                    testing.Test(),
+                    testing.Test(),
+                ],
+            ),
+            RuntimeError,
+        )
+        pager = await client.list_tests(request={})
+        pages = [page async for page in pager.pages]
+        for page, token in zip(pages, ['abc','def','ghi', '']):
+            assert page.raw_page.next_page_token == token
+
+
+def test_list_tests_pager_prefetch():
+    client = TestingClient(
+        credentials=credentials.AnonymousCredentials,
+        page_prefetch_depth=2,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.list_tests),
+            '__call__') as call:
+        # Set the response to a series of pages; they are fetched ahead.
+        call.side_effect = (
+            testing.ListTestsResponse(
+                tests=[
+                    testing.Test(),
+                    testing.Test(),
+                    testing.Test(),
+                ],
+                next_page_token='abc',
+            ),
+            testing.ListTestsResponse(
+                tests=[],
+                next_page_token='def',
+            ),
+            testing.ListTestsResponse(
+                tests=[
+                    testing.Test(),
+                ],
+                next_page_token='ghi',
+            ),
+            testing.ListTestsResponse(
+                tests=[
+                    testing.Test(),
+                    testing.Test(),
+                ],
+            ),
+            RuntimeError,
+        )
+        pager = client.list_tests(request={})
+        results = [i for i in pager]
+        assert pager.next_page_token == ''
+        assert len(results) == 6
+        assert all([isinstance(i, testing.Test)
+                    for i in results])
+
+
+@pytest.mark.asyncio
+async def test_list_tests_pager_prefetch_async():
+    client = TestingAsyncClient(
+        credentials=credentials.AnonymousCredentials,
+        page_prefetch_depth=2,
+    )
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.list_tests),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Set the response to a series of pages; they are fetched ahead.
+        call.side_effect = (
+            testing.ListTestsResponse(
+                tests=[
+                    testing.Test(),
+                    testing.Test(),
+                    testing.Test(),
+                ],
+                next_page_token='abc',
+            ),
+            testing.ListTestsResponse(
+                tests=[],
+                next_page_token='def',
+            ),
+            testing.ListTestsResponse(
+                tests=[
+                    testing.Test(),
+                ],
+                next_page_token='ghi',
+            ),
+            testing.ListTestsResponse(
+                tests=[
+                    testing.Test(),
+                    testing.Test(),
+                ],
+            ),
+            RuntimeError,
+        )
+        pager = await client.list_tests(request={})
+        results = [i async for i in pager]
+        assert pager.next_page_token == ''
+        assert len(results) == 6
+        assert all([isinstance(i, testing.Test)
+                    for i in results])
+
+
 def test_delete_test(transport: str = 'grpc'):
     client = TestingClient(
         credentials=credentials.AnonymousCredentials(),
@@ -509,6 +1092,34 @@ def test_delete_test(transport: str = 'grpc'):
     assert response is None
 
 
+@pytest.mark.asyncio
+async def test_delete_test_async():
+    client = TestingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = testing.DeleteTestRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.delete_test),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = None
+        response = await client.delete_test(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert response is None
+
+
 def test_verify_test(transport: str = 'grpc'):
     client = TestingClient(
         credentials=credentials.AnonymousCredentials(),
@@ -537,6 +1148,166 @@ def test_verify_test(transport: str = 'grpc'):
     assert isinstance(response, testing.VerifyTestResponse)
 
 
+@pytest.mark.asyncio
+async def test_verify_test_async():
+    client = TestingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Everything is optional in proto3 as far as the runtime is concerned,
+    # and we are mocking out the actual API, so just send an empty request.
+    request = testing.VerifyTestRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._client._transport.verify_test),
+            '__call__',
+            new_callable=mock.AsyncMock) as call:
+        # Designate an appropriate return value for the call.
+        call.return_value = testing.VerifyTestResponse(
+        )
+        response = await client.verify_test(request)
+
+        # Establish that the underlying gRPC stub method was called.
+        assert len(call.mock_calls) == 1
+        _, args, _ = call.mock_calls[0]
+        assert args[0] == request
+
+    # Establish that the response is the type that we expect.
+    assert isinstance(response, testing.VerifyTestResponse)
+
+
+@pytest.mark.parametrize('take_request_ownership', [False, True])
+def test_list_sessions_pager_request_ownership(take_request_ownership):
+    client = TestingClient(
+        credentials=credentials.AnonymousCredentials(),
+        take_request_ownership=take_request_ownership,
+    )
+    request = testing.ListSessionsRequest()
+
+    # Mock the actual call within the gRPC stub, and fake the request.
+    with mock.patch.object(
+            type(client._transport.list_sessions),
+            '__call__') as call:
+        call.side_effect = (
+            testing.ListSessionsResponse(next_page_token='abc'),
+            testing.ListSessionsResponse(),
+        )
+        pager = client.list_sessions(request)
+        pages = list(pager.pages)
+
+    # The pager only advances the caller's own request once the caller has
+    # handed it over; otherwise it works on a copy.
+    assert len(pages) == 2
+    assert (pager._request is request) == take_request_ownership
+    assert request.page_token == ('abc' if take_request_ownership else '')
+
+
+_METHODS = (
+    ('create_session', testing.CreateSessionRequest),
+    ('get_session', testing.GetSessionRequest),
+    ('list_sessions', testing.ListSessionsRequest),
+    ('delete_session', testing.DeleteSessionRequest),
+    ('report_session', testing.ReportSessionRequest),
+    ('list_tests', testing.ListTestsRequest),
+    ('delete_test', testing.DeleteTestRequest),
+    ('verify_test', testing.VerifyTestRequest),
+)
+
+
+def test_testing_wrapped_methods_are_cached():
+    client = TestingClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Mock out the wrapping itself, so that we can count how often it happens.
+    with mock.patch.object(gapic_v1.method, 'wrap_method') as wrap:
+        wrap.return_value.return_value = operations_pb2.Operation(
+            name='operations/spam',
+        )
+
+        # Call every method twice; only the first call should wrap.
+        for _ in range(2):
+            for name, request_type in _METHODS:
+                getattr(client, name)(request_type())
+
+        assert wrap.call_count == len(_METHODS)
+        assert sorted(client._inner_api_calls) == sorted(
+            name for name, _ in _METHODS)
+
+
+def test_testing_requests_are_not_copied():
+    client = TestingClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    with mock.patch.object(gapic_v1.method, 'wrap_method') as wrap:
+        rpc = wrap.return_value
+        rpc.return_value = operations_pb2.Operation(name='operations/spam')
+
+        for name, request_type in _METHODS:
+            # A request of exactly the right type is sent as-is...
+            request = request_type()
+            getattr(client, name)(request)
+            _, args, _ = rpc.mock_calls[-1]
+            assert args[0] is request
+
+            # ...while anything else is coerced into a new request.
+            getattr(client, name)({})
+            _, args, _ = rpc.mock_calls[-1]
+            assert isinstance(args[0], request_type)
+
+
+@pytest.mark.asyncio
+async def test_testing_async_wrapped_methods_are_cached():
+    client = TestingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    # Mock out the wrapping itself, so that we can count how often it happens.
+    with mock.patch.object(gapic_v1.method_async, 'wrap_method') as wrap:
+        wrap.return_value = mock.AsyncMock(
+            return_value=grpc_helpers_async.FakeUnaryUnaryCall(
+                operations_pb2.Operation(name='operations/spam'),
+            ),
+        )
+
+        # Call every method twice; only the first call should wrap.
+        for _ in range(2):
+            for name, request_type in _METHODS:
+                await getattr(client, name)(request_type())
+
+        assert wrap.call_count == len(_METHODS)
+        assert sorted(client._inner_api_calls) == sorted(
+            name for name, _ in _METHODS)
+
+
+@pytest.mark.asyncio
+async def test_testing_async_requests_are_not_copied():
+    client = TestingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+
+    with mock.patch.object(gapic_v1.method_async, 'wrap_method') as wrap:
+        rpc = wrap.return_value = mock.AsyncMock(
+            return_value=grpc_helpers_async.FakeUnaryUnaryCall(
+                operations_pb2.Operation(name='operations/spam'),
+            ),
+        )
+
+        for name, request_type in _METHODS:
+            # A request of exactly the right type is sent as-is...
+            request = request_type()
+            await getattr(client, name)(request)
+            _, args, _ = rpc.mock_calls[-1]
+            assert args[0] is request
+
+            # ...while anything else is coerced into a new request.
+            await getattr(client, name)({})
+            _, args, _ = rpc.mock_calls[-1]
+            assert isinstance(args[0], request_type)
+
+
 def test_credentials_transport_error():
     # It is an error to provide credentials and a transport instance.
     transport = transports.TestingGrpcTransport(
@@ -569,6 +1340,17 @@ def test_transport_grpc_default():
     )
 
 
+def test_transport_grpc_asyncio_default():
+    # An async client should use the gRPC AsyncIO transport by default.
+    client = TestingAsyncClient(
+        credentials=credentials.AnonymousCredentials(),
+    )
+    assert isinstance(
+        client._client._transport,
+        transports.TestingGrpcAsyncIOTransport,
+    )
+
+
 def test_testing_base_transport():
     # Instantiate the base transport.
     transport = transports.TestingTransport(
@@ -593,12 +1375,16 @@ def test_testing_base_transport():
 
 
 def test_testing_auth_adc():
-    # If no credentials are provided, we should use ADC credentials.
+    # If no credentials are provided, we should use ADC credentials,
+    # resolved once for every client.
+    credentials_cache.clear()
     with mock.patch.object(auth, 'default') as adc:
         adc.return_value = (credentials.AnonymousCredentials(), None)
         client = TestingClient()
+        assert TestingClient()._transport._credentials is client._transport._credentials
         adc.assert_called_once_with(scopes=(
         ))
+    credentials_cache.clear()
 
 
 def test_testing_host_no_port():
@@ -619,6 +1405,32 @@ def test_testing_host_with_port():
     assert client._transport._host == 'localhost:8000'
 
 
+def test_testing_grpc_transport_service_config():
+    with mock.patch.object(grpc_helpers, 'create_channel') as create_channel:
+        transport = transports.TestingGrpcTransport(
+            credentials=credentials.AnonymousCredentials(),
+            grpc_service_config=True,
+        )
+        assert transport.grpc_channel is create_channel.return_value
+        create_channel.assert_called_once_with(
+            'localhost:7469',
+            credentials=mock.ANY,
+            scopes=(),
+            options=[('grpc.service_config', service_config.SERVICE_CONFIG_JSON)],
+        )
+
+    # The pool is created with the same option.
+    with mock.patch.object(channel_pool, 'shared_pool') as shared_pool:
+        transport = transports.TestingGrpcTransport(
+            credentials=credentials.AnonymousCredentials(),
+            channel_pool_size=2,
+            grpc_service_config=True,
+        )
+        assert transport.grpc_channel is shared_pool.return_value
+        assert shared_pool.call_args[1]['options'] == [
+            ('grpc.service_config', service_config.SERVICE_CONFIG_JSON)]
+
+
 def test_testing_grpc_transport_channel():
     channel = grpc.insecure_channel('http://localhost/')
     transport = transports.TestingGrpcTransport(
@@ -627,6 +1439,37 @@ def test_testing_grpc_transport_channel():
     assert transport.grpc_channel is channel
 
 
+@pytest.mark.asyncio
+async def test_testing_grpc_asyncio_transport_channel():
+    channel = aio.insecure_channel('http://localhost/')
+    transport = transports.TestingGrpcAsyncIOTransport(
+        channel=channel,
+    )
+    assert transport.grpc_channel is channel
+
+
+@pytest.mark.parametrize('grpc_service_config,options', [
+    (False, []),
+    (True, [('grpc.service_config', service_config.SERVICE_CONFIG_JSON)]),
+])
+def test_testing_grpc_asyncio_transport_create_channel(grpc_service_config, options):
+    creds = credentials.AnonymousCredentials()
+    with mock.patch.object(grpc_helpers_async, 'create_channel') as create_channel:
+        transport = transports.TestingGrpcAsyncIOTransport(
+            host='squid.clam.whelk',
+            credentials=creds,
+            grpc_service_config=grpc_service_config,
+        )
+        assert transport.grpc_channel is create_channel.return_value
+        assert transport.grpc_channel is create_channel.return_value
+        create_channel.assert_called_once_with(
+            'squid.clam.whelk:443',
+            credentials=creds,
+            scopes=transport.AUTH_SCOPES,
+            options=options,
+        )
+
+
 def test_session_path():
   session = "squid"
 